@@ -1,12 +1,17 @@
 from django.contrib import admin
-from .models import User, Student, Parent
+from django.utils.html import format_html_join
+from django.utils.translation import gettext_lazy as _
+from core.admin import BulkDeleteMixin
+
+from .directory import filter_users
+from .models import ActivityLog, Parent, Student, TeacherInfo, User, UserImport
 from .forms import UserCreationForm
 
 # ------------------------------
 # UserAdmin simple
 # ------------------------------
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(BulkDeleteMixin, admin.ModelAdmin):
     form = UserCreationForm
 
     list_display = [
@@ -23,11 +28,75 @@ class UserAdmin(admin.ModelAdmin):
 
     search_fields = ["username", "first_name", "last_name", "email"]
 
-    # Actions de suppression Django par défaut
-    actions = ["delete_selected"]
+    def get_search_results(self, request, queryset, search_term):
+        # Colonne normalisée et indexée plutôt qu'un icontains par champ (voir accounts.directory)
+        return filter_users(queryset, search_term), False
+
+# ------------------------------
+# Profils (le libellé de chaque ligne lit l'utilisateur : list_select_related)
+# ------------------------------
+@admin.register(Student)
+class StudentAdmin(BulkDeleteMixin, admin.ModelAdmin):
+    list_display = ["__str__", "level"]
+    list_filter = ["level"]
+    list_select_related = ["student"]
+    search_fields = ["student__username", "student__first_name", "student__last_name"]
+
+
+@admin.register(Parent)
+class ParentAdmin(BulkDeleteMixin, admin.ModelAdmin):
+    list_display = ["__str__", "relation_ship", "student"]
+    list_select_related = ["parent", "student__student"]
+    search_fields = ["parent__username", "parent__first_name", "parent__last_name"]
+
+
+@admin.register(TeacherInfo)
+class TeacherInfoAdmin(BulkDeleteMixin, admin.ModelAdmin):
+    list_display = ["__str__", "email", "section_enseignement", "updated_at"]
+    list_select_related = ["teacher__user"]
+    search_fields = ["nom", "prenom", "email", "teacher__user__matricule"]
+    raw_id_fields = ["teacher"]
+
+
+@admin.register(ActivityLog)
+class ActivityLogAdmin(BulkDeleteMixin, admin.ModelAdmin):
+    list_display = ["__str__", "user", "created_at"]
+    list_select_related = ["user"]
+    date_hierarchy = "created_at"
+    raw_id_fields = ["user"]
 
 # ------------------------------
-# Enregistrement des autres modèles
+# Import en masse (traité par la commande import_users)
 # ------------------------------
-admin.site.register(Student)
-admin.site.register(Parent)
+@admin.register(UserImport)
+class UserImportAdmin(admin.ModelAdmin):
+    list_display = ["__str__", "default_role", "status", "row_count", "created_count", "error_count", "created_at"]
+    list_filter = ["status", "default_role"]
+    readonly_fields = [
+        "status", "uploaded_by", "created_at", "finished_at",
+        "row_count", "created_count", "error_list",
+    ]
+    actions = ["requeue_imports"]
+
+    def get_readonly_fields(self, request, obj=None):
+        # Le fichier n'est plus modifiable une fois déposé
+        return self.readonly_fields + (["file", "default_role", "send_emails"] if obj else [])
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.uploaded_by = request.user
+            self.message_user(request, _("Fichier déposé : il sera traité par la commande import_users."))
+        super().save_model(request, obj, form, change)
+
+    def error_count(self, obj):
+        return len(obj.errors)
+    error_count.short_description = _("Erreurs")
+
+    def error_list(self, obj):
+        return format_html_join("\n", "<div>ligne {} : {}</div>", obj.errors[:500]) or "—"
+    error_list.short_description = _("Lignes rejetées")
+
+    def requeue_imports(self, request, queryset):
+        updated = queryset.filter(status=UserImport.FAILED).update(status=UserImport.PENDING, errors=[])
+        self.message_user(request, _("%d import(s) remis en attente.") % updated)
+    requeue_imports.short_description = _("Relancer les imports en échec")
@@ -0,0 +1,57 @@
+# accounts/directory.py
+"""
+Recherche dans l'annuaire des utilisateurs (listes, filtres, admin).
+
+Au lieu de quatre ``icontains`` (UPPER() et parcours complet de la table),
+on interroge la colonne ``User.search_text`` : prénom, nom, identifiant et
+email en minuscules sans accents, recalculée à chaque sauvegarde. Elle
+est indexée par trigrammes (migration 0005) :
+
+- PostgreSQL : index GIN ``gin_trgm_ops``, utilisé par ``LIKE '%mot%'`` ;
+- SQLite : table FTS5 ``accounts_user_fts`` (tokenizer trigram, SQLite
+  3.34+), interrogée par MATCH.
+
+Les mots de moins de trois lettres n'ont pas de trigramme : ils sont
+cherchés par ``LIKE`` sur la colonne, après les autres conditions.
+"""
+from django.db import connection
+
+from search.typeahead import words
+
+SEARCH_FIELDS = ("first_name", "last_name", "username", "email")
+TRIGRAM = 3  # longueur minimale d'un mot servi par l'index
+
+
+def build_search_text(first_name="", last_name="", username="", email=""):
+    return " ".join(words(" ".join(part or "" for part in (first_name, last_name, username, email))))
+
+
+def user_search_text(user):
+    return build_search_text(*(getattr(user, field) for field in SEARCH_FIELDS))
+
+
+def has_trigram_fts(conn=connection):
+    return conn.vendor == "sqlite" and conn.Database.sqlite_version_info >= (3, 34, 0)
+
+
+def filter_users(queryset, query, path=""):
+    """
+    Restreint ``queryset`` aux utilisateurs dont le nom, l'identifiant ou
+    l'email contient chaque mot de ``query`` (sans casse ni accents).
+    ``path`` : chemin de l'utilisateur depuis le modèle du queryset, ex.
+    "student__" pour un queryset de Student.
+    """
+    query_words = words(query or "")
+    if not query_words:
+        return queryset
+    short = query_words
+    if has_trigram_fts(connection):
+        long = [word for word in query_words if len(word) >= TRIGRAM]
+        short = [word for word in query_words if len(word) < TRIGRAM]
+        if long:
+            # Un seul MATCH (mots implicitement liés par AND) ; les guillemets neutralisent la syntaxe FTS5
+            expression = " ".join(f'"{word}"' for word in long)
+            queryset = queryset.filter(**{f"{path}search_fts__document__match": expression})
+    for word in short:
+        queryset = queryset.filter(**{f"{path}search_text__contains": word})
+    return queryset
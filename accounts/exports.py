@@ -0,0 +1,437 @@
+# accounts/exports.py
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+
+from django.http import FileResponse
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate, Paragraph, Table, TableStyle
+
+from core import pdf_assets
+from core.pdf_assets import LOGO, SIGNATURE, STAMP, draw_image, fit_text
+
+from .models import Parent, Student, User
+
+# Lignes lues par aller-retour base / lignes par tableau (environ une page)
+FETCH_SIZE = 2000
+ROWS_PER_TABLE = 40
+
+FONT = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+FONT_SIZE = 8
+ROW_HEIGHT = 14
+CELL_PADDING = 4
+PRIMARY = colors.HexColor("#0D47A1")
+STRIPE = colors.HexColor("#F1F5FB")
+
+
+@dataclass(frozen=True)
+class Column:
+    header: str
+    width: float  # part relative de la largeur utile
+
+
+# ----------------------------------------
+# Flux de flowables
+# ----------------------------------------
+class FlowableStream(list):
+    """
+    Liste de flowables alimentée à la demande par un générateur : platypus
+    consomme l'histoire par la tête, seuls quelques tableaux existent en
+    mémoire à un instant donné.
+    """
+
+    def __init__(self, source, lookahead=2):
+        super().__init__()
+        self._source = iter(source)
+        self._lookahead = lookahead
+
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+
+# ----------------------------------------
+# Document
+# ----------------------------------------
+class ListDocTemplate(BaseDocTemplate):
+    """
+    Gabarit paysage : en-tête de l'établissement sur la première page,
+    ligne d'en-tête du tableau et numéro de page répétés sur chaque page.
+    """
+
+    def __init__(self, filename, title, columns, **kwargs):
+        super().__init__(filename, pagesize=landscape(A4), title=title, **kwargs)
+        self.list_title = title
+        self.columns = columns
+        self.generated_at = datetime.now().strftime("%d/%m/%Y à %H:%M")
+        total = sum(column.width for column in columns)
+        self.col_widths = [self.width * column.width / total for column in columns]
+        header_space = ROW_HEIGHT + 0.3 * cm
+        first = Frame(
+            self.leftMargin, self.bottomMargin, self.width, self.height - 3 * cm - header_space, id="first"
+        )
+        later = Frame(self.leftMargin, self.bottomMargin, self.width, self.height - header_space, id="later")
+        self.addPageTemplates([
+            PageTemplate(id="First", frames=[first], onPage=self._draw_first_page, autoNextPageTemplate="Later"),
+            PageTemplate(id="Later", frames=[later], onPage=self._draw_page),
+        ])
+
+    def _draw_first_page(self, canv, doc):
+        width, height = self.pagesize
+        canv.saveState()
+        draw_image(canv, LOGO, self.leftMargin, height - self.topMargin - 2.2 * cm, 2.6 * cm, 2.1 * cm)
+        canv.setFillColor(PRIMARY)
+        canv.setFont(FONT_BOLD, 16)
+        canv.drawCentredString(width / 2, height - self.topMargin - 0.8 * cm, "THE GENIUS ACADEMY")
+        canv.setFont(FONT_BOLD, 12)
+        canv.drawCentredString(width / 2, height - self.topMargin - 1.5 * cm, self.list_title)
+        canv.setFillColor(colors.grey)
+        canv.setFont(FONT, 9)
+        canv.drawCentredString(width / 2, height - self.topMargin - 2.1 * cm, f"Généré le : {self.generated_at}")
+        canv.restoreState()
+        self._draw_table_header(canv, top=height - self.topMargin - 3 * cm)
+        self._draw_footer(canv)
+
+    def _draw_page(self, canv, doc):
+        self._draw_table_header(canv, top=self.pagesize[1] - self.topMargin)
+        self._draw_footer(canv)
+
+    def _draw_table_header(self, canv, top):
+        canv.saveState()
+        canv.setFillColor(PRIMARY)
+        canv.rect(self.leftMargin, top - ROW_HEIGHT, self.width, ROW_HEIGHT, stroke=0, fill=1)
+        canv.setFillColor(colors.white)
+        canv.setFont(FONT_BOLD, FONT_SIZE)
+        x = self.leftMargin
+        for column, width in zip(self.columns, self.col_widths):
+            canv.drawString(x + CELL_PADDING, top - ROW_HEIGHT + 4, column.header)
+            x += width
+        canv.restoreState()
+
+    def _draw_footer(self, canv):
+        canv.saveState()
+        canv.setFont(FONT, 8)
+        canv.setFillColor(colors.grey)
+        canv.drawRightString(self.leftMargin + self.width, self.bottomMargin / 2, f"Page {canv.getPageNumber()}")
+        canv.drawString(self.leftMargin, self.bottomMargin / 2, f"{self.list_title} – The Genius Academy")
+        canv.restoreState()
+
+
+TABLE_STYLE = TableStyle([
+    ("FONT", (0, 0), (-1, -1), FONT, FONT_SIZE),
+    ("LEFTPADDING", (0, 0), (-1, -1), CELL_PADDING),
+    ("RIGHTPADDING", (0, 0), (-1, -1), CELL_PADDING),
+    ("TOPPADDING", (0, 0), (-1, -1), 0),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("ROWBACKGROUNDS", (0, 0), (-1, -1), [colors.white, STRIPE]),
+    ("LINEBELOW", (0, 0), (-1, -1), 0.25, colors.HexColor("#D0D7E2")),
+])
+
+
+def _story(rows, col_widths):
+    """Tableaux de ROWS_PER_TABLE lignes, construits au fil de la lecture, puis le total."""
+    rows = iter(rows)
+    total = 0
+    while chunk := list(islice(rows, ROWS_PER_TABLE)):
+        data = [
+            [fit_text(value, width, FONT, FONT_SIZE, CELL_PADDING) for value, width in zip([total + i + 1, *row], col_widths)]
+            for i, row in enumerate(chunk)
+        ]
+        total += len(chunk)
+        yield Table(data, colWidths=col_widths, rowHeights=ROW_HEIGHT, style=TABLE_STYLE)
+    yield Paragraph(f"<br/><b>Total : {total}</b>", pdf_assets.styles()["Normal"])
+
+
+def build_list_pdf(output, title, columns, rows):
+    """
+    Écrit dans ``output`` un PDF paginé de ``rows`` (itérable de tuples,
+    sans la colonne de numérotation qui est ajoutée). Les lignes sont
+    consommées au fur et à mesure de la mise en page.
+    """
+    columns = [Column("#", 0.5), *columns]
+    doc = ListDocTemplate(output, title, columns, leftMargin=1.2 * cm, rightMargin=1.2 * cm,
+                          topMargin=1.2 * cm, bottomMargin=1.5 * cm)
+    doc.build(FlowableStream(_story(rows, doc.col_widths)))
+
+
+def list_pdf_response(filename, title, columns, rows):
+    """Construit le PDF dans un fichier temporaire et le renvoie en flux (FileResponse)."""
+    output = tempfile.TemporaryFile(suffix=".pdf")
+    try:
+        build_list_pdf(output, title, columns, rows)
+    except Exception:
+        output.close()
+        raise
+    output.seek(0)
+    return FileResponse(output, filename=filename, content_type="application/pdf")
+
+
+# ----------------------------------------
+# Listes exportées (projections values_list, lues en flux)
+# ----------------------------------------
+def _full_name(first_name, last_name):
+    return f"{first_name or ''} {last_name or ''}".strip()
+
+
+def student_rows():
+    rows = (
+        Student.objects.order_by("student__last_name", "student__first_name", "pk")
+        .values_list("student__username", "student__first_name", "student__last_name",
+                     "student__email", "student__phone", "level")
+        .iterator(chunk_size=FETCH_SIZE)
+    )
+    levels = dict(Student._meta.get_field("level").choices)
+    for username, first_name, last_name, email, phone, level in rows:
+        yield username, _full_name(first_name, last_name), email, phone or "-", levels.get(level, level or "-")
+
+
+def user_rows(**filters):
+    rows = (
+        User.objects.filter(**filters)
+        .order_by("last_name", "first_name", "pk")
+        .values_list("username", "first_name", "last_name", "email", "phone", "address")
+        .iterator(chunk_size=FETCH_SIZE)
+    )
+    for username, first_name, last_name, email, phone, address in rows:
+        yield username, _full_name(first_name, last_name), email, phone or "-", address or "-"
+
+
+def parent_rows():
+    rows = (
+        Parent.objects.order_by("parent__last_name", "parent__first_name", "pk")
+        .values_list("parent__username", "parent__first_name", "parent__last_name", "parent__email",
+                     "parent__phone", "relation_ship", "student__student__first_name",
+                     "student__student__last_name", "parent__date_joined")
+        .iterator(chunk_size=FETCH_SIZE)
+    )
+    for (username, first_name, last_name, email, phone, relation,
+         child_first, child_last, date_joined) in rows:
+        child = _full_name(child_first, child_last) or "Aucun enfant assigné"
+        yield (username, _full_name(first_name, last_name), email or "-", phone or "-",
+               relation or "Non spécifié", child, date_joined.strftime("%d/%m/%Y"))
+
+
+STUDENT_COLUMNS = [
+    Column("Numéro ID", 1.4), Column("Nom complet", 2.5), Column("Email", 3),
+    Column("Téléphone", 1.6), Column("Niveau", 1.2),
+]
+USER_COLUMNS = [
+    Column("Numéro ID", 1.4), Column("Nom complet", 2.5), Column("Email", 3),
+    Column("Téléphone", 1.6), Column("Adresse/Ville", 2.2),
+]
+PARENT_COLUMNS = [
+    Column("Nom d'utilisateur", 1.4), Column("Nom complet", 2.2), Column("Email", 2.6),
+    Column("Téléphone", 1.5), Column("Relation", 1.1), Column("Enfant", 2.2), Column("Inscription", 1.1),
+]
+
+
+# ----------------------------------------
+# Fiche répétiteur
+# ----------------------------------------
+def teacher_info_filename(info):
+    return f"fiche_repetiteur_{info.nom}_{info.prenom}.pdf"
+
+
+def build_teacher_info_pdf(output, info):
+    width, height = A4
+    p = canvas.Canvas(output, pagesize=A4)
+
+    # === Watermark discret ===
+    p.saveState()
+    p.setFont("Helvetica-Bold", 60)
+    p.setFillColorRGB(0.92, 0.92, 0.92)
+    p.translate(width/2, height/2)
+    p.rotate(45)
+    p.drawCentredString(0, 0, "THE GENIUS ACADEMY")
+    p.restoreState()
+
+    # === Bandeau République / Académie ===
+    def draw_header(x_center, country_fr, country_en):
+        stars = "★ ★ ★ ★ ★"
+        spacing = 20
+        # Français
+        y = height - 55
+        p.setFont("Helvetica-Bold", 11)
+        p.drawCentredString(x_center, y, country_fr)
+        y -= spacing
+        p.setFont("Helvetica-Bold", 12)
+        p.drawCentredString(x_center, y, stars)
+        y -= spacing
+        p.setFont("Helvetica-Oblique", 10)
+        p.drawCentredString(x_center, y, "Paix - Travail - Patrie")
+        y -= spacing
+        p.setFont("Helvetica-Bold", 12)
+        p.drawCentredString(x_center, y, stars)
+        y -= spacing
+        p.setFont("Helvetica-Bold", 11)
+        p.drawCentredString(x_center, y, "THE GENIUS ACADEMY")
+
+        # Anglais
+        y = height - 55
+        p.setFont("Helvetica-Bold", 11)
+        p.drawCentredString(x_center + width/2, y, country_en)
+        y -= spacing
+        p.setFont("Helvetica-Bold", 12)
+        p.drawCentredString(x_center + width/2, y, stars)
+        y -= spacing
+        p.setFont("Helvetica-Oblique", 10)
+        p.drawCentredString(x_center + width/2, y, "Peace - Work - Fatherland")
+        y -= spacing
+        p.setFont("Helvetica-Bold", 12)
+        p.drawCentredString(x_center + width/2, y, stars)
+        y -= spacing
+        p.setFont("Helvetica-Bold", 11)
+        p.drawCentredString(x_center + width/2, y, "THE GENIUS ACADEMY")
+
+    draw_header(width/4, "REPUBLIQUE DU CAMEROUN", "REPUBLIC OF CAMEROON")
+
+    # === Logo ===
+    logo_size = 100
+    logo_y_offset = 135 - (logo_size - 60)/2
+    draw_image(p, LOGO, width/2 - logo_size/2, height - logo_y_offset, logo_size, logo_size)
+
+    # === Titre principal et référence ===
+    p.setFillColor(colors.darkblue)
+    p.setFont("Helvetica-Bold", 18)
+    p.drawCentredString(width/2, height - 165, "FICHE D’ENREGISTREMENT POUR RÉPÉTITEUR")
+    p.setFont("Helvetica-BoldOblique", 12)
+    p.drawCentredString(width/2, height - 190, "DE THE GENIUS ACADEMY")
+    p.setFont("Helvetica-Bold", 10)
+    p.setFillColor(colors.black)
+    p.drawCentredString(width/2, height - 210, f"NOUS CONTACTER: +237 680700470 /+237 693501411")
+
+    # === Infos Personnelles ===
+    y_top = height - 235
+    y_title = y_top - 10
+    p.setFont("Helvetica-Bold", 12)
+    p.setFillColor(colors.HexColor("#0D47A1"))
+    p.drawString(50, y_title, "➤ INFORMATIONS PERSONNELLES :")
+    p.setFillColor(colors.black)
+
+    y = y_title - 25
+    col1_x = 60
+    col2_x = 200
+    row_height = 18
+    padding = 12
+    y_box_start = y + row_height + padding
+
+    lignes = [
+        ("Nom et Prénoms", f"{info.nom} {info.prenom}"),
+        ("Date de naissance", info.date_naissance.strftime('%d/%m/%Y') if info.date_naissance else ""),
+        ("Lieu de naissance", info.lieu_naissance or ""),
+        ("Sexe", info.sexe or ""),
+        ("Nationalité", info.nationalite or ""),
+        ("Statut matrimonial", info.statut_matrimonial or ""),
+        ("Adresse", info.adresse or ""),
+        ("Email", info.email or ""),
+        ("Téléphone", info.contact or ""),
+        ("N° CNI / Récépissé", info.cni_numero or ""),
+        ("Personne à contacter", f"{info.personne_urgence or ''} "),
+        ("Numéro d'urgence", f"{info.contact_urgence or ''}")
+    ]
+
+    for label, value in lignes:
+        p.setFont("Helvetica-Bold", 10)
+        p.drawString(col1_x, y, f"{label} :")
+        p.setFont("Helvetica", 10)
+        p.drawString(col2_x, y, value)
+        y -= row_height
+
+    p.setStrokeColor(colors.HexColor("#0D47A1"))
+    p.setLineWidth(1.5)
+    p.roundRect(35, y, width - 70, y_box_start - y + 5, radius=10, stroke=1, fill=0)
+
+    # === Matricule et Photo ===
+    matricule_y = y + (y_box_start - y - 110)/2 + 110 + 10
+    p.setFont("Helvetica-Bold", 10)
+    p.drawCentredString(width - 120, matricule_y, f"Matricule : {info.matricule or 'N/A'}")
+
+    photo_width = 90
+    photo_height = 110
+    photo_x = width - 160
+    photo_y = y + (y_box_start - y - photo_height)/2
+    p.setLineWidth(1)
+    p.setStrokeColor(colors.darkblue)
+    p.rect(photo_x, photo_y, photo_width, photo_height, stroke=1, fill=0)
+    p.setFont("Helvetica-Oblique", 8)
+    p.drawCentredString(photo_x + photo_width/2, photo_y - 12, "PHOTO 4x4")
+    if info.photo and os.path.exists(info.photo.path):
+        p.drawImage(info.photo.path, photo_x, photo_y, width=photo_width, height=photo_height, mask='auto')
+
+    # === Infos Professionnelles ===
+    y_top2 = y - 20
+    y_title2 = y_top2 - 10
+    p.setFont("Helvetica-Bold", 12)
+    p.setFillColor(colors.HexColor("#BF360C"))
+    p.drawString(50, y_title2, "➤ INFORMATIONS PROFESSIONNELLES :")
+    p.setFillColor(colors.black)
+
+    y = y_title2 - 25
+    y_box2_start = y + row_height + padding
+
+    lignes2 = [
+        ("Section d’enseignement", info.section_enseignement or ""),
+        ("Domaine d’enseignement", info.domaine_enseignement or ""),
+        ("Niveau scolaire", info.niveau_scolaire or ""),
+        ("Diplôme le plus élevé", info.diplome or ""),
+        ("Marge d’enseignement", info.marge_enseignement or ""),
+        ("Matières du primaire", info.matieres_primaire or ""),
+        ("Matières du secondaire", info.matieres_secondaire or ""),
+        ("Expérience professionnelle", info.experience or ""),
+    ]
+
+    for label, value in lignes2:
+        p.setFont("Helvetica-Bold", 10)
+        p.drawString(col1_x, y, f"{label} :")
+        p.setFont("Helvetica", 10)
+        p.drawString(col2_x, y, value)
+        y -= row_height
+
+    p.setStrokeColor(colors.HexColor("#BF360C"))
+    p.setLineWidth(1.5)
+    p.roundRect(35, y, width - 70, y_box2_start - y + 5, radius=10, stroke=1, fill=0)
+
+    # === Signatures finales ===
+    y_sign = y - 40
+    date_str = datetime.now().strftime("%d/%m/%Y")
+
+    # Signature du répétiteur
+    p.setFont("Helvetica", 10)
+    p.drawString(60, y_sign, "Signature du Répétiteur")
+
+    # Signature de l’administrateur
+    right_x = width - 200
+    y_sign_admin = y_sign - 5
+    p.drawString(right_x, y_sign_admin, f"Fait à Yaoundé, le {date_str}")
+    p.drawString(right_x, y_sign_admin - 20, "Directeur Général")
+
+    # Signature en arrière-plan
+    sign_width = 150
+    sign_height = 90
+    draw_image(p, SIGNATURE, right_x + 40, y_sign_admin - 80, sign_width, sign_height)
+
+    # Cachet central
+    cachet_width = 130
+    cachet_height = 130
+    draw_image(p, STAMP, width/2 - cachet_width/2, y_sign - 90, cachet_width, cachet_height)
+
+    p.showPage()
+    p.save()
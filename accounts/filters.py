@@ -1,17 +1,37 @@
-from django.db.models import Q
 import django_filters
 from django_filters import FilterSet, CharFilter, ChoiceFilter
+from django_filters.constants import EMPTY_VALUES
 from django.db import models  # Ajout pour gérer ImageField
+from .directory import filter_users
 from .models import User, Student, Parent, Teacher, Level
 from .constants import GENDERS, RELATION_SHIP
 
+
+# -----------------------------
+# Filtre sur un champ utilisateur
+# -----------------------------
+class UserSearchFilter(CharFilter):
+    """
+    Filtre texte sur un champ utilisateur (``field_name``, ex.
+    "parent__first_name") : la colonne indexée User.search_text réduit
+    d'abord les candidats (voir accounts.directory), puis ``lookup_expr``
+    s'applique au champ demandé, sur ces seules lignes.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        path, _sep, _field = self.field_name.rpartition("__")
+        return super().filter(filter_users(qs, value, f"{path}__" if path else ""), value)
+
+
 # -----------------------------
 # Lecturer Filter
 # -----------------------------
 class LecturerFilter(django_filters.FilterSet):
     username = django_filters.CharFilter(field_name="username", lookup_expr="exact", label="")
     name = django_filters.CharFilter(method="filter_by_name", label="")
-    email = django_filters.CharFilter(lookup_expr="icontains", label="")
+    email = UserSearchFilter(field_name="email", lookup_expr="icontains", label="")
 
     class Meta:
         model = User
@@ -33,7 +53,7 @@ class LecturerFilter(django_filters.FilterSet):
         self.filters["email"].field.widget.attrs.update({"class": "au-input", "placeholder": "Email"})
 
     def filter_by_name(self, queryset, name, value):
-        return queryset.filter(Q(first_name__icontains=value) | Q(last_name__icontains=value))
+        return filter_users(queryset, value)
 
 # -----------------------------
 # Student Filter
@@ -41,7 +61,7 @@ class LecturerFilter(django_filters.FilterSet):
 class StudentFilter(django_filters.FilterSet):
     id_no = django_filters.CharFilter(field_name="student__username", lookup_expr="exact", label="")
     name = django_filters.CharFilter(method="filter_by_name", label="")
-    email = django_filters.CharFilter(field_name="student__email", lookup_expr="icontains", label="")
+    email = UserSearchFilter(field_name="student__email", lookup_expr="icontains", label="")
     program = django_filters.CharFilter(field_name="program__title", lookup_expr="icontains", label="")
     level = django_filters.CharFilter(field_name="level__name", lookup_expr="icontains", label="")
 
@@ -67,30 +87,28 @@ class StudentFilter(django_filters.FilterSet):
         self.filters["level"].field.widget.attrs.update({"class": "au-input", "placeholder": "Niveau"})
 
     def filter_by_name(self, queryset, name, value):
-        return queryset.filter(
-            Q(student__first_name__icontains=value) | Q(student__last_name__icontains=value)
-        )
+        return filter_users(queryset, value, "student__")
 
 # -----------------------------
 # Parent Filter
 # -----------------------------
 class ParentFilter(django_filters.FilterSet):
-    parent__username = django_filters.CharFilter(
+    parent__username = UserSearchFilter(
         field_name='parent__username', 
         lookup_expr='icontains',
         label='Nom d\'utilisateur'
     )
-    parent__first_name = django_filters.CharFilter(
+    parent__first_name = UserSearchFilter(
         field_name='parent__first_name', 
         lookup_expr='icontains',
         label='Prénom'
     )
-    parent__last_name = django_filters.CharFilter(
+    parent__last_name = UserSearchFilter(
         field_name='parent__last_name', 
         lookup_expr='icontains',
         label='Nom'
     )
-    parent__email = django_filters.CharFilter(
+    parent__email = UserSearchFilter(
         field_name='parent__email', 
         lookup_expr='icontains',
         label='Email'
@@ -132,22 +150,22 @@ class ParentFilter(django_filters.FilterSet):
 # Other Users Filter
 # -----------------------------
 class OtherFilter(FilterSet):
-    username = CharFilter(
+    username = UserSearchFilter(
         field_name='username', 
         lookup_expr='icontains',
         label='Nom d\'utilisateur'
     )
-    first_name = CharFilter(
+    first_name = UserSearchFilter(
         field_name='first_name', 
         lookup_expr='icontains',
         label='Prénom'
     )
-    last_name = CharFilter(
+    last_name = UserSearchFilter(
         field_name='last_name', 
         lookup_expr='icontains',
         label='Nom'
     )
-    email = CharFilter(
+    email = UserSearchFilter(
         field_name='email', 
         lookup_expr='icontains',
         label='Email'
@@ -185,15 +203,15 @@ class OtherFilter(FilterSet):
             },
         }
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    def __init__(self, data=None, queryset=None, **kwargs):
+        # Uniquement les utilisateurs de type "other" (sauf queryset fourni par la vue)
+        if queryset is None:
+            queryset = User.objects.filter(is_other=True)
+        super().__init__(data, queryset, **kwargs)
         # Mettre à jour les attributs des champs pour le style
         self.filters["username"].field.widget.attrs.update({"class": "au-input", "placeholder": "Nom d'utilisateur"})
         self.filters["first_name"].field.widget.attrs.update({"class": "au-input", "placeholder": "Prénom"})
         self.filters["last_name"].field.widget.attrs.update({"class": "au-input", "placeholder": "Nom"})
         self.filters["email"].field.widget.attrs.update({"class": "au-input", "placeholder": "Email"})
         self.filters["phone"].field.widget.attrs.update({"class": "au-input", "placeholder": "Téléphone"})
-        self.filters["gender"].field.widget.attrs.update({"class": "au-input", "placeholder": "Genre"})
-        
-        # Filtrer uniquement les utilisateurs de type "other"
-        self.queryset = User.objects.filter(is_other=True)
\ No newline at end of file
+        self.filters["gender"].field.widget.attrs.update({"class": "au-input", "placeholder": "Genre"})
\ No newline at end of file
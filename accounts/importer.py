@@ -0,0 +1,384 @@
+# accounts/importer.py
+import csv
+import io
+import logging
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .directory import user_search_text
+from .models import Level, Parent, RELATION_SHIP, Student, Teacher, User, UserImport
+from .utils import generate_password, reserve_lecturer_ids, set_password_url
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = getattr(settings, "USER_IMPORT_CHUNK_SIZE", 500)
+HASH_WORKERS = getattr(settings, "USER_IMPORT_HASH_WORKERS", 2)  # 0 : hachage dans le processus courant
+
+STUDENT, PARENT, LECTURER, OTHER = "student", "parent", "lecturer", "other"
+ROLE_FLAGS = {STUDENT: "is_student", PARENT: "is_parent", LECTURER: "is_lecturer", OTHER: "is_other"}
+ROLE_ALIASES = {
+    "eleve": STUDENT, "élève": STUDENT, "etudiant": STUDENT, "étudiant": STUDENT,
+    "enseignant": LECTURER, "professeur": LECTURER, "teacher": LECTURER,
+    "autre": OTHER,
+}
+WELCOME_TEMPLATES = {
+    STUDENT: "accounts/email/new_student_account_confirmation.html",
+    LECTURER: "accounts/email/new_lecturer_account_confirmation.html",
+    PARENT: "accounts/email/new_account_confirmation.html",
+    OTHER: "accounts/email/new_account_confirmation.html",
+}
+WELCOME_SUBJECT = "Confirmation de votre compte The Genius Academy"
+
+# En-têtes acceptés (français ou anglais) → champ interne
+HEADER_ALIASES = {
+    "rôle": "role", "nom_utilisateur": "username", "identifiant": "username",
+    "prenom": "first_name", "prénom": "first_name", "nom": "last_name",
+    "genre": "gender", "sexe": "gender", "telephone": "phone", "téléphone": "phone",
+    "adresse": "address", "niveau": "level", "mot_de_passe": "password",
+    "specialite": "speciality", "spécialité": "speciality", "diplome": "diploma", "diplôme": "diploma",
+    "eleve": "student", "élève": "student", "lien": "relation_ship", "relation": "relation_ship",
+}
+
+LEVELS = {value for value, _label in Level}
+RELATIONS = {str(value) for value, _label in RELATION_SHIP}
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: Counter = field(default_factory=Counter)
+    errors: list = field(default_factory=list)  # [(ligne, message)]
+
+    @property
+    def created_count(self):
+        return sum(self.created.values())
+
+    def add_error(self, line, messages):
+        self.errors.append((line, "; ".join(str(message) for message in messages)))
+
+
+# -----------------------------
+# Lecture en flux
+# -----------------------------
+def _normalize_header(header):
+    key = str(header or "").strip().lower().replace(" ", "_")
+    return HEADER_ALIASES.get(key, key)
+
+
+def _read_csv(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="") if _is_binary(fileobj) else fileobj
+    first_line = text.readline()
+    delimiter = ";" if first_line.count(";") > first_line.count(",") else ","
+    headers = [_normalize_header(h) for h in next(csv.reader([first_line], delimiter=delimiter))]
+    for line, values in enumerate(csv.reader(text, delimiter=delimiter), start=2):
+        if any(value.strip() for value in values):
+            yield line, dict(zip(headers, values))
+
+
+def _read_xlsx(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:  # pragma: no cover
+        raise ValidationError("Le paquet openpyxl est requis pour importer des fichiers .xlsx.")
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = [_normalize_header(h) for h in next(rows, ())]
+        for line, values in enumerate(rows, start=2):
+            if any(value not in (None, "") for value in values):
+                yield line, dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def _is_binary(fileobj):
+    return not isinstance(fileobj, io.TextIOBase)
+
+
+def read_rows(fileobj, filename):
+    """Générateur de (numéro de ligne, dict) ; le format suit l'extension du fichier."""
+    if os.path.splitext(filename)[1].lower() == ".xlsx":
+        return _read_xlsx(fileobj)
+    return _read_csv(fileobj)
+
+
+# -----------------------------
+# Validation
+# -----------------------------
+def clean_row(raw, default_role=None):
+    """Normalise et valide une ligne ; lève ValidationError avec la liste des problèmes."""
+    row = {key: ("" if value is None else str(value).strip()) for key, value in raw.items() if key}
+    errors = []
+
+    role = row.get("role", "").lower() or (default_role or "")
+    role = ROLE_ALIASES.get(role, role)
+    if role not in ROLE_FLAGS:
+        errors.append(f"Rôle inconnu : « {row.get('role') or default_role or ''} »")
+    row["role"] = role
+
+    for name, label in (("first_name", "prénom"), ("last_name", "nom"), ("email", "email")):
+        if not row.get(name):
+            errors.append(f"Champ obligatoire manquant : {label}")
+    if not row.get("username") and role != LECTURER:
+        errors.append("Champ obligatoire manquant : nom d'utilisateur")
+    if row.get("email"):
+        try:
+            validate_email(row["email"])
+        except ValidationError:
+            errors.append(f"Email invalide : {row['email']}")
+
+    gender = row.get("gender", "").upper()[:1]
+    if gender and gender not in ("M", "F"):
+        errors.append(f"Genre invalide : {row['gender']} (M ou F)")
+    row["gender"] = gender
+
+    phone = row.get("phone", "")
+    if phone and (not phone.startswith("+") or len(phone) < 10):
+        errors.append(f"Téléphone invalide : {phone} (ex: +237 6xx xx xx xx)")
+
+    if role == STUDENT and row.get("level") and row["level"] not in LEVELS:
+        errors.append(f"Niveau invalide : {row['level']} ({', '.join(sorted(LEVELS))})")
+    if role == LECTURER and not row.get("speciality"):
+        errors.append("Champ obligatoire manquant : spécialité")
+    if role == PARENT and row.get("relation_ship") and row["relation_ship"] not in RELATIONS:
+        errors.append(f"Lien de parenté invalide : {row['relation_ship']}")
+
+    if errors:
+        raise ValidationError(errors)
+    row["password"] = row.get("password") or generate_password()
+    return row
+
+
+def _validate_chunk(rows, default_role, state, report):
+    """
+    Valide un lot : contrôles ligne par ligne, puis doublons (dans le
+    fichier et en base) et élèves référencés par les parents, en une
+    requête par type de contrôle pour tout le lot.
+    """
+    cleaned = []
+    for line, raw in rows:
+        try:
+            cleaned.append((line, clean_row(raw, default_role)))
+        except ValidationError as e:
+            report.add_error(line, e.messages)
+
+    usernames = {row["username"] for _line, row in cleaned if row.get("username")}
+    emails = {row["email"].lower() for _line, row in cleaned}
+    students = {row["student"] for _line, row in cleaned if row["role"] == PARENT and row.get("student")}
+    taken_usernames = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+    taken_emails = set(
+        User.objects.annotate(email_key=Lower("email"))
+        .filter(email_key__in=emails)
+        .values_list("email_key", flat=True)
+    )
+    known_students = set(
+        Student.objects.filter(student__username__in=students).values_list("student__username", flat=True)
+    )
+
+    valid = []
+    for line, row in cleaned:
+        errors = []
+        username, email = row.get("username"), row["email"].lower()
+        if username and (username in taken_usernames or username in state["usernames"]):
+            errors.append(f"Nom d'utilisateur déjà utilisé : {username}")
+        if email in taken_emails or email in state["emails"]:
+            errors.append(f"Email déjà utilisé : {row['email']}")
+        student = row.get("student")
+        if student and student not in known_students and student not in state["students"]:
+            errors.append(f"Élève introuvable : {student}")
+        if errors:
+            report.add_error(line, errors)
+            continue
+        if username:
+            state["usernames"].add(username)
+            if row["role"] == STUDENT:
+                state["students"].add(username)
+        state["emails"].add(email)
+        valid.append((line, row))
+    return valid
+
+
+# -----------------------------
+# Hachage des mots de passe
+# -----------------------------
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def hash_passwords(passwords, executor=None):
+    if executor is None:
+        return [make_password(password) for password in passwords]
+    return list(executor.map(make_password, passwords, chunksize=16))
+
+
+# -----------------------------
+# Insertion
+# -----------------------------
+def _bulk_insert(items):
+    """Crée les comptes d'un lot (User puis profils) ; retourne [(user, ligne)]."""
+    lecturers = sum(1 for _line, row, _hash in items if row["role"] == LECTURER)
+    matricules = iter(reserve_lecturer_ids(lecturers) if lecturers else ())
+
+    users = []
+    for _line, row, hashed in items:
+        user = User(
+            username=row.get("username", ""),
+            first_name=row["first_name"],
+            last_name=row["last_name"],
+            email=row["email"],
+            gender=row["gender"] or None,
+            phone=row.get("phone") or None,
+            address=row.get("address") or None,
+            password=hashed,
+        )
+        setattr(user, ROLE_FLAGS[row["role"]], True)
+        if row["role"] == LECTURER:
+            user.matricule = next(matricules)
+            user.username = user.username or user.matricule
+        user.search_text = user_search_text(user)  # bulk_create n'appelle pas save()
+        users.append(user)
+    User.objects.bulk_create(users)
+
+    created = list(zip(users, (row for _line, row, _hash in items)))
+    Student.objects.bulk_create(
+        Student(student=user, level=row.get("level") or None) for user, row in created if row["role"] == STUDENT
+    )
+    Teacher.objects.bulk_create(
+        Teacher(user=user, speciality=row["speciality"], diploma=row.get("diploma") or None)
+        for user, row in created if row["role"] == LECTURER
+    )
+    parents = [(user, row) for user, row in created if row["role"] == PARENT]
+    if parents:
+        refs = {row["student"] for _user, row in parents if row.get("student")}
+        students = {
+            student.student.username: student
+            for student in Student.objects.filter(student__username__in=refs).select_related("student")
+        }
+        Parent.objects.bulk_create(
+            Parent(parent=user, student=students.get(row.get("student")), relation_ship=row.get("relation_ship", ""))
+            for user, row in parents
+        )
+    return created
+
+
+def _insert(items, report):
+    """Insère un lot ; en cas de conflit en base, isole la ou les lignes fautives."""
+    try:
+        with transaction.atomic():
+            return _bulk_insert(items)
+    except IntegrityError as e:
+        if len(items) == 1:
+            report.add_error(items[0][0], [f"Erreur base de données : {e}"])
+            return []
+    created = []
+    for item in items:
+        created.extend(_insert([item], report))
+    return created
+
+
+def _queue_welcome_emails(created):
+    from core.mailer import enqueue_mass_mail
+
+    messages = []
+    for user, row in created:
+        # Lien pour définir le mot de passe : le mot de passe lui-même ne passe jamais par la file d'envoi
+        html = render_to_string(WELCOME_TEMPLATES[row["role"]], {"user": user, "set_password_url": set_password_url(user)})
+        messages.append((WELCOME_SUBJECT, strip_tags(html), html, [user.email]))
+    enqueue_mass_mail(messages)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_users(fileobj, filename, default_role=None, chunk_size=CHUNK_SIZE, workers=HASH_WORKERS, send_emails=True):
+    """
+    Importe des comptes depuis un CSV ou un XLSX, lu en flux et traité par
+    lots de ``chunk_size`` lignes : validation groupée, mots de passe
+    hachés dans un pool de processus, insertion par ``bulk_create``,
+    matricules réservés en bloc, emails de bienvenue mis en file.
+    Une ligne invalide est signalée dans le rapport sans interrompre l'import.
+    """
+    from core.models import DashboardSnapshot
+    from search.index import REGISTRY, index_objects
+
+    report = ImportReport()
+    state = {"usernames": set(), "emails": set(), "students": set()}
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) if workers > 0 else None
+    try:
+        for chunk in _chunks(read_rows(fileobj, filename), chunk_size):
+            report.rows += len(chunk)
+            valid = _validate_chunk(chunk, default_role, state, report)
+            if not valid:
+                continue
+            hashes = hash_passwords([row["password"] for _line, row in valid], executor)
+            items = [(line, row, hashed) for (line, row), hashed in zip(valid, hashes)]
+            created = _insert(items, report)
+            report.created.update(row["role"] for _user, row in created)
+            # Pas de post_save avec bulk_create : indexation du lot pour la recherche
+            index_objects(REGISTRY["user"], [user for user, _row in created])
+            if send_emails and created:
+                _queue_welcome_emails(created)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # bulk_create ne déclenche aucun signal : on recalcule le tableau de bord une fois
+    if report.created_count:
+        DashboardSnapshot.rebuild()
+    report.errors.sort()
+    return report
+
+
+def run_user_import(user_import, **options):
+    """
+    Traite un UserImport déposé depuis l'admin et y enregistre le rapport.
+    Retourne None si l'import a échoué (statut FAILED, erreur dans le rapport).
+    """
+    try:
+        with user_import.file.open("rb") as f:
+            report = import_users(
+                f, user_import.file.name,
+                default_role=user_import.default_role or None,
+                send_emails=user_import.send_emails,
+                **options,
+            )
+    except Exception as e:
+        logger.exception("Import %s échoué", user_import.pk)
+        UserImport.objects.filter(pk=user_import.pk).update(
+            status=UserImport.FAILED, finished_at=timezone.now(), errors=[[0, str(e)]]
+        )
+        return None
+    UserImport.objects.filter(pk=user_import.pk).update(
+        status=UserImport.DONE,
+        finished_at=timezone.now(),
+        row_count=report.rows,
+        created_count=report.created_count,
+        errors=[list(error) for error in report.errors],
+    )
+    return report
+
+
+def claim_pending_import():
+    """Réserve le plus ancien import en attente (None si aucun)."""
+    for user_import in UserImport.objects.filter(status=UserImport.PENDING).order_by("created_at"):
+        if UserImport.objects.filter(pk=user_import.pk, status=UserImport.PENDING).update(status=UserImport.RUNNING):
+            return user_import
+    return None
@@ -0,0 +1,68 @@
+import csv
+import os
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.importer import CHUNK_SIZE, HASH_WORKERS, claim_pending_import, import_users, run_user_import
+from accounts.models import IMPORT_ROLES
+
+
+class Command(BaseCommand):
+    help = (
+        "Importe des élèves, parents et enseignants depuis un CSV ou un XLSX. "
+        "Sans fichier, traite les imports déposés depuis l'admin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Fichier .csv ou .xlsx")
+        parser.add_argument("--role", choices=[role for role, _label in IMPORT_ROLES],
+                            help="Rôle des lignes sans colonne « role »")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Lignes validées et insérées par lot")
+        parser.add_argument("--workers", type=int, default=HASH_WORKERS,
+                            help="Processus de hachage des mots de passe (0 : aucun)")
+        parser.add_argument("--no-email", action="store_true", help="Ne pas envoyer d'email de bienvenue")
+        parser.add_argument("--errors-file", help="Écrit les lignes rejetées dans ce CSV")
+
+    def handle(self, *args, **options):
+        batch = {"chunk_size": options["chunk_size"], "workers": options["workers"]}
+        if options["path"]:
+            if not os.path.exists(options["path"]):
+                raise CommandError(f"Fichier introuvable : {options['path']}")
+            try:
+                with open(options["path"], "rb") as f:
+                    report = import_users(
+                        f, options["path"], default_role=options["role"],
+                        send_emails=not options["no_email"], **batch,
+                    )
+            except ValidationError as e:
+                raise CommandError("; ".join(e.messages))
+            self.print_report(report, options["errors_file"])
+            return
+
+        for user_import in iter(claim_pending_import, None):
+            self.stdout.write(f"Import « {user_import} »…")
+            report = run_user_import(user_import, **batch)
+            if report is None:
+                # Échec enregistré sur l'import ; les suivants sont traités
+                self.stderr.write(self.style.ERROR(f"Import « {user_import} » échoué, voir son rapport dans l'admin."))
+                continue
+            self.print_report(report, options["errors_file"])
+
+    def print_report(self, report, errors_file=None):
+        created = ", ".join(f"{count} {role}" for role, count in sorted(report.created.items())) or "aucun"
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.rows} ligne(s) lue(s), {report.created_count} compte(s) créé(s) ({created})."
+        ))
+        if not report.errors:
+            return
+        self.stdout.write(self.style.WARNING(f"{len(report.errors)} ligne(s) rejetée(s) :"))
+        for line, message in report.errors[:50]:
+            self.stdout.write(f"  ligne {line} : {message}")
+        if len(report.errors) > 50:
+            self.stdout.write(f"  … et {len(report.errors) - 50} autre(s)")
+        if errors_file:
+            with open(errors_file, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["ligne", "erreur"])
+                writer.writerows(report.errors)
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import DEFAULT_PICTURE, User
+from accounts.thumbnails import process_pending_pictures
+
+
+class Command(BaseCommand):
+    help = "Génère les miniatures (40/150/300 px, WebP) des photos de profil modifiées."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--workers", type=int, default=2, help="Images décodées en parallèle")
+        parser.add_argument("--all", action="store_true", help="Re-signale toutes les photos (rattrapage)")
+        parser.add_argument("--loop", action="store_true", help="Tourne en continu")
+        parser.add_argument("--interval", type=float, default=5.0, help="Pause (s) quand rien n'est en attente")
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            marked = (
+                User.objects.exclude(picture__in=["", DEFAULT_PICTURE])
+                .exclude(picture__isnull=True)
+                .update(picture_pending=True)
+            )
+            self.stdout.write(f"{marked} photo(s) signalée(s).")
+
+        while True:
+            done, failed = process_pending_pictures(
+                batch_size=options["batch_size"], workers=options["workers"]
+            )
+            if done or failed:
+                self.stdout.write(f"{done} photo(s) traitée(s), {failed} en erreur.")
+            if done + failed < options["batch_size"]:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.teacher_sheets import WORKERS, regenerate_sheets
+
+
+class Command(BaseCommand):
+    help = "Génère en parallèle les fiches répétiteur absentes du cache (toutes avec --force)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("pks", nargs="*", type=int, help="Fiches à traiter (toutes par défaut)")
+        parser.add_argument("--force", action="store_true", help="Redessine même les fiches déjà en cache")
+        parser.add_argument(
+            "--workers", type=int, default=WORKERS, help="Processus de rendu (0 : dans le processus courant)"
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        results = regenerate_sheets(options["pks"] or None, force=options["force"], workers=options["workers"])
+        for pk, _drawn, error in results:
+            if error:
+                self.stderr.write(f"Fiche {pk} : {error}")
+        drawn = sum(1 for _pk, was_drawn, _error in results if was_drawn)
+        failed = sum(1 for _pk, _drawn, error in results if error)
+        self.stdout.write(
+            f"{drawn} fiche(s) générée(s), {len(results) - drawn - failed} déjà à jour, "
+            f"{failed} en erreur ({time.perf_counter() - started:.1f} s)."
+        )
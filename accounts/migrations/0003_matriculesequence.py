@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_picture_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatriculeSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=10)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('last_value', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('prefix', 'year'), name='unique_matricule_sequence')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:39
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_matriculesequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(help_text="CSV (séparateur , ou ;) ou XLSX, avec une ligne d'en-tête.", upload_to='imports/%Y/%m/', validators=[django.core.validators.FileExtensionValidator(['csv', 'xlsx'])], verbose_name='Fichier')),
+                ('default_role', models.CharField(blank=True, choices=[('student', 'Élève'), ('parent', 'Parent'), ('lecturer', 'Enseignant'), ('other', 'Autre')], help_text='Utilisé pour les lignes sans colonne « role ».', max_length=10, verbose_name='Rôle par défaut')),
+                ('send_emails', models.BooleanField(default=True, verbose_name='Envoyer les emails de bienvenue')),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('done', 'Terminé'), ('failed', 'Échec')], default='pending', max_length=10, verbose_name='Statut')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Déposé le')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Terminé le')),
+                ('row_count', models.PositiveIntegerField(default=0, verbose_name='Lignes lues')),
+                ('created_count', models.PositiveIntegerField(default=0, verbose_name='Comptes créés')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Erreurs')),
+                ('uploaded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Déposé par')),
+            ],
+            options={
+                'verbose_name': "Import d'utilisateurs",
+                'verbose_name_plural': "Imports d'utilisateurs",
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:28
+
+import django.db.models.deletion
+import search.models
+from django.conf import settings
+from django.db import migrations, models
+
+from accounts.directory import build_search_text, has_trigram_fts
+
+# Table FTS5 trigram à contenu externe sur accounts_user.search_text, tenue
+# à jour par triggers (seulement quand search_text change).
+# Attention : une migration qui reconstruit accounts_user sur SQLite (ALTER
+# non supporté) supprime ces triggers ; les recréer ensuite.
+SQLITE_SQL = [
+    """
+    CREATE VIRTUAL TABLE accounts_user_fts USING fts5(
+        search_text, content='accounts_user', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER accounts_user_fts_insert AFTER INSERT ON accounts_user BEGIN
+        INSERT INTO accounts_user_fts(rowid, search_text) VALUES (new.id, new.search_text);
+    END
+    """,
+    """
+    CREATE TRIGGER accounts_user_fts_delete AFTER DELETE ON accounts_user BEGIN
+        INSERT INTO accounts_user_fts(accounts_user_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+    END
+    """,
+    """
+    CREATE TRIGGER accounts_user_fts_update AFTER UPDATE OF search_text ON accounts_user BEGIN
+        INSERT INTO accounts_user_fts(accounts_user_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+        INSERT INTO accounts_user_fts(rowid, search_text) VALUES (new.id, new.search_text);
+    END
+    """,
+    "INSERT INTO accounts_user_fts(accounts_user_fts) VALUES ('rebuild')",
+]
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS accounts_user_fts_insert",
+    "DROP TRIGGER IF EXISTS accounts_user_fts_delete",
+    "DROP TRIGGER IF EXISTS accounts_user_fts_update",
+    "DROP TABLE IF EXISTS accounts_user_fts",
+]
+POSTGRESQL_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX accounts_user_search_trgm ON accounts_user USING gin (search_text gin_trgm_ops)",
+]
+POSTGRESQL_REVERSE_SQL = ["DROP INDEX IF EXISTS accounts_user_search_trgm"]
+
+
+def fill_search_text(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    users = User.objects.only("first_name", "last_name", "username", "email")
+    batch = []
+    for user in users.iterator(chunk_size=2000):
+        user.search_text = build_search_text(user.first_name, user.last_name, user.username, user.email)
+        batch.append(user)
+        if len(batch) == 2000:
+            User.objects.bulk_update(batch, ["search_text"])
+            batch = []
+    User.objects.bulk_update(batch, ["search_text"])
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        connection = schema_editor.connection
+        if connection.vendor == "sqlite" and not has_trigram_fts(connection):
+            return  # SQLite < 3.34 : pas de tokenizer trigram, recherche par LIKE
+        for sql in statements.get(connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+create_search_index = _run({"sqlite": SQLITE_SQL, "postgresql": POSTGRESQL_SQL})
+drop_search_index = _run({"sqlite": SQLITE_REVERSE_SQL, "postgresql": POSTGRESQL_REVERSE_SQL})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_userimport'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchFTS',
+            fields=[
+                ('user', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_fts', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('document', search.models.FullTextField(db_column='accounts_user_fts')),
+            ],
+            options={
+                'db_table': 'accounts_user_fts',
+                'managed': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
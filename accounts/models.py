@@ -1,13 +1,17 @@
-from django.db import models
+import os
+
+from django.db import models, transaction
 from django.urls import reverse
 from django.contrib.auth.models import AbstractUser, UserManager
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Q
-from PIL import Image
+from django.db.models import F, Q
 from django.core.validators import FileExtensionValidator
-import os
 from django.utils.crypto import get_random_string
+from django.utils import timezone
+
+from accounts.directory import SEARCH_FIELDS, filter_users, user_search_text
+from search.models import FullTextField
 
 # -----------------------------
 # Constantes et choix
@@ -39,20 +43,15 @@ STATUT_MATRIMONIAL = (
     ("widowed", _("Veuf(ve)")),
 )
 
+DEFAULT_PICTURE = "default.png"
+
 # -----------------------------
 # Custom User Manager
 # -----------------------------
 class CustomUserManager(UserManager):
     def search(self, query=None):
-        qs = self.get_queryset()
-        if query:
-            qs = qs.filter(
-                Q(username__icontains=query)
-                | Q(first_name__icontains=query)
-                | Q(last_name__icontains=query)
-                | Q(email__icontains=query)
-            ).distinct()
-        return qs
+        # Colonne normalisée et indexée (voir accounts.directory)
+        return filter_users(self.get_queryset(), query)
 
     def get_student_count(self):
         return self.get_queryset().filter(is_student=True).count()
@@ -85,41 +84,81 @@ class User(AbstractUser):
     phone = models.CharField(max_length=60, blank=True, null=True)
     address = models.CharField(max_length=120, blank=True, null=True)
     picture = models.ImageField(
-        upload_to="profile_pictures/%y/%m/%d/", default="default.png", null=True, blank=True
+        upload_to="profile_pictures/%y/%m/%d/", default=DEFAULT_PICTURE, null=True, blank=True
     )
+    # Dérivés de la photo (voir accounts.thumbnails), générés hors requête
+    picture_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+    picture_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+    picture_pending = models.BooleanField(default=False, db_index=True, editable=False)
+    # Prénom, nom, identifiant et email normalisés pour la recherche (voir accounts.directory)
+    search_text = models.TextField(blank=True, default="", editable=False)
 
     objects = CustomUserManager()
 
     class Meta:
         ordering = ("-date_joined",)
+        # Tri et pagination par curseur des listes (voir core.pagination)
+        indexes = [models.Index(fields=["-date_joined", "-id"], name="user_date_joined_id")]
 
     def save(self, *args, **kwargs):
-        # Éviter la boucle infinie avec un flag
-        if not hasattr(self, '_generating_matricule') and not self.matricule and self.is_lecturer:
-            try:
-                from accounts.utils import generate_lecturer_id
-                self._generating_matricule = True  # ⛔ Flag anti-boucle
-                self.matricule = generate_lecturer_id()
-            except ImportError:
-                # Fallback si l'import échoue
-                import random
-                self.matricule = f"TGA{random.randint(1000, 9999)}"
-            finally:
-                if hasattr(self, '_generating_matricule'):
-                    delattr(self, '_generating_matricule')
-        
+        # Matricule séquentiel (voir MatriculeSequence), attribué une seule fois
+        if not self.matricule and self.is_lecturer:
+            from accounts.utils import generate_lecturer_id
+            self.matricule = generate_lecturer_id()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"matricule"}
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or set(update_fields) & set(SEARCH_FIELDS):
+            self.search_text = user_search_text(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"search_text"}
+
+        # Les miniatures sont générées par la commande process_pictures :
+        # on se contente de signaler un changement de photo.
+        if self.picture_changed():
+            self.picture_pending = bool(self.picture) and self.picture.name != DEFAULT_PICTURE
+            if not self.picture_pending:
+                self.picture_hash, self.picture_derivatives = "", {}
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "picture" in update_fields:
+                kwargs["update_fields"] = set(update_fields) | {
+                    "picture_pending", "picture_hash", "picture_derivatives"
+                }
+
         super().save(*args, **kwargs)
-        
-        # Traitement de l'image APRÈS l'enregistrement
-        if self.picture and hasattr(self.picture, 'path') and os.path.exists(self.picture.path):
-            try:
-                img = Image.open(self.picture.path)
-                if img.height > 300 or img.width > 300:
-                    img.thumbnail((300, 300))
-                    img.save(self.picture.path)
-            except (IOError, OSError):
-                # Gérer les erreurs de traitement d'image
-                pass
+        self._loaded_picture_name = self.picture.name if self.picture else None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "picture" in instance.__dict__:
+            instance._loaded_picture_name = instance.__dict__["picture"] or None
+        return instance
+
+    def picture_changed(self):
+        """Vrai si la photo a été remplacée (nouveau fichier ou autre chemin) depuis le chargement."""
+        if "picture" not in self.__dict__:
+            return False  # champ différé (only/defer) : non modifié
+        if self.picture and not self.picture._committed:
+            return True
+        current = self.picture.name if self.picture else None
+        return current != getattr(self, "_loaded_picture_name", DEFAULT_PICTURE)
+
+    def get_picture_url(self, size=None, webp=False):
+        """
+        URL de la plus petite variante couvrant ``size`` pixels (la photo
+        originale si aucune variante n'est encore générée).
+        """
+        from accounts.thumbnails import pick_derivative
+
+        if not self.picture:
+            return ""
+        derivative = pick_derivative(self.picture_derivatives, size, webp)
+        if derivative is None:
+            return self.picture.url
+        return self.picture.storage.url(derivative["name"])
 
     # Méthodes utiles pour AdminRole
     def is_admin_role(self, role_name):
@@ -129,6 +168,69 @@ class User(AbstractUser):
     def admin_role_name(self):
         return self.admin_role.get_role_display() if hasattr(self, "admin_role") else None
 
+
+class UserSearchFTS(models.Model):
+    """
+    Table virtuelle FTS5 trigram (SQLite) sur ``User.search_text``, à
+    contenu externe : ``rowid`` = ``User.id`` (voir accounts.directory).
+    """
+
+    user = models.OneToOneField(
+        User, primary_key=True, db_column="rowid", on_delete=models.DO_NOTHING, related_name="search_fts"
+    )
+    document = FullTextField(db_column="accounts_user_fts")
+
+    class Meta:
+        managed = False
+        db_table = "accounts_user_fts"
+
+# -----------------------------
+# Séquence des matricules
+# -----------------------------
+class MatriculeSequence(models.Model):
+    """Compteur par préfixe et par année (ex. 26TGA0001, 26TGA0002…)."""
+
+    prefix = models.CharField(max_length=10)
+    year = models.PositiveSmallIntegerField()
+    last_value = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["prefix", "year"], name="unique_matricule_sequence"),
+        ]
+
+    def __str__(self):
+        return f"{self.year:02d}{self.prefix} → {self.last_value}"
+
+    @staticmethod
+    def format(prefix, year, number):
+        return f"{year:02d}{prefix}{number:04d}"
+
+    @classmethod
+    def _initial_value(cls, prefix, year):
+        # Reprend après les matricules déjà attribués (ancien tirage aléatoire)
+        start = f"{year:02d}{prefix}"
+        suffixes = User.objects.filter(matricule__startswith=start).values_list("matricule", flat=True)
+        return max((int(m[len(start):]) for m in suffixes if m[len(start):].isdigit()), default=0)
+
+    @classmethod
+    def allocate(cls, prefix, year, count=1):
+        """
+        Réserve ``count`` numéros consécutifs et retourne le range obtenu.
+        La ligne du compteur est verrouillée le temps de l'incrément :
+        aucun essai/erreur, une seule écriture quel que soit ``count``.
+        """
+        if count < 1:
+            raise ValueError("count doit être >= 1")
+        with transaction.atomic():
+            sequence, _created = cls.objects.select_for_update().get_or_create(
+                prefix=prefix, year=year, defaults={"last_value": lambda: cls._initial_value(prefix, year)}
+            )
+            sequence.last_value = F("last_value") + count
+            sequence.save(update_fields=["last_value"])
+            sequence.refresh_from_db(fields=["last_value"])
+        return range(sequence.last_value - count + 1, sequence.last_value + 1)
+
 # -----------------------------
 # Admin Role model
 # -----------------------------
@@ -276,7 +378,8 @@ class TeacherInfo(models.Model):
 class ActivityLog(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Heure de l'événement (pas de la sauvegarde) : les entrées sont écrites par lots, voir core.activity
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
 
     class Meta:
         ordering = ('-created_at',)
@@ -295,4 +398,59 @@ class Classe(models.Model):
         verbose_name_plural = _("Classes")
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+# -----------------------------
+# Import en masse (CSV / XLSX)
+# -----------------------------
+IMPORT_ROLES = (
+    ("student", _("Élève")),
+    ("parent", _("Parent")),
+    ("lecturer", _("Enseignant")),
+    ("other", _("Autre")),
+)
+
+class UserImport(models.Model):
+    """Fichier d'import déposé depuis l'admin, traité par la commande import_users."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (PENDING, _("En attente")),
+        (RUNNING, _("En cours")),
+        (DONE, _("Terminé")),
+        (FAILED, _("Échec")),
+    )
+
+    file = models.FileField(
+        upload_to="imports/%Y/%m/",
+        validators=[FileExtensionValidator(["csv", "xlsx"])],
+        verbose_name=_("Fichier"),
+        help_text=_("CSV (séparateur , ou ;) ou XLSX, avec une ligne d'en-tête."),
+    )
+    default_role = models.CharField(
+        max_length=10, choices=IMPORT_ROLES, blank=True,
+        verbose_name=_("Rôle par défaut"),
+        help_text=_("Utilisé pour les lignes sans colonne « role »."),
+    )
+    send_emails = models.BooleanField(default=True, verbose_name=_("Envoyer les emails de bienvenue"))
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name=_("Statut"))
+    uploaded_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+", verbose_name=_("Déposé par")
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Déposé le"))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Terminé le"))
+    row_count = models.PositiveIntegerField(default=0, verbose_name=_("Lignes lues"))
+    created_count = models.PositiveIntegerField(default=0, verbose_name=_("Comptes créés"))
+    errors = models.JSONField(default=list, blank=True, verbose_name=_("Erreurs"))
+
+    class Meta:
+        verbose_name = _("Import d'utilisateurs")
+        verbose_name_plural = _("Imports d'utilisateurs")
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{os.path.basename(self.file.name)} ({self.get_status_display()})"
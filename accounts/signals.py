@@ -6,6 +6,7 @@ from django.core.exceptions import ObjectDoesNotExist
 import logging
 from .utils import (
     generate_lecturer_credentials,
+    is_lecturer_id,
     send_new_account_email,
 )
 from .models import User
@@ -35,22 +36,22 @@ def handle_lecturer_credentials(sender, instance, created, **kwargs):
             # Verrouiller l'enregistrement pour éviter les conflits
             user = User.objects.select_for_update().get(pk=instance.pk)
             
-            # Vérifier si le username est déjà défini (ne commence pas par le préfixe)
-            if user.username and not user.username.startswith('25TGA'):
+            # Vérifier si le username est déjà défini (autre chose qu'un matricule)
+            if user.username and not is_lecturer_id(user.username):
                 logger.info(f"Username déjà défini pour l'enseignant {user.pk}: {user.username}")
                 return
                 
             # Générer les identifiants
-            username, password = generate_lecturer_credentials()
+            username, password = generate_lecturer_credentials(user.matricule)
             
             # Mettre à jour l'utilisateur
             user.username = username
             user.password = make_password(password)
             user.save(update_fields=['username', 'password'])
             
-            # Envoyer l'email (hors transaction)
+            # Envoyer l'email (hors transaction) : lien pour définir le mot de passe, jamais le mot de passe
             transaction.on_commit(
-                lambda: send_new_account_email(user, password)
+                lambda: send_new_account_email(user)
             )
             
             logger.info(f"Identifiants générés pour l'enseignant {user.pk}: {username}")
@@ -61,4 +62,156 @@ def handle_lecturer_credentials(sender, instance, created, **kwargs):
             logger.error(f"Erreur génération identifiants enseignant {instance.pk}: {e}")
             # En cas d'erreur, on retire le flag pour permettre une nouvelle tentative
             if hasattr(instance, '_lecturer_credentials_processed'):
-                delattr(instance, '_lecturer_credentials_processed')
\ No newline at end of file
+                delattr(instance, '_lecturer_credentials_processed')
+
+# ----------------------------------------------------------------------
+# Tableau de bord : mise à jour incrémentale de core.DashboardSnapshot
+# ----------------------------------------------------------------------
+from django.db.models.signals import pre_save, post_delete
+from core import dashboard
+from core.deletions import signals_deferred
+from core.models import DashboardSnapshot, Testimonial
+from .models import Student, Teacher
+
+USER_TRACKED_FIELDS = ("is_student", "is_lecturer", "is_superuser", "gender")
+
+
+def _skip(raw, update_fields, tracked):
+    """Ignore les chargements de fixtures et les saves qui ne touchent aucun champ suivi."""
+    return raw or (update_fields is not None and not set(update_fields) & set(tracked))
+
+
+@receiver(pre_save, sender=User)
+def remember_user_dashboard_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._dashboard_old = None
+    if instance.pk and not _skip(raw, update_fields, USER_TRACKED_FIELDS):
+        instance._dashboard_old = sender.objects.filter(pk=instance.pk).values(*USER_TRACKED_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def update_dashboard_on_user_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if _skip(raw, update_fields, USER_TRACKED_FIELDS):
+        return
+    old = getattr(instance, "_dashboard_old", None)
+    if not created and old is None:
+        return
+    new_counter = dashboard.user_contribution(instance.is_student, instance.is_lecturer, instance.is_superuser)
+    old_counter = dashboard.user_contribution(old["is_student"], old["is_lecturer"], old["is_superuser"]) if old else {}
+    delta = dashboard.diff(new_counter, old_counter)
+
+    # Le genre n'est compté que pour les utilisateurs ayant un profil élève
+    if old and old["gender"] != instance.gender and Student.objects.filter(student=instance).exists():
+        for key, amount in dashboard.diff(
+            dashboard.student_contribution(None, instance.gender),
+            dashboard.student_contribution(None, old["gender"]),
+        ).items():
+            delta[key] = delta.get(key, 0) + amount
+
+    DashboardSnapshot.apply_delta(delta)
+
+
+@receiver(post_delete, sender=User)
+def update_dashboard_on_user_delete(sender, instance, **kwargs):
+    if signals_deferred():  # suppression en masse : reconstruit à la fin (core.deletions)
+        return
+    counter = dashboard.user_contribution(instance.is_student, instance.is_lecturer, instance.is_superuser)
+    DashboardSnapshot.apply_delta({key: -amount for key, amount in counter.items()})
+
+
+def _student_gender(student):
+    try:
+        return student.student.gender
+    except ObjectDoesNotExist:
+        return None
+
+
+@receiver(pre_save, sender=Student)
+def remember_student_dashboard_state(sender, instance, raw=False, **kwargs):
+    instance._dashboard_old = None
+    if instance.pk and not raw:
+        old = sender.objects.filter(pk=instance.pk).values("level", "student__gender").first()
+        if old:
+            instance._dashboard_old = dashboard.student_contribution(old["level"], old["student__gender"])
+
+
+@receiver(post_save, sender=Student)
+def update_dashboard_on_student_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    new_counter = dashboard.student_contribution(instance.level, _student_gender(instance))
+    DashboardSnapshot.apply_delta(dashboard.diff(new_counter, getattr(instance, "_dashboard_old", None) or {}))
+
+
+@receiver(post_delete, sender=Student)
+def update_dashboard_on_student_delete(sender, instance, **kwargs):
+    if signals_deferred():  # suppression en masse : reconstruit à la fin (core.deletions)
+        return
+    counter = dashboard.student_contribution(instance.level, _student_gender(instance))
+    DashboardSnapshot.apply_delta({key: -amount for key, amount in counter.items()})
+
+
+@receiver(pre_save, sender=Teacher)
+def remember_teacher_dashboard_state(sender, instance, raw=False, **kwargs):
+    instance._dashboard_old = None
+    if instance.pk and not raw:
+        old = sender.objects.filter(pk=instance.pk).values("diploma").first()
+        if old:
+            instance._dashboard_old = dashboard.teacher_contribution(old["diploma"])
+
+
+@receiver(post_save, sender=Teacher)
+def update_dashboard_on_teacher_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    new_counter = dashboard.teacher_contribution(instance.diploma)
+    DashboardSnapshot.apply_delta(dashboard.diff(new_counter, getattr(instance, "_dashboard_old", None) or {}))
+
+
+@receiver(post_delete, sender=Teacher)
+def update_dashboard_on_teacher_delete(sender, instance, **kwargs):
+    if signals_deferred():  # suppression en masse : reconstruit à la fin (core.deletions)
+        return
+    counter = dashboard.teacher_contribution(instance.diploma)
+    DashboardSnapshot.apply_delta({key: -amount for key, amount in counter.items()})
+
+
+TESTIMONIAL_TRACKED_FIELDS = ("rating", "is_active", "is_approved")
+
+
+@receiver(pre_save, sender=Testimonial)
+def remember_testimonial_dashboard_state(sender, instance, raw=False, **kwargs):
+    instance._dashboard_old = None
+    if instance.pk and not raw:
+        old = sender.objects.filter(pk=instance.pk).values(*TESTIMONIAL_TRACKED_FIELDS).first()
+        if old:
+            instance._dashboard_old = dashboard.testimonial_contribution(**old)
+
+
+@receiver(post_save, sender=Testimonial)
+def update_dashboard_on_testimonial_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    new_counter = dashboard.testimonial_contribution(instance.rating, instance.is_active, instance.is_approved)
+    DashboardSnapshot.apply_delta(dashboard.diff(new_counter, getattr(instance, "_dashboard_old", None) or {}))
+
+
+@receiver(post_delete, sender=Testimonial)
+def update_dashboard_on_testimonial_delete(sender, instance, **kwargs):
+    if signals_deferred():  # suppression en masse : reconstruit à la fin (core.deletions)
+        return
+    counter = dashboard.testimonial_contribution(instance.rating, instance.is_active, instance.is_approved)
+    DashboardSnapshot.apply_delta({key: -amount for key, amount in counter.items()})
+
+
+# ----------------------------------------------------------------------
+# Cache des fiches répétiteur
+# ----------------------------------------------------------------------
+from .models import TeacherInfo
+from .teacher_sheets import delete_sheets
+
+
+@receiver(post_delete, sender=TeacherInfo)
+def delete_teacher_sheets(sender, instance, **kwargs):
+    if signals_deferred():  # supprimées avec les fichiers (core.deletions)
+        return
+    delete_sheets(instance.pk)
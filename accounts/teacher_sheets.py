@@ -0,0 +1,137 @@
+# accounts/teacher_sheets.py
+"""
+Cache disque des fiches répétiteur (PDF). Une fiche est rangée sous une clé
+dérivée de son contenu : pk, ``updated_at``, nom, taille et date de
+modification de la photo, matricule, version du gabarit et date du jour
+(imprimée dans « Fait à Yaoundé, le … »). Tant que rien ne change, le
+fichier existant est resservi tel quel ; une nouvelle clé remplace l'ancien
+fichier, donc une fiche est redessinée au plus une fois par jour.
+
+Le cache est hors de MEDIA_ROOT : les fiches contiennent des données
+personnelles et ne sont servies que par la vue (connexion requise).
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import repeat
+
+from django.conf import settings
+
+from .exports import build_teacher_info_pdf
+from .models import TeacherInfo
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter à chaque modification du dessin (build_teacher_info_pdf)
+SHEET_VERSION = 1
+CACHE_DIR = getattr(
+    settings, "TEACHER_SHEET_CACHE_DIR", os.path.join(settings.BASE_DIR, "var", "teacher_sheets")
+)
+WORKERS = getattr(settings, "TEACHER_SHEET_WORKERS", 2)
+
+
+# -----------------------------
+# Clé de cache
+# -----------------------------
+def photo_stamp(info):
+    """Nom, taille et date de modification de la photo (métadonnées seules, le fichier n'est pas lu)."""
+    if not info.photo:
+        return ""
+    storage, name = info.photo.storage, info.photo.name
+    try:
+        return f"{name}:{storage.size(name)}:{storage.get_modified_time(name).timestamp()}"
+    except (OSError, NotImplementedError):
+        return ""  # photo absente du disque : la fiche est dessinée sans
+
+
+def sheet_key(info):
+    parts = (
+        SHEET_VERSION, info.pk, info.updated_at.isoformat(), photo_stamp(info), info.matricule or "",
+        date.today().isoformat(),  # même horloge que la date imprimée par build_teacher_info_pdf
+    )
+    return hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()[:40]
+
+
+def sheet_path(pk, key):
+    return os.path.join(CACHE_DIR, str(pk), f"{key}.pdf")
+
+
+# -----------------------------
+# Génération
+# -----------------------------
+def write_sheet(info, path):
+    """Dessine la fiche dans ``path`` (écriture atomique) et supprime les versions précédentes."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as output:
+            build_teacher_info_pdf(output, info)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    for name in os.listdir(directory):
+        if name.endswith(".pdf") and os.path.join(directory, name) != path:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def open_sheet(info, key=None):
+    """Retourne la fiche ouverte en lecture binaire, générée si absente du cache."""
+    path = sheet_path(info.pk, key or sheet_key(info))
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        write_sheet(info, path)
+        return open(path, "rb")
+
+
+def ensure_sheet(info, force=False):
+    """Génère la fiche si elle n'est pas en cache (ou toujours avec ``force``) ; retourne True si dessinée."""
+    path = sheet_path(info.pk, sheet_key(info))
+    if not force and os.path.exists(path):
+        return False
+    write_sheet(info, path)
+    return True
+
+
+def delete_sheets(pk):
+    shutil.rmtree(os.path.join(CACHE_DIR, str(pk)), ignore_errors=True)
+
+
+# -----------------------------
+# Régénération en masse
+# -----------------------------
+def _regenerate(pk, force):
+    """Exécuté dans un processus du pool ; retourne (pk, dessinée, erreur)."""
+    try:
+        info = TeacherInfo.objects.select_related("teacher__user").get(pk=pk)
+        return pk, ensure_sheet(info, force), ""
+    except Exception as e:
+        logger.exception("Fiche répétiteur %s non générée", pk)
+        return pk, False, str(e) or e.__class__.__name__
+
+
+def regenerate_sheets(pks=None, force=False, workers=WORKERS):
+    """
+    (Re)génère les fiches ``pks`` (toutes par défaut) dans ``workers``
+    processus. Retourne la liste des (pk, dessinée, erreur).
+    """
+    if pks is None:
+        pks = list(TeacherInfo.objects.order_by("pk").values_list("pk", flat=True))
+    if workers <= 0 or len(pks) <= 1:
+        return [_regenerate(pk, force) for pk in pks]
+
+    from core import report_worker
+
+    context = multiprocessing.get_context("spawn")  # pas de connexion base héritée du parent
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=report_worker.init) as executor:
+        return list(executor.map(_regenerate, pks, repeat(force), chunksize=8))
@@ -0,0 +1,18 @@
+# accounts.templatetags.pictures.py
+from django import template
+
+register = template.Library()
+
+
+@register.filter()
+def picture_url(user, size=None):
+    """{{ user|picture_url:40 }} : plus petite variante couvrant 40 px."""
+    return user.get_picture_url(int(size) if size else None)
+
+
+@register.filter()
+def picture_webp_url(user, size=None):
+    """Variante WebP, pour un <source type="image/webp"> ; vide si aucune."""
+    if not user.picture_derivatives:
+        return ""
+    return user.get_picture_url(int(size) if size else None, webp=True)
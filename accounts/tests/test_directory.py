@@ -0,0 +1,70 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.filters import LecturerFilter, OtherFilter, ParentFilter, StudentFilter
+from accounts.models import Parent, Student, User
+
+
+class SearchTextTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="hnkoulou", first_name="Hélène", last_name="Nkoulou", email="Helene.N@Example.com", password="x",
+        )
+
+    def test_search_text_is_normalized_on_save(self):
+        self.assertEqual(self.user.search_text, "helene nkoulou hnkoulou helene n example com")
+
+        self.user.last_name = "Ngo Bassa"
+        self.user.save(update_fields=["last_name"])
+        self.user.refresh_from_db()
+        self.assertIn("ngo bassa", self.user.search_text)
+
+    def test_unrelated_partial_saves_leave_it_alone(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.user.save(update_fields=["last_login"])
+        self.assertNotIn("search_text", queries[0]["sql"])
+
+    def test_manager_search(self):
+        other = User.objects.create_user(username="pbiya", first_name="Paul", last_name="Biya", password="x")
+        self.assertEqual(list(User.objects.search("helene")), [self.user])  # sans accents
+        self.assertEqual(list(User.objects.search("KOUL")), [self.user])  # au milieu d'un mot
+        self.assertEqual(list(User.objects.search("paul bi")), [other])  # chaque mot, même court
+        self.assertEqual(list(User.objects.search("example.com")), [self.user])
+        self.assertEqual(list(User.objects.search("paul nkoulou")), [])
+        self.assertEqual(User.objects.search("").count(), 2)
+        self.assertEqual(list(User.objects.search('"* OR')), [])  # syntaxe FTS5 neutralisée
+
+    def test_admin_search(self):
+        admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.client.force_login(admin)
+        response = self.client.get(reverse("admin:accounts_user_changelist"), {"q": "nkoul"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.user])
+
+
+class UserFiltersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.lecturer = User.objects.create(username="jdoe", first_name="John", last_name="Doe", is_lecturer=True)
+        cls.student = Student.objects.create(
+            student=User.objects.create(username="aeba", first_name="Aïcha", last_name="Eba", email="aicha@example.com")
+        )
+        cls.parent = Parent.objects.create(
+            parent=User.objects.create(username="meba", first_name="Martin", last_name="Eba", email="m@example.com"),
+            student=cls.student,
+        )
+        cls.other = User.objects.create(username="sec", first_name="Doe", last_name="Secrétaire", is_other=True)
+
+    def test_name_filters_use_every_user_field(self):
+        self.assertEqual(list(LecturerFilter({"name": "john"}, queryset=User.objects.all()).qs), [self.lecturer])
+        self.assertEqual(list(StudentFilter({"name": "aicha"}, queryset=Student.objects.all()).qs), [self.student])
+        self.assertEqual(list(StudentFilter({"email": "aicha@"}, queryset=Student.objects.all()).qs), [self.student])
+
+    def test_field_filters_keep_their_field(self):
+        # « Eba » est le nom des deux comptes, mais aucun prénom
+        self.assertEqual(ParentFilter({"parent__first_name": "eba"}, queryset=Parent.objects.all()).qs.count(), 0)
+        self.assertEqual(list(ParentFilter({"parent__last_name": "eba"}, queryset=Parent.objects.all()).qs), [self.parent])
+        # « Doe » est le nom de l'enseignant et le prénom de l'autre compte
+        self.assertEqual(list(OtherFilter({"first_name": "doe"}).qs), [self.other])
+        self.assertEqual(OtherFilter({"last_name": "doe"}).qs.count(), 0)
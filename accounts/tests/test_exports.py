@@ -0,0 +1,113 @@
+import io
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import FileResponse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from pypdf import PdfReader
+
+from accounts.exports import USER_COLUMNS, FlowableStream, ListDocTemplate, build_list_pdf
+from accounts.models import Parent, Student
+
+User = get_user_model()
+
+
+def create_students(count, offset=0):
+    users = User.objects.bulk_create(
+        User(username=f"eleve{offset + i}", first_name="Élève", last_name=f"N°{offset + i}",
+             email=f"eleve{offset + i}@example.com", is_student=True)
+        for i in range(count)
+    )
+    return Student.objects.bulk_create(Student(student=user, level="Primary") for user in users)
+
+
+class ListPdfExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.client.force_login(self.admin)
+
+    def get_pdf(self, url_name):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(url_name))
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        content = b"".join(response.streaming_content)
+        self.assertTrue(content.startswith(b"%PDF"))
+        return PdfReader(io.BytesIO(content)), len(queries)
+
+    def test_student_list_paginates_with_constant_queries(self):
+        create_students(5)
+        small, small_queries = self.get_pdf("student_list_pdf")
+        create_students(300, offset=5)
+        large, large_queries = self.get_pdf("student_list_pdf")
+
+        self.assertEqual(len(small.pages), 1)
+        self.assertGreater(len(large.pages), 5)
+        self.assertEqual(small_queries, large_queries)
+        last_page = large.pages[-1].extract_text()
+        self.assertIn("Total : 305", last_page)
+        self.assertIn("Numéro ID", last_page)  # en-tête répété sur chaque page
+
+    def test_parent_and_user_lists(self):
+        student = create_students(1)[0]
+        parent = User.objects.create_user(username="papa", first_name="Paul", last_name="Martin",
+                                          password="x", is_parent=True)
+        Parent.objects.create(parent=parent, student=student, relation_ship="Père")
+        User.objects.create_user(username="prof", password="x", is_lecturer=True)
+        User.objects.create_user(username="autre", password="x", is_other=True)
+
+        parents, _queries = self.get_pdf("parent_list_pdf")
+        text = parents.pages[0].extract_text()
+        self.assertIn("Paul Martin", text)
+        self.assertIn("Élève N°0", text)
+
+        lecturers, _queries = self.get_pdf("lecturer_list_pdf")
+        self.assertIn("prof", lecturers.pages[0].extract_text())
+        others, _queries = self.get_pdf("other_list_pdf")
+        self.assertIn("autre", others.pages[0].extract_text())
+
+    def test_non_admin_is_redirected(self):
+        self.client.force_login(User.objects.create_user(username="eleve", password="x"))
+        self.assertEqual(self.client.get(reverse("student_list_pdf")).status_code, 302)
+
+
+class FlowableStreamTests(TestCase):
+    def test_rows_are_consumed_page_by_page(self):
+        consumed, seen_at_page = [], []
+
+        def rows():
+            for i in range(400):
+                consumed.append(i)
+                yield f"id{i}", "Nom", "mail@example.com", "-", "-"
+
+        original = ListDocTemplate._draw_page
+
+        def draw_page(doc, canv, _doc):
+            seen_at_page.append(len(consumed))
+            return original(doc, canv, _doc)
+
+        output = io.BytesIO()
+        with mock.patch.object(ListDocTemplate, "_draw_page", draw_page):
+            build_list_pdf(output, "Test", USER_COLUMNS, rows())
+
+        self.assertEqual(len(consumed), 400)
+        self.assertGreater(len(PdfReader(output).pages), 5)
+        # Au début de la 2e page, seule une petite partie des lignes a été lue
+        self.assertLess(seen_at_page[0], 200)
+        self.assertEqual(seen_at_page, sorted(seen_at_page))
+
+    def test_stream_behaves_like_a_list(self):
+        stream = FlowableStream(iter(range(5)), lookahead=2)
+        self.assertEqual(list.__len__(stream), 0)
+        self.assertEqual(stream[0], 0)
+        del stream[0]
+        self.assertEqual(len(stream), 2)
+
+        remaining = []
+        while len(stream):  # comme BaseDocTemplate.build
+            remaining.append(stream[0])
+            del stream[0]
+        self.assertEqual(remaining, [1, 2, 3, 4])
@@ -0,0 +1,147 @@
+import io
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from openpyxl import Workbook
+
+from accounts.importer import import_users
+from accounts.models import Parent, Student, Teacher, UserImport
+from core.models import DashboardSnapshot, OutboundEmail
+
+User = get_user_model()
+
+HEADER = "role;username;prenom;nom;email;genre;telephone;niveau;specialite;eleve;lien;mot_de_passe\n"
+
+
+def csv_file(*lines):
+    return io.BytesIO((HEADER + "\n".join(lines) + "\n").encode("utf-8"))
+
+
+# Hachage rapide : le coût de PBKDF2 n'est pas ce que ces tests mesurent
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class UserImportTests(TestCase):
+    def test_creates_accounts_profiles_and_welcome_emails(self):
+        f = csv_file(
+            "eleve;alice;Alice;Martin;alice@example.com;F;+237600000000;Primary;;;;secret123",
+            "student;bob;Bob;Durand;bob@example.com;M;;High;;;;",
+            "parent;pmartin;Paul;Martin;paul@example.com;M;;;;alice;Père;",
+            "enseignant;;Claire;Nguema;claire@example.com;F;;;Maths;;;",
+        )
+        report = import_users(f, "comptes.csv", workers=0)
+
+        self.assertEqual(report.errors, [])
+        self.assertEqual(report.created_count, 4)
+        self.assertEqual(Student.objects.count(), 2)
+        self.assertEqual(Parent.objects.get().student.student.username, "alice")
+        teacher = Teacher.objects.select_related("user").get()
+        year = timezone.now().year % 100
+        self.assertEqual(teacher.user.matricule, f"{year:02d}TGA0001")
+        self.assertEqual(teacher.user.username, teacher.user.matricule)
+        self.assertTrue(User.objects.get(username="alice").check_password("secret123"))
+        self.assertEqual(list(User.objects.search("claire nguema")), [teacher.user])  # bulk_create compris
+
+        self.assertEqual(OutboundEmail.objects.count(), 4)
+        welcome = OutboundEmail.objects.get(to=["alice@example.com"])
+        self.assertNotIn("secret123", welcome.body + welcome.html_body)
+        self.assertIn("/reset/", welcome.body)
+        self.assertEqual(DashboardSnapshot.load().student_count, 2)
+
+    def test_invalid_rows_are_reported_without_aborting(self):
+        User.objects.create_user(username="existant", email="pris@example.com", password="x")
+        f = csv_file(
+            "student;ok1;Ok;Un;ok1@example.com;;;;;;;",
+            "student;existant;Dup;Nom;autre@example.com;;;;;;;",
+            "student;dup_email;Dup;Email;PRIS@example.com;;;;;;;",
+            "student;mauvais;Mauvais;Email;pas-un-email;;;;;;;",
+            "student;ok1;Doublon;Fichier;ok1bis@example.com;;;;;;;",
+            "pirate;x;X;Y;x@example.com;;;;;;;",
+            "parent;orphelin;Sans;Eleve;orphelin@example.com;;;;;inconnu;;",
+            "student;ok2;Ok;Deux;ok2@example.com;;;Secondary;;;;",
+        )
+        report = import_users(f, "comptes.csv", chunk_size=3, workers=0, send_emails=False)
+
+        self.assertEqual(report.rows, 8)
+        self.assertEqual(report.created_count, 2)
+        self.assertEqual([line for line, _message in report.errors], [3, 4, 5, 6, 7, 8])
+        self.assertIn("Email déjà utilisé", dict(report.errors)[4])
+        self.assertIn("Élève introuvable", dict(report.errors)[8])
+        self.assertEqual(OutboundEmail.objects.count(), 0)
+
+    def test_queries_do_not_scale_per_row(self):
+        DashboardSnapshot.rebuild()
+
+        def run(count, offset):
+            lines = [f"student;s{offset + i};S;N;s{offset + i}@example.com;;;;;;;p" for i in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                import_users(csv_file(*lines), "comptes.csv", chunk_size=1000, workers=0)
+            return len(queries)
+
+        small, large = run(5, 0), run(200, 100)
+        # Seul le découpage des INSERT imposé par la base varie, jamais une requête par ligne
+        self.assertLess(large - small, 200 // 20)
+
+    def test_passwords_are_hashed_in_a_process_pool(self):
+        f = csv_file(*[f"student;p{i};P;N;p{i}@example.com;;;;;;;mdp{i}" for i in range(4)])
+        report = import_users(f, "comptes.csv", workers=2, send_emails=False)
+        self.assertEqual(report.created_count, 4)
+        self.assertTrue(User.objects.get(username="p3").check_password("mdp3"))
+
+    def test_xlsx_files_are_supported(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["Prénom", "Nom", "Email", "Username", "Niveau"])
+        sheet.append(["Awa", "Diallo", "awa@example.com", "awa", "Primary"])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        buffer.seek(0)
+
+        report = import_users(buffer, "eleves.xlsx", default_role="student", workers=0)
+
+        self.assertEqual(report.created_count, 1)
+        self.assertEqual(Student.objects.get().level, "Primary")
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class UserImportCommandTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def test_command_processes_admin_uploads(self):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            upload = UserImport.objects.create(
+                file=SimpleUploadedFile("eleves.csv", csv_file("student;zoe;Zoé;K;zoe@example.com;;;;;;;").read()),
+                send_emails=False,
+            )
+            call_command("import_users", "--workers", "0", stdout=io.StringIO())
+
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, UserImport.DONE)
+        self.assertEqual((upload.row_count, upload.created_count, upload.errors), (1, 1, []))
+        self.assertTrue(User.objects.filter(username="zoe", is_student=True).exists())
+
+    def test_failed_upload_does_not_stop_the_queue(self):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            broken = UserImport.objects.create(file=SimpleUploadedFile("casse.xlsx", b"pas un classeur"))
+            upload = UserImport.objects.create(
+                file=SimpleUploadedFile("eleves.csv", csv_file("student;zoe;Zoé;K;zoe@example.com;;;;;;;").read()),
+                send_emails=False,
+            )
+            stderr = io.StringIO()
+            call_command("import_users", "--workers", "0", stdout=io.StringIO(), stderr=stderr)
+
+        broken.refresh_from_db()
+        upload.refresh_from_db()
+        self.assertEqual(broken.status, UserImport.FAILED)
+        self.assertEqual(upload.status, UserImport.DONE)
+        self.assertIn("casse.xlsx", stderr.getvalue())
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.directory import user_search_text
+from accounts.models import Parent, Student, User
+from core.pagination import KeysetPaginator
+
+NOW = timezone.now()
+
+
+def create_users(count, start=0, role="lecturer"):
+    """Comptes inscrits toutes les heures, par paires (dates égales : départage par id)."""
+    users = [
+        User(username=f"{role}{i}", first_name="Prénom", last_name=f"Nom {i}", email=f"{role}{i}@example.com",
+             date_joined=NOW - timedelta(hours=i // 2), **{f"is_{role}": True})
+        for i in range(start, start + count)
+    ]
+    for user in users:
+        user.search_text = user_search_text(user)
+    return User.objects.bulk_create(users, batch_size=1000)
+
+
+def add_rows(count, start=0):
+    """``count`` lignes dans chacune des quatre listes."""
+    create_users(count, start)
+    create_users(count, start, role="other")
+    students = Student.objects.bulk_create(
+        Student(student=user) for user in create_users(count, start, "student")
+    )
+    Parent.objects.bulk_create(
+        Parent(parent=user, student=student)
+        for user, student in zip(create_users(count, start, "parent"), students)
+    )
+
+
+LISTS = ["lecturer_list", "student_list", "other_list", "parent_list"]
+
+
+class DirectoryListTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.client.force_login(self.admin)
+
+    def count_queries(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_query_count_does_not_depend_on_table_size(self):
+        add_rows(10)
+        small = {name: self.count_queries(reverse(name))[0] for name in LISTS}
+        add_rows(9990, start=10)
+        for name in LISTS:
+            with self.subTest(name):
+                url = reverse(name)
+                count, response = self.count_queries(url)
+                self.assertEqual(count, small[name])
+                self.assertLessEqual(count, 4)  # session, utilisateur, page (+ total des parents)
+                page_count, _response = self.count_queries(url, after=response.context["page_obj"].next_cursor)
+                self.assertEqual(page_count, count)
+
+    def test_pages_cover_every_row_once(self):
+        add_rows(53)
+        url = reverse("lecturer_list")
+        seen, params = [], {}
+        while True:
+            page = self.client.get(url, params).context["page_obj"]
+            seen += [user.pk for user in page]
+            if not page.has_next():
+                break
+            params = {"after": page.next_cursor}
+        expected = list(User.objects.filter(is_lecturer=True).order_by("-date_joined", "-pk").values_list("pk", flat=True))
+        self.assertEqual(seen, expected)
+
+        # Retour en arrière depuis la dernière page
+        previous = self.client.get(url, {"before": page.previous_cursor}).context["page_obj"]
+        self.assertEqual([user.pk for user in previous], expected[25:50])
+        self.assertTrue(previous.has_previous())
+        self.assertTrue(previous.has_next())
+
+    def test_filters_and_invalid_cursors(self):
+        add_rows(30)
+        response = self.client.get(reverse("lecturer_list"), {"name": "lecturer2", "after": "falsifié"})
+        page = response.context["page_obj"]
+        self.assertFalse(page.has_previous())  # curseur invalide : première page
+        self.assertEqual(len(page), 11)  # lecturer2, lecturer20 à lecturer29
+        self.assertContains(response, "Nom 29")
+
+    def test_paginator_on_first_page(self):
+        add_rows(3)
+        page = KeysetPaginator(User.objects.filter(is_other=True), ("-date_joined", "-pk"), 25).page()
+        self.assertEqual(len(page), 3)
+        self.assertFalse(page.has_other_pages())
@@ -0,0 +1,94 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.utils import timezone
+
+from accounts.models import MatriculeSequence
+from accounts.utils import generate_lecturer_id, is_lecturer_id, reserve_lecturer_ids
+from core.models import OutboundEmail
+
+User = get_user_model()
+
+
+class MatriculeAllocatorTests(TestCase):
+    def setUp(self):
+        self.year = timezone.now().year % 100
+
+    def test_ids_are_sequential_per_year(self):
+        first = generate_lecturer_id()
+        second = generate_lecturer_id()
+        self.assertEqual(first, f"{self.year:02d}TGA0001")
+        self.assertEqual(second, f"{self.year:02d}TGA0002")
+        self.assertTrue(is_lecturer_id(first))
+
+        self.assertEqual(reserve_lecturer_ids(1, year=2030), ["30TGA0001"])
+        self.assertEqual(MatriculeSequence.objects.get(prefix="TGA", year=self.year).last_value, 2)
+
+    def test_block_allocation_is_a_single_increment(self):
+        generate_lecturer_id()
+        with self.assertNumQueries(5):  # savepoint, verrou, incrément, relecture, fin savepoint
+            ids = reserve_lecturer_ids(500)
+        self.assertEqual(len(set(ids)), 500)
+        self.assertEqual(ids[0], f"{self.year:02d}TGA0002")
+        self.assertEqual(ids[-1], f"{self.year:02d}TGA0501")
+        self.assertEqual(generate_lecturer_id(), f"{self.year:02d}TGA0502")
+
+    def test_sequence_starts_after_existing_matricules(self):
+        User.objects.create_user(username="legacy", password="x", matricule=f"{self.year:02d}TGA4821")
+        self.assertEqual(generate_lecturer_id(), f"{self.year:02d}TGA4822")
+
+    def test_lecturer_gets_matricule_and_matching_username(self):
+        user = User.objects.create(username="", is_lecturer=True)  # comme LecturerAddForm
+        user.refresh_from_db()
+        self.assertEqual(user.matricule, f"{self.year:02d}TGA0001")
+        self.assertEqual(user.username, user.matricule)
+
+        # Un nom d'utilisateur choisi n'est pas remplacé
+        other = User.objects.create_user(username="prof.martin", password="x", is_lecturer=True)
+        other.refresh_from_db()
+        self.assertEqual(other.username, "prof.martin")
+        self.assertEqual(other.matricule, f"{self.year:02d}TGA0002")
+
+    def test_welcome_email_links_to_password_setup(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create(username="", email="prof@example.com", is_lecturer=True)
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.to, ["prof@example.com"])
+        self.assertNotIn("password:", email.body.lower())
+
+        link = next(word for word in email.body.split() if "/reset/" in word)
+        user.refresh_from_db()
+        self.assertIn(user.username, email.body)
+        response = self.client.get(link.replace("http://localhost:8000", ""), follow=True)
+        self.assertTrue(response.context["validlink"])
+
+
+# SQLite (base de test en mémoire partagée) refuse les écritures concurrentes
+# au lieu de les sérialiser : ce test tourne sur PostgreSQL / MySQL.
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentMatriculeTests(TransactionTestCase):
+    def test_parallel_creations_never_collide(self):
+        workers, per_worker = 8, 10
+        barrier = threading.Barrier(workers)
+
+        def create_lecturers(worker):
+            barrier.wait()
+            try:
+                for i in range(per_worker):
+                    User.objects.create(username=f"prof{worker}_{i}", is_lecturer=True)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(create_lecturers, range(workers)))
+
+        matricules = list(User.objects.filter(is_lecturer=True).values_list("matricule", flat=True))
+        self.assertEqual(len(matricules), workers * per_worker)
+        self.assertEqual(len(set(matricules)), workers * per_worker)
+        year = timezone.now().year % 100
+        self.assertEqual(
+            MatriculeSequence.objects.get(prefix="TGA", year=year).last_value, workers * per_worker
+        )
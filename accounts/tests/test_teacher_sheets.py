@@ -0,0 +1,125 @@
+import datetime
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts import teacher_sheets
+from accounts.models import Teacher, TeacherInfo
+from accounts.tests.test_thumbnails import make_image
+
+User = get_user_model()
+
+
+def create_teacher_info(username="prof", **kwargs):
+    user = User.objects.create(username=username, first_name="Jean", last_name="Mbarga")
+    teacher = Teacher.objects.create(user=user, speciality="Mathématiques")
+    fields = dict(
+        nom="Mbarga", prenom="Jean", date_naissance=datetime.date(1990, 5, 1), lieu_naissance="Yaoundé",
+        statut_matrimonial="single", email=f"{username}@example.com", personne_urgence="Marie",
+        cont_urgence="+237600000000", section_enseignement="Francophone", diplome="Licence",
+    )
+    fields.update(kwargs)
+    return TeacherInfo.objects.create(teacher=teacher, **fields)
+
+
+class TeacherSheetCacheTests(TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.media_root = tempfile.mkdtemp()
+        for directory in (self.cache_dir, self.media_root):
+            self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        patcher = mock.patch.object(teacher_sheets, "CACHE_DIR", self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.info = create_teacher_info()
+        self.client.force_login(User.objects.create_user(username="admin", password="x", is_superuser=True))
+        self.url = reverse("teacher_info_pdf", args=[self.info.pk])
+        self.draw = mock.patch.object(
+            teacher_sheets, "build_teacher_info_pdf", wraps=teacher_sheets.build_teacher_info_pdf
+        ).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def download(self, **headers):
+        response = self.client.get(self.url, headers=headers)
+        if response.status_code == 200:
+            content = b"".join(response.streaming_content)
+            self.assertTrue(content.startswith(b"%PDF"))
+        return response
+
+    def cached_files(self):
+        return os.listdir(os.path.join(self.cache_dir, str(self.info.pk)))
+
+    def test_repeat_downloads_are_served_from_cache(self):
+        first = self.download()
+        second = self.download()
+        self.assertEqual(self.draw.call_count, 1)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertIn("private", first["Cache-Control"])
+        self.assertIn('filename="fiche_repetiteur_Mbarga_Jean.pdf"', first["Content-Disposition"])
+
+        not_modified = self.download(if_none_match=first["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(self.draw.call_count, 1)
+
+    def test_update_replaces_the_cached_sheet(self):
+        etag = self.download()["ETag"]
+        self.info.lieu_naissance = "Douala"
+        self.info.save()
+
+        response = self.download(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.draw.call_count, 2)
+        self.assertEqual(len(self.cached_files()), 1)  # l'ancienne version est supprimée
+
+    def test_photo_file_is_part_of_the_key(self):
+        self.info.photo = SimpleUploadedFile("photo.jpg", make_image(color="red"), content_type="image/jpeg")
+        self.info.save()
+        with mock.patch("builtins.open", side_effect=AssertionError("photo lue")):
+            key = teacher_sheets.sheet_key(self.info)
+        with open(self.info.photo.path, "wb") as f:  # même nom, même updated_at, autre fichier
+            f.write(make_image(color="blue"))
+        os.utime(self.info.photo.path, (0, 0))
+        self.assertNotEqual(teacher_sheets.sheet_key(self.info), key)
+
+    def test_sheet_is_redrawn_with_the_new_date(self):
+        etag = self.download()["ETag"]
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        with mock.patch.object(teacher_sheets, "date", mock.Mock(today=mock.Mock(return_value=tomorrow))):
+            response = self.download(if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.draw.call_count, 2)
+        self.assertEqual(len(self.cached_files()), 1)
+
+    def test_deleting_the_info_drops_its_sheets(self):
+        self.download()
+        self.info.delete()
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, str(self.info.pk))))
+
+    def test_regenerate_command(self):
+        create_teacher_info(username="prof2")
+        out = StringIO()
+        call_command("regenerate_teacher_sheets", "--workers", "0", stdout=out)
+        self.assertIn("2 fiche(s) générée(s), 0 déjà à jour", out.getvalue())
+
+        call_command("regenerate_teacher_sheets", "--workers", "0", stdout=out)
+        self.assertIn("0 fiche(s) générée(s), 2 déjà à jour", out.getvalue())
+        self.assertEqual(self.draw.call_count, 2)
+
+        call_command("regenerate_teacher_sheets", str(self.info.pk), "--workers", "0", "--force", stdout=out)
+        self.assertIn("1 fiche(s) générée(s), 0 déjà à jour", out.getvalue())
+
+        self.download()
+        self.assertEqual(self.draw.call_count, 3)  # servie depuis le cache régénéré
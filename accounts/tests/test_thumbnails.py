@@ -0,0 +1,111 @@
+import json
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from accounts import thumbnails
+from accounts.thumbnails import process_pending_pictures
+
+User = get_user_model()
+
+
+def make_image(size=(800, 600), color="red", fmt="JPEG"):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, fmt)
+    return buffer.getvalue()
+
+
+class ThumbnailPipelineTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.user = User.objects.create_user(username="alice", password="password")
+
+    def upload(self, user, data, name="photo.jpg"):
+        user.picture = SimpleUploadedFile(name, data, content_type="image/jpeg")
+        user.save()
+
+    def test_saving_without_picture_change_does_no_image_work(self):
+        self.assertFalse(self.user.picture_pending)
+        with mock.patch.object(thumbnails.Image, "open") as image_open:
+            user = User.objects.get(pk=self.user.pk)
+            user.first_name = "Alice"
+            user.save()
+            user.save(update_fields=["last_login"])
+            process_pending_pictures()
+        image_open.assert_not_called()
+        self.assertFalse(User.objects.get(pk=self.user.pk).picture_pending)
+
+    def test_upload_is_processed_off_the_request_path(self):
+        self.upload(self.user, make_image())
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.picture_pending)
+        self.assertEqual(user.get_picture_url(40), user.picture.url)  # original en attendant
+
+        self.assertEqual(process_pending_pictures(), (1, 0))
+
+        user = User.objects.get(pk=self.user.pk)
+        self.assertFalse(user.picture_pending)
+        manifest = user.picture_derivatives
+        self.assertEqual(len(manifest["derivatives"]), 6)
+        self.assertEqual(
+            sorted({(item["size"], item["format"]) for item in manifest["derivatives"]}),
+            [(40, "jpeg"), (40, "webp"), (150, "jpeg"), (150, "webp"), (300, "jpeg"), (300, "webp")],
+        )
+        for item in manifest["derivatives"]:
+            self.assertTrue(default_storage.exists(item["name"]))
+            self.assertEqual(max(item["width"], item["height"]), item["size"])
+
+        # Manifeste écrit à côté de l'original
+        manifest_name = thumbnails.derivative_name(user.picture.name, thumbnails.MANIFEST_SUFFIX)
+        with default_storage.open(manifest_name) as f:
+            self.assertEqual(json.load(f)["hash"], user.picture_hash)
+
+        self.assertIn(".40.jpg", user.get_picture_url(40))
+        self.assertIn(".150.webp", user.get_picture_url(100, webp=True))
+        self.assertIn(".300.jpg", user.get_picture_url(1000))
+
+        # Une nouvelle sauvegarde sans changement de photo ne relance rien
+        user.save()
+        self.assertFalse(User.objects.get(pk=self.user.pk).picture_pending)
+
+    def test_same_content_under_new_name_is_not_decoded_again(self):
+        data = make_image()
+        self.upload(self.user, data)
+        process_pending_pictures()
+        first = User.objects.get(pk=self.user.pk)
+
+        self.upload(first, data, name="autre.jpg")
+        with mock.patch.object(thumbnails.Image, "open") as image_open:
+            self.assertEqual(process_pending_pictures(), (1, 0))
+        image_open.assert_not_called()
+        self.assertEqual(User.objects.get(pk=self.user.pk).picture_derivatives, first.picture_derivatives)
+
+    def test_replaced_picture_removes_old_derivatives(self):
+        self.upload(self.user, make_image(color="red"))
+        process_pending_pictures()
+        old = User.objects.get(pk=self.user.pk).picture_derivatives
+
+        self.upload(User.objects.get(pk=self.user.pk), make_image(color="blue"), name="neuve.jpg")
+        process_pending_pictures()
+
+        for item in old["derivatives"]:
+            self.assertFalse(default_storage.exists(item["name"]))
+
+    def test_unreadable_picture_is_logged_and_cleared(self):
+        self.upload(self.user, b"pas une image", name="casse.jpg")
+        with self.assertLogs("accounts.thumbnails", "ERROR"):
+            self.assertEqual(process_pending_pictures(), (0, 1))
+        user = User.objects.get(pk=self.user.pk)
+        self.assertFalse(user.picture_pending)
+        self.assertEqual(user.get_picture_url(40), user.picture.url)
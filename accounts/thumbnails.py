@@ -0,0 +1,194 @@
+# accounts/thumbnails.py
+import hashlib
+import json
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# 40 : avatar de la barre de navigation, 150 : listes, 300 : profil
+PICTURE_SIZES = tuple(getattr(settings, "PICTURE_SIZES", (40, 150, 300)))
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+MANIFEST_SUFFIX = "manifest.json"
+
+
+# -----------------------------
+# Choix d'une variante (templates)
+# -----------------------------
+def pick_derivative(manifest, size=None, webp=False):
+    """
+    Plus petite variante dont le grand côté couvre ``size`` (la plus
+    grande si aucune ne suffit). None si le manifeste est vide.
+    """
+    fmt = "webp" if webp else None
+    candidates = [
+        item for item in (manifest or {}).get("derivatives", [])
+        if (item["format"] == "webp") == bool(fmt)
+    ]
+    if not candidates:
+        return None
+    candidates.sort(key=lambda item: item["size"])
+    if size is None:
+        return candidates[-1]
+    for item in candidates:
+        if item["size"] >= size:
+            return item
+    return candidates[-1]
+
+
+# -----------------------------
+# Génération (aucun accès base ici)
+# -----------------------------
+def content_hash(name, storage=default_storage):
+    digest = hashlib.sha256()
+    with storage.open(name, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def derivative_name(source_name, suffix):
+    stem, _ext = posixpath.splitext(source_name)
+    return f"{stem}.{suffix}"
+
+
+def _encode(image, fmt):
+    buffer = BytesIO()
+    if fmt == "webp":
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+    elif fmt == "jpeg":
+        image.convert("RGB").save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _save(name, data, storage):
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(data))
+
+
+def build_derivatives(source_name, known_hash="", known_manifest=None, storage=default_storage):
+    """
+    Génère les variantes (tailles ``PICTURE_SIZES``, format d'origine et
+    WebP) à côté de la photo et écrit le manifeste ``<photo>.manifest.json``.
+    Si le contenu n'a pas changé (même empreinte), le manifeste connu est
+    réutilisé sans décoder l'image. Retourne le manifeste.
+    """
+    digest = content_hash(source_name, storage)
+    if known_manifest and digest == known_hash and all(
+        storage.exists(item["name"]) for item in known_manifest.get("derivatives", [])
+    ):
+        return known_manifest
+
+    with storage.open(source_name, "rb") as f:
+        image = Image.open(f)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    base_format = "png" if has_alpha else "jpeg"
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    derivatives = []
+    for size in PICTURE_SIZES:
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)
+        for fmt in (base_format, "webp"):
+            ext = "jpg" if fmt == "jpeg" else fmt
+            name = _save(derivative_name(source_name, f"{size}.{ext}"), _encode(resized, fmt), storage)
+            derivatives.append({
+                "size": size,
+                "format": fmt,
+                "width": resized.width,
+                "height": resized.height,
+                "name": name,
+            })
+
+    manifest = {
+        "source": source_name,
+        "hash": digest,
+        "width": image.width,
+        "height": image.height,
+        "derivatives": derivatives,
+    }
+    _save(
+        derivative_name(source_name, MANIFEST_SUFFIX),
+        json.dumps(manifest, indent=2).encode("utf-8"),
+        storage,
+    )
+    return manifest
+
+
+def manifest_files(manifest):
+    """Fichiers d'un manifeste : variantes et manifeste lui-même."""
+    if not manifest:
+        return []
+    names = [item["name"] for item in manifest.get("derivatives", [])]
+    names.append(derivative_name(manifest["source"], MANIFEST_SUFFIX))
+    return names
+
+
+def delete_derivatives(manifest, storage=default_storage):
+    """Supprime les fichiers d'un ancien manifeste (variantes et manifeste)."""
+    for name in manifest_files(manifest):
+        try:
+            storage.delete(name)
+        except OSError:
+            pass
+
+
+# -----------------------------
+# Traitement de la file (worker)
+# -----------------------------
+def _process(row):
+    pk, name, known_hash, known_manifest = row
+    try:
+        return pk, name, build_derivatives(name, known_hash, known_manifest), None
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        return pk, name, None, str(e) or e.__class__.__name__
+
+
+def process_pending_pictures(batch_size=50, workers=2):
+    """
+    Génère les variantes des photos signalées ``picture_pending``.
+    Le décodage se fait en parallèle ; les écritures en base restent dans
+    le thread appelant. Retourne (traitées, en erreur).
+    """
+    from accounts.models import User
+
+    rows = list(
+        User.objects.filter(picture_pending=True)
+        .order_by("pk")
+        .values_list("pk", "picture", "picture_hash", "picture_derivatives")[:batch_size]
+    )
+    if not rows:
+        return 0, 0
+
+    previous_manifests = {row[0]: row[3] for row in rows}
+    done = failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(rows)))) as executor:
+        for pk, name, manifest, error in executor.map(_process, rows):
+            previous = previous_manifests[pk]
+            # Filtre sur le nom : une photo remplacée entre-temps reste en attente
+            pending = User.objects.filter(pk=pk, picture=name, picture_pending=True)
+            if error:
+                logger.error("Miniatures impossibles pour l'utilisateur %s (%s): %s", pk, name, error)
+                pending.update(picture_pending=False, picture_hash="", picture_derivatives={})
+                failed += 1
+                continue
+            if pending.update(picture_pending=False, picture_hash=manifest["hash"], picture_derivatives=manifest):
+                if previous and previous.get("source") != manifest["source"]:
+                    delete_derivatives(previous)
+                done += 1
+    return done, failed
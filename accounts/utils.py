@@ -1,15 +1,17 @@
-import threading
-import random
+import re
 import string
 import logging
 from datetime import datetime
 from django.utils import timezone
 from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
 from django.conf import settings
-from django.core.mail import send_mail
 from django.db import IntegrityError, transaction
 from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.encoding import force_bytes
 from django.utils.html import strip_tags
+from django.utils.http import urlsafe_base64_encode
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
@@ -24,80 +26,78 @@ def generate_password():
 # -----------------------------
 # Génération d'identifiants UNIQUEMENT pour enseignants
 # -----------------------------
-def generate_lecturer_id():
-    """Crée un matricule enseignant unique au format 25TGAXXXX"""
-    user_model = get_user_model()
-    year = str(timezone.now().year)[-2:]  # "25" pour 2025
-    prefix = "TGA"  # Pour enseignant
+LECTURER_PREFIX = "TGA"
+LECTURER_ID_RE = re.compile(rf"^\d{{2}}{LECTURER_PREFIX}\d{{4,}}$")
+
+
+def reserve_lecturer_ids(count, year=None):
+    """
+    Réserve ``count`` matricules enseignant consécutifs (format 26TGA0001)
+    en une seule écriture ; utile pour les imports en masse.
+    """
+    from .models import MatriculeSequence
+
+    year = (year or timezone.now().year) % 100
+    numbers = MatriculeSequence.allocate(LECTURER_PREFIX, year, count)
+    return [MatriculeSequence.format(LECTURER_PREFIX, year, number) for number in numbers]
+
 
-    for _ in range(20):
-        number = random.randint(1000, 9999)
-        lecturer_id = f"{year}{prefix}{number}"
+def generate_lecturer_id():
+    """Crée un matricule enseignant unique au format 26TGA0001 (compteur annuel)."""
+    return reserve_lecturer_ids(1)[0]
 
-        # Vérifier si le matricule existe déjà
-        if not user_model.objects.filter(username=lecturer_id).exists():
-            return lecturer_id
 
-    raise Exception("Impossible de générer un lecturer_id unique après 20 essais")
+def is_lecturer_id(value):
+    return bool(value and LECTURER_ID_RE.match(value))
 
 # -----------------------------
 # Génération credentials UNIQUEMENT pour enseignants
 # -----------------------------
-def generate_lecturer_credentials():
-    return generate_lecturer_id(), generate_password()
+def generate_lecturer_credentials(matricule=None):
+    """Identifiant (le matricule s'il est déjà attribué) et mot de passe."""
+    return matricule or generate_lecturer_id(), generate_password()
 
 # -----------------------------
 # Envoi d'emails UNIQUEMENT pour enseignants
 # -----------------------------
 def send_html_email(subject, recipient_list, template, context):
-    """Envoi d'un email HTML basé sur un template"""
+    """Met en file un email HTML basé sur un template (envoyé par process_outbox)"""
+    from core.mailer import enqueue_mail
+
     try:
         html_message = render_to_string(template, context)
         plain_message = strip_tags(html_message)
 
-        send_mail(
+        enqueue_mail(
             subject,
             plain_message,
-            settings.DEFAULT_FROM_EMAIL,  # Utiliser le paramètre standard Django
             recipient_list,
+            from_email=settings.DEFAULT_FROM_EMAIL,  # Utiliser le paramètre standard Django
             html_message=html_message,
-            fail_silently=False,
         )
-        logger.info(f"Email envoyé à {recipient_list}")
+        logger.info(f"Email mis en file pour {recipient_list}")
     except Exception as e:
-        logger.error(f"Erreur envoi email à {recipient_list}: {e}")
-
-class EmailThread(threading.Thread):
-    def __init__(self, subject, recipient_list, template_name, context):
-        self.subject = subject
-        self.recipient_list = recipient_list
-        self.template_name = template_name
-        self.context = context
-        threading.Thread.__init__(self)
-
-    def run(self):
-        try:
-            send_html_email(
-                subject=self.subject,
-                recipient_list=self.recipient_list,
-                template=self.template_name,
-                context=self.context,
-            )
-        except Exception as e:
-            logger.error(f"EmailThread failed: {e}")
-
-def send_new_account_email(user, password):
+        logger.error(f"Erreur mise en file email pour {recipient_list}: {e}")
+
+def set_password_url(user):
+    """
+    Lien absolu « définir mon mot de passe » (jeton de réinitialisation
+    Django, à usage unique et limité à PASSWORD_RESET_TIMEOUT) : le mot de
+    passe initial n'apparaît jamais dans l'email ni dans la file d'envoi.
+    """
+    path = reverse("password_reset_confirm", kwargs={
+        "uidb64": urlsafe_base64_encode(force_bytes(user.pk)),
+        "token": default_token_generator.make_token(user),
+    })
+    return settings.SITE_URL.rstrip("/") + path
+
+def send_new_account_email(user):
     """Envoi d'un email de confirmation de compte UNIQUEMENT pour les enseignants"""
     if user.is_lecturer:  # SEULEMENT pour les enseignants
-        try:
-            template = "accounts/email/new_lecturer_account_confirmation.html"
-            
-            EmailThread(
-                subject="Confirmation de votre compte The Genius Academy",
-                recipient_list=[user.email],
-                template_name=template,
-                context={"user": user, "password": password}
-            ).start()
-            logger.info(f"Email de confirmation programmé pour l'enseignant {user.email}")
-        except Exception as e:
-            logger.error(f"Erreur programmation email pour {user.email}: {e}")
\ No newline at end of file
+        template = "accounts/email/new_lecturer_account_confirmation.html"
+        send_html_email(
+            subject="Confirmation de votre compte The Genius Academy",
+            recipient_list=[user.email],
+            template=template,
+            context={"user": user, "set_password_url": set_password_url(user)},
+        )
@@ -3,8 +3,9 @@ from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.forms import PasswordChangeForm
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, HttpResponse, JsonResponse
 from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import method_decorator
 from django.views.generic import CreateView
 from django_filters.views import FilterView
@@ -13,6 +14,16 @@ from django.contrib.auth import authenticate, login, logout
 from django.core.exceptions import PermissionDenied
 
 from accounts.decorators import admin_required
+from accounts.exports import (
+    PARENT_COLUMNS,
+    STUDENT_COLUMNS,
+    USER_COLUMNS,
+    list_pdf_response,
+    parent_rows,
+    student_rows,
+    teacher_info_filename,
+    user_rows,
+)
 from accounts.forms import (
     StaffAddForm,
     StudentAddForm,
@@ -23,13 +34,9 @@ from accounts.forms import (
 )
 from accounts.models import User, Student, Parent, Teacher, TeacherInfo
 from accounts.filters import LecturerFilter, StudentFilter, ParentFilter, OtherFilter
+from accounts.teacher_sheets import open_sheet, sheet_key
+from core.pagination import KeysetPaginationMixin
 from django.db import transaction
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas
-from datetime import datetime
-import os
-from django.conf import settings
 
 # ----------------------------------------
 # PDF utility
@@ -494,257 +501,90 @@ def teacher_info_delete(request, pk):
 
 @login_required
 def teacher_info_pdf(request, pk):
-    info = get_object_or_404(TeacherInfo, pk=pk)
-    response = HttpResponse(content_type='application/pdf')
-    filename = f"fiche_repetiteur_{info.nom}_{info.prenom}.pdf"
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-    width, height = A4
-    p = canvas.Canvas(response, pagesize=A4)
-
-    # === Watermark discret ===
-    p.saveState()
-    p.setFont("Helvetica-Bold", 60)
-    p.setFillColorRGB(0.92, 0.92, 0.92)
-    p.translate(width/2, height/2)
-    p.rotate(45)
-    p.drawCentredString(0, 0, "THE GENIUS ACADEMY")
-    p.restoreState()
-
-    # === Bandeau République / Académie ===
-    def draw_header(x_center, country_fr, country_en):
-        stars = "★ ★ ★ ★ ★"
-        spacing = 20
-        # Français
-        y = height - 55
-        p.setFont("Helvetica-Bold", 11)
-        p.drawCentredString(x_center, y, country_fr)
-        y -= spacing
-        p.setFont("Helvetica-Bold", 12)
-        p.drawCentredString(x_center, y, stars)
-        y -= spacing
-        p.setFont("Helvetica-Oblique", 10)
-        p.drawCentredString(x_center, y, "Paix - Travail - Patrie")
-        y -= spacing
-        p.setFont("Helvetica-Bold", 12)
-        p.drawCentredString(x_center, y, stars)
-        y -= spacing
-        p.setFont("Helvetica-Bold", 11)
-        p.drawCentredString(x_center, y, "THE GENIUS ACADEMY")
-
-        # Anglais
-        y = height - 55
-        p.setFont("Helvetica-Bold", 11)
-        p.drawCentredString(x_center + width/2, y, country_en)
-        y -= spacing
-        p.setFont("Helvetica-Bold", 12)
-        p.drawCentredString(x_center + width/2, y, stars)
-        y -= spacing
-        p.setFont("Helvetica-Oblique", 10)
-        p.drawCentredString(x_center + width/2, y, "Peace - Work - Fatherland")
-        y -= spacing
-        p.setFont("Helvetica-Bold", 12)
-        p.drawCentredString(x_center + width/2, y, stars)
-        y -= spacing
-        p.setFont("Helvetica-Bold", 11)
-        p.drawCentredString(x_center + width/2, y, "THE GENIUS ACADEMY")
-
-    draw_header(width/4, "REPUBLIQUE DU CAMEROUN", "REPUBLIC OF CAMEROON")
-
-    # === Logo ===
-    logo_path = os.path.join(settings.BASE_DIR, "static", "img", "logo2.jpg")
-    logo_size = 100
-    logo_y_offset = 135 - (logo_size - 60)/2
-    if os.path.exists(logo_path):
-        p.drawImage(logo_path, width/2 - logo_size/2, height - logo_y_offset, width=logo_size, height=logo_size, mask='auto')
-
-    # === Titre principal et référence ===
-    p.setFillColor(colors.darkblue)
-    p.setFont("Helvetica-Bold", 18)
-    p.drawCentredString(width/2, height - 165, "FICHE D’ENREGISTREMENT POUR RÉPÉTITEUR")
-    p.setFont("Helvetica-BoldOblique", 12)
-    p.drawCentredString(width/2, height - 190, "DE THE GENIUS ACADEMY")
-    p.setFont("Helvetica-Bold", 10)
-    p.setFillColor(colors.black)
-    p.drawCentredString(width/2, height - 210, f"NOUS CONTACTER: +237 680700470 /+237 693501411")
-
-    # === Infos Personnelles ===
-    y_top = height - 235
-    y_title = y_top - 10
-    p.setFont("Helvetica-Bold", 12)
-    p.setFillColor(colors.HexColor("#0D47A1"))
-    p.drawString(50, y_title, "➤ INFORMATIONS PERSONNELLES :")
-    p.setFillColor(colors.black)
-
-    y = y_title - 25
-    col1_x = 60
-    col2_x = 200
-    row_height = 18
-    padding = 12
-    y_box_start = y + row_height + padding
-
-    lignes = [
-        ("Nom et Prénoms", f"{info.nom} {info.prenom}"),
-        ("Date de naissance", info.date_naissance.strftime('%d/%m/%Y') if info.date_naissance else ""),
-        ("Lieu de naissance", info.lieu_naissance or ""),
-        ("Sexe", info.sexe or ""),
-        ("Nationalité", info.nationalite or ""),
-        ("Statut matrimonial", info.statut_matrimonial or ""),
-        ("Adresse", info.adresse or ""),
-        ("Email", info.email or ""),
-        ("Téléphone", info.contact or ""),
-        ("N° CNI / Récépissé", info.cni_numero or ""),
-        ("Personne à contacter", f"{info.personne_urgence or ''} "),
-        ("Numéro d'urgence", f"{info.contact_urgence or ''}")
-    ]
-
-    for label, value in lignes:
-        p.setFont("Helvetica-Bold", 10)
-        p.drawString(col1_x, y, f"{label} :")
-        p.setFont("Helvetica", 10)
-        p.drawString(col2_x, y, value)
-        y -= row_height
-
-    p.setStrokeColor(colors.HexColor("#0D47A1"))
-    p.setLineWidth(1.5)
-    p.roundRect(35, y, width - 70, y_box_start - y + 5, radius=10, stroke=1, fill=0)
-
-    # === Matricule et Photo ===
-    matricule_y = y + (y_box_start - y - 110)/2 + 110 + 10
-    p.setFont("Helvetica-Bold", 10)
-    p.drawCentredString(width - 120, matricule_y, f"Matricule : {info.matricule or 'N/A'}")
-
-    photo_width = 90
-    photo_height = 110
-    photo_x = width - 160
-    photo_y = y + (y_box_start - y - photo_height)/2
-    p.setLineWidth(1)
-    p.setStrokeColor(colors.darkblue)
-    p.rect(photo_x, photo_y, photo_width, photo_height, stroke=1, fill=0)
-    p.setFont("Helvetica-Oblique", 8)
-    p.drawCentredString(photo_x + photo_width/2, photo_y - 12, "PHOTO 4x4")
-    if info.photo and os.path.exists(info.photo.path):
-        p.drawImage(info.photo.path, photo_x, photo_y, width=photo_width, height=photo_height, mask='auto')
-
-    # === Infos Professionnelles ===
-    y_top2 = y - 20
-    y_title2 = y_top2 - 10
-    p.setFont("Helvetica-Bold", 12)
-    p.setFillColor(colors.HexColor("#BF360C"))
-    p.drawString(50, y_title2, "➤ INFORMATIONS PROFESSIONNELLES :")
-    p.setFillColor(colors.black)
-
-    y = y_title2 - 25
-    y_box2_start = y + row_height + padding
-
-    lignes2 = [
-        ("Section d’enseignement", info.section_enseignement or ""),
-        ("Domaine d’enseignement", info.domaine_enseignement or ""),
-        ("Niveau scolaire", info.niveau_scolaire or ""),
-        ("Diplôme le plus élevé", info.diplome or ""),
-        ("Marge d’enseignement", info.marge_enseignement or ""),
-        ("Matières du primaire", info.matieres_primaire or ""),
-        ("Matières du secondaire", info.matieres_secondaire or ""),
-        ("Expérience professionnelle", info.experience or ""),
-    ]
-
-    for label, value in lignes2:
-        p.setFont("Helvetica-Bold", 10)
-        p.drawString(col1_x, y, f"{label} :")
-        p.setFont("Helvetica", 10)
-        p.drawString(col2_x, y, value)
-        y -= row_height
-
-    p.setStrokeColor(colors.HexColor("#BF360C"))
-    p.setLineWidth(1.5)
-    p.roundRect(35, y, width - 70, y_box2_start - y + 5, radius=10, stroke=1, fill=0)
-
-    # === Signatures finales ===
-    y_sign = y - 40
-    date_str = datetime.now().strftime("%d/%m/%Y")
-
-    # Signature du répétiteur
-    p.setFont("Helvetica", 10)
-    p.drawString(60, y_sign, "Signature du Répétiteur")
-
-    # Signature de l’administrateur
-    right_x = width - 200
-    y_sign_admin = y_sign - 5
-    p.drawString(right_x, y_sign_admin, f"Fait à Yaoundé, le {date_str}")
-    p.drawString(right_x, y_sign_admin - 20, "Directeur Général")
-
-    # Signature en arrière-plan
-    sign_path = os.path.join(settings.BASE_DIR, "static", "img", "signature_admin.png")
-    if os.path.exists(sign_path):
-        sign_width = 150
-        sign_height = 90
-        p.drawImage(sign_path, right_x + 40, y_sign_admin - 80, width=sign_width, height=sign_height, mask='auto')
-
-    # Cachet central
-    cachet_path = os.path.join(settings.BASE_DIR, "static", "img", "cachet.png")
-    cachet_width = 130
-    cachet_height = 130
-    if os.path.exists(cachet_path):
-        p.drawImage(cachet_path, width/2 - cachet_width/2, y_sign - 90, width=cachet_width, height=cachet_height, mask='auto')
-
-    p.showPage()
-    p.save()
+    info = get_object_or_404(TeacherInfo.objects.select_related("teacher__user"), pk=pk)
+    key = sheet_key(info)
+    etag = f'"{key}"'
+    # Fiche inchangée côté navigateur : 304 sans ouvrir le fichier
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = FileResponse(
+            open_sheet(info, key), as_attachment=True,
+            filename=teacher_info_filename(info), content_type="application/pdf",
+        )
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
     return response
 
+# ----------------------------------------
+# Listes filtrées (pagination par curseur, voir core.pagination)
+# ----------------------------------------
+# Colonnes affichées par les listes : le reste du profil n'est pas chargé
+USER_LIST_FIELDS = ("username", "first_name", "last_name", "email", "phone", "address", "last_login", "date_joined")
+
+
+def _user_fields(path):
+    return [f"{path}__{field}" for field in USER_LIST_FIELDS]
+
+
 # ----------------------------------------
 # Lecturer filter & list
 # ----------------------------------------
 @method_decorator([login_required, admin_required], name="dispatch")
-class LecturerFilterView(FilterView):
+class LecturerFilterView(KeysetPaginationMixin, FilterView):
     model = User
     filterset_class = LecturerFilter
     template_name = "accounts/lecturer_list.html"
     context_object_name = "filter"
-    
+    keyset_ordering = ("-date_joined", "-pk")
+
     def get_queryset(self):
-        return User.objects.filter(is_lecturer=True)
+        return User.objects.filter(is_lecturer=True).only(*USER_LIST_FIELDS)
 
 # ----------------------------------------
 # Student filter & list
 # ----------------------------------------
 @method_decorator([login_required, admin_required], name="dispatch")
-class StudentFilterView(FilterView):
+class StudentFilterView(KeysetPaginationMixin, FilterView):
     model = Student
     filterset_class = StudentFilter
     template_name = "accounts/student_list.html"
     context_object_name = "filter"
+    keyset_ordering = ("-student__date_joined", "-pk")
 
     def get_queryset(self):
-        return Student.objects.all()
+        return Student.objects.select_related("student").only("level", *_user_fields("student"))
 
 # ----------------------------------------
 # Other users filter & list
 # ----------------------------------------
 @method_decorator([login_required, admin_required], name="dispatch")
-class OtherFilterView(FilterView):
+class OtherFilterView(KeysetPaginationMixin, FilterView):
     model = User
     filterset_class = OtherFilter  # Correction: Ajout explicite de filterset_class
     template_name = "accounts/other_list.html"
     context_object_name = "filter"
+    keyset_ordering = ("-date_joined", "-pk")
 
     def get_queryset(self):
-        queryset = User.objects.filter(is_other=True)
-        self.filter = OtherFilter(self.request.GET, queryset=queryset)
-        return self.filter.qs
+        return User.objects.filter(is_other=True).only("gender", *USER_LIST_FIELDS)
 
 # ----------------------------------------
 # Parent filter & list
 # ----------------------------------------
 @method_decorator([login_required, admin_required], name="dispatch")
-class ParentFilterView(FilterView):
+class ParentFilterView(KeysetPaginationMixin, FilterView):
     model = Parent
     filterset_class = ParentFilter
     template_name = "accounts/parent_list.html"
     context_object_name = "filter"
     paginate_by = 20
+    keyset_ordering = ("-parent__date_joined", "-pk")
 
     def get_queryset(self):
-        return Parent.objects.select_related('parent', 'student__student').all()
+        return Parent.objects.select_related("parent", "student__student").only(
+            "relation_ship", *_user_fields("parent"),
+            "student__student__first_name", "student__student__last_name",
+        )
 
 # ----------------------------------------
 # Parent list view (simple)
@@ -761,9 +601,9 @@ def parent_list(request):
 @login_required
 @admin_required
 def render_lecturer_pdf_list(request):
-    lecturers = User.objects.filter(is_lecturer=True)
-    context = {"lecturers": lecturers, "title": "Lecturers List"}
-    return render_to_pdf("pdf/lecturer_list.html", context)
+    return list_pdf_response(
+        "enseignants.pdf", "Liste des Enseignants", USER_COLUMNS, user_rows(is_lecturer=True)
+    )
 
 # ----------------------------------------
 # Export students list to PDF
@@ -771,9 +611,7 @@ def render_lecturer_pdf_list(request):
 @login_required
 @admin_required
 def render_student_pdf_list(request):
-    students = Student.objects.all()
-    context = {"students": students, "title": "Students List"}
-    return render_to_pdf("pdf/student_list.html", context)
+    return list_pdf_response("eleves.pdf", "Liste des Élèves", STUDENT_COLUMNS, student_rows())
 
 # ----------------------------------------
 # Export other users list to PDF
@@ -781,9 +619,9 @@ def render_student_pdf_list(request):
 @login_required
 @admin_required
 def render_other_pdf_list(request):
-    others = User.objects.filter(is_other=True)
-    context = {"others": others, "title": "Other Users List"}
-    return render_to_pdf("pdf/other_list.html", context)
+    return list_pdf_response(
+        "autres_utilisateurs.pdf", "Liste des Autres Utilisateurs", USER_COLUMNS, user_rows(is_other=True)
+    )
 
 # ----------------------------------------
 # Export parents list to PDF
@@ -791,9 +629,7 @@ def render_other_pdf_list(request):
 @login_required
 @admin_required
 def render_parent_pdf_list(request):
-    parents = Parent.objects.select_related('parent', 'student__student').all()
-    context = {"parents": parents, "title": "Liste des Parents"}
-    return render_to_pdf("pdf/parent_list.html", context)
+    return list_pdf_response("parents.pdf", "Liste des Parents", PARENT_COLUMNS, parent_rows())
 
 from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import get_object_or_404
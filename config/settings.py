@@ -4,6 +4,7 @@ Django settings for Genius Academy project.
 Optimisé pour Genius Academy : 100% Jazzmin + multilingue + PWA.
 """
 
+import json
 import os
 from decouple import config
 import dj_database_url
@@ -31,7 +32,7 @@ AUTH_USER_MODEL = "accounts.User"
 # Installed apps
 # -------------------------
 DJANGO_APPS = [
-   
+    "modeltranslation",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -42,7 +43,6 @@ DJANGO_APPS = [
 
 THIRD_PARTY_APPS = [
     "jazzmin",
-    "modeltranslation",  # multilingue
     "crispy_forms",
     "crispy_bootstrap5",
     "django_filters",
@@ -69,6 +69,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.AuthStateHeaderMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -89,6 +90,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "core.context_processors.stats",
             ],
         },
     },
@@ -105,6 +107,30 @@ DATABASES = {
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# -------------------------
+# Cache
+# -------------------------
+# Développement : mémoire locale (un cache par processus).
+# Production multi-workers (gunicorn) : un cache partagé entre processus, ex.
+#   CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+#   CACHE_LOCATION=/var/tmp/genius_academy_cache
+# ou
+#   CACHE_BACKEND=django.core.cache.backends.db.DatabaseCache
+#   CACHE_LOCATION=genius_academy_cache   (puis: python manage.py createcachetable)
+CACHES = {
+    "default": {
+        "BACKEND": config("CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("CACHE_LOCATION", default="genius-academy"),
+    }
+}
+
+# Durée de vie (secondes) du contexte commun des pages publiques
+BASE_CONTEXT_CACHE_TIMEOUT = config("BASE_CONTEXT_CACHE_TIMEOUT", default=60 * 60, cast=int)
+# Durée de vie (secondes) des pages complètes servies aux visiteurs anonymes
+PAGE_CACHE_TIMEOUT = config("PAGE_CACHE_TIMEOUT", default=10 * 60, cast=int)
+# Durée de vie (secondes) des listes « dernières actualités / activités » (core.feeds)
+FEED_CACHE_TIMEOUT = config("FEED_CACHE_TIMEOUT", default=60 * 60, cast=int)
+
 # -------------------------
 # Password validators
 # -------------------------
@@ -151,6 +177,51 @@ EMAIL_PORT = config("EMAIL_PORT", default=587, cast=int)
 EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
 EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
+CONTACT_EMAIL = config("CONTACT_EMAIL", default="ayangluc096@gmail.com")
+# Adresse publique du site, pour les liens absolus des emails (ex. lien « définir mon mot de passe »)
+SITE_URL = config("SITE_URL", default="http://localhost:8000")
+
+# File d'attente des emails (core.OutboundEmail), vidée par: python manage.py process_outbox --loop
+EMAIL_OUTBOX_MAX_ATTEMPTS = config("EMAIL_OUTBOX_MAX_ATTEMPTS", default=5, cast=int)
+EMAIL_OUTBOX_RETRY_DELAY = config("EMAIL_OUTBOX_RETRY_DELAY", default=60, cast=int)  # secondes
+
+# Campagnes newsletter (core.Campaign), envoyées par: python manage.py send_campaigns
+CAMPAIGN_CHUNK_SIZE = config("CAMPAIGN_CHUNK_SIZE", default=500, cast=int)
+CAMPAIGN_BATCH_SIZE = config("CAMPAIGN_BATCH_SIZE", default=100, cast=int)
+CAMPAIGN_WORKERS = config("CAMPAIGN_WORKERS", default=4, cast=int)
+
+# Import en masse des comptes (python manage.py import_users fichier.csv|.xlsx)
+USER_IMPORT_CHUNK_SIZE = config("USER_IMPORT_CHUNK_SIZE", default=500, cast=int)
+USER_IMPORT_HASH_WORKERS = config("USER_IMPORT_HASH_WORKERS", default=2, cast=int)
+
+# Exports PDF/DOCX en arrière-plan (core.ReportJob): python manage.py process_report_jobs --loop
+REPORT_JOB_WORKERS = config("REPORT_JOB_WORKERS", default=2, cast=int)  # processus de rendu
+REPORT_JOB_TTL = config("REPORT_JOB_TTL", default=3600, cast=int)  # secondes de disponibilité du fichier
+REPORT_JOB_TIMEOUT = config("REPORT_JOB_TIMEOUT", default=15 * 60, cast=int)  # tâche bloquée reprise après
+
+# Suppressions en masse depuis l'admin (core.deletions, commande process_bulk_deletions)
+BULK_DELETE_CHUNK_SIZE = config("BULK_DELETE_CHUNK_SIZE", default=200, cast=int)  # objets par transaction
+BULK_DELETE_INLINE_LIMIT = config("BULK_DELETE_INLINE_LIMIT", default=50, cast=int)  # au-delà : en arrière-plan
+
+# Journaux d'activité (core.activity) : python manage.py archive_activity_logs, une fois par jour
+ACTIVITY_LOG_BUFFER_SIZE = config("ACTIVITY_LOG_BUFFER_SIZE", default=100, cast=int)  # entrées par INSERT groupé
+ACTIVITY_LOG_FLUSH_INTERVAL = config("ACTIVITY_LOG_FLUSH_INTERVAL", default=5, cast=int)  # attente max. (s)
+ACTIVITY_LOG_RETENTION_DAYS = config("ACTIVITY_LOG_RETENTION_DAYS", default=180, cast=int)  # au-delà : archivé
+ACTIVITY_LOG_ARCHIVE_DIR = config("ACTIVITY_LOG_ARCHIVE_DIR", default=os.path.join(BASE_DIR, "var", "activity_logs"))
+
+# Cache des fiches répétiteur (hors MEDIA_ROOT) : python manage.py regenerate_teacher_sheets
+TEACHER_SHEET_CACHE_DIR = config("TEACHER_SHEET_CACHE_DIR", default=os.path.join(BASE_DIR, "var", "teacher_sheets"))
+TEACHER_SHEET_WORKERS = config("TEACHER_SHEET_WORKERS", default=2, cast=int)
+
+# Moteur de recherche (search.backends) : "auto" (FTS5 sur SQLite, tsvector/GIN sur PostgreSQL)
+# ou chemin d'une classe, ex. search.backends.BasicBackend. Reconstruction : python manage.py rebuild_search_index
+SEARCH_BACKEND = config("SEARCH_BACKEND", default="auto")
+# Suggestions de la barre de recherche (search.typeahead) : résultats par réponse, préfixes gardés en LRU
+TYPEAHEAD_LIMIT = config("TYPEAHEAD_LIMIT", default=8, cast=int)
+TYPEAHEAD_CACHE_SIZE = config("TYPEAHEAD_CACHE_SIZE", default=1024, cast=int)
+
+# Polices TrueType des PDF (core.pdf_assets), JSON : PDF_FONTS={"DejaVuSans": "/usr/share/fonts/.../DejaVuSans.ttf"}
+PDF_FONTS = config("PDF_FONTS", default="{}", cast=json.loads)
 
 # -------------------------
 # Crispy Forms
@@ -236,6 +307,22 @@ PWA_APP_SPLASH_SCREEN = []
 PWA_APP_DIR = "ltr"
 PWA_APP_LANG = "fr-FR"
 
+# Service worker généré (core.service_worker) : python manage.py build_service_worker, après collectstatic
+SERVICE_WORKER_PATH = os.path.join(STATIC_ROOT, "serviceworker.js")
+SERVICE_WORKER_PRECACHE = [
+    "css/style.css",
+    "css/style.min.css",
+    "css/tailwind.css",
+    "vendor/bootstrap-5.3.2/css/bootstrap.min.css",
+    "vendor/fontawesome-6.5.1/css/all.min.css",
+    "js/main.js",
+    "vendor/bootstrap-5.3.2/js/bootstrap.bundle.min.js",
+    "vendor/jquery-3.7.1/jquery-3.7.1.min.js",
+    "img/icons/web-app-manifest-192x192.png",
+    "img/icons/web-app-manifest-512x512.png",
+    "manifest/site.webmanifest",
+]
+
 # -------------------------
 # Logging
 # -------------------------
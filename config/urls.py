@@ -1,3 +1,5 @@
+import os
+
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
@@ -45,9 +47,10 @@ urlpatterns += [
         "path": "manifest/site.webmanifest",
         "document_root": settings.STATIC_ROOT
     }),
+    # Généré par: python manage.py build_service_worker (portée : tout le site)
     path("serviceworker.js", serve, {
-        "path": "js/service-worker.js",
-        "document_root": settings.STATIC_ROOT
+        "path": os.path.basename(settings.SERVICE_WORKER_PATH),
+        "document_root": os.path.dirname(settings.SERVICE_WORKER_PATH)
     }),
 ]
 
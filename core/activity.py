@@ -0,0 +1,242 @@
+# core/activity.py
+"""
+Journaux d'activité (accounts.ActivityLog et core.ActivityLog).
+
+- Écriture : ``log_activity`` / ``log_event`` ajoutent l'entrée à un
+  tampon du processus, écrit en un INSERT groupé dès BUFFER_SIZE
+  entrées, en fin de requête si la plus ancienne attend depuis
+  FLUSH_INTERVAL secondes, et à la sortie du processus. L'heure
+  enregistrée est celle de l'événement.
+- Compteurs : ``rollup`` tient à jour ActivityRollup (entrées par jour et
+  par journal), qui survit à l'archivage.
+- Rétention : ``archive`` écrit les entrées de plus de RETENTION_DAYS
+  jours dans des fichiers JSONL compressés (un par jour et par journal,
+  ARCHIVE_DIR/<journal>/<année>/) puis les supprime. Les jours sont
+  traités un par un, par plage sur l'index de created_at.
+
+Commande quotidienne : python manage.py archive_activity_logs
+"""
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+from datetime import datetime, time, timedelta
+from time import monotonic
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from . import deletions, feeds
+from .models import ActivityRollup
+
+logger = logging.getLogger(__name__)
+
+BUFFER_SIZE = getattr(settings, "ACTIVITY_LOG_BUFFER_SIZE", 100)
+FLUSH_INTERVAL = getattr(settings, "ACTIVITY_LOG_FLUSH_INTERVAL", 5)  # secondes
+RETENTION_DAYS = getattr(settings, "ACTIVITY_LOG_RETENTION_DAYS", 180)
+ARCHIVE_DIR = getattr(settings, "ACTIVITY_LOG_ARCHIVE_DIR", os.path.join(settings.BASE_DIR, "var", "activity_logs"))
+
+# Journal -> modèle
+SOURCES = {
+    "accounts": "accounts.ActivityLog",
+    "core": "core.ActivityLog",
+}
+
+
+def get_model(source):
+    return apps.get_model(SOURCES[source])
+
+
+# ----------------------------------------
+# Écriture groupée
+# ----------------------------------------
+class ActivityBuffer:
+    """Entrées en attente, partagées par les threads du processus."""
+
+    def __init__(self, size=BUFFER_SIZE, interval=FLUSH_INTERVAL):
+        self.size = size
+        self.interval = interval
+        self._entries = []
+        self._since = None  # instant d'ajout de la plus ancienne entrée en attente
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, entry):
+        with self._lock:
+            if not self._entries:
+                self._since = monotonic()
+            self._entries.append(entry)
+            full = len(self._entries) >= self.size
+        if full:
+            self.flush()
+
+    def due(self):
+        since = self._since
+        return bool(self._entries) and since is not None and monotonic() - since >= self.interval
+
+    def flush_if_due(self):
+        return self.flush() if self.due() else 0
+
+    def flush(self):
+        """Écrit les entrées en attente (un INSERT par modèle) ; retourne leur nombre."""
+        with self._lock:
+            entries, self._entries, self._since = self._entries, [], None
+        by_model = {}
+        for entry in entries:
+            by_model.setdefault(type(entry), []).append(entry)
+        for model, objs in by_model.items():
+            try:
+                model.objects.bulk_create(objs, batch_size=self.size)
+            except DatabaseError:
+                # Un journal ne doit jamais faire échouer la requête qui l'alimente
+                logger.exception("%d entrée(s) %s perdue(s)", len(objs), model._meta.label)
+        if entries:
+            feeds.invalidate_feeds("activity")  # bulk_create n'envoie pas post_save
+        return len(entries)
+
+
+buffer = ActivityBuffer()
+atexit.register(buffer.flush)
+
+
+def log_activity(message, user=None):
+    """Entrée du journal des utilisateurs (accounts.ActivityLog)."""
+    user = user if user is not None and user.is_authenticated else None
+    buffer.add(get_model("accounts")(user=user, message=message, created_at=timezone.now()))
+
+
+def log_event(message):
+    """Entrée du journal système (core.ActivityLog)."""
+    buffer.add(get_model("core")(message=message, created_at=timezone.now()))
+
+
+def recent_activity(limit=5):
+    """Dernières entrées du journal des utilisateurs (parcours de l'index, entrées en attente comprises)."""
+    buffer.flush()
+    return get_model("accounts").objects.only("user_id", "message", "created_at").order_by("-created_at")[:limit]
+
+
+# ----------------------------------------
+# Jours (fuseau du site)
+# ----------------------------------------
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def day_range(day):
+    return {"created_at__gte": day_start(day), "created_at__lt": day_start(day + timedelta(days=1))}
+
+
+def first_day(queryset, since=None):
+    """Jour de la plus ancienne entrée (à partir de ``since``), ou None."""
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=day_start(since))
+    oldest = queryset.order_by("created_at").values_list("created_at", flat=True).first()
+    return timezone.localdate(oldest) if oldest else None
+
+
+# ----------------------------------------
+# Compteurs journaliers
+# ----------------------------------------
+def rollup(source, since=None):
+    """
+    Recalcule ActivityRollup pour ``source`` depuis ``since`` (par défaut
+    le dernier jour compté, qui pouvait être incomplet) ; une requête
+    groupée. Les jours archivés gardent leur compteur.
+    """
+    if since is None:
+        since = (
+            ActivityRollup.objects.filter(source=source, archived=False).order_by("-day")
+            .values_list("day", flat=True).first()
+        )
+    queryset = get_model(source)._base_manager.all()
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=day_start(since))
+    counts = dict(
+        queryset.annotate(day=TruncDate("created_at", tzinfo=timezone.get_current_timezone()))
+        .order_by().values("day").annotate(count=Count("pk")).values_list("day", "count")
+    )
+    archived = set(
+        ActivityRollup.objects.filter(source=source, archived=True, day__in=counts).values_list("day", flat=True)
+    )
+    rows = [
+        ActivityRollup(source=source, day=day, count=count)
+        for day, count in counts.items() if day not in archived
+    ]
+    ActivityRollup.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=["source", "day"], update_fields=["count"],
+    )
+    return len(rows)
+
+
+# ----------------------------------------
+# Rétention
+# ----------------------------------------
+def archive_path(source, day, first_pk, last_pk):
+    # Nom déterministe : une reprise après interruption réécrit le même fichier
+    return os.path.join(ARCHIVE_DIR, source, f"{day:%Y}", f"{day:%Y-%m-%d}-{first_pk}-{last_pk}.jsonl.gz")
+
+
+def archive_day(source, day):
+    """Archive puis supprime les entrées de ``day`` ; retourne leur nombre."""
+    model = get_model(source)
+    queryset = model._base_manager.filter(**day_range(day)).order_by("pk")
+    fields = [field.attname for field in model._meta.concrete_fields]
+    bounds = queryset.values_list("pk", flat=True)
+    first_pk, last_pk = bounds.first(), bounds.last()
+    if first_pk is None:
+        return 0
+
+    path = archive_path(source, day, first_pk, last_pk)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    written = 0
+    with gzip.open(f"{path}.tmp", "wt", encoding="utf-8") as archive:
+        for row in queryset.filter(pk__lte=last_pk).values(*fields).iterator(chunk_size=2000):
+            archive.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n")
+            written += 1
+    os.replace(f"{path}.tmp", path)
+
+    with transaction.atomic():
+        with deletions.deferred_signals():  # fil « activité » invalidé une fois, par archive()
+            deleted, _by_model = queryset.filter(pk__lte=last_pk).delete()
+        rolled, created = ActivityRollup.objects.get_or_create(
+            source=source, day=day, defaults={"count": deleted, "archived": True}
+        )
+        if not created:
+            # Compteur définitif après le premier archivage ; les entrées tardives s'y ajoutent
+            count = F("count") + deleted if rolled.archived else deleted
+            ActivityRollup.objects.filter(pk=rolled.pk).update(count=count, archived=True)
+    if deleted != written:
+        logger.warning("%s %s : %d entrée(s) archivée(s), %d supprimée(s)", source, day, written, deleted)
+    return deleted
+
+
+def archive(source, retention_days=RETENTION_DAYS):
+    """Archive les jours antérieurs à la période de rétention ; retourne le nombre d'entrées archivées."""
+    cutoff = timezone.localdate() - timedelta(days=retention_days)
+    queryset = get_model(source)._base_manager.filter(created_at__lt=day_start(cutoff))
+    total = 0
+    day = first_day(queryset)
+    while day is not None:
+        total += archive_day(source, day)
+        # Saut direct au jour suivant qui a des entrées
+        day = first_day(queryset, since=day + timedelta(days=1))
+    if total and source == "accounts":
+        feeds.invalidate_feeds("activity")
+    return total
+
+
+def read_archive(path):
+    """Entrées d'un fichier d'archive (dictionnaires)."""
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            yield json.loads(line)
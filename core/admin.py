@@ -1,25 +1,69 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
+from django.db.models import Count, Exists, OuterRef
 from django.utils.translation import gettext_lazy as _
+from django.urls import reverse
 from django.utils.html import format_html
 from modeltranslation.admin import TranslationAdmin
+from . import deletions
+from .caching import invalidate_base_context
+from .testimonial_stats import invalidate_testimonial_stats
 from .models import (
     Slide, GalleryImage, Testimonial, NewsletterSubscriber, 
     ContactMessage, StatValue, NewsAndEvents, AcademicEvent,
-    Absence, Reservation, SuccessRate
+    Absence, Reservation, SuccessRate, DashboardSnapshot, OutboundEmail,
+    Campaign, CampaignDelivery, ReportJob, BulkDeletion, ActivityRollup
 )
 
 # ------------------------------
 # Action générique pour supprimer
 # ------------------------------
 def delete_selected_objects(modeladmin, request, queryset):
-    count = queryset.count()
-    queryset.delete()
-    modeladmin.message_user(request, _("%d objet(s) supprimé(s) avec succès.") % count)
+    # Page de confirmation d'abord (nombre d'objets seulement, sans parcours des cascades)
+    if request.POST.get("post") != "yes":
+        select_across = request.POST.get("select_across") == "1"
+        return TemplateResponse(request, "admin/core/bulk_delete_confirmation.html", {
+            **modeladmin.admin_site.each_context(request),
+            "title": _("Êtes-vous sûr ?"),
+            "opts": modeladmin.model._meta,
+            "media": modeladmin.media,
+            "count": queryset.count(),
+            "select_across": select_across,
+            "pks": [] if select_across else queryset.values_list("pk", flat=True),
+            "action": request.POST.get("action", "delete_selected_objects"),
+            "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+        })
+    # Par paquets, cascades comprises ; les grosses sélections partent en arrière-plan (core.deletions)
+    job = deletions.schedule(queryset, request.user)
+    if job.status == BulkDeletion.DONE:
+        modeladmin.message_user(request, _("%d objet(s) supprimé(s) avec succès.") % job.total)
+    elif job.status == BulkDeletion.FAILED:
+        modeladmin.message_user(request, _("Échec de la suppression : %s") % job.error, messages.ERROR)
+    else:
+        modeladmin.message_user(request, format_html(
+            _("Suppression de {} objet(s) programmée : <a href=\"{}\">suivre l'avancement</a>."),
+            job.total, reverse("admin:core_bulkdeletion_change", args=[job.pk]),
+        ))
 delete_selected_objects.short_description = _("Supprimer les objets sélectionnés")
+delete_selected_objects.allowed_permissions = ("delete",)
+
+
+class BulkDeleteMixin:
+    """
+    Remplace l'action Django « delete_selected » (cascades chargées dans la
+    requête, signaux envoyés objet par objet) par delete_selected_objects.
+    """
+    actions = [delete_selected_objects]
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
 
 # ---------------- NewsAndEvents Admin ----------------
 @admin.register(NewsAndEvents)
-class NewsAndEventsAdmin(TranslationAdmin):
+class NewsAndEventsAdmin(BulkDeleteMixin, TranslationAdmin):
     list_display = ('title', 'summary', 'posted_as', 'updated_date')
     list_filter = ('posted_as', 'updated_date')
     search_fields = ('title', 'summary')
@@ -56,7 +100,7 @@ class GalleryImageInline(admin.TabularInline):
 
 # ---------------- Slide Admin ----------------
 @admin.register(Slide)
-class SlideAdmin(admin.ModelAdmin):
+class SlideAdmin(BulkDeleteMixin, admin.ModelAdmin):
     list_display = ["image_count", "order"]
     list_editable = ["order"]
     list_display_links = ["image_count"]
@@ -64,13 +108,18 @@ class SlideAdmin(admin.ModelAdmin):
     inlines = [GalleryImageInline]
     actions = [delete_selected_objects]
 
+    def get_queryset(self, request):
+        # Nombre d'images calculé dans la requête de la liste (pas de COUNT par ligne)
+        return super().get_queryset(request).annotate(image_count=Count("images"))
+
     def image_count(self, obj):
-        return obj.images.count()
+        return obj.image_count
     image_count.short_description = _("Nombre d'images")
+    image_count.admin_order_field = "image_count"
 
 # ---------------- Testimonial Admin ----------------
 @admin.register(Testimonial)
-class TestimonialAdmin(admin.ModelAdmin):
+class TestimonialAdmin(BulkDeleteMixin, admin.ModelAdmin):
     list_display = ["author", "content_preview", "is_active", "is_approved", "order", "created_at", "thumbnail"]
     list_editable = ["order", "is_active", "is_approved"]
     list_filter = ["is_active", "is_approved", "created_at"]
@@ -110,19 +159,26 @@ class TestimonialAdmin(admin.ModelAdmin):
 
     def approve_testimonials(self, request, queryset):
         updated = queryset.update(is_approved=True)
+        # update() ne déclenche pas les signaux : on resynchronise les caches
+        DashboardSnapshot.refresh_ratings()
+        invalidate_base_context()
+        invalidate_testimonial_stats()
         self.message_user(request, _("%d témoignage(s) approuvé(s).") % updated)
     approve_testimonials.short_description = _("Approuver les témoignages sélectionnés")
 
     def disapprove_testimonials(self, request, queryset):
         updated = queryset.update(is_approved=False)
+        DashboardSnapshot.refresh_ratings()
+        invalidate_base_context()
+        invalidate_testimonial_stats()
         self.message_user(request, _("%d témoignage(s) désapprouvé(s).") % updated)
     disapprove_testimonials.short_description = _("Désapprouver les témoignages sélectionnés")
 
 # ---------------- Newsletter Subscriber Admin ----------------
 @admin.register(NewsletterSubscriber)
-class NewsletterSubscriberAdmin(admin.ModelAdmin):
-    list_display = ["email", "subscribed_at", "is_active", "display_subscription_source"]
-    list_filter = ["is_active", "subscribed_at"]
+class NewsletterSubscriberAdmin(BulkDeleteMixin, admin.ModelAdmin):
+    list_display = ["email", "language", "subscribed_at", "is_active", "display_subscription_source"]
+    list_filter = ["is_active", "language", "subscribed_at"]
     search_fields = ["email"]
     actions = ["activate_subscribers", "deactivate_subscribers", delete_selected_objects]
     readonly_fields = ["subscribed_at"]
@@ -130,7 +186,7 @@ class NewsletterSubscriberAdmin(admin.ModelAdmin):
     
     fieldsets = (
         (None, {
-            'fields': ('email', 'is_active')
+            'fields': ('email', 'language', 'is_active')
         }),
         (_('Subscription Info'), {
             'fields': ('subscribed_at',),
@@ -138,11 +194,14 @@ class NewsletterSubscriberAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        via_contact = ContactMessage.objects.filter(email=OuterRef("email"), newsletter=True)
+        return super().get_queryset(request).annotate(via_contact=Exists(via_contact))
+
     def display_subscription_source(self, obj):
-        from .models import ContactMessage
-        contact_message = ContactMessage.objects.filter(email=obj.email, newsletter=True).first()
-        return _("Via formulaire de contact") if contact_message else _("Via formulaire de newsletter")
+        return _("Via formulaire de contact") if obj.via_contact else _("Via formulaire de newsletter")
     display_subscription_source.short_description = _("Source de l'inscription")
+    display_subscription_source.admin_order_field = "via_contact"
 
     def activate_subscribers(self, request, queryset):
         updated = queryset.update(is_active=True)
@@ -156,7 +215,7 @@ class NewsletterSubscriberAdmin(admin.ModelAdmin):
 
 # ---------------- Contact Message Admin ----------------
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(BulkDeleteMixin, admin.ModelAdmin):
     list_display = ["nom", "email", "sujet", "created_at", "is_read", "newsletter"]
     list_filter = ["newsletter", "is_read", "created_at"]
     search_fields = ["nom", "email", "sujet", "message"]
@@ -197,7 +256,7 @@ class ContactMessageAdmin(admin.ModelAdmin):
 
 # ---------------- Stat Value Admin ----------------
 @admin.register(StatValue)
-class StatValueAdmin(admin.ModelAdmin):
+class StatValueAdmin(BulkDeleteMixin, admin.ModelAdmin):
     list_display = ('name', 'value', 'display_icon')
     list_editable = ('value',)
     search_fields = ('name',)
@@ -215,7 +274,7 @@ class StatValueAdmin(admin.ModelAdmin):
 
 # ---------------- Academic Event Admin ----------------
 @admin.register(AcademicEvent)
-class AcademicEventAdmin(admin.ModelAdmin):
+class AcademicEventAdmin(BulkDeleteMixin, admin.ModelAdmin):
     list_display = ("date", "activity", "responsible")
     search_fields = ("activity", "responsible")
     list_filter = ("date",)
@@ -223,7 +282,7 @@ class AcademicEventAdmin(admin.ModelAdmin):
 
 # ---------------- Success Rate Admin ----------------
 @admin.register(SuccessRate)
-class SuccessRateAdmin(admin.ModelAdmin):
+class SuccessRateAdmin(BulkDeleteMixin, admin.ModelAdmin):
     list_display = ('year', 'rate', 'created_at')
     list_filter = ('year',)
     search_fields = ('year',)
@@ -233,18 +292,156 @@ class SuccessRateAdmin(admin.ModelAdmin):
 
 # ---------------- Absence Admin ----------------
 @admin.register(Absence)
-class AbsenceAdmin(admin.ModelAdmin):
+class AbsenceAdmin(BulkDeleteMixin, admin.ModelAdmin):
     list_display = ['teacher', 'date', 'reason']
     list_filter = ['date', 'teacher']
     search_fields = ['teacher__username', 'reason']
+    list_select_related = ['teacher']
     ordering = ['date']
     actions = [delete_selected_objects]
 
 # ---------------- Reservation Admin ----------------
 @admin.register(Reservation)
-class ReservationAdmin(admin.ModelAdmin):
+class ReservationAdmin(BulkDeleteMixin, admin.ModelAdmin):
     list_display = ['course_name', 'student_name', 'date']
     list_filter = ['date']
     search_fields = ['course_name', 'student_name']
     ordering = ['date']
     actions = [delete_selected_objects]
+
+
+# ---------------- Outbound Email Admin ----------------
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(BulkDeleteMixin, admin.ModelAdmin):
+    list_display = ["subject", "status", "attempts", "next_attempt_at", "created_at", "sent_at"]
+    list_filter = ["status", "created_at"]
+    search_fields = ["subject", "to"]
+    # Contenu figé une fois en file (il peut porter un lien d'activation de compte)
+    readonly_fields = ["body", "created_at", "sent_at", "locked_at", "last_error", "attempts"]
+    exclude = ["html_body"]
+    actions = ["requeue_emails", delete_selected_objects]
+    list_per_page = 25
+
+    def requeue_emails(self, request, queryset):
+        from django.utils import timezone
+        updated = queryset.exclude(status=OutboundEmail.SENT).update(
+            status=OutboundEmail.PENDING, attempts=0, next_attempt_at=timezone.now(), locked_at=None
+        )
+        self.message_user(request, _("%d email(s) remis en file d'attente.") % updated)
+    requeue_emails.short_description = _("Remettre en file d'attente")
+
+
+# ---------------- Newsletter Campaign Admin ----------------
+@admin.register(Campaign)
+class CampaignAdmin(BulkDeleteMixin, TranslationAdmin):
+    list_display = ["title", "status", "sent_count", "failed_count", "messages_per_second", "started_at", "finished_at"]
+    list_filter = ["status", "created_at"]
+    search_fields = ["title", "subject"]
+    readonly_fields = [
+        "status", "created_at", "started_at", "finished_at",
+        "sent_count", "failed_count", "send_seconds", "messages_per_second",
+    ]
+    actions = ["queue_campaigns", delete_selected_objects]
+    list_per_page = 25
+
+    def messages_per_second(self, obj):
+        return obj.messages_per_second
+    messages_per_second.short_description = _("Débit (msg/s)")
+
+    def queue_campaigns(self, request, queryset):
+        # L'envoi lui-même est fait par la commande send_campaigns, hors requête
+        updated = queryset.filter(status=Campaign.DRAFT).update(status=Campaign.QUEUED)
+        self.message_user(request, _("%d campagne(s) programmée(s) pour envoi.") % updated)
+    queue_campaigns.short_description = _("Programmer l'envoi des campagnes sélectionnées")
+
+
+@admin.register(CampaignDelivery)
+class CampaignDeliveryAdmin(admin.ModelAdmin):
+    list_display = ["email", "campaign", "status", "sent_at"]
+    list_filter = ["status", "campaign"]
+    search_fields = ["email"]
+    list_select_related = ["campaign"]
+    readonly_fields = ["campaign", "subscriber", "email", "status", "error", "sent_at", "updated_at"]
+    list_per_page = 50
+
+
+# ---------------- Report Job Admin ----------------
+@admin.register(ReportJob)
+class ReportJobAdmin(BulkDeleteMixin, admin.ModelAdmin):
+    list_display = ["kind", "status", "request_count", "requested_by", "created_at", "finished_at", "expires_at"]
+    list_filter = ["status", "kind", "created_at"]
+    list_select_related = ["requested_by"]
+    readonly_fields = [
+        "token", "kind", "params", "status", "requested_by", "request_count", "artifact", "error",
+        "created_at", "started_at", "finished_at", "expires_at",
+    ]
+    actions = ["requeue_jobs", delete_selected_objects]
+    list_per_page = 25
+
+    def has_add_permission(self, request):
+        # Les tâches sont créées depuis les boutons d'export
+        return False
+
+    def requeue_jobs(self, request, queryset):
+        from django.db import IntegrityError, transaction
+        updated = 0
+        for job in queryset.filter(status=ReportJob.FAILED):
+            try:
+                # Refusé par la contrainte si une tâche identique est déjà en cours
+                with transaction.atomic():
+                    updated += ReportJob.objects.filter(pk=job.pk).update(
+                        status=ReportJob.PENDING, error="", started_at=None, finished_at=None, expires_at=None
+                    )
+            except IntegrityError:
+                pass
+        self.message_user(request, _("%d rapport(s) remis en file d'attente.") % updated)
+    requeue_jobs.short_description = _("Relancer les rapports en échec")
+
+
+
+# ---------------- Bulk Deletion Admin ----------------
+@admin.register(BulkDeletion)
+class BulkDeletionAdmin(admin.ModelAdmin):
+    list_display = [
+        "model", "status", "total", "progress_display", "deleted_rows", "files_deleted",
+        "requested_by", "created_at", "finished_at",
+    ]
+    list_filter = ["status", "model"]
+    list_select_related = ["requested_by"]
+    readonly_fields = [
+        "model", "status", "total", "progress_display", "deleted_rows", "files_deleted", "requested_by",
+        "error", "created_at", "started_at", "finished_at",
+    ]
+    exclude = ["object_ids", "cleanup"]
+    actions = ["requeue_deletions"]
+    list_per_page = 25
+
+    def has_add_permission(self, request):
+        # Les suppressions sont demandées par l'action « Supprimer les objets sélectionnés »
+        return False
+
+    def progress_display(self, obj):
+        return f"{obj.processed}/{obj.total} ({obj.progress} %)"
+    progress_display.short_description = _("Avancement")
+
+    def requeue_deletions(self, request, queryset):
+        # Reprise là où la tâche s'était arrêtée (objets déjà traités ignorés)
+        updated = queryset.filter(status=BulkDeletion.FAILED).update(
+            status=BulkDeletion.PENDING, error="", finished_at=None
+        )
+        self.message_user(request, _("%d suppression(s) remise(s) en file d'attente.") % updated)
+    requeue_deletions.short_description = _("Relancer les suppressions en échec")
+
+
+# ---------------- Activity Rollup Admin ----------------
+@admin.register(ActivityRollup)
+class ActivityRollupAdmin(admin.ModelAdmin):
+    # Tenu à jour par la commande archive_activity_logs
+    list_display = ["day", "source", "count", "archived"]
+    list_filter = ["source", "archived"]
+    date_hierarchy = "day"
+    readonly_fields = ["source", "day", "count", "archived"]
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        return False
@@ -6,4 +6,5 @@ class CoreConfig(AppConfig):
     verbose_name = 'Core'
 
     def ready(self):
-        import core.translation  # Import des traductions
\ No newline at end of file
+        import core.translation  # Import des traductions
+        import core.signals  # noqa: F401
\ No newline at end of file
@@ -0,0 +1,209 @@
+# core/caching.py
+import hashlib
+import re
+import time
+import zlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.functional import Promise
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language, gettext_lazy as _
+
+from .models import GalleryImage, Slide, Testimonial
+
+# Durée de vie par défaut : les signaux invalident le cache bien avant
+BASE_CONTEXT_TIMEOUT = getattr(settings, "BASE_CONTEXT_CACHE_TIMEOUT", 60 * 60)
+BASE_CONTEXT_KEY = "core:base_context:{language}"
+
+
+def fallback_slides():
+    """Slides de secours si aucune slide en base."""
+    return [
+        {
+            "images": [
+                {"image": "img/carousel1.jpg", "alt": _("Image alternative 1")},
+            ],
+            "title": _("L'excellence éducative à Yaoundé"),
+            "description": _("Accompagnement scolaire personnalisé de la maternelle à la terminale."),
+            "primary_cta": _("Nos services"),
+            "primary_link": "#services",
+            "secondary_cta": _("Contactez-nous"),
+            "secondary_link": "#contact",
+            "secondary_icon": "phone-alt",
+            "tag": _("Excellence académique"),
+            "tag_class": "bg-primary-600",
+        },
+        {
+            "images": [
+                {"image": "img/carousel2.jpg", "alt": _("Image alternative 2")},
+            ],
+            "title": _("Une pédagogie adaptée à chaque élève"),
+            "description": _("Des enseignants qualifiés pour un suivi personnalisé."),
+            "primary_cta": _("Découvrir nos cours"),
+            "primary_link": "#services",
+            "secondary_cta": _("Nous contacter"),
+            "secondary_link": "#contact",
+            "secondary_icon": "envelope",
+            "tag": _("Apprentissage sur mesure"),
+            "tag_class": "bg-primary-500",
+        },
+    ]
+
+
+def _resolve_lazy(value):
+    """Traduit récursivement les chaînes paresseuses dans la langue active."""
+    if isinstance(value, Promise):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: _resolve_lazy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_lazy(item) for item in value]
+    return value
+
+
+def base_context_key(language=None):
+    return BASE_CONTEXT_KEY.format(language=language or get_language() or settings.LANGUAGE_CODE)
+
+
+def get_cached_base_context():
+    """
+    Données communes des pages publiques (galerie, slides, témoignages,
+    slides de secours), mises en cache par langue. Lève DatabaseError
+    si la base est indisponible ; rien n'est alors mis en cache.
+    """
+    key = base_context_key()
+    data = cache.get(key)
+    if data is None:
+        data = {
+            "gallery_images": list(
+                GalleryImage.objects.filter(slide__isnull=True).order_by("order")[:6]
+            ),
+            "slides": list(Slide.objects.prefetch_related("images").order_by("order")),
+            "testimonials": list(
+                Testimonial.objects.filter(is_active=True, is_approved=True).order_by("order")[:3]
+            ),
+            "fallback_slides": _resolve_lazy(fallback_slides()),
+        }
+        cache.set(key, data, BASE_CONTEXT_TIMEOUT)
+    return data
+
+
+def invalidate_base_context(**kwargs):
+    """Supprime le contexte en cache pour toutes les langues (et les pages qui l'affichent)."""
+    cache.delete_many([base_context_key(language) for language, _name in settings.LANGUAGES])
+    bump_page_tag("base")
+
+
+# ----------------------------------------
+# Cache de pages complètes (visiteurs anonymes)
+# ----------------------------------------
+PAGE_CACHE_TIMEOUT = getattr(settings, "PAGE_CACHE_TIMEOUT", 10 * 60)
+PAGE_TAG_KEY = "core:page_tag:{tag}"
+PAGE_KEY = "core:page:{path}:{language}:{versions}"
+
+# Le jeton CSRF est propre à chaque visiteur : on le remplace par un
+# marqueur avant stockage, puis par un jeton frais à chaque service.
+CSRF_INPUT_RE = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+CSRF_PLACEHOLDER = b"__CSRF_TOKEN__"
+
+
+def bump_page_tag(*tags):
+    """Invalide toutes les pages dépendant de ces étiquettes (changement de version)."""
+    for tag in tags:
+        key = PAGE_TAG_KEY.format(tag=tag)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def _page_key(request, tags):
+    tag_keys = [PAGE_TAG_KEY.format(tag=tag) for tag in tags]
+    stored = cache.get_many(tag_keys)
+    versions = ".".join(str(stored.get(key, 0)) for key in tag_keys)
+    path = hashlib.md5(request.path.encode("utf-8")).hexdigest()
+    return PAGE_KEY.format(path=path, language=request.LANGUAGE_CODE, versions=versions)
+
+
+def _is_cacheable_request(request):
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        # Des messages en attente seraient affichés (puis consommés) par la vue
+        and "messages" not in request.COOKIES
+    )
+
+
+def _is_cacheable_response(request, response):
+    storage = getattr(request, "_messages", None)
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not response.has_header("Cache-Control")
+        and not (storage is not None and storage.added_new)
+    )
+
+
+def _serve(request, entry):
+    response = get_conditional_response(
+        request, etag=entry["etag"], last_modified=entry["last_modified"]
+    )
+    if response is None:
+        content = zlib.decompress(entry["content"])
+        if CSRF_PLACEHOLDER in content:
+            content = content.replace(CSRF_PLACEHOLDER, get_token(request).encode("ascii"))
+        response = HttpResponse(content, content_type=entry["content_type"])
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(entry["last_modified"])
+    patch_vary_headers(response, ("Accept-Language",))
+    return response
+
+
+def cache_anonymous_page(*tags):
+    """
+    Met en cache la réponse complète d'une vue pour les visiteurs anonymes,
+    par chemin et langue. Le contenu est compressé, servi avec ETag /
+    Last-Modified et répond 304 aux requêtes conditionnelles. Les étiquettes
+    (``tags``) permettent une invalidation ciblée via ``bump_page_tag``.
+    """
+    tags = tags or ("base",)
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_key(request, tags)
+            entry = cache.get(key)
+            if entry is not None:
+                return _serve(request, entry)
+
+            response = view_func(request, *args, **kwargs)
+            if hasattr(response, "render") and callable(response.render):
+                response = response.render()
+            if request.GET or not _is_cacheable_response(request, response):
+                return response
+
+            content = CSRF_INPUT_RE.sub(rb"\1" + CSRF_PLACEHOLDER + rb"\2", response.content)
+            entry = {
+                "content": zlib.compress(content),
+                "content_type": response["Content-Type"],
+                "etag": quote_etag(hashlib.md5(content).hexdigest()),
+                "last_modified": int(time.time()),
+            }
+            cache.set(key, entry, PAGE_CACHE_TIMEOUT)
+            response["ETag"] = entry["etag"]
+            response["Last-Modified"] = http_date(entry["last_modified"])
+            patch_vary_headers(response, ("Accept-Language",))
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,241 @@
+# core/campaigns.py
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.template import Context, Template
+from django.utils import timezone, translation
+from django.utils.html import strip_tags
+
+from .models import Campaign, CampaignDelivery, NewsletterSubscriber
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = getattr(settings, "CAMPAIGN_CHUNK_SIZE", 500)  # lignes lues par aller-retour base
+BATCH_SIZE = getattr(settings, "CAMPAIGN_BATCH_SIZE", 100)  # messages par lot et par connexion
+WORKERS = getattr(settings, "CAMPAIGN_WORKERS", 4)  # connexions SMTP simultanées
+
+
+@dataclass(frozen=True)
+class RenderedContent:
+    subject: str
+    text: str
+    html: str
+
+
+# ----------------------------------------
+# Rendu (une fois par langue)
+# ----------------------------------------
+def render_campaign(campaign):
+    """
+    Rend le sujet et le corps de la campagne une seule fois par langue
+    configurée. Les champs traduits (modeltranslation) suivent la langue
+    active et retombent sur la langue par défaut s'ils sont vides.
+    """
+    rendered = {}
+    for language, _name in settings.LANGUAGES:
+        with translation.override(language):
+            subject = " ".join(str(campaign.subject).split())  # pas de saut de ligne dans un en-tête
+            html = Template(campaign.body).render(
+                Context({"campaign": campaign, "language": language})
+            )
+        rendered[language] = RenderedContent(subject=subject, text=strip_tags(html), html=html)
+    return rendered
+
+
+# ----------------------------------------
+# Connexions SMTP réutilisées
+# ----------------------------------------
+class ConnectionPool:
+    """
+    Une connexion SMTP par thread, ouverte au premier envoi et conservée
+    pour toute la campagne. Une connexion en erreur est abandonnée et
+    rouverte au message suivant.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def get(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def discard(self):
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+def send_batch(pool, rendered, from_email, recipients):
+    """
+    Envoie un lot de destinataires (pk, email, langue) sur la connexion du
+    thread. Retourne [(pk, email, erreur ou None)]. Aucun accès base ici.
+    """
+    results = []
+    for pk, email, language in recipients:
+        content = rendered.get(language) or rendered[settings.LANGUAGE_CODE]
+        try:
+            connection = pool.get()
+            message = EmailMultiAlternatives(
+                subject=content.subject,
+                body=content.text,
+                from_email=from_email,
+                to=[email],
+                connection=connection,
+            )
+            message.attach_alternative(content.html, "text/html")
+            connection.send_messages([message])
+            results.append((pk, email, None))
+        except Exception as e:
+            pool.discard()
+            results.append((pk, email, str(e) or e.__class__.__name__))
+    return results
+
+
+# ----------------------------------------
+# Suivi par destinataire
+# ----------------------------------------
+def pending_recipients(campaign, window):
+    """
+    Retire de la fenêtre les abonnés déjà servis (reprise après arrêt).
+    Retourne (destinataires à envoyer, pks en échec lors d'un passage précédent).
+    """
+    statuses = dict(
+        CampaignDelivery.objects.filter(
+            campaign=campaign, subscriber_id__in=[pk for pk, _email, _language in window]
+        ).values_list("subscriber_id", "status")
+    )
+    pending = [row for row in window if statuses.get(row[0]) != CampaignDelivery.SENT]
+    previously_failed = {pk for pk, status in statuses.items() if status == CampaignDelivery.FAILED}
+    return pending, previously_failed
+
+
+def record_deliveries(campaign, results, previously_failed, elapsed):
+    """Enregistre l'état de chaque destinataire et met à jour les compteurs de la campagne."""
+    now = timezone.now()
+    CampaignDelivery.objects.bulk_create(
+        [
+            CampaignDelivery(
+                campaign=campaign,
+                subscriber_id=pk,
+                email=email,
+                status=CampaignDelivery.FAILED if error else CampaignDelivery.SENT,
+                error=error or "",
+                sent_at=None if error else now,
+            )
+            for pk, email, error in results
+        ],
+        update_conflicts=True,
+        unique_fields=["campaign", "subscriber"],
+        update_fields=["status", "error", "sent_at", "updated_at"],
+    )
+    sent = sum(1 for _pk, _email, error in results if error is None)
+    # Un échec déjà compté ne l'est pas deux fois ; un échec repris avec succès est décompté
+    failed_delta = sum(
+        (1 if error else -1) if pk in previously_failed else (1 if error else 0)
+        for pk, _email, error in results
+    )
+    Campaign.objects.filter(pk=campaign.pk).update(
+        sent_count=F("sent_count") + sent,
+        failed_count=F("failed_count") + failed_delta,
+        send_seconds=F("send_seconds") + elapsed,
+    )
+    return sent
+
+
+def _windows(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        window = list(islice(iterator, size))
+        if not window:
+            return
+        yield window
+
+
+# ----------------------------------------
+# Envoi d'une campagne
+# ----------------------------------------
+def send_campaign(campaign, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE, workers=WORKERS):
+    """
+    Envoie la campagne à tous les abonnés actifs. Les abonnés sont lus en
+    flux (``iterator``), envoyés par lots sur des connexions SMTP
+    réutilisées, et l'état de chaque destinataire est enregistré après
+    chaque fenêtre : relancer l'envoi reprend là où il s'était arrêté.
+    Retourne le nombre de messages envoyés lors de cet appel.
+    """
+    rendered = render_campaign(campaign)
+    from_email = settings.DEFAULT_FROM_EMAIL
+    Campaign.objects.filter(pk=campaign.pk).update(
+        status=Campaign.SENDING, started_at=Coalesce(F("started_at"), timezone.now()), finished_at=None
+    )
+
+    subscribers = (
+        NewsletterSubscriber.objects.filter(is_active=True)
+        .order_by("pk")
+        .values_list("pk", "email", "language")
+        .iterator(chunk_size=chunk_size)
+    )
+    workers = max(1, workers)
+    pool = ConnectionPool()
+    total_sent = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for window in _windows(subscribers, batch_size * workers):
+                pending, previously_failed = pending_recipients(campaign, window)
+                if not pending:
+                    continue
+                batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+                started = time.monotonic()
+                results = []
+                for batch_results in executor.map(partial(send_batch, pool, rendered, from_email), batches):
+                    results.extend(batch_results)
+                total_sent += record_deliveries(
+                    campaign, results, previously_failed, time.monotonic() - started
+                )
+    finally:
+        pool.close()
+
+    Campaign.objects.filter(pk=campaign.pk).update(status=Campaign.SENT, finished_at=timezone.now())
+    campaign.refresh_from_db()
+    logger.info(
+        "Campagne %s : %s envoyé(s), %s échec(s), %s msg/s",
+        campaign.pk, campaign.sent_count, campaign.failed_count, campaign.messages_per_second,
+    )
+    return total_sent
+
+
+def claim_queued_campaign():
+    """Réserve la plus ancienne campagne programmée (None si aucune)."""
+    for campaign in Campaign.objects.filter(status=Campaign.QUEUED).order_by("created_at"):
+        if Campaign.objects.filter(pk=campaign.pk, status=Campaign.QUEUED).update(status=Campaign.SENDING):
+            return campaign
+    return None
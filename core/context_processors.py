@@ -0,0 +1,11 @@
+from django.utils.functional import SimpleLazyObject
+
+from .stat_values import stat_values
+
+
+def stats(request):
+    """
+    ``{{ stats.students.value }}`` dans n'importe quel gabarit ; le
+    registre n'est consulté que si le gabarit s'en sert.
+    """
+    return {"stats": SimpleLazyObject(stat_values)}
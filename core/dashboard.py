@@ -0,0 +1,139 @@
+# core/dashboard.py
+from collections import Counter
+from dataclasses import dataclass, fields
+
+from django.db.models import Count, Q
+
+from accounts.models import User
+
+# -----------------------------
+# Catégories suivies par le tableau de bord
+# -----------------------------
+TEACHER_DIPLOMAS = {
+    "PhD": "PHD",
+    "Masters": "Master",
+    "BSc": "BSc",
+}
+
+STUDENT_LEVELS = ("Primary", "Secondary", "High")
+
+
+@dataclass(frozen=True)
+class DashboardStats:
+    """Instantané des compteurs affichés sur le tableau de bord admin."""
+
+    student_count: int = 0
+    lecturer_count: int = 0
+    superuser_count: int = 0
+    males_count: int = 0
+    females_count: int = 0
+    phd_count: int = 0
+    masters_count: int = 0
+    bsc_count: int = 0
+    primary_count: int = 0
+    secondary_count: int = 0
+    high_count: int = 0
+
+    @property
+    def teacher_qualifications(self):
+        return {
+            "PhD": self.phd_count,
+            "Masters": self.masters_count,
+            "BSc": self.bsc_count,
+        }
+
+    @property
+    def student_levels(self):
+        return {
+            "Primary": self.primary_count,
+            "Secondary": self.secondary_count,
+            "High": self.high_count,
+        }
+
+
+def get_dashboard_stats():
+    """
+    Calcule tous les compteurs du tableau de bord en une seule requête
+    (agrégation conditionnelle sur User avec jointures Student / Teacher).
+    """
+    # Student et Teacher sont en OneToOne avec User : les LEFT JOIN
+    # ne dupliquent aucune ligne, les COUNT restent exacts.
+    aggregates = {
+        "student_count": Count("pk", filter=Q(is_student=True)),
+        "lecturer_count": Count("pk", filter=Q(is_lecturer=True)),
+        "superuser_count": Count("pk", filter=Q(is_superuser=True)),
+        "males_count": Count("student", filter=Q(gender="M")),
+        "females_count": Count("student", filter=Q(gender="F")),
+    }
+    for label, needle in TEACHER_DIPLOMAS.items():
+        aggregates[f"{label.lower()}_count"] = Count(
+            "teacher", filter=Q(teacher__diploma__icontains=needle)
+        )
+    for level in STUDENT_LEVELS:
+        aggregates[f"{level.lower()}_count"] = Count(
+            "student", filter=Q(student__level=level)
+        )
+
+    return DashboardStats(**User.objects.aggregate(**aggregates))
+
+
+def get_rating_counts():
+    """Histogramme des notes des témoignages publiés, en une requête groupée."""
+    from .testimonial_stats import rating_histogram
+
+    return {f"rating_{rating}_count": count for rating, count in rating_histogram().items()}
+
+
+def load_dashboard_stats():
+    """Lit les compteurs pré-calculés (une seule ligne, par clé primaire)."""
+    from .models import DashboardSnapshot
+
+    snapshot = DashboardSnapshot.load()
+    return DashboardStats(
+        **{field.name: getattr(snapshot, field.name) for field in fields(DashboardStats)}
+    )
+
+
+# -----------------------------
+# Contributions incrémentales (utilisées par accounts.signals)
+# -----------------------------
+GENDER_FIELDS = {"M": "males_count", "F": "females_count"}
+
+
+def user_contribution(is_student, is_lecturer, is_superuser):
+    """Compteurs portés par les drapeaux du User lui-même."""
+    return Counter({
+        "student_count": int(bool(is_student)),
+        "lecturer_count": int(bool(is_lecturer)),
+        "superuser_count": int(bool(is_superuser)),
+    })
+
+
+def student_contribution(level, gender):
+    counter = Counter()
+    if level in STUDENT_LEVELS:
+        counter[f"{level.lower()}_count"] += 1
+    if gender in GENDER_FIELDS:
+        counter[GENDER_FIELDS[gender]] += 1
+    return counter
+
+
+def teacher_contribution(diploma):
+    counter = Counter()
+    diploma = (diploma or "").lower()
+    for label, needle in TEACHER_DIPLOMAS.items():
+        if needle.lower() in diploma:
+            counter[f"{label.lower()}_count"] += 1
+    return counter
+
+
+def testimonial_contribution(rating, is_active, is_approved):
+    counter = Counter()
+    if is_active and is_approved and rating in range(1, 6):
+        counter[f"rating_{rating}_count"] += 1
+    return counter
+
+
+def diff(new, old):
+    """Delta entre deux contributions (les valeurs négatives sont conservées)."""
+    return {key: new.get(key, 0) - old.get(key, 0) for key in set(new) | set(old)}
@@ -0,0 +1,233 @@
+# core/deletions.py
+"""
+Suppressions en masse depuis l'admin (BulkDeletion).
+
+``queryset.delete()`` sur des milliers d'utilisateurs charge toutes les
+cascades en mémoire et déclenche, pour chaque objet, les receveurs
+post_delete (tableau de bord, index de recherche, cache des fiches) : la
+requête d'admin expire. Ici :
+
+- la sélection est découpée en paquets de CHUNK_SIZE objets, chacun
+  supprimé (avec ses cascades) dans sa propre transaction, l'avancement
+  étant enregistré avec le paquet : une tâche interrompue reprend où elle
+  s'était arrêtée ;
+- les receveurs coûteux sont différés (``signals_deferred``) et rattrapés
+  en bloc : index de recherche par paquet, tableau de bord une fois à la
+  fin ;
+- les fichiers (photos, variantes, fiches répétiteur) sont notés pendant
+  la suppression et effacés ensuite, hors transaction.
+
+Les petites sélections (INLINE_LIMIT) sont traitées immédiatement ; les
+autres par la commande process_bulk_deletions.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import islice
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import router, transaction
+from django.db.models import FileField, Q
+from django.db.models.deletion import Collector
+from django.utils import timezone
+
+from accounts.models import TeacherInfo
+from accounts.teacher_sheets import delete_sheets
+from accounts.thumbnails import manifest_files
+from search.index import remove_objects, spec_for_model
+
+from . import feeds
+from .models import BulkDeletion, DashboardSnapshot
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = getattr(settings, "BULK_DELETE_CHUNK_SIZE", 200)
+INLINE_LIMIT = getattr(settings, "BULK_DELETE_INLINE_LIMIT", 50)
+TIMEOUT = 30 * 60  # tâche « en cours » sans nouvelles depuis : reprise par un autre worker
+
+_state = threading.local()
+
+
+# ----------------------------------------
+# Receveurs différés
+# ----------------------------------------
+@contextmanager
+def deferred_signals():
+    """Les receveurs post_delete qui consultent ``signals_deferred()`` ne font rien dans ce bloc."""
+    previous = getattr(_state, "deferred", False)
+    _state.deferred = True
+    try:
+        yield
+    finally:
+        _state.deferred = previous
+
+
+def signals_deferred():
+    return getattr(_state, "deferred", False)
+
+
+# ----------------------------------------
+# Fichiers des objets supprimés
+# ----------------------------------------
+def _file_fields(model):
+    return [field for field in model._meta.concrete_fields if isinstance(field, FileField)]
+
+
+def _names(field, values):
+    # Le fichier par défaut (ex. default.png) est partagé : on ne le supprime jamais
+    return [value for value in values if value and value != field.default]
+
+
+def cleanup_targets(collector):
+    """Fichiers et caches à supprimer pour les objets réunis par ``collector``."""
+    files, sheets = [], []
+    for model, instances in collector.data.items():
+        instances = list(instances)
+        fields = _file_fields(model)
+        # Le Collector ne charge que les clés des modèles sans receveur : champs relus en une requête
+        deferred = instances[0].get_deferred_fields() if instances else set()
+        loaded = [field for field in fields if field.attname not in deferred]
+        lazy = [field for field in fields if field.attname in deferred]
+        for obj in instances:
+            for field in loaded:
+                files += _names(field, [getattr(obj, field.attname).name])
+            if "picture_derivatives" not in deferred:
+                files += manifest_files(getattr(obj, "picture_derivatives", None))
+        if lazy:
+            rows = model._base_manager.filter(pk__in=[obj.pk for obj in instances])
+            for values in rows.values_list(*(field.attname for field in lazy)):
+                for field, value in zip(lazy, values):
+                    files += _names(field, [value])
+        if issubclass(model, TeacherInfo):
+            sheets += [obj.pk for obj in instances]
+    # Suppressions directes (sans chargement des objets)
+    for queryset in collector.fast_deletes:
+        fields = _file_fields(queryset.model)
+        for values in queryset.values_list(*(field.attname for field in fields)) if fields else ():
+            for field, value in zip(fields, values):
+                files += _names(field, [value])
+    return files, sheets
+
+
+# ----------------------------------------
+# Exécution
+# ----------------------------------------
+def schedule(queryset, user=None):
+    """Enregistre la suppression de ``queryset`` ; les petites sélections sont traitées tout de suite."""
+    pks = list(queryset.order_by("pk").values_list("pk", flat=True))
+    job = BulkDeletion.objects.create(
+        model=queryset.model._meta.label_lower, object_ids=pks, total=len(pks),
+        requested_by=user if user and user.is_authenticated else None,
+    )
+    if len(pks) <= INLINE_LIMIT:
+        job.status, job.started_at = BulkDeletion.RUNNING, timezone.now()
+        BulkDeletion.objects.filter(pk=job.pk).update(status=job.status, started_at=job.started_at)
+        run(job)
+    return job
+
+
+def claim_jobs(limit):
+    """Réserve jusqu'à ``limit`` tâches (les tâches bloquées depuis TIMEOUT sont reprises là où elles en étaient)."""
+    now = timezone.now()
+    claimable = Q(status=BulkDeletion.PENDING) | Q(
+        status__in=[BulkDeletion.RUNNING, BulkDeletion.CLEANUP], started_at__lt=now - timedelta(seconds=TIMEOUT)
+    )
+    claimed = []
+    for job in BulkDeletion.objects.filter(claimable).order_by("created_at")[:limit]:
+        status = BulkDeletion.CLEANUP if job.status == BulkDeletion.CLEANUP else BulkDeletion.RUNNING
+        if BulkDeletion.objects.filter(claimable, pk=job.pk, started_at=job.started_at).update(
+            status=status, started_at=now
+        ):
+            job.status, job.started_at = status, now
+            claimed.append(job)
+    return claimed
+
+
+def _touch(job, **changes):
+    """Enregistre l'avancement ; ``started_at`` sert de battement de cœur pour la reprise."""
+    job.started_at = changes["started_at"] = timezone.now()
+    for field, value in changes.items():
+        setattr(job, field, value)
+    BulkDeletion.objects.filter(pk=job.pk).update(**changes)
+
+
+def delete_chunk(job, model, pks):
+    """Supprime un paquet et ses cascades dans une transaction ; retourne le nombre de lignes supprimées."""
+    using = router.db_for_write(model)
+    with transaction.atomic(using=using):
+        queryset = model._base_manager.filter(pk__in=pks)
+        collector = Collector(using=using, origin=queryset)
+        collector.collect(queryset)
+        files, sheets = cleanup_targets(collector)
+        # Index de recherche : une requête par type plutôt qu'une par objet (clés lues avant
+        # la suppression, qui les remet à None)
+        unindexed = [
+            (spec, [obj.pk for obj in instances])
+            for spec, instances in ((spec_for_model(model), instances) for model, instances in collector.data.items())
+            if spec is not None
+        ]
+        with deferred_signals():
+            deleted, _by_model = collector.delete()
+        for spec, spec_pks in unindexed:
+            remove_objects(spec, spec_pks)
+        cleanup = {
+            "files": job.cleanup.get("files", []) + files,
+            "teacher_sheets": job.cleanup.get("teacher_sheets", []) + sheets,
+        }
+        _touch(
+            job, processed=job.processed + len(pks), deleted_rows=job.deleted_rows + deleted, cleanup=cleanup,
+        )
+    return deleted
+
+
+def delete_files(job, batch_size=CHUNK_SIZE):
+    """Efface les fichiers notés (à partir de ``files_deleted`` : reprise possible)."""
+    files = job.cleanup.get("files", [])
+    remaining = iter(files[job.files_deleted:])
+    while batch := list(islice(remaining, batch_size)):
+        for name in batch:
+            try:
+                default_storage.delete(name)
+            except OSError as e:
+                logger.warning("Fichier %s non supprimé : %s", name, e)
+        _touch(job, files_deleted=job.files_deleted + len(batch))
+    for pk in job.cleanup.get("teacher_sheets", []):
+        delete_sheets(pk)
+
+
+def reconcile():
+    """Recalcule les compteurs et listes ignorés pendant la suppression (signaux différés)."""
+    DashboardSnapshot.rebuild()
+    feeds.invalidate_feeds()
+
+
+def run(job, chunk_size=CHUNK_SIZE):
+    """Exécute (ou reprend) une tâche réservée."""
+    try:
+        try:
+            if job.status == BulkDeletion.RUNNING:
+                model = apps.get_model(job.model)
+                remaining = iter(job.object_ids[job.processed:])
+                while chunk := list(islice(remaining, chunk_size)):
+                    delete_chunk(job, model, chunk)
+                _touch(job, status=BulkDeletion.CLEANUP)
+        finally:
+            # Une fois par passage, y compris après un échec : les paquets validés restent supprimés
+            if job.processed:
+                reconcile()
+        delete_files(job)
+        _touch(job, status=BulkDeletion.DONE, finished_at=timezone.now())
+    except Exception as e:
+        logger.exception("Suppression en masse %s échouée", job.pk)
+        _touch(job, status=BulkDeletion.FAILED, error=str(e) or e.__class__.__name__, finished_at=timezone.now())
+
+
+def process_bulk_deletions(limit=1, chunk_size=CHUNK_SIZE):
+    """Traite jusqu'à ``limit`` tâches ; retourne le nombre de tâches traitées."""
+    jobs = claim_jobs(limit)
+    for job in jobs:
+        run(job, chunk_size)
+    return len(jobs)
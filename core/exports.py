@@ -0,0 +1,403 @@
+# core/exports.py
+"""
+Documents générés par le secrétariat (calendrier académique, rapport).
+Chaque ``build_*`` écrit dans un fichier binaire ouvert : une réponse HTTP
+pour les vues, un fichier temporaire pour les tâches de rapport.
+"""
+import os
+from datetime import datetime
+from itertools import groupby, islice
+
+from django.utils.formats import date_format
+from django.utils.text import capfirst
+from django.utils.translation import gettext_lazy as _
+from docx import Document
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.shared import Inches, Pt
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import (
+    BaseDocTemplate, Flowable, Frame, PageBreak, PageTemplate, Paragraph, SimpleDocTemplate, Spacer, Table,
+    TableStyle,
+)
+
+from accounts.exports import FlowableStream
+
+from . import pdf_assets
+from .models import Absence, AcademicEvent, Reservation
+from .pdf_assets import LOGO, SIGNATURE, STAMP, AssetImage, draw_image, fit_text
+
+
+def calendar_events(start_year, end_year):
+    return AcademicEvent.objects.filter(date__year__gte=start_year, date__year__lte=end_year).order_by("date")
+
+
+# -------------------------------
+# En-tête et pied de page (canvas)
+# -------------------------------
+def header_footer(p, width, height, start_year, end_year):
+    """Header PDF avec étoiles, logo et titre"""
+    stars = "★ ★ ★ ★ ★"
+    spacing = 18
+
+    # République / Académie
+    for x_center, lang in [(width/4, "FR"), (3*width/4, "EN")]:
+        y = height - 50
+        p.setFont("Helvetica-Bold", 11)
+        text = "REPUBLIQUE DU CAMEROUN" if lang=="FR" else "REPUBLIC OF CAMEROON"
+        p.drawCentredString(x_center, y, text)
+        y -= spacing
+        p.setFont("Helvetica-Bold", 12)
+        p.drawCentredString(x_center, y, stars)
+        y -= spacing
+        p.setFont("Helvetica-Oblique", 10)
+        text = "Paix – Travail – Patrie" if lang=="FR" else "Peace – Work – Fatherland"
+        p.drawCentredString(x_center, y, text)
+        y -= spacing
+        p.setFont("Helvetica-Bold", 12)
+        p.drawCentredString(x_center, y, stars)
+
+    # Logo centré
+    draw_image(p, LOGO, width/2 - 50, height - 150, 100, 80)
+
+    # Titre
+    p.setFont("Helvetica-Bold", 16)
+    p.setFillColor(colors.HexColor("#0D47A1"))
+    p.drawCentredString(width/2, height - 180, "CALENDRIER DE L’ANNÉE SCOLAIRE ACADÉMIQUE")
+    p.setFont("Helvetica-Bold", 13)
+    p.drawCentredString(width/2, height - 200, f"{start_year} – {end_year}")
+    p.setFont("Helvetica-Bold", 12)
+    p.drawCentredString(width/2, height - 220, "DU GROUPE THE GENIUS ACADEMY")
+    p.setFillColor(colors.black)
+
+# -------------------------------
+# Signatures (canvas)
+# -------------------------------
+def footer_signature(p, width):
+    """Footer PDF avec signatures et cachet"""
+    y_footer = 70
+    date_str = datetime.now().strftime("%d/%m/%Y")
+    p.setFont("Helvetica", 10)
+    p.drawString(50, y_footer, "Visa du Responsable Académique")
+    p.drawString(width - 200, y_footer, f"Yaoundé, le {date_str}")
+    p.drawString(width - 200, y_footer - 15, "Directeur Général")
+
+    draw_image(p, SIGNATURE, width - 180, y_footer - 80, 120, 60)
+    draw_image(p, STAMP, width/2 - 50, y_footer - 60, 100, 100)
+
+# -------------------------------
+# Calendrier académique (PDF)
+# -------------------------------
+CALENDAR_COLUMNS = ("Dates", "Activités", "Responsable")
+CALENDAR_COL_WIDTHS = (100, 280, 120)
+CALENDAR_HEADER_HEIGHT = 240  # en-tête officiel de la première page (header_footer)
+# Événements lus par aller-retour base / lignes par tableau
+CALENDAR_FETCH_SIZE = 2000
+CALENDAR_ROWS_PER_TABLE = 40
+CALENDAR_FONT_SIZE = 9
+
+CALENDAR_TABLE_STYLE = TableStyle([
+    ('SPAN', (0,0), (-1,0)),
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#E3EAF6")),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.HexColor("#0D47A1")),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('BACKGROUND', (0,1), (-1,1), colors.HexColor("#0D47A1")),
+    ('TEXTCOLOR', (0,1), (-1,1), colors.white),
+    ('FONTNAME', (0,1), (-1,1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,1), 11),
+    ('FONTSIZE', (0,2), (-1,-1), CALENDAR_FONT_SIZE),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('INNERGRID', (0,0), (-1,-1), 0.5, colors.black),
+    ('BOX', (0,0), (-1,-1), 1, colors.black),
+])
+
+
+def watermark(p, width, height):
+    p.saveState()
+    p.setFont("Helvetica-Bold", 60)
+    p.setFillColorRGB(0.92, 0.92, 0.92)
+    p.translate(width/2, height/2)
+    p.rotate(45)
+    p.drawCentredString(0, 0, "THE GENIUS ACADEMY")
+    p.restoreState()
+
+
+class SignatureBlock(Flowable):
+    """Visa, signature et cachet (footer_signature) en fin de document."""
+
+    def __init__(self, page_width):
+        super().__init__()
+        self.page_width = page_width
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self.height = 130
+        return self.width, self.height
+
+    def draw(self):
+        # footer_signature dessine de y=-10 à y=110 en coordonnées de page
+        self.canv.translate(-(self.page_width - self.width) / 2, 15)
+        footer_signature(self.canv, self.page_width)
+
+
+class CalendarDocTemplate(BaseDocTemplate):
+    """
+    A4 portrait : en-tête officiel sur la première page, filigrane et
+    numéro de page sur toutes. Les tableaux du calendrier s'écoulent d'une
+    page à l'autre, mois et ligne d'en-tête répétés.
+    """
+
+    def __init__(self, filename, start_year, end_year, **kwargs):
+        margin = (A4[0] - sum(CALENDAR_COL_WIDTHS)) / 2
+        super().__init__(filename, pagesize=A4, leftMargin=margin, rightMargin=margin,
+                         topMargin=40, bottomMargin=40, title="Calendrier académique", **kwargs)
+        self.start_year = start_year
+        self.end_year = end_year
+        page_height = self.pagesize[1]
+        first = Frame(self.leftMargin, self.bottomMargin, self.width,
+                      page_height - CALENDAR_HEADER_HEIGHT - self.bottomMargin, id="first")
+        later = Frame(self.leftMargin, self.bottomMargin, self.width, self.height, id="later")
+        self.addPageTemplates([
+            PageTemplate(id="First", frames=[first], onPage=self._draw_first_page, autoNextPageTemplate="Later"),
+            PageTemplate(id="Later", frames=[later], onPage=self._draw_page),
+        ])
+
+    def _draw_first_page(self, canv, doc):
+        self._draw_page(canv, doc)
+        header_footer(canv, *self.pagesize, self.start_year, self.end_year)
+
+    def _draw_page(self, canv, doc):
+        width, height = self.pagesize
+        watermark(canv, width, height)
+        canv.saveState()
+        canv.setFont("Helvetica", 8)
+        canv.setFillColor(colors.grey)
+        canv.drawString(self.leftMargin, self.bottomMargin / 2,
+                        f"Calendrier académique {self.start_year} – {self.end_year}")
+        canv.drawRightString(self.leftMargin + self.width, self.bottomMargin / 2, f"Page {canv.getPageNumber()}")
+        canv.restoreState()
+
+
+def _month_label(date):
+    return capfirst(date_format(date, "F Y"))
+
+
+def _month_table(label, rows):
+    data = [[label, "", ""], list(CALENDAR_COLUMNS)]
+    data += [
+        [date.strftime("%d %b %Y"), *(fit_text(value, width, size=CALENDAR_FONT_SIZE) for value, width in zip(row, CALENDAR_COL_WIDTHS[1:]))]
+        for date, *row in rows
+    ]
+    return Table(data, colWidths=CALENDAR_COL_WIDTHS, repeatRows=2, style=CALENDAR_TABLE_STYLE)
+
+
+def _calendar_story(events, page_width, month_sections=False):
+    """
+    Un tableau par mois (découpé tous les CALENDAR_ROWS_PER_TABLE
+    événements), construit au fil de la lecture ; avec ``month_sections``,
+    chaque mois commence une nouvelle page.
+    """
+    first = True
+    for _month, month_events in groupby(events, key=lambda event: (event[0].year, event[0].month)):
+        if month_sections and not first:
+            yield PageBreak()
+        first = False
+        label = None
+        while chunk := list(islice(month_events, CALENDAR_ROWS_PER_TABLE)):
+            label = label or _month_label(chunk[0][0])
+            yield _month_table(label, chunk)
+    if first:
+        yield Paragraph(str(_("Aucun événement pour cette période.")), pdf_assets.styles()["Normal"])
+    yield Spacer(1, 24)
+    yield SignatureBlock(page_width)
+
+
+def build_calendar_pdf(output, start_year, end_year, month_sections=False):
+    """
+    Calendrier de ``start_year`` à ``end_year`` (inclus) sur autant de pages
+    que nécessaire. Les événements sont lus en flux : la mémoire ne dépend
+    pas de la taille de la période.
+    """
+    events = (
+        calendar_events(start_year, end_year)
+        .values_list("date", "activity", "responsible")
+        .iterator(chunk_size=CALENDAR_FETCH_SIZE)
+    )
+    doc = CalendarDocTemplate(output, start_year, end_year)
+    doc.build(FlowableStream(_calendar_story(events, doc.pagesize[0], month_sections)))
+
+
+# -------------------------------
+# Calendrier académique (DOCX)
+# -------------------------------
+def build_calendar_docx(output, start_year, end_year):
+    document = Document()
+
+    # Header République / Académie avec étoiles
+    stars = "★ ★ ★ ★ ★"
+    table_header = document.add_table(rows=2, cols=2)
+    table_header.autofit = True
+    table_header.cell(0,0).text = f"REPUBLIQUE DU CAMEROUN\n{stars}\nPaix – Travail – Patrie\n{stars}"
+    table_header.cell(0,1).text = f"REPUBLIC OF CAMEROON\n{stars}\nPeace – Work – Fatherland\n{stars}"
+    for cell in table_header.rows[0].cells:
+        for paragraph in cell.paragraphs:
+            paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+            run = paragraph.runs[0]
+            run.font.size = Pt(10)
+            run.font.bold = True
+
+    # Logo centré
+    logo_path = os.path.join(pdf_assets.IMAGE_DIR, LOGO)
+    if os.path.exists(logo_path):
+        document.add_picture(logo_path, width=Inches(1.5))
+        document.paragraphs[-1].alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+
+    # Titre
+    title = document.add_paragraph()
+    title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    run = title.add_run("CALENDRIER DE L’ANNÉE SCOLAIRE ACADÉMIQUE\n")
+    run.font.size = Pt(14)
+    run.font.bold = True
+    run.font.name = "Arial"
+
+    subtitle = document.add_paragraph()
+    subtitle.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    run = subtitle.add_run(f"{start_year} – {end_year}\n")
+    run.font.size = Pt(12)
+    run.font.bold = True
+
+    school = document.add_paragraph()
+    school.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    run = school.add_run("DU GROUPE THE GENIUS ACADEMY\n\n")
+    run.font.size = Pt(12)
+    run.font.bold = True
+
+    # Tableau des événements
+    table = document.add_table(rows=1, cols=3)
+    hdr_cells = table.rows[0].cells
+    hdr_cells[0].text = "Dates"
+    hdr_cells[1].text = "Activités"
+    hdr_cells[2].text = "Responsable"
+    events = (
+        calendar_events(start_year, end_year)
+        .values_list("date", "activity", "responsible")
+        .iterator(chunk_size=CALENDAR_FETCH_SIZE)
+    )
+    for date, activity, responsible in events:
+        row_cells = table.add_row().cells
+        row_cells[0].text = date.strftime("%d/%m/%Y")
+        row_cells[1].text = activity
+        row_cells[2].text = responsible
+
+    # Footer
+    document.add_paragraph("\n\n")
+    footer = document.add_table(rows=1, cols=2)
+    footer.autofit = True
+    footer.cell(0, 0).text = "Visa du Responsable Académique"
+    footer.cell(0, 1).text = f"Yaoundé, le {datetime.now().strftime('%d/%m/%Y')}\nDirecteur Général"
+
+    # Signatures et cachet
+    sign_path = os.path.join(pdf_assets.IMAGE_DIR, SIGNATURE)
+    if os.path.exists(sign_path):
+        document.add_picture(sign_path, width=Inches(2))
+    cachet_path = os.path.join(pdf_assets.IMAGE_DIR, STAMP)
+    if os.path.exists(cachet_path):
+        document.add_picture(cachet_path, width=Inches(1.5))
+
+    document.save(output)
+
+
+# -------------------------------
+# Rapport du secrétariat
+# -------------------------------
+def build_table(title, columns, rows):
+    styles = pdf_assets.styles()
+    elements = []
+
+    # Titre de section
+    elements.append(Paragraph(f"<b>{title}</b>", styles["Heading3"]))
+    elements.append(Spacer(1, 6))
+
+    if not rows:
+        elements.append(Paragraph(_("<i>No data available</i>"), styles["Normal"]))
+        elements.append(Spacer(1, 12))
+        return elements
+
+    data = [columns] + rows
+    table = Table(data, colWidths=[120, 200, 120])
+
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0D47A1")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 11),
+        ("FONTSIZE", (0, 1), (-1, -1), 9),
+        ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.black),
+        ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
+    ]))
+
+    elements.append(table)
+    elements.append(Spacer(1, 18))
+    return elements
+
+
+def build_secretary_report_pdf(output, report_ids):
+    """``report_ids`` : {"events": [...], "absences": [...], "reservations": [...]}."""
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=A4,
+        rightMargin=30, leftMargin=30,
+        topMargin=40, bottomMargin=30
+    )
+
+    styles = pdf_assets.styles()
+
+    elements = []
+
+    # En-tête officiel
+    elements.append(Paragraph("<b>REPUBLIQUE DU CAMEROUN</b>", styles["Centered"]))
+    elements.append(Paragraph(_("Peace – Work – Fatherland"), styles["Centered"]))
+    elements.append(Spacer(1, 6))
+    elements.append(Paragraph("<b>REPUBLIC OF CAMEROON</b>", styles["Centered"]))
+    elements.append(Paragraph(_("Paix – Travail – Patrie"), styles["Centered"]))
+    elements.append(Spacer(1, 12))
+
+    # Logo
+    if pdf_assets.image(LOGO):
+        elements.append(AssetImage(LOGO, 80, 60))
+        elements.append(Spacer(1, 12))
+
+    # Titre rapport
+    elements.append(Paragraph("<b><font size=14 color='#0D47A1'>"
+                              f"{_('SECRETARY MANAGEMENT REPORT')}"
+                              "</font></b>", styles["Centered"]))
+    elements.append(Spacer(1, 24))
+
+    # Récupération des données
+    events = AcademicEvent.objects.filter(id__in=report_ids.get("events", []))
+    absences = Absence.objects.filter(id__in=report_ids.get("absences", [])).select_related("teacher")
+    reservations = Reservation.objects.filter(id__in=report_ids.get("reservations", []))
+
+    # Tables
+    rows = [[e.date.strftime("%d/%m/%Y"), e.activity, e.responsible] for e in events]
+    elements += build_table(_("Academic Events"), [_("Date"), _("Activity"), _("Responsible")], rows)
+
+    rows = [[a.teacher.get_full_name(), a.date.strftime("%d/%m/%Y"), a.reason or ""] for a in absences]
+    elements += build_table(_("Teacher Absences"), [_("Teacher"), _("Date"), _("Reason")], rows)
+
+    rows = [[r.course_name, r.student_name, r.date.strftime("%d/%m/%Y")] for r in reservations]
+    elements += build_table(_("Course Reservations"), [_("Course"), _("Student"), _("Date")], rows)
+
+    # Signature et footer
+    date_str = datetime.now().strftime("%d/%m/%Y")
+    elements.append(Spacer(1, 24))
+    elements.append(Paragraph(_("Secretary's approval"), styles["Normal"]))
+    elements.append(Paragraph(f"Yaoundé, le {date_str}", styles["Normal"]))
+
+    # Signature + cachet
+    for name, width, height in ((SIGNATURE, 120, 60), (STAMP, 100, 100)):
+        if pdf_assets.image(name):
+            elements.append(AssetImage(name, width, height))
+
+    doc.build(elements)
@@ -0,0 +1,68 @@
+# core/feeds.py
+"""
+Listes « dernières N » affichées par l'accueil et le tableau de bord
+(actualités, activité récente, dernier taux de réussite), gardées en
+cache et invalidées par les signaux (core.signals) : une page servie à
+cache chaud ne fait aucune requête pour ces listes.
+
+Les actualités ont des champs traduits (modeltranslation) : elles sont
+mises en cache par langue, comme le contexte commun (core.caching).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+from . import activity
+from .models import NewsAndEvents, SuccessRate
+
+FEED_TIMEOUT = getattr(settings, "FEED_CACHE_TIMEOUT", 60 * 60)
+FEED_KEY = "core:feed:{name}:{language}"
+
+
+def latest_news():
+    return list(NewsAndEvents.objects.order_by("-updated_date")[:5])
+
+
+def latest_activity():
+    return list(activity.recent_activity(10))
+
+
+# Nom -> (construction, traduit)
+FEEDS = {
+    "news": (latest_news, True),
+    "activity": (latest_activity, False),
+    "success_rate": (SuccessRate.get_latest, False),
+}
+
+
+def feed_key(name, language=None):
+    if not FEEDS[name][1]:
+        language = "all"
+    return FEED_KEY.format(name=name, language=language or get_language() or settings.LANGUAGE_CODE)
+
+
+def get_feeds(*names):
+    """Listes demandées (toutes par défaut), lues en un seul accès au cache ; les absentes sont reconstruites."""
+    names = names or tuple(FEEDS)
+    if "activity" in names:
+        activity.buffer.flush()  # entrées en attente : écrites (et le fil invalidé) avant lecture
+    keys = {name: feed_key(name) for name in names}
+    stored = cache.get_many(keys.values())
+    feeds, missing = {}, {}
+    for name, key in keys.items():
+        if key in stored:
+            # Valeur enveloppée : un dernier taux absent (None) est aussi mis en cache
+            feeds[name] = stored[key]["value"]
+        else:
+            feeds[name] = FEEDS[name][0]()
+            missing[key] = {"value": feeds[name]}
+    if missing:
+        cache.set_many(missing, FEED_TIMEOUT)
+    return feeds
+
+
+def invalidate_feeds(*names):
+    """Supprime les listes (toutes par défaut) pour toutes les langues."""
+    cache.delete_many([
+        feed_key(name, language) for name in names or FEEDS for language, _name in settings.LANGUAGES
+    ])
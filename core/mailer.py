@@ -0,0 +1,160 @@
+# core/mailer.py
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import BadHeaderError, EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5)
+RETRY_DELAY = getattr(settings, "EMAIL_OUTBOX_RETRY_DELAY", 60)  # secondes, doublé à chaque échec
+LOCK_TIMEOUT = getattr(settings, "EMAIL_OUTBOX_LOCK_TIMEOUT", 15 * 60)
+
+
+# ----------------------------------------
+# Mise en file (appelée depuis les vues)
+# ----------------------------------------
+def enqueue_mail(subject, message, recipient_list, from_email=None, html_message=None):
+    """
+    Équivalent non bloquant de ``send_mail`` : l'email est enregistré dans
+    la file et sera envoyé par la commande ``process_outbox``.
+    """
+    if "\n" in subject or "\r" in subject:
+        raise BadHeaderError("Header values can't contain newlines (got %r)" % subject)
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=message,
+        html_body=html_message or "",
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(recipient_list),
+    )
+
+
+def enqueue_mass_mail(datatuple, from_email=None, batch_size=500):
+    """
+    Met en file plusieurs emails en une insertion groupée.
+    ``datatuple`` : itérable de (sujet, message, message_html, destinataires).
+    """
+    emails = []
+    for subject, message, html_message, recipient_list in datatuple:
+        if "\n" in subject or "\r" in subject:
+            raise BadHeaderError("Header values can't contain newlines (got %r)" % subject)
+        emails.append(OutboundEmail(
+            subject=subject,
+            body=message,
+            html_body=html_message or "",
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            to=list(recipient_list),
+        ))
+    return OutboundEmail.objects.bulk_create(emails, batch_size=batch_size)
+
+
+# ----------------------------------------
+# Traitement de la file (worker)
+# ----------------------------------------
+def retry_delay(attempts):
+    """Délai exponentiel avant la prochaine tentative."""
+    return timedelta(seconds=RETRY_DELAY * 2 ** max(attempts - 1, 0))
+
+
+def claim_batch(batch_size):
+    """Réserve un lot d'emails dus (les verrous expirés sont repris)."""
+    now = timezone.now()
+    due = Q(status=OutboundEmail.PENDING, next_attempt_at__lte=now) | Q(
+        status=OutboundEmail.SENDING, locked_at__lt=now - timedelta(seconds=LOCK_TIMEOUT)
+    )
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        OutboundEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            status=OutboundEmail.SENDING, locked_at=now, attempts=F("attempts") + 1
+        )
+    for email in batch:
+        email.attempts += 1
+    return batch
+
+
+def build_message(email, connection=None):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or None,
+        to=email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def send_chunk(emails):
+    """
+    Envoie un lot sur une seule connexion SMTP réutilisée.
+    Retourne {pk: erreur ou None}. Aucun accès base de données ici.
+    """
+    results = {}
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        return {email.pk: str(e) or e.__class__.__name__ for email in emails}
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([build_message(email, connection)])
+                results[email.pk] = None
+            except Exception as e:
+                results[email.pk] = str(e) or e.__class__.__name__
+    finally:
+        connection.close()
+    return results
+
+
+def record_results(emails, results):
+    now = timezone.now()
+    sent = [pk for pk, error in results.items() if error is None]
+    OutboundEmail.objects.filter(pk__in=sent).update(
+        status=OutboundEmail.SENT, sent_at=now, locked_at=None, last_error=""
+    )
+    for email in emails:
+        error = results.get(email.pk)
+        if email.pk in sent:
+            continue
+        if email.attempts >= MAX_ATTEMPTS:
+            status, next_attempt_at = OutboundEmail.DEAD, email.next_attempt_at
+            logger.error("Email %s abandonné après %s tentatives: %s", email.pk, email.attempts, error)
+        else:
+            status, next_attempt_at = OutboundEmail.PENDING, now + retry_delay(email.attempts)
+        OutboundEmail.objects.filter(pk=email.pk).update(
+            status=status, next_attempt_at=next_attempt_at, locked_at=None, last_error=error or ""
+        )
+    return len(sent)
+
+
+def process_outbox(batch_size=100, workers=4, chunk_size=25):
+    """
+    Traite un lot de la file : au plus ``workers`` connexions SMTP en
+    parallèle, chacune envoyant ``chunk_size`` messages. Retourne
+    (nombre envoyé, nombre traité).
+    """
+    emails = claim_batch(batch_size)
+    if not emails:
+        return 0, 0
+
+    chunks = [emails[i:i + chunk_size] for i in range(0, len(emails), chunk_size)]
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as executor:
+        for chunk_results in executor.map(send_chunk, chunks):
+            results.update(chunk_results)
+
+    return record_results(emails, results), len(emails)
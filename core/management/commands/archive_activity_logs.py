@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.activity import RETENTION_DAYS, SOURCES, archive, buffer, rollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Met à jour les compteurs journaliers des journaux d'activité puis archive (JSONL compressé) "
+        "et supprime les entrées plus anciennes que la période de rétention. À lancer une fois par jour."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retention-days", type=int, default=RETENTION_DAYS, help="Jours conservés en base")
+        parser.add_argument("--source", choices=sorted(SOURCES), action="append", help="Journal à traiter (tous par défaut)")
+
+    def handle(self, *args, **options):
+        buffer.flush()
+        for source in options["source"] or SOURCES:
+            days = rollup(source)
+            archived = archive(source, options["retention_days"])
+            self.stdout.write(f"{source} : {days} jour(s) compté(s), {archived} entrée(s) archivée(s).")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.service_worker import OUTPUT_PATH, write_service_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère le service worker (préchargement des fichiers statiques hachés, nom de cache versionné). "
+        "À lancer après collectstatic, à chaque déploiement."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=OUTPUT_PATH, help="Fichier généré")
+
+    def handle(self, *args, **options):
+        try:
+            path = write_service_worker(options["output"])
+        except (FileNotFoundError, ValueError) as e:
+            raise CommandError(f"Fichier statique introuvable ({e}) : lancez d'abord collectstatic.")
+        self.stdout.write(self.style.SUCCESS(f"Service worker écrit dans {path}."))
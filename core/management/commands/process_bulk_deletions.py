@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.deletions import CHUNK_SIZE, process_bulk_deletions
+
+
+class Command(BaseCommand):
+    help = "Exécute les suppressions en masse demandées depuis l'admin (BulkDeletion), par paquets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Objets supprimés par transaction")
+        parser.add_argument("--loop", action="store_true", help="Tourne en continu")
+        parser.add_argument("--interval", type=float, default=5.0, help="Pause (s) quand la file est vide")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_bulk_deletions(chunk_size=options["chunk_size"])
+            if processed:
+                self.stdout.write(f"{processed} suppression(s) en masse traitée(s).")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
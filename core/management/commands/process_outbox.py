@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.mailer import process_outbox
+
+
+class Command(BaseCommand):
+    help = "Envoie les emails en attente dans la file (OutboundEmail)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--workers", type=int, default=4, help="Connexions SMTP simultanées")
+        parser.add_argument("--chunk-size", type=int, default=25, help="Messages par connexion")
+        parser.add_argument("--loop", action="store_true", help="Tourne en continu")
+        parser.add_argument("--interval", type=float, default=5.0, help="Pause (s) quand la file est vide")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, processed = process_outbox(
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                chunk_size=options["chunk_size"],
+            )
+            if processed:
+                self.stdout.write(f"{sent}/{processed} email(s) envoyé(s).")
+            if not options["loop"]:
+                break
+            if processed < options["batch_size"]:
+                time.sleep(options["interval"])
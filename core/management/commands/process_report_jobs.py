@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.reports import WORKERS, process_report_jobs, purge_expired_reports, report_executor
+
+
+class Command(BaseCommand):
+    help = "Génère les rapports demandés (ReportJob) et supprime les fichiers expirés."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10)
+        parser.add_argument(
+            "--workers", type=int, default=WORKERS, help="Processus de rendu (0 : dans le processus courant)"
+        )
+        parser.add_argument("--purge", action="store_true", help="Supprime seulement les rapports expirés")
+        parser.add_argument("--loop", action="store_true", help="Tourne en continu")
+        parser.add_argument("--interval", type=float, default=2.0, help="Pause (s) quand la file est vide")
+
+    def handle(self, *args, **options):
+        purged = purge_expired_reports()
+        if purged:
+            self.stdout.write(f"{purged} rapport(s) expiré(s) supprimé(s).")
+        if options["purge"]:
+            return
+
+        executor = report_executor(options["workers"]) if options["workers"] > 0 else None
+        try:
+            while True:
+                done, processed = process_report_jobs(batch_size=options["batch_size"], executor=executor)
+                if processed:
+                    self.stdout.write(f"{done}/{processed} rapport(s) généré(s).")
+                if not options["loop"]:
+                    break
+                if processed < options["batch_size"]:
+                    purge_expired_reports()
+                    time.sleep(options["interval"])
+        finally:
+            if executor is not None:
+                executor.shutdown()
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.models import DashboardSnapshot
+
+
+class Command(BaseCommand):
+    help = "Recalcule entièrement les compteurs pré-calculés du tableau de bord."
+
+    def handle(self, *args, **options):
+        snapshot = DashboardSnapshot.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Tableau de bord reconstruit : {snapshot.student_count} élève(s), "
+                f"{snapshot.lecturer_count} enseignant(s), {snapshot.superuser_count} administrateur(s)."
+            )
+        )
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.campaigns import BATCH_SIZE, CHUNK_SIZE, WORKERS, claim_queued_campaign, send_campaign
+from core.models import Campaign
+
+
+class Command(BaseCommand):
+    help = (
+        "Envoie les campagnes newsletter programmées. Avec des identifiants, "
+        "envoie (ou reprend après interruption) les campagnes indiquées."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("campaign_ids", nargs="*", type=int)
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Abonnés lus par requête")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Messages par lot")
+        parser.add_argument("--workers", type=int, default=WORKERS, help="Connexions SMTP simultanées")
+
+    def handle(self, *args, **options):
+        if options["campaign_ids"]:
+            campaigns = list(Campaign.objects.filter(pk__in=options["campaign_ids"]))
+            missing = set(options["campaign_ids"]) - {campaign.pk for campaign in campaigns}
+            if missing:
+                raise CommandError(f"Campagne(s) introuvable(s) : {', '.join(map(str, sorted(missing)))}")
+        else:
+            campaigns = iter(claim_queued_campaign, None)
+
+        for campaign in campaigns:
+            self.stdout.write(f"Envoi de la campagne « {campaign} »…")
+            sent = send_campaign(
+                campaign,
+                chunk_size=options["chunk_size"],
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"{sent} message(s) envoyé(s) ({campaign.sent_count} au total, "
+                f"{campaign.failed_count} échec(s), {campaign.messages_per_second} msg/s)."
+            ))
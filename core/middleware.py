@@ -0,0 +1,28 @@
+from django.utils.cache import patch_cache_control
+
+from .service_worker import AUTH_HEADER
+
+
+class AuthStateHeaderMiddleware:
+    """
+    Indique au service worker si une page HTML a été produite pour un
+    utilisateur connecté (« 1 ») ou un visiteur anonyme (« 0 ») : seules
+    les secondes sont mises en cache côté navigateur, et seulement si elles
+    ne portent pas de jeton CSRF (sinon ``Cache-Control: private,
+    no-store``) : une page de connexion resservie après rotation du jeton
+    ferait échouer le formulaire (403).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        user = getattr(request, "user", None)
+        if user is not None and response.get("Content-Type", "").startswith("text/html"):
+            response[AUTH_HEADER] = "1" if user.is_authenticated else "0"
+            # Positionné par get_token() / rotate_token() (CSRF_COOKIE_USED avant Django 4.1) ;
+            # encore visible ici, CsrfViewMiddleware étant plus haut dans MIDDLEWARE
+            if request.META.get("CSRF_COOKIE_NEEDS_UPDATE"):
+                patch_cache_control(response, private=True, no_store=True)
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('lecturer_count', models.PositiveIntegerField(default=0)),
+                ('superuser_count', models.PositiveIntegerField(default=0)),
+                ('males_count', models.PositiveIntegerField(default=0)),
+                ('females_count', models.PositiveIntegerField(default=0)),
+                ('phd_count', models.PositiveIntegerField(default=0)),
+                ('masters_count', models.PositiveIntegerField(default=0)),
+                ('bsc_count', models.PositiveIntegerField(default=0)),
+                ('primary_count', models.PositiveIntegerField(default=0)),
+                ('secondary_count', models.PositiveIntegerField(default=0)),
+                ('high_count', models.PositiveIntegerField(default=0)),
+                ('rating_1_count', models.PositiveIntegerField(default=0)),
+                ('rating_2_count', models.PositiveIntegerField(default=0)),
+                ('rating_3_count', models.PositiveIntegerField(default=0)),
+                ('rating_4_count', models.PositiveIntegerField(default=0)),
+                ('rating_5_count', models.PositiveIntegerField(default=0)),
+                ('rebuilt_at', models.DateTimeField(blank=True, null=True, verbose_name='Dernière reconstruction')),
+            ],
+            options={
+                'verbose_name': 'Instantané du tableau de bord',
+                'verbose_name_plural': 'Instantanés du tableau de bord',
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Campaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='Titre interne')),
+                ('subject', models.CharField(max_length=255, verbose_name='Sujet')),
+                ('subject_fr', models.CharField(max_length=255, null=True, verbose_name='Sujet')),
+                ('subject_en', models.CharField(max_length=255, null=True, verbose_name='Sujet')),
+                ('body', models.TextField(help_text='Template Django ; variables disponibles : campaign, language.', verbose_name='Contenu (HTML)')),
+                ('body_fr', models.TextField(help_text='Template Django ; variables disponibles : campaign, language.', null=True, verbose_name='Contenu (HTML)')),
+                ('body_en', models.TextField(help_text='Template Django ; variables disponibles : campaign, language.', null=True, verbose_name='Contenu (HTML)')),
+                ('status', models.CharField(choices=[('draft', 'Brouillon'), ('queued', 'Programmée'), ('sending', "En cours d'envoi"), ('sent', 'Envoyée')], default='draft', max_length=10, verbose_name='Statut')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name="Début d'envoi")),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name="Fin d'envoi")),
+                ('sent_count', models.PositiveIntegerField(default=0, verbose_name='Envoyés')),
+                ('failed_count', models.PositiveIntegerField(default=0, verbose_name='Échecs')),
+                ('send_seconds', models.FloatField(default=0, verbose_name="Durée d'envoi (s)")),
+            ],
+            options={
+                'verbose_name': 'Campagne newsletter',
+                'verbose_name_plural': 'Campagnes newsletter',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='newslettersubscriber',
+            name='language',
+            field=models.CharField(choices=[('fr', 'Français'), ('en', 'English')], default='fr', max_length=7, verbose_name='Langue'),
+        ),
+        migrations.CreateModel(
+            name='CampaignDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(max_length=254)),
+                ('status', models.CharField(choices=[('sent', 'Envoyé'), ('failed', 'Échec')], max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='core.campaign')),
+                ('subscriber', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='core.newslettersubscriber')),
+            ],
+            options={
+                'verbose_name': 'Envoi de campagne',
+                'verbose_name_plural': 'Envois de campagne',
+                'constraints': [models.UniqueConstraint(fields=('campaign', 'subscriber'), name='unique_campaign_delivery')],
+            },
+        ),
+    ]
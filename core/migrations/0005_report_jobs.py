@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:51
+
+import core.models
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_campaigns'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('kind', models.CharField(max_length=50, verbose_name='Type de rapport')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Paramètres')),
+                ('key', models.CharField(db_index=True, editable=False, max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('done', 'Terminé'), ('failed', 'Échec')], default='pending', max_length=10, verbose_name='Statut')),
+                ('request_count', models.PositiveIntegerField(default=1, verbose_name='Demandes')),
+                ('artifact', models.FileField(blank=True, upload_to=core.models.report_upload_to, verbose_name='Fichier')),
+                ('error', models.TextField(blank=True, verbose_name='Erreur')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Demandé le')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Début')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('expires_at', models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Expire le')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Demandé par')),
+            ],
+            options={
+                'verbose_name': 'Tâche de rapport',
+                'verbose_name_plural': 'Tâches de rapport',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='core_report_status_f898a4_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('key',), name='unique_inflight_report_job')],
+            },
+        ),
+    ]
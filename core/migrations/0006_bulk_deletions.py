@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_report_jobs'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, verbose_name='Modèle')),
+                ('object_ids', models.JSONField(default=list, editable=False)),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'Suppression en cours'), ('cleanup', 'Nettoyage des fichiers'), ('done', 'Terminé'), ('failed', 'Échec')], default='pending', max_length=10, verbose_name='Statut')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Objets')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Objets traités')),
+                ('deleted_rows', models.PositiveIntegerField(default=0, verbose_name='Lignes supprimées')),
+                ('cleanup', models.JSONField(blank=True, default=dict, editable=False)),
+                ('files_deleted', models.PositiveIntegerField(default=0, verbose_name='Fichiers supprimés')),
+                ('error', models.TextField(blank=True, verbose_name='Erreur')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Demandé le')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Début')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Demandé par')),
+            ],
+            options={
+                'verbose_name': 'Suppression en masse',
+                'verbose_name_plural': 'Suppressions en masse',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='core_bulkde_status_656398_idx')],
+            },
+        ),
+    ]
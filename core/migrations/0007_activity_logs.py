@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_bulk_deletions'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='activitylog',
+            options={'ordering': ('-created_at',)},
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='ActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=30, verbose_name='Journal')),
+                ('day', models.DateField(verbose_name='Jour')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Entrées')),
+                ('archived', models.BooleanField(default=False, verbose_name='Archivé')),
+            ],
+            options={
+                'verbose_name': 'Activité journalière',
+                'verbose_name_plural': 'Activité journalière',
+                'ordering': ['-day', 'source'],
+                'constraints': [models.UniqueConstraint(fields=('source', 'day'), name='activity_rollup_source_day')],
+            },
+        ),
+    ]
@@ -1,11 +1,16 @@
 # models.py
+import os
+import uuid
+
+from django.conf import settings
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, Q
 from django.utils.translation import gettext_lazy as _
 from django.utils.encoding import force_str
 from django.core.validators import MinValueValidator, MaxValueValidator
 from accounts.models import User, Student, Parent
 from django.urls import reverse
+from django.utils import timezone
 
 
 NEWS = _("News")
@@ -72,7 +77,11 @@ class NewsAndEvents(models.Model):
 
 class ActivityLog(models.Model):
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now=True)
+    # Heure de l'événement (pas de la sauvegarde) : les entrées sont écrites par lots, voir core.activity
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ('-created_at',)
 
     def __str__(self):
         return f"[{self.created_at}]{self.message}"
@@ -104,6 +113,9 @@ class NewsletterSubscriber(models.Model):
     source = models.CharField(max_length=50, blank=True, null=True, verbose_name=_("Source"))
     subscribed_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Date d'inscription"))
     is_active = models.BooleanField(default=True, verbose_name=_("Actif"))
+    language = models.CharField(
+        max_length=7, choices=settings.LANGUAGES, default=settings.LANGUAGE_CODE, verbose_name=_("Langue")
+    )
 
     class Meta:
         verbose_name = _("Abonné à la newsletter")
@@ -438,3 +450,335 @@ class Reservation(models.Model):
 
     def __str__(self):
         return f"{self.course_name} - {self.student_name} - {self.date}"
+
+
+# -------------------------------
+# Journaux d'activité : compteurs journaliers
+# -------------------------------
+class ActivityRollup(models.Model):
+    """
+    Nombre d'entrées par jour et par journal ; conservé après l'archivage
+    des entrées elles-mêmes (voir core.activity).
+    """
+    source = models.CharField(max_length=30, verbose_name=_("Journal"))
+    day = models.DateField(verbose_name=_("Jour"))
+    count = models.PositiveIntegerField(default=0, verbose_name=_("Entrées"))
+    archived = models.BooleanField(default=False, verbose_name=_("Archivé"))
+
+    class Meta:
+        verbose_name = _("Activité journalière")
+        verbose_name_plural = _("Activité journalière")
+        ordering = ['-day', 'source']
+        constraints = [models.UniqueConstraint(fields=["source", "day"], name="activity_rollup_source_day")]
+
+    def __str__(self):
+        return f"{self.source} {self.day} : {self.count}"
+
+
+# -------------------------------
+# Tableau de bord : compteurs pré-calculés
+# -------------------------------
+class DashboardSnapshot(models.Model):
+    """
+    Ligne unique contenant les compteurs du tableau de bord, maintenue
+    par des mises à jour incrémentales (voir accounts.signals).
+    """
+    SINGLETON_PK = 1
+
+    student_count = models.PositiveIntegerField(default=0)
+    lecturer_count = models.PositiveIntegerField(default=0)
+    superuser_count = models.PositiveIntegerField(default=0)
+    males_count = models.PositiveIntegerField(default=0)
+    females_count = models.PositiveIntegerField(default=0)
+    phd_count = models.PositiveIntegerField(default=0)
+    masters_count = models.PositiveIntegerField(default=0)
+    bsc_count = models.PositiveIntegerField(default=0)
+    primary_count = models.PositiveIntegerField(default=0)
+    secondary_count = models.PositiveIntegerField(default=0)
+    high_count = models.PositiveIntegerField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    rebuilt_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Dernière reconstruction"))
+
+    class Meta:
+        verbose_name = _("Instantané du tableau de bord")
+        verbose_name_plural = _("Instantanés du tableau de bord")
+
+    def __str__(self):
+        return f"Snapshot ({self.rebuilt_at})"
+
+    @property
+    def rating_distribution(self):
+        return {n: getattr(self, f"rating_{n}_count") for n in range(5, 0, -1)}
+
+    @classmethod
+    def load(cls):
+        """Lecture par clé primaire ; reconstruit la ligne si elle n'existe pas."""
+        snapshot = cls.objects.filter(pk=cls.SINGLETON_PK).first()
+        return snapshot or cls.rebuild()
+
+    @classmethod
+    def rebuild(cls):
+        """Recalcule tous les compteurs depuis les tables sources."""
+        from dataclasses import asdict
+        from django.utils import timezone
+        from .dashboard import get_dashboard_stats, get_rating_counts
+
+        values = asdict(get_dashboard_stats())
+        values.update(get_rating_counts())
+        values["rebuilt_at"] = timezone.now()
+        snapshot, _created = cls.objects.update_or_create(pk=cls.SINGLETON_PK, defaults=values)
+        return snapshot
+
+    @classmethod
+    def refresh_ratings(cls):
+        """Recalcule uniquement l'histogramme des notes (après un update() en masse)."""
+        from .dashboard import get_rating_counts
+
+        if not cls.objects.filter(pk=cls.SINGLETON_PK).update(**get_rating_counts()):
+            cls.rebuild()
+
+    @classmethod
+    def apply_delta(cls, delta):
+        """Applique un delta {champ: +/-n} en un seul UPDATE atomique (F())."""
+        changes = {field: F(field) + amount for field, amount in delta.items() if amount}
+        if not changes:
+            return
+        if not cls.objects.filter(pk=cls.SINGLETON_PK).update(**changes):
+            cls.rebuild()
+
+
+# -------------------------------
+# File d'attente des emails sortants
+# -------------------------------
+class OutboundEmail(models.Model):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"
+
+    STATUS_CHOICES = (
+        (PENDING, _("En attente")),
+        (SENDING, _("En cours d'envoi")),
+        (SENT, _("Envoyé")),
+        (DEAD, _("Abandonné")),
+    )
+
+    subject = models.CharField(max_length=255, verbose_name=_("Sujet"))
+    body = models.TextField(verbose_name=_("Message"))
+    html_body = models.TextField(blank=True, verbose_name=_("Message HTML"))
+    from_email = models.CharField(max_length=254, blank=True, verbose_name=_("Expéditeur"))
+    to = models.JSONField(default=list, verbose_name=_("Destinataires"))
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name=_("Statut"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("Tentatives"))
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name=_("Prochaine tentative"))
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, verbose_name=_("Dernière erreur"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Date de création"))
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Date d'envoi"))
+
+    class Meta:
+        verbose_name = _("Email sortant")
+        verbose_name_plural = _("Emails sortants")
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)} ({self.get_status_display()})"
+
+
+# -------------------------------
+# Campagnes newsletter
+# -------------------------------
+class Campaign(models.Model):
+    DRAFT = "draft"
+    QUEUED = "queued"
+    SENDING = "sending"
+    SENT = "sent"
+
+    STATUS_CHOICES = (
+        (DRAFT, _("Brouillon")),
+        (QUEUED, _("Programmée")),
+        (SENDING, _("En cours d'envoi")),
+        (SENT, _("Envoyée")),
+    )
+
+    title = models.CharField(max_length=200, verbose_name=_("Titre interne"))
+    subject = models.CharField(max_length=255, verbose_name=_("Sujet"))
+    body = models.TextField(
+        verbose_name=_("Contenu (HTML)"),
+        help_text=_("Template Django ; variables disponibles : campaign, language."),
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=DRAFT, verbose_name=_("Statut"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Date de création"))
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Début d'envoi"))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Fin d'envoi"))
+    sent_count = models.PositiveIntegerField(default=0, verbose_name=_("Envoyés"))
+    failed_count = models.PositiveIntegerField(default=0, verbose_name=_("Échecs"))
+    send_seconds = models.FloatField(default=0, verbose_name=_("Durée d'envoi (s)"))
+
+    class Meta:
+        verbose_name = _("Campagne newsletter")
+        verbose_name_plural = _("Campagnes newsletter")
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return force_str(self.title)
+
+    @property
+    def messages_per_second(self):
+        """Débit mesuré (messages envoyés / temps passé à envoyer)."""
+        return round(self.sent_count / self.send_seconds, 1) if self.send_seconds else 0.0
+
+
+class CampaignDelivery(models.Model):
+    SENT = "sent"
+    FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (SENT, _("Envoyé")),
+        (FAILED, _("Échec")),
+    )
+
+    campaign = models.ForeignKey(Campaign, on_delete=models.CASCADE, related_name="deliveries")
+    subscriber = models.ForeignKey(NewsletterSubscriber, on_delete=models.CASCADE, related_name="deliveries")
+    email = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Envoi de campagne")
+        verbose_name_plural = _("Envois de campagne")
+        constraints = [
+            models.UniqueConstraint(fields=["campaign", "subscriber"], name="unique_campaign_delivery"),
+        ]
+
+    def __str__(self):
+        return f"{self.campaign} → {self.email} ({self.get_status_display()})"
+
+
+# -------------------------------
+# Rapports générés en arrière-plan
+# -------------------------------
+def report_upload_to(instance, filename):
+    return f"reports/{instance.token}/{filename}"
+
+
+class ReportJob(models.Model):
+    """
+    Export (PDF/DOCX) demandé depuis une vue et produit par la commande
+    process_report_jobs. Une seule tâche en cours par couple (type, paramètres) :
+    les demandes identiques rejoignent la tâche existante.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (PENDING, _("En attente")),
+        (RUNNING, _("En cours")),
+        (DONE, _("Terminé")),
+        (FAILED, _("Échec")),
+    )
+    IN_FLIGHT = (PENDING, RUNNING)
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    kind = models.CharField(max_length=50, verbose_name=_("Type de rapport"))
+    params = models.JSONField(default=dict, blank=True, verbose_name=_("Paramètres"))
+    key = models.CharField(max_length=64, db_index=True, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name=_("Statut"))
+    requested_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+", verbose_name=_("Demandé par")
+    )
+    request_count = models.PositiveIntegerField(default=1, verbose_name=_("Demandes"))
+    artifact = models.FileField(upload_to=report_upload_to, blank=True, verbose_name=_("Fichier"))
+    error = models.TextField(blank=True, verbose_name=_("Erreur"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Demandé le"))
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Début"))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Fin"))
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True, verbose_name=_("Expire le"))
+
+    class Meta:
+        verbose_name = _("Tâche de rapport")
+        verbose_name_plural = _("Tâches de rapport")
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key"], condition=Q(status__in=["pending", "running"]), name="unique_inflight_report_job"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} ({self.get_status_display()})"
+
+    @property
+    def is_expired(self):
+        return self.expires_at is not None and self.expires_at <= timezone.now()
+
+    @property
+    def artifact_filename(self):
+        return os.path.basename(self.artifact.name) if self.artifact else ""
+
+
+# ----------------------------------------
+# Suppressions en masse (voir core.deletions)
+# ----------------------------------------
+class BulkDeletion(models.Model):
+    """
+    Suppression demandée depuis l'admin et exécutée par lots par la
+    commande process_bulk_deletions : cascades par paquets de
+    BULK_DELETE_CHUNK_SIZE objets, puis suppression des fichiers.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    CLEANUP = "cleanup"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUS_CHOICES = (
+        (PENDING, _("En attente")),
+        (RUNNING, _("Suppression en cours")),
+        (CLEANUP, _("Nettoyage des fichiers")),
+        (DONE, _("Terminé")),
+        (FAILED, _("Échec")),
+    )
+
+    model = models.CharField(max_length=100, verbose_name=_("Modèle"))  # "app_label.model"
+    object_ids = models.JSONField(default=list, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name=_("Statut"))
+    requested_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+", verbose_name=_("Demandé par")
+    )
+    total = models.PositiveIntegerField(default=0, verbose_name=_("Objets"))
+    processed = models.PositiveIntegerField(default=0, verbose_name=_("Objets traités"))
+    deleted_rows = models.PositiveIntegerField(default=0, verbose_name=_("Lignes supprimées"))
+    # Fichiers et caches à supprimer après coup : {"files": [...], "teacher_sheets": [...]}
+    cleanup = models.JSONField(default=dict, blank=True, editable=False)
+    files_deleted = models.PositiveIntegerField(default=0, verbose_name=_("Fichiers supprimés"))
+    error = models.TextField(blank=True, verbose_name=_("Erreur"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Demandé le"))
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Début"))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_("Fin"))
+
+    class Meta:
+        verbose_name = _("Suppression en masse")
+        verbose_name_plural = _("Suppressions en masse")
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.model} × {self.total} ({self.get_status_display()})"
+
+    @property
+    def progress(self):
+        """Avancement en pourcentage des objets traités."""
+        return round(100 * self.processed / self.total) if self.total else 100
@@ -0,0 +1,130 @@
+# core/pagination.py
+"""
+Pagination par curseur (keyset / seek) pour les longues listes.
+
+Au lieu de LIMIT/OFFSET (la base relit toutes les lignes précédentes) et
+d'un COUNT(*) par page, chaque page part des clés de tri de la dernière
+ligne affichée : ``WHERE (date, id) < (d, i) ORDER BY date DESC, id DESC
+LIMIT n + 1``. Le coût d'une page ne dépend pas de sa position ni du
+nombre total de lignes ; la ligne supplémentaire indique s'il existe une
+page suivante.
+
+Les curseurs sont signés (paramètres GET ``after`` / ``before``) : un
+curseur invalide ou périmé ramène à la première page.
+"""
+from django.core import signing
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+
+CURSOR_SALT = "core.pagination"
+
+
+def _value(obj, path):
+    for attribute in path.split(LOOKUP_SEP):
+        obj = getattr(obj, attribute)
+    return obj
+
+
+class KeysetPage:
+    def __init__(self, object_list, has_next, has_previous, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __repr__(self):
+        return f"<KeysetPage {len(self)} objet(s)>"
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+class KeysetPaginator:
+    """
+    ``ordering`` : clés de tri, la dernière unique (ex. ("-date_joined",
+    "-pk")) ; un index sur ces colonnes rend chaque page indépendante de
+    la taille de la table.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+
+    def encode(self, obj):
+        return signing.dumps(
+            [str(_value(obj, key.lstrip("-"))) for key in self.ordering], salt=CURSOR_SALT, compress=True
+        )
+
+    def decode(self, cursor):
+        try:
+            values = signing.loads(cursor, salt=CURSOR_SALT)
+        except signing.BadSignature:
+            return None
+        return values if isinstance(values, list) and len(values) == len(self.ordering) else None
+
+    def seek(self, values, forward=True):
+        """Lignes strictement après (``forward``) ou avant la position ``values``, dans l'ordre de tri."""
+        condition, equal = Q(), {}
+        for key, value in zip(self.ordering, values):
+            field = key.lstrip("-")
+            descending = key.startswith("-") == forward
+            condition |= Q(**equal, **{f"{field}__{'lt' if descending else 'gt'}": value})
+            equal[field] = value
+        return self.queryset.filter(condition)
+
+    def page(self, after=None, before=None):
+        """Page suivant le curseur ``after``, précédant ``before``, ou première page."""
+        after = after and self.decode(after)
+        before = not after and before and self.decode(before)
+        if before:
+            reverse = tuple(key[1:] if key.startswith("-") else f"-{key}" for key in self.ordering)
+            rows = list(self.seek(before, forward=False).order_by(*reverse)[:self.per_page + 1])
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next = True
+        else:
+            queryset = self.seek(after) if after else self.queryset
+            rows = list(queryset.order_by(*self.ordering)[:self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_previous = bool(after)
+        return KeysetPage(
+            rows,
+            has_next=has_next and bool(rows),
+            has_previous=has_previous and bool(rows),
+            next_cursor=self.encode(rows[-1]) if rows else None,
+            previous_cursor=self.encode(rows[0]) if rows else None,
+        )
+
+
+class KeysetPaginationMixin:
+    """
+    Pour les ListView / FilterView : remplace la pagination par numéro de
+    page. Le contexte garde ``page_obj``, ``paginator`` et
+    ``is_paginated`` ; voir templates/snippets/keyset_pagination.html.
+    """
+
+    paginate_by = 25
+    keyset_ordering = ("-pk",)
+
+    def get_keyset_ordering(self):
+        return self.keyset_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, self.get_keyset_ordering(), page_size)
+        page = paginator.page(after=self.request.GET.get("after"), before=self.request.GET.get("before"))
+        return paginator, page, page.object_list, page.has_other_pages()
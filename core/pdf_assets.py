@@ -0,0 +1,186 @@
+# core/pdf_assets.py
+"""
+Ressources partagées des documents reportlab, chargées une fois par
+processus : images de l'établissement (logo, signature, cachet) décodées et
+déjà encodées en XObject PDF, polices et feuille de styles.
+
+Passer un chemin ou un ImageReader à ``canvas.drawImage`` réencode les
+pixels (zlib + ASCII85) à chaque document : c'est l'essentiel du temps de
+rendu d'une fiche. ``draw_image`` réutilise le flux encodé au chargement ;
+ce chemin rapide passe par l'API interne du Canvas et n'est activé que pour
+les versions de reportlab vérifiées (FAST_PATH_VERSIONS). Sinon, l'image
+est dessinée par ``canvas.drawImage`` avec l'ImageReader partagé (pixels
+décodés une fois, réencodés à chaque document).
+"""
+import copy
+import hashlib
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+import reportlab
+from django.conf import settings
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfdoc import PDFImageXObject, PDFObjectReference
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Flowable
+
+IMAGE_DIR = os.path.join(settings.BASE_DIR, "static", "img")
+LOGO = "logo2.jpg"
+SIGNATURE = "signature_admin.png"
+STAMP = "cachet.png"
+
+# Polices standard PDF : rien à embarquer, seules les métriques sont chargées
+BASE_FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique")
+
+# Versions de reportlab dont les attributs internes utilisés par _draw_encoded ont été vérifiés
+FAST_PATH_VERSIONS = ("4.0.",)
+FAST_PATH = reportlab.Version.startswith(FAST_PATH_VERSIONS)
+
+
+@dataclass(frozen=True)
+class PdfImage:
+    name: str
+    reader: ImageReader
+    xobject: PDFImageXObject  # flux encodé, copié dans chaque document
+
+    @property
+    def size(self):
+        return self.reader.getSize()
+
+
+# ----------------------------------------
+# Registre (un chargement par processus)
+# ----------------------------------------
+@lru_cache(maxsize=None)
+def image(name):
+    """Image de static/img décodée et encodée une seule fois ; None si le fichier manque."""
+    path = os.path.join(IMAGE_DIR, name)
+    if not os.path.exists(path):
+        return None
+    reader = ImageReader(path)
+    xobject_name = hashlib.md5(f"asset:{name}".encode()).hexdigest()
+    return PdfImage(name, reader, PDFImageXObject(xobject_name, reader, mask="auto"))
+
+
+@lru_cache(maxsize=None)
+def fonts():
+    """
+    Charge les métriques des polices standard et enregistre les TrueType
+    déclarées dans ``settings.PDF_FONTS`` ({nom: chemin .ttf}).
+    """
+    for name in BASE_FONTS:
+        pdfmetrics.getFont(name)
+    for name, path in getattr(settings, "PDF_FONTS", {}).items():
+        pdfmetrics.registerFont(TTFont(name, path))
+    return tuple(pdfmetrics.getRegisteredFontNames())
+
+
+@lru_cache(maxsize=None)
+def styles():
+    """Feuille de styles partagée (styles reportlab + styles maison) : à ne pas modifier."""
+    fonts()
+    sheet = getSampleStyleSheet()
+    sheet.add(ParagraphStyle(name="Centered", alignment=TA_CENTER, fontSize=12, spaceAfter=12))
+    sheet.add(ParagraphStyle(name="Small", alignment=TA_LEFT, fontSize=9, textColor=colors.grey))
+    return sheet
+
+
+def preload():
+    """Charge tout le registre (démarrage d'un processus de rendu)."""
+    for name in (LOGO, SIGNATURE, STAMP):
+        image(name)
+    styles()
+
+
+def clear():
+    for cached in (image, fonts, styles):
+        cached.cache_clear()
+
+
+# ----------------------------------------
+# Dessin
+# ----------------------------------------
+def draw_image(canv, name, x, y, width, height):
+    """
+    Équivalent de ``canv.drawImage(chemin, x, y, width, height, mask="auto")``,
+    sans réencodage si FAST_PATH. Retourne False (rien n'est dessiné) si
+    l'image manque.
+    """
+    asset = image(name)
+    if asset is None:
+        return False
+    if FAST_PATH:
+        _draw_encoded(canv, asset, x, y, width, height)
+    else:
+        canv.drawImage(asset.reader, x, y, width, height, mask="auto")
+    return True
+
+
+def _draw_encoded(canv, asset, x, y, width, height):
+    """Dessine le XObject déjà encodé de ``asset`` (API interne du Canvas reportlab 4.0)."""
+    doc = canv._doc
+    reg_name = doc.getXObjectName(asset.xobject.name)
+    if reg_name not in doc.idToObject:
+        # Même enregistrement que Canvas.drawImage, sur une copie : reportlab
+        # marque chaque objet avec son nom interne dans le document.
+        xobject = copy.copy(asset.xobject)
+        smask = vars(xobject).pop("_smask", None)
+        canv._setXObjects(xobject)
+        doc.Reference(xobject, reg_name)
+        doc.addForm(xobject.name, xobject)
+        if smask is not None:
+            mask_name = doc.getXObjectName(smask.name)
+            if mask_name in doc.idToObject:
+                xobject.smask = PDFObjectReference(mask_name)
+            else:
+                smask = copy.copy(smask)
+                canv._setXObjects(smask)
+                xobject.smask = doc.Reference(smask, mask_name)
+    canv._currentPageHasImages = 1
+    canv.saveState()
+    canv.translate(x, y)
+    canv.scale(width, height)
+    canv._code.append(f"/{reg_name} Do")
+    canv.restoreState()
+    canv._formsinuse.append(asset.xobject.name)  # ressources XObject de la page
+
+
+def fit_text(text, width, font="Helvetica", size=9, padding=6):
+    """
+    Tronque le texte (avec « … ») pour qu'il tienne sur une ligne dans une
+    cellule de ``width`` points, ``padding`` de marge de chaque côté.
+    """
+    text = "" if text is None else str(text)
+    available = width - 2 * padding
+    if pdfmetrics.stringWidth(text, font, size) <= available:
+        return text
+    low, high = 0, len(text)  # plus long préfixe qui tient avec « … » (recherche dichotomique)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if pdfmetrics.stringWidth(text[:middle] + "…", font, size) <= available:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + "…"
+
+
+class AssetImage(Flowable):
+    """Flowable platypus (centré, comme ``platypus.Image``) pour une image du registre."""
+
+    def __init__(self, name, width, height):
+        super().__init__()
+        self.name = name
+        self.width = width
+        self.height = height
+        self.hAlign = "CENTER"
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        draw_image(self.canv, self.name, 0, 0, self.width, self.height)
@@ -0,0 +1,26 @@
+# core/report_worker.py
+"""
+Points d'entrée des processus de rendu (core.reports, accounts.teacher_sheets).
+Rien de Django n'est importé au chargement : un processus « spawn » charge
+ce module avant d'avoir exécuté django.setup().
+"""
+
+
+def init():
+    import django
+
+    django.setup()
+
+    from .pdf_assets import preload
+
+    preload()  # images et styles chargés une fois pour toutes les tâches du processus
+
+
+def render(kind, params, path):
+    """Écrit le rapport dans ``path`` et retourne son nom de téléchargement."""
+    from .reports import REPORTS
+
+    report = REPORTS[kind]
+    with open(path, "wb") as output:
+        report.build(output, **params)
+    return report.get_filename(params)
@@ -0,0 +1,286 @@
+# core/reports.py
+"""
+Exports lourds (listes PDF, calendrier, rapport du secrétariat, fiche
+répétiteur) produits hors requête : la vue enregistre un ReportJob, la
+commande process_report_jobs le rend dans un pool de processus et dépose
+le fichier dans MEDIA_ROOT/reports/, où il reste disponible REPORT_JOB_TTL
+secondes.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.http import Http404
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from accounts.exports import (
+    PARENT_COLUMNS,
+    STUDENT_COLUMNS,
+    USER_COLUMNS,
+    build_list_pdf,
+    parent_rows,
+    student_rows,
+    teacher_info_filename,
+    user_rows,
+)
+from accounts.models import TeacherInfo
+from accounts.teacher_sheets import open_sheet
+
+from . import report_worker
+from .exports import build_calendar_docx, build_calendar_pdf, build_secretary_report_pdf
+from .models import ReportJob
+
+logger = logging.getLogger(__name__)
+
+WORKERS = getattr(settings, "REPORT_JOB_WORKERS", 2)
+TTL = getattr(settings, "REPORT_JOB_TTL", 3600)
+TIMEOUT = getattr(settings, "REPORT_JOB_TIMEOUT", 15 * 60)
+
+PDF = "application/pdf"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+# ----------------------------------------
+# Types de rapport
+# ----------------------------------------
+def _is_superuser(user):
+    return user.is_active and user.is_superuser
+
+
+def _is_staff(user):
+    return user.is_staff or user.is_superuser
+
+
+def _authenticated(user):
+    return user.is_authenticated
+
+
+def _no_params(request):
+    return {}
+
+
+def _calendar_params(request):
+    start_year = request.session.get("calendar_start_year", datetime.now().year)
+    return {
+        "start_year": start_year,
+        "end_year": request.session.get("calendar_end_year", start_year + 1),
+    }
+
+
+def _secretary_params(request):
+    report_ids = request.session.get("secretary_report_ids", {})
+    return {"report_ids": {name: sorted(report_ids.get(name, [])) for name in ("events", "absences", "reservations")}}
+
+
+def _teacher_info_params(request):
+    pk = request.GET.get("pk", "")
+    if not pk.isdigit() or not TeacherInfo.objects.filter(pk=pk).exists():
+        raise Http404
+    return {"pk": int(pk)}
+
+
+@dataclass(frozen=True)
+class ReportKind:
+    label: str
+    filename: object  # nom du fichier, ou fonction(params) -> nom
+    content_type: str
+    build: Callable  # build(output, **params)
+    allowed: Callable = _is_staff  # allowed(user)
+    params: Callable = _no_params  # params(request) -> dict sérialisable en JSON
+
+    def get_filename(self, params):
+        return self.filename(params) if callable(self.filename) else self.filename
+
+
+def build_student_list(output):
+    build_list_pdf(output, "Liste des Élèves", STUDENT_COLUMNS, student_rows())
+
+
+def build_lecturer_list(output):
+    build_list_pdf(output, "Liste des Enseignants", USER_COLUMNS, user_rows(is_lecturer=True))
+
+
+def build_other_list(output):
+    build_list_pdf(output, "Liste des Autres Utilisateurs", USER_COLUMNS, user_rows(is_other=True))
+
+
+def build_parent_list(output):
+    build_list_pdf(output, "Liste des Parents", PARENT_COLUMNS, parent_rows())
+
+
+def build_teacher_info(output, pk):
+    # Fiche servie depuis le cache disque (accounts.teacher_sheets)
+    with open_sheet(TeacherInfo.objects.select_related("teacher__user").get(pk=pk)) as sheet:
+        shutil.copyfileobj(sheet, output)
+
+
+def _teacher_info_filename(params):
+    return teacher_info_filename(TeacherInfo.objects.get(pk=params["pk"]))
+
+
+REPORTS = {
+    "student_list": ReportKind(_("Liste des élèves"), "eleves.pdf", PDF, build_student_list, _is_superuser),
+    "lecturer_list": ReportKind(_("Liste des enseignants"), "enseignants.pdf", PDF, build_lecturer_list, _is_superuser),
+    "other_list": ReportKind(
+        _("Liste des autres utilisateurs"), "autres_utilisateurs.pdf", PDF, build_other_list, _is_superuser
+    ),
+    "parent_list": ReportKind(_("Liste des parents"), "parents.pdf", PDF, build_parent_list, _is_superuser),
+    "calendar_pdf": ReportKind(
+        _("Calendrier académique (PDF)"), "calendrier_academique.pdf", PDF, build_calendar_pdf,
+        params=_calendar_params,
+    ),
+    "calendar_docx": ReportKind(
+        _("Calendrier académique (DOCX)"), "calendrier_academique.docx", DOCX, build_calendar_docx,
+        params=_calendar_params,
+    ),
+    "secretary_report": ReportKind(
+        _("Rapport du secrétariat"), "rapport_secretaire.pdf", PDF, build_secretary_report_pdf,
+        params=_secretary_params,
+    ),
+    "teacher_info": ReportKind(
+        _("Fiche répétiteur"), _teacher_info_filename, PDF, build_teacher_info, _authenticated,
+        params=_teacher_info_params,
+    ),
+}
+
+
+# ----------------------------------------
+# Mise en file (appelée depuis les vues)
+# ----------------------------------------
+def report_key(kind, params):
+    payload = json.dumps([kind, params], sort_keys=True, separators=(",", ":"), cls=DjangoJSONEncoder)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def enqueue_report(kind, params=None, user=None):
+    """
+    Retourne (job, créé). Une demande identique à une tâche en attente ou
+    en cours rejoint cette tâche au lieu d'en créer une autre ; la
+    contrainte unique partielle départage deux demandes simultanées.
+    """
+    if kind not in REPORTS:
+        raise KeyError(kind)
+    params = params or {}
+    key = report_key(kind, params)
+    for attempt in range(3):
+        job = ReportJob.objects.filter(key=key, status__in=ReportJob.IN_FLIGHT).first()
+        if job is not None:
+            ReportJob.objects.filter(pk=job.pk).update(request_count=F("request_count") + 1)
+            job.request_count += 1
+            return job, False
+        try:
+            with transaction.atomic():
+                return ReportJob.objects.create(kind=kind, params=params, key=key, requested_by=user), True
+        except IntegrityError:
+            if attempt == 2:
+                raise
+            # créée entre-temps par une autre requête : on la rejoint
+
+
+# ----------------------------------------
+# Traitement (worker)
+# ----------------------------------------
+def report_executor(workers=WORKERS):
+    """Pool de rendu (processus « spawn » : aucune connexion base héritée du parent)."""
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), initializer=report_worker.init
+    )
+
+
+def claim_jobs(limit):
+    """Réserve jusqu'à ``limit`` tâches (les tâches bloquées depuis TIMEOUT sont reprises)."""
+    now = timezone.now()
+    claimable = Q(status=ReportJob.PENDING) | Q(
+        status=ReportJob.RUNNING, started_at__lt=now - timedelta(seconds=TIMEOUT)
+    )
+    claimed = []
+    for job in ReportJob.objects.filter(claimable).order_by("created_at")[:limit]:
+        if ReportJob.objects.filter(claimable, pk=job.pk, started_at=job.started_at).update(
+            status=ReportJob.RUNNING, started_at=now
+        ):
+            job.status, job.started_at = ReportJob.RUNNING, now
+            claimed.append(job)
+    return claimed
+
+
+def finish_job(job, path=None, filename=None, error=""):
+    """Enregistre le résultat ; ignoré si la tâche a été reprise par un autre worker entre-temps."""
+    now = timezone.now()
+    changes = {"finished_at": now, "expires_at": now + timedelta(seconds=TTL)}
+    if error:
+        changes.update(status=ReportJob.FAILED, error=error)
+    else:
+        with open(path, "rb") as f:
+            name = default_storage.save(job.artifact.field.generate_filename(job, filename), File(f))
+        changes.update(status=ReportJob.DONE, artifact=name, error="")
+    updated = ReportJob.objects.filter(pk=job.pk, status=ReportJob.RUNNING, started_at=job.started_at).update(
+        **changes
+    )
+    if not updated and not error:
+        default_storage.delete(changes["artifact"])
+    return bool(updated)
+
+
+def _render_all(jobs, paths, executor):
+    """Produit (tâche, nom de téléchargement, exception) au fil des rendus."""
+    if executor is None:
+        for job in jobs:
+            try:
+                yield job, report_worker.render(job.kind, job.params, paths[job.pk]), None
+            except Exception as e:
+                yield job, None, e
+        return
+    futures = {executor.submit(report_worker.render, job.kind, job.params, paths[job.pk]): job for job in jobs}
+    for future in as_completed(futures):
+        try:
+            yield futures[future], future.result(), None
+        except Exception as e:
+            yield futures[future], None, e
+
+
+def process_report_jobs(batch_size=10, executor=None):
+    """
+    Traite un lot de tâches. Sans ``executor``, le rendu a lieu dans le
+    processus courant. Retourne (nombre réussi, nombre traité).
+    """
+    jobs = claim_jobs(batch_size)
+    if not jobs:
+        return 0, 0
+
+    done = 0
+    staging = tempfile.mkdtemp(prefix="reports-")
+    try:
+        paths = {job.pk: os.path.join(staging, str(job.token)) for job in jobs}
+        for job, filename, exc in _render_all(jobs, paths, executor):
+            if exc is not None:
+                logger.error("Rapport %s (%s) échoué : %r", job.pk, job.kind, exc)
+                finish_job(job, error=str(exc) or exc.__class__.__name__)
+            elif finish_job(job, paths[job.pk], filename):
+                done += 1
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return done, len(jobs)
+
+
+def purge_expired_reports(now=None):
+    """Supprime les tâches expirées et leurs fichiers ; retourne le nombre de tâches supprimées."""
+    expired = ReportJob.objects.filter(expires_at__lte=now or timezone.now())
+    for name in expired.exclude(artifact="").values_list("artifact", flat=True):
+        default_storage.delete(name)
+    count, _deleted = expired.delete()
+    return count
@@ -0,0 +1,93 @@
+# core/service_worker.py
+"""
+Service worker généré depuis les fichiers statiques collectés
+(python manage.py build_service_worker, après collectstatic).
+
+- Les fichiers de SERVICE_WORKER_PRECACHE sont mis en cache à
+  l'installation, sous leur nom haché quand le stockage tient un
+  manifeste (ManifestStaticFilesStorage / whitenoise) : ces URL ne
+  changent qu'avec leur contenu et sont servies depuis le cache.
+- Le nom du cache dérive de ces URL (et, sans manifeste, du contenu des
+  fichiers) : un déploiement qui ne modifie aucun fichier garde le cache,
+  sinon l'ancien est supprimé à l'activation.
+- Pages HTML : stale-while-revalidate pour les visiteurs anonymes,
+  network-first pour les utilisateurs connectés, dont les pages ne sont
+  jamais mises en cache. L'état est lu dans l'en-tête AUTH_HEADER (voir
+  core.middleware).
+"""
+import hashlib
+import json
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import translation
+
+AUTH_HEADER = "X-Authenticated"
+PRECACHE = getattr(settings, "SERVICE_WORKER_PRECACHE", [])
+OUTPUT_PATH = getattr(settings, "SERVICE_WORKER_PATH", os.path.join(settings.STATIC_ROOT, "serviceworker.js"))
+# Jamais interceptés (ni cache, ni page hors ligne)
+NETWORK_ONLY = ["/admin/", "/pwa/", "/i18n/"]
+
+
+def has_manifest(storage=staticfiles_storage):
+    return isinstance(storage, ManifestFilesMixin)
+
+
+def precache_urls(paths=None, storage=staticfiles_storage):
+    """URL publiques des fichiers à précharger (hachées si le stockage tient un manifeste)."""
+    paths = PRECACHE if paths is None else paths
+    if has_manifest(storage):
+        # force : URL hachée même en DEBUG ; ValueError si le fichier manque au manifeste
+        return [storage.url(path, force=True) for path in paths]
+    missing = [path for path in paths if not storage.exists(path)]
+    if missing:
+        raise FileNotFoundError(", ".join(missing))
+    return [storage.url(path) for path in paths]
+
+
+def offline_urls():
+    urls = {}
+    for language, _name in settings.LANGUAGES:
+        with translation.override(language):
+            urls[language] = reverse("offline")
+    return urls
+
+
+def cache_version(urls, paths=None, storage=staticfiles_storage):
+    """Empreinte des fichiers préchargés : leurs URL hachées, ou à défaut leur contenu."""
+    digest = hashlib.sha256("\n".join(urls).encode("utf-8"))
+    if not has_manifest(storage):
+        for path in PRECACHE if paths is None else paths:
+            with storage.open(path) as file:
+                for chunk in file.chunks():
+                    digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def build_service_worker(paths=None, storage=staticfiles_storage):
+    urls = precache_urls(paths, storage)
+    offline = offline_urls()
+    context = {
+        "version": cache_version(urls + sorted(offline.values()), paths, storage),
+        "precache_urls": json.dumps(urls),
+        "offline_urls": json.dumps(offline),
+        "default_language": settings.LANGUAGE_CODE,
+        "static_url": settings.STATIC_URL,
+        "hashed": json.dumps(has_manifest(storage)),
+        "network_only": json.dumps(NETWORK_ONLY),
+        "auth_header": AUTH_HEADER,
+    }
+    return render_to_string("core/service-worker.js", context)
+
+
+def write_service_worker(path=None, **kwargs):
+    """Écrit le service worker (remplacement atomique) ; retourne son chemin."""
+    path = path or OUTPUT_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as output:
+        output.write(build_service_worker(**kwargs))
+    os.replace(f"{path}.tmp", path)
+    return path
@@ -0,0 +1,65 @@
+from django.core.signals import request_finished
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import ActivityLog
+
+from . import activity
+from .caching import bump_page_tag, invalidate_base_context
+from .deletions import signals_deferred
+from .feeds import invalidate_feeds
+from .stat_values import invalidate_stat_values
+from .testimonial_stats import invalidate_testimonial_stats
+from .models import GalleryImage, NewsAndEvents, Slide, StatValue, SuccessRate, Testimonial
+
+
+# ----------------------------------------
+# Invalidation du contexte commun des pages publiques
+# ----------------------------------------
+@receiver([post_save, post_delete], sender=Slide)
+@receiver([post_save, post_delete], sender=GalleryImage)
+@receiver([post_save, post_delete], sender=Testimonial)
+def invalidate_public_context(sender, **kwargs):
+    invalidate_base_context()
+
+
+# ----------------------------------------
+# Invalidation ciblée des pages en cache
+# ----------------------------------------
+@receiver([post_save, post_delete], sender=StatValue)
+def invalidate_stat_pages(sender, **kwargs):
+    bump_page_tag("stats")
+    invalidate_stat_values()
+
+
+@receiver([post_save, post_delete], sender=Testimonial)
+def invalidate_testimonial_statistics(sender, **kwargs):
+    invalidate_testimonial_stats()
+
+
+# ----------------------------------------
+# Listes « dernières N » (core.feeds)
+# ----------------------------------------
+@receiver([post_save, post_delete], sender=NewsAndEvents)
+def invalidate_news_feed(sender, **kwargs):
+    invalidate_feeds("news")
+
+
+@receiver([post_save, post_delete], sender=SuccessRate)
+def invalidate_success_rate_feed(sender, **kwargs):
+    invalidate_feeds("success_rate")
+
+
+@receiver([post_save, post_delete], sender=ActivityLog)
+def invalidate_activity_feed(sender, **kwargs):
+    if signals_deferred():  # suppression en masse ou archivage : invalidé une fois à la fin
+        return
+    invalidate_feeds("activity")
+
+
+# ----------------------------------------
+# Journaux d'activité : écriture groupée (voir core.activity)
+# ----------------------------------------
+@receiver(request_finished)
+def flush_activity_log(sender, **kwargs):
+    activity.buffer.flush_if_due()
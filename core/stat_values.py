@@ -0,0 +1,56 @@
+# core/stat_values.py
+"""
+Registre des StatValue (chiffres clés affichés sur les pages publiques).
+
+Toutes les lignes sont chargées en une requête dans un dictionnaire du
+processus, marqué d'un jeton de version. Le jeton est partagé par le
+cache et remplacé à chaque modification (core.signals) : chaque worker
+compare son jeton à celui du cache (un accès au cache, sans requête) et
+recharge la table s'il diffère.
+"""
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import StatValue
+
+STAT_VERSION_KEY = "core:stat_values:version"
+
+_lock = threading.Lock()
+_registry = {"version": None, "values": {}}
+
+
+def current_version():
+    version = cache.get(STAT_VERSION_KEY)
+    if version is None:
+        # Jeton absent (cache vidé) : un nouveau, pour qu'aucun worker ne garde d'anciennes valeurs
+        cache.add(STAT_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(STAT_VERSION_KEY)
+    return version
+
+
+def stat_values():
+    """{nom: StatValue} ; rechargé en une requête seulement si une valeur a changé."""
+    # Jeton lu avant les lignes : une modification concurrente provoque au pire un rechargement de plus
+    version = current_version()
+    if _registry["version"] != version:
+        values = {stat.name: stat for stat in StatValue.objects.all()}
+        with _lock:
+            _registry.update(version=version, values=values)
+    return _registry["values"]
+
+
+def bump_version():
+    cache.set(STAT_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_stat_values(**kwargs):
+    """
+    Nouveau jeton tout de suite, puis de nouveau après validation de la
+    transaction : un worker qui aurait rechargé entre-temps l'ancien état
+    le rechargera encore.
+    """
+    bump_version()
+    transaction.on_commit(bump_version)
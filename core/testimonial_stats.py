@@ -0,0 +1,54 @@
+# core/testimonial_stats.py
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Testimonial
+
+TESTIMONIAL_STATS_KEY = "core:testimonial_stats"
+TESTIMONIAL_STATS_TIMEOUT = 60 * 60
+
+
+@dataclass(frozen=True)
+class TestimonialStats:
+    """Statistiques des témoignages publiés (actifs et approuvés)."""
+
+    distribution: dict = field(default_factory=lambda: {5: 0, 4: 0, 3: 0, 2: 0, 1: 0})
+    total: int = 0
+    average: float = 0.0
+
+
+def published_testimonials():
+    return Testimonial.objects.filter(is_active=True, is_approved=True)
+
+
+def rating_histogram():
+    """Nombre de témoignages publiés par note, en une requête groupée."""
+    distribution = {5: 0, 4: 0, 3: 0, 2: 0, 1: 0}
+    rows = published_testimonials().values("rating").annotate(count=Count("pk")).order_by()
+    for row in rows:
+        if row["rating"] in distribution:
+            distribution[row["rating"]] = row["count"]
+    return distribution
+
+
+def compute_testimonial_stats():
+    """Distribution, total et moyenne dérivés du même histogramme (une requête)."""
+    distribution = rating_histogram()
+    total = sum(distribution.values())
+    weighted = sum(rating * count for rating, count in distribution.items())
+    average = round(weighted / total, 1) if total else 0.0
+    return TestimonialStats(distribution=distribution, total=total, average=average)
+
+
+def get_testimonial_stats():
+    stats = cache.get(TESTIMONIAL_STATS_KEY)
+    if stats is None:
+        stats = compute_testimonial_stats()
+        cache.set(TESTIMONIAL_STATS_KEY, stats, TESTIMONIAL_STATS_TIMEOUT)
+    return stats
+
+
+def invalidate_testimonial_stats(**kwargs):
+    cache.delete(TESTIMONIAL_STATS_KEY)
@@ -0,0 +1,2 @@
+# core/tests/__init__.py
+# This ensures that tests is treated as a package.
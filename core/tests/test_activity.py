@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import ActivityLog
+from core import activity
+from core.models import ActivityLog as EventLog, ActivityRollup
+
+User = get_user_model()
+
+
+def days_ago(days, hour=12):
+    return timezone.localtime().replace(hour=hour, minute=0, second=0, microsecond=0) - timedelta(days=days)
+
+
+class ActivityBufferTests(TestCase):
+    def setUp(self):
+        self.buffer = activity.ActivityBuffer(size=3, interval=60)
+        patcher = mock.patch.object(activity, "buffer", self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user(username="prof")
+
+    def test_entries_are_written_in_batches(self):
+        with self.assertNumQueries(0):
+            activity.log_activity("Connexion", self.user)
+            activity.log_event("Sauvegarde")
+        # Troisième entrée : tampon plein, un INSERT par modèle
+        with self.assertNumQueries(2):
+            activity.log_activity("Déconnexion", self.user)
+        self.assertEqual(ActivityLog.objects.count(), 2)
+        self.assertEqual(EventLog.objects.get().message, "Sauvegarde")
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_event_time_is_kept(self):
+        activity.log_activity("Connexion", self.user)
+        logged_at = self.buffer._entries[0].created_at
+        with mock.patch.object(timezone, "now", return_value=logged_at + timedelta(minutes=5)):
+            self.buffer.flush()
+        self.assertEqual(ActivityLog.objects.get().created_at, logged_at)
+
+    def test_request_end_flushes_once_due(self):
+        activity.log_activity("Connexion", self.user)
+        request_finished.send(sender=None)
+        self.assertFalse(ActivityLog.objects.exists())
+        self.buffer.interval = 0
+        request_finished.send(sender=None)
+        self.assertTrue(ActivityLog.objects.exists())
+
+    def test_readers_see_pending_entries(self):
+        admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.client.force_login(admin)
+        activity.log_activity("Publication ajoutée : Rentrée", admin)
+        response = self.client.get(reverse("dashboard"))
+        self.assertContains(response, "Publication ajoutée : Rentrée")
+
+
+class ActivityRetentionTests(TestCase):
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir, ignore_errors=True)
+        patcher = mock.patch.object(activity, "ARCHIVE_DIR", self.archive_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_logs(self, days, count):
+        ActivityLog.objects.bulk_create(
+            ActivityLog(message=f"Entrée {days}-{i}", created_at=days_ago(days, hour=i % 24)) for i in range(count)
+        )
+
+    def counts(self, source="accounts"):
+        return dict(ActivityRollup.objects.filter(source=source).values_list("day", "count"))
+
+    def test_rollup_counts_per_local_day(self):
+        self.create_logs(1, 24)
+        self.create_logs(3, 5)
+        self.assertEqual(activity.rollup("accounts"), 2)
+        self.assertEqual(self.counts(), {days_ago(1).date(): 24, days_ago(3).date(): 5})
+
+        # Reprise au dernier jour compté
+        self.create_logs(1, 2)
+        self.create_logs(0, 1)
+        self.assertEqual(activity.rollup("accounts"), 2)
+        self.assertEqual(self.counts()[days_ago(1).date()], 26)
+
+    def test_archive_moves_old_days_to_compressed_files(self):
+        self.create_logs(400, 3)
+        self.create_logs(200, 4)
+        self.create_logs(10, 2)
+        activity.rollup("accounts")
+
+        self.assertEqual(activity.archive("accounts", retention_days=180), 7)
+        self.assertEqual(ActivityLog.objects.count(), 2)
+        files = sorted(
+            os.path.join(root, name) for root, _dirs, names in os.walk(self.archive_dir) for name in names
+        )
+        self.assertEqual(len(files), 2)
+        self.assertTrue(all(name.endswith(".jsonl.gz") for name in files))
+        rows = [row for path in files for row in activity.read_archive(path)]
+        self.assertEqual(sorted(row["message"] for row in rows)[:2], ["Entrée 200-0", "Entrée 200-1"])
+        self.assertEqual(set(rows[0]), {"id", "user_id", "message", "created_at"})
+
+        # Les compteurs survivent à l'archivage et ne sont plus recalculés
+        activity.rollup("accounts", since=days_ago(500).date())
+        self.assertEqual(self.counts()[days_ago(400).date()], 3)
+        self.assertTrue(ActivityRollup.objects.get(day=days_ago(200).date()).archived)
+        self.assertEqual(activity.archive("accounts", retention_days=180), 0)
+
+    def test_late_entries_add_to_archived_day(self):
+        self.create_logs(300, 2)
+        activity.archive("accounts", retention_days=180)
+        self.create_logs(300, 1)
+        activity.archive("accounts", retention_days=180)
+        self.assertEqual(self.counts()[days_ago(300).date()], 3)
+
+    def test_command(self):
+        self.create_logs(365, 2)
+        EventLog.objects.create(message="Ancien", created_at=days_ago(365))
+        EventLog.objects.create(message="Récent", created_at=days_ago(1))
+        out = StringIO()
+        call_command("archive_activity_logs", retention_days=30, stdout=out)
+        self.assertIn("accounts : 1 jour(s) compté(s), 2 entrée(s) archivée(s).", out.getvalue())
+        self.assertEqual(list(EventLog.objects.values_list("message", flat=True)), ["Récent"])
+        self.assertEqual(self.counts("core"), {days_ago(365).date(): 1, days_ago(1).date(): 1})
@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+
+from django.contrib import admin
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import ActivityLog, Parent, Student, Teacher, TeacherInfo, User, UserImport
+from core.models import (
+    AcademicEvent, Absence, ActivityRollup, BulkDeletion, Campaign, CampaignDelivery, ContactMessage, GalleryImage, NewsAndEvents,
+    NewsletterSubscriber, OutboundEmail, ReportJob, Reservation, Slide, StatValue, SuccessRate, Testimonial,
+)
+
+ROWS = 1000
+# Session, utilisateur, COUNT filtré et total, page ; plus les filtres de liste et date_hierarchy
+QUERY_BUDGET = 8
+
+
+def users(prefix, count, start=0, **fields):
+    return User.objects.bulk_create(
+        User(username=f"{prefix}{i}", first_name="Prénom", last_name=f"{prefix} {i}", **fields)
+        for i in range(start, start + count)
+    )
+
+
+def teacher_infos(count, start):
+    teachers = Teacher.objects.bulk_create(
+        Teacher(user=user, speciality="Maths") for user in users("prof", count, start, is_lecturer=True)
+    )
+    TeacherInfo.objects.bulk_create(
+        TeacherInfo(
+            teacher=teacher, nom="Nom", prenom="Prénom", date_naissance=date(1990, 1, 1), lieu_naissance="Yaoundé",
+            statut_matrimonial="single", email="prof@example.com", personne_urgence="X", cont_urgence="600",
+            section_enseignement="Francophone", diplome="Licence",
+        )
+        for teacher in teachers
+    )
+
+
+def parents(count, start):
+    students = Student.objects.bulk_create(Student(student=user) for user in users("enfant", count, start))
+    Parent.objects.bulk_create(
+        Parent(parent=user, student=student) for user, student in zip(users("parent", count, start), students)
+    )
+
+
+def slides(count, start):
+    created = Slide.objects.bulk_create(Slide(title=f"Slide {i}", order=i) for i in range(start, start + count))
+    GalleryImage.objects.bulk_create(
+        GalleryImage(slide=slide, image=f"gallery/{slide.pk}-{n}.jpg", order=n) for slide in created for n in range(2)
+    )
+
+
+def subscribers(count, start):
+    NewsletterSubscriber.objects.bulk_create(
+        NewsletterSubscriber(email=f"abonne{i}@example.com") for i in range(start, start + count)
+    )
+    ContactMessage.objects.bulk_create(
+        ContactMessage(nom="Parent", email=f"abonne{i}@example.com", sujet="Inscription", message="…", newsletter=True)
+        for i in range(start, start + count, 2)
+    )
+
+
+def deliveries(count, start):
+    campaign = Campaign.objects.create(title=f"Campagne {start}", subject="Rentrée", body="…")
+    subscribers_ = NewsletterSubscriber.objects.bulk_create(
+        NewsletterSubscriber(email=f"envoi{i}@example.com") for i in range(start, start + count)
+    )
+    CampaignDelivery.objects.bulk_create(
+        CampaignDelivery(campaign=campaign, subscriber=s, email=s.email, status=CampaignDelivery.SENT)
+        for s in subscribers_
+    )
+
+
+def absences(count, start):
+    Absence.objects.bulk_create(
+        Absence(teacher=teacher, date=date(2025, 9, 1) + timedelta(days=i % 200), reason="Maladie")
+        for i, teacher in enumerate(users("absent", count, start, is_lecturer=True))
+    )
+
+
+def activity_logs(count, start):
+    ActivityLog.objects.bulk_create(
+        ActivityLog(user=user, message=f"Connexion {user.username}") for user in users("log", count, start)
+    )
+
+
+def bulk(model, build):
+    return lambda count, start: model.objects.bulk_create(build(i) for i in range(start, start + count))
+
+
+# Générateur de ``count`` lignes pour chaque changelist
+BUILDERS = {
+    User: lambda count, start: users("compte", count, start),
+    Student: lambda count, start: Student.objects.bulk_create(
+        Student(student=user) for user in users("eleve", count, start)
+    ),
+    Parent: parents,
+    TeacherInfo: teacher_infos,
+    ActivityLog: activity_logs,
+    UserImport: bulk(UserImport, lambda i: UserImport(file=f"imports/{i}.csv", errors=[[i, "Email invalide"]])),
+    NewsAndEvents: bulk(NewsAndEvents, lambda i: NewsAndEvents(title=f"Actualité {i}", summary="…")),
+    Slide: slides,
+    Testimonial: bulk(Testimonial, lambda i: Testimonial(author=f"Parent {i}", content="Très satisfait")),
+    NewsletterSubscriber: subscribers,
+    ContactMessage: bulk(ContactMessage, lambda i: ContactMessage(nom=f"Nom {i}", email="a@example.com", sujet="Info", message="…")),
+    StatValue: bulk(StatValue, lambda i: StatValue(name=f"stat{i}", value=i)),
+    AcademicEvent: bulk(AcademicEvent, lambda i: AcademicEvent(date=date(2025, 9, 1), activity=f"Activité {i}", responsible="Direction")),
+    SuccessRate: bulk(SuccessRate, lambda i: SuccessRate(year=1000 + i, rate=90)),
+    Absence: absences,
+    Reservation: bulk(Reservation, lambda i: Reservation(course_name="Maths", student_name=f"Élève {i}", date=date(2025, 9, 1))),
+    OutboundEmail: bulk(OutboundEmail, lambda i: OutboundEmail(subject=f"Sujet {i}", body="…", to=["a@example.com"])),
+    Campaign: bulk(Campaign, lambda i: Campaign(title=f"Campagne {i}", subject="Sujet", body="…")),
+    CampaignDelivery: deliveries,
+    ReportJob: bulk(ReportJob, lambda i: ReportJob(kind="student_list", key=f"cle{i}", status=ReportJob.DONE)),
+    ActivityRollup: bulk(ActivityRollup, lambda i: ActivityRollup(source="accounts", day=date(2020, 1, 1) + timedelta(days=i), count=i)),
+    BulkDeletion: lambda count, start: BulkDeletion.objects.bulk_create(
+        BulkDeletion(model="accounts.user", object_ids=[i], total=1, requested_by=user)
+        for i, user in enumerate(users("demandeur", count, start), start)
+    ),
+}
+
+
+class AdminChangelistQueryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.client.force_login(self.admin)
+
+    def changelist_queries(self, model):
+        url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_every_admin_is_covered(self):
+        registered = {model for model in admin.site._registry if model._meta.app_label in ("core", "accounts")}
+        self.assertEqual(registered - set(BUILDERS), set())
+
+    def test_changelists_have_a_fixed_query_budget(self):
+        for model, build in BUILDERS.items():
+            with self.subTest(model._meta.label):
+                build(1, 0)
+                few = self.changelist_queries(model)
+                build(ROWS - 1, 1)
+                many = self.changelist_queries(model)
+                self.assertEqual(many, few)  # pas de requête par ligne
+                self.assertLessEqual(many, QUERY_BUDGET)
@@ -0,0 +1,172 @@
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import ActivityLog, Student, Teacher, TeacherInfo
+from core import deletions
+from core.admin import BulkDeleteMixin
+from core.models import BulkDeletion, DashboardSnapshot
+from search.index import REGISTRY, index_objects
+from search.models import SearchEntry
+
+User = get_user_model()
+
+
+@mock.patch.object(deletions, "INLINE_LIMIT", 5)
+class BulkDeletionTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+
+    def create_users(self, count):
+        """Élèves et enseignants (avec fiche, photo et journal d'activité)."""
+        users = []
+        for i in range(count):
+            user = User.objects.create_user(username=f"compte{i}", first_name="Prénom", last_name=f"Nom {i}")
+            name = default_storage.save(f"profile_pictures/{i}.jpg", ContentFile(b"jpeg"))
+            User.objects.filter(pk=user.pk).update(picture=name)
+            if i % 2:
+                Student.objects.create(student=user)
+            else:
+                teacher = Teacher.objects.create(user=user, speciality="Maths")
+                TeacherInfo.objects.create(
+                    teacher=teacher, nom="Nom", prenom="Prénom", date_naissance=date(1990, 1, 1),
+                    lieu_naissance="Douala", statut_matrimonial="single", email="prof@example.com",
+                    personne_urgence="X", cont_urgence="600", section_enseignement="Francophone", diplome="Licence",
+                    photo=default_storage.save(f"fiches/{i}.jpg", ContentFile(b"jpeg")),
+                )
+            ActivityLog.objects.create(user=user, message=f"Connexion {i}")
+            users.append(user)
+        index_objects(REGISTRY["user"], users)
+        return users
+
+    def test_chunks_cascade_and_clean_up(self):
+        users = self.create_users(7)
+        pks = [user.pk for user in users]
+        files = [name for user in User.objects.filter(pk__in=pks) for name in [user.picture.name]]
+        files += list(TeacherInfo.objects.values_list("photo", flat=True))
+        DashboardSnapshot.rebuild()
+
+        job = deletions.schedule(User.objects.filter(pk__in=pks), self.admin)
+        self.assertEqual((job.status, job.total), (BulkDeletion.PENDING, 7))  # au-delà d'INLINE_LIMIT
+        with mock.patch.object(deletions, "delete_sheets") as delete_sheets:
+            self.assertEqual(deletions.process_bulk_deletions(chunk_size=3), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, BulkDeletion.DONE)
+        self.assertEqual((job.processed, job.progress), (7, 100))
+        # 7 comptes, 4 enseignants et leurs fiches, 3 élèves, 7 journaux
+        self.assertEqual(job.deleted_rows, 25)
+        self.assertEqual(job.files_deleted, 11)
+        self.assertFalse(User.objects.filter(pk__in=pks).exists())
+        self.assertFalse(ActivityLog.objects.exists())
+        self.assertFalse(SearchEntry.objects.filter(kind="user", object_id__in=pks).exists())
+        self.assertFalse(any(default_storage.exists(name) for name in files))
+        self.assertEqual(delete_sheets.call_count, 4)
+        self.assertEqual(DashboardSnapshot.load().student_count, 0)
+
+    def test_default_picture_is_kept(self):
+        user = User.objects.create_user(username="defaut")
+        default = default_storage.save(user.picture.name, ContentFile(b"png"))
+        User.objects.filter(pk=user.pk).update(picture=default)
+        job = deletions.schedule(User.objects.filter(pk=user.pk))
+        self.assertEqual(job.status, BulkDeletion.DONE)
+        self.assertTrue(default_storage.exists(default))
+
+    def test_interrupted_job_resumes(self):
+        pks = [user.pk for user in self.create_users(6)]
+        User.objects.filter(student__isnull=False).update(is_student=True)
+        DashboardSnapshot.rebuild()
+        self.assertEqual(DashboardSnapshot.load().student_count, 3)
+        job = deletions.schedule(User.objects.filter(pk__in=pks), self.admin)
+        (job,) = deletions.claim_jobs(1)
+
+        calls = []
+        original = deletions.delete_chunk
+
+        def fail_second(job, model, chunk):
+            calls.append(chunk)
+            if len(calls) == 2:
+                raise RuntimeError("coupure")
+            return original(job, model, chunk)
+
+        with mock.patch.object(deletions, "delete_chunk", fail_second), self.assertLogs("core.deletions", "ERROR"):
+            deletions.run(job, chunk_size=2)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.error), (BulkDeletion.FAILED, 2, "coupure"))
+        self.assertEqual(User.objects.filter(pk__in=pks).count(), 4)  # le paquet en échec est annulé
+        self.assertEqual(DashboardSnapshot.load().student_count, 2)  # premier paquet validé : pris en compte
+
+        BulkDeletion.objects.filter(pk=job.pk).update(status=BulkDeletion.PENDING)
+        call_command("process_bulk_deletions", chunk_size=2, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), (BulkDeletion.DONE, 6))
+        self.assertFalse(User.objects.filter(pk__in=pks).exists())
+
+    def test_queries_per_chunk_do_not_depend_on_its_size(self):
+        def chunk_queries(count):
+            users = self.create_users(count)
+            job = BulkDeletion.objects.create(model="accounts.user", object_ids=[u.pk for u in users], total=count)
+            with CaptureQueriesContext(connection) as queries:
+                deletions.delete_chunk(job, User, job.object_ids)
+            return len(queries)
+
+        self.assertEqual(chunk_queries(4), chunk_queries(40))
+
+    def test_default_delete_action_is_replaced(self):
+        request = RequestFactory().get("/")
+        request.user = self.admin
+        for model_admin in admin.site._registry.values():
+            if isinstance(model_admin, BulkDeleteMixin):
+                actions = model_admin.get_actions(request)
+                self.assertNotIn("delete_selected", actions, model_admin)
+                self.assertIn("delete_selected_objects", actions, model_admin)
+        for model in (User, Student, TeacherInfo, ActivityLog):
+            self.assertIsInstance(admin.site._registry[model], BulkDeleteMixin)
+
+    def test_admin_action(self):
+        self.client.force_login(self.admin)
+        pks = [user.pk for user in self.create_users(3)]
+        url = reverse("admin:accounts_user_changelist")
+
+        # Premier envoi : confirmation seulement, rien n'est supprimé
+        response = self.client.post(url, {"action": "delete_selected_objects", "_selected_action": pks})
+        self.assertContains(response, '<input type="hidden" name="post" value="yes">', html=True)
+        self.assertEqual(User.objects.filter(pk__in=pks).count(), 3)
+        self.assertFalse(BulkDeletion.objects.exists())
+        response = self.client.post(
+            url, {"action": "delete_selected_objects", "_selected_action": pks[:1], "select_across": "1"}
+        )
+        self.assertContains(response, '<input type="hidden" name="select_across" value="1">', html=True)
+        self.assertEqual(User.objects.count(), 4)
+
+        response = self.client.post(
+            url, {"action": "delete_selected_objects", "_selected_action": pks, "post": "yes"}, follow=True
+        )
+        self.assertContains(response, "3 objet(s) supprimé(s) avec succès.")
+        self.assertFalse(User.objects.filter(pk__in=pks).exists())
+
+        pks = [user.pk for user in self.create_users(3)]
+        with mock.patch.object(deletions, "INLINE_LIMIT", 2):
+            response = self.client.post(
+                url, {"action": "delete_selected_objects", "_selected_action": pks, "post": "yes"}, follow=True
+            )
+        job = BulkDeletion.objects.get(status=BulkDeletion.PENDING)
+        self.assertContains(response, reverse("admin:core_bulkdeletion_change", args=[job.pk]))
+        self.assertEqual(User.objects.filter(pk__in=pks).count(), 3)  # en attente du worker
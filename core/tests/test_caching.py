@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import translation
+
+from core.caching import CSRF_PLACEHOLDER, base_context_key, get_cached_base_context
+from core.models import GalleryImage, Slide, StatValue, Testimonial
+
+User = get_user_model()
+
+
+class BaseContextCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.slide = Slide.objects.create(title="Accueil", order=1)
+        GalleryImage.objects.create(slide=self.slide, image="gallery/a.jpg", order=1)
+        Testimonial.objects.create(author="A", content="Très bien", is_approved=True)
+
+    def test_second_call_hits_no_database(self):
+        get_cached_base_context()
+        with self.assertNumQueries(0):
+            data = get_cached_base_context()
+        self.assertEqual(len(data["slides"]), 1)
+        self.assertEqual(len(data["slides"][0].images.all()), 1)
+        self.assertEqual(len(data["testimonials"]), 1)
+
+    def test_cache_is_keyed_by_language(self):
+        with translation.override("en"):
+            english = get_cached_base_context()["fallback_slides"][0]["primary_cta"]
+        with translation.override("fr"):
+            french = get_cached_base_context()["fallback_slides"][0]["primary_cta"]
+        self.assertIsInstance(english, str)
+        self.assertEqual(french, "Nos services")
+        self.assertIsNotNone(cache.get(base_context_key("en")))
+        self.assertIsNotNone(cache.get(base_context_key("fr")))
+
+    def test_model_changes_invalidate_every_language(self):
+        for language in ("fr", "en"):
+            with translation.override(language):
+                get_cached_base_context()
+        Slide.objects.create(title="Nouvelle", order=2)
+        self.assertIsNone(cache.get(base_context_key("fr")))
+        self.assertIsNone(cache.get(base_context_key("en")))
+
+    def test_anonymous_page_view_costs_no_query_once_warm(self):
+        url = reverse("services")
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def queries_for(self, url, **headers):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, headers=headers)
+        return response, len(queries)
+
+    def test_cached_page_gets_fresh_csrf_token_and_validators(self):
+        url = reverse("services")
+        first = self.client.get(url)
+        second, queries = self.queries_for(url)
+
+        self.assertEqual(queries, 0)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertIn("Last-Modified", second)
+        self.assertNotIn(CSRF_PLACEHOLDER, second.content)
+        self.assertIn(b'name="csrfmiddlewaretoken" value="', second.content)
+
+    def test_conditional_get_returns_not_modified(self):
+        url = reverse("services")
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_authenticated_users_bypass_cache(self):
+        user = User.objects.create_user(username="user", password="password")
+        self.client.force_login(user)
+        response = self.client.get(reverse("services"))
+        self.assertNotIn("ETag", response)
+
+    def test_stat_change_only_invalidates_dependent_pages(self):
+        about, services = reverse("about"), reverse("services")
+        self.client.get(about)
+        self.client.get(services)
+
+        StatValue.objects.create(name="students", value=120)
+
+        self.assertGreater(self.queries_for(about)[1], 0)
+        self.assertEqual(self.queries_for(services)[1], 0)
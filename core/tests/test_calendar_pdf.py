@@ -0,0 +1,91 @@
+import io
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from pypdf import PdfReader
+
+from core.exports import build_calendar_pdf
+from core.models import AcademicEvent
+
+User = get_user_model()
+
+SCHOOL_YEAR_START = date(2025, 9, 1)
+
+
+def create_events(count, days=300):
+    """``count`` événements répartis sur ``days`` jours à partir de la rentrée."""
+    AcademicEvent.objects.bulk_create(
+        (
+            AcademicEvent(
+                date=SCHOOL_YEAR_START + timedelta(days=i * days // count),
+                activity=f"Activité {i}", responsible="Direction",
+            )
+            for i in range(count)
+        ),
+        batch_size=1000,
+    )
+
+
+def render(start_year=2025, end_year=2026, **kwargs):
+    output = io.BytesIO()
+    build_calendar_pdf(output, start_year, end_year, **kwargs)
+    output.seek(0)
+    return PdfReader(output)
+
+
+class CalendarPdfTests(TestCase):
+    def assertPagesWellFormed(self, pdf, sample=None):
+        pages = pdf.pages if sample is None else [pdf.pages[i] for i in sample]
+        for page in pages:
+            text = page.extract_text()
+            self.assertIn("Activités", text)  # ligne d'en-tête répétée
+            self.assertIn("Direction", text)
+        self.assertIn("Directeur Général", pdf.pages[-1].extract_text())
+
+    def test_ten_events_fit_on_one_page(self):
+        create_events(10, days=20)
+        pdf = render()
+        self.assertEqual(len(pdf.pages), 1)
+        text = pdf.pages[0].extract_text()
+        self.assertIn("Septembre 2025", text)
+        self.assertIn("Activité 9", text)
+        self.assertIn("2025 – 2026", text)
+
+    def test_thousand_events_are_paginated(self):
+        create_events(1000)
+        pdf = render()
+        self.assertEqual(len(pdf.pages), 28)
+        self.assertPagesWellFormed(pdf)
+        self.assertIn("Activité 999", pdf.pages[-1].extract_text())
+
+    def test_twenty_thousand_events(self):
+        create_events(20000, days=2 * 365)
+        pdf = render(end_year=2027)
+        self.assertEqual(len(pdf.pages), 540)
+        self.assertPagesWellFormed(pdf, sample=[0, 267, 538])
+        self.assertIn("Activité 19999", pdf.pages[538].extract_text())
+
+    def test_month_sections_start_new_pages(self):
+        create_events(10, days=120)  # septembre à décembre
+        pdf = render(month_sections=True)
+        self.assertEqual(len(pdf.pages), 4)
+        self.assertTrue(pdf.pages[1].extract_text().count("Octobre 2025"))
+
+    def test_period_is_limited_to_the_selected_years(self):
+        create_events(10, days=20)
+        AcademicEvent.objects.create(date=date(2030, 1, 1), activity="Hors période", responsible="Direction")
+        pdf = render()
+        self.assertNotIn("Hors période", pdf.pages[-1].extract_text())
+        self.assertIn("Aucun événement", render(2020, 2021).pages[0].extract_text())
+
+    def test_period_is_stored_in_session(self):
+        self.client.force_login(User.objects.create_user(username="secretaire", password="x", is_staff=True))
+        response = self.client.post(reverse("generate_calendar"), {"period": "", "start_year": 2025, "end_year": 2027})
+        self.assertRedirects(response, reverse("generate_calendar"))
+        self.assertEqual(self.client.session["calendar_end_year"], 2027)
+
+        response = self.client.post(reverse("generate_calendar"), {"period": "", "start_year": 2027, "end_year": 2025})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.session["calendar_start_year"], 2025)
@@ -0,0 +1,130 @@
+from io import StringIO
+from smtplib import SMTPRecipientsRefused
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.template import Template
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core import campaigns
+from core.campaigns import send_campaign
+from core.models import Campaign, CampaignDelivery, NewsletterSubscriber
+
+
+class RejectingBackend(EmailBackend):
+    """Refuse les adresses contenant « rejet »."""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if any("rejet" in address for address in message.to):
+                raise SMTPRecipientsRefused({message.to[0]: (550, b"refused")})
+        return super().send_messages(messages)
+
+
+class CampaignSenderTests(TestCase):
+    def setUp(self):
+        self.campaign = Campaign.objects.create(
+            title="Rentrée",
+            subject_fr="Rentrée scolaire",
+            subject_en="Back to school",
+            body_fr="<p>Bonjour ({{ language }})</p>",
+            body_en="<p>Hello ({{ language }})</p>",
+        )
+
+    def subscribe(self, count, language="fr", prefix="user", **kwargs):
+        NewsletterSubscriber.objects.bulk_create(
+            NewsletterSubscriber(email=f"{prefix}{i}@example.com", language=language, **kwargs)
+            for i in range(count)
+        )
+
+    def test_sends_to_active_subscribers_in_their_language(self):
+        self.subscribe(3, "fr", prefix="fr")
+        self.subscribe(2, "en", prefix="en")
+        self.subscribe(2, prefix="inactive", is_active=False)
+
+        sent = send_campaign(self.campaign, chunk_size=2, batch_size=2, workers=2)
+
+        self.assertEqual(sent, 5)
+        self.assertEqual(len(mail.outbox), 5)
+        subjects = {message.to[0]: message.subject for message in mail.outbox}
+        self.assertEqual(subjects["fr0@example.com"], "Rentrée scolaire")
+        self.assertEqual(subjects["en0@example.com"], "Back to school")
+        english = next(m for m in mail.outbox if m.to == ["en1@example.com"])
+        self.assertIn("Hello (en)", english.alternatives[0][0])
+
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, Campaign.SENT)
+        self.assertEqual(self.campaign.sent_count, 5)
+        self.assertEqual(CampaignDelivery.objects.filter(status=CampaignDelivery.SENT).count(), 5)
+        self.assertGreater(self.campaign.send_seconds, 0)
+        self.assertGreater(self.campaign.messages_per_second, 0)
+
+    def test_content_is_rendered_once_per_language(self):
+        self.subscribe(20)
+        with mock.patch.object(campaigns, "Template", wraps=Template) as template:
+            send_campaign(self.campaign, batch_size=5)
+        self.assertEqual(template.call_count, 2)
+
+    def test_resume_skips_recipients_already_served(self):
+        self.subscribe(4)
+        first = NewsletterSubscriber.objects.order_by("pk").first()
+        CampaignDelivery.objects.create(
+            campaign=self.campaign, subscriber=first, email=first.email, status=CampaignDelivery.SENT
+        )
+        Campaign.objects.filter(pk=self.campaign.pk).update(status=Campaign.SENDING, sent_count=1)
+
+        send_campaign(self.campaign)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertNotIn([first.email], [message.to for message in mail.outbox])
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.sent_count, 4)
+
+    @override_settings(EMAIL_BACKEND="core.tests.test_campaigns.RejectingBackend")
+    def test_failures_are_recorded_per_recipient_and_retried_on_resume(self):
+        self.subscribe(3)
+        self.subscribe(1, prefix="rejet")
+
+        send_campaign(self.campaign)
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.sent_count, self.campaign.failed_count), (3, 1))
+        failed = CampaignDelivery.objects.get(status=CampaignDelivery.FAILED)
+        self.assertEqual(failed.email, "rejet0@example.com")
+        self.assertTrue(failed.error)
+
+        # L'adresse est corrigée : seule elle est renvoyée à la reprise
+        NewsletterSubscriber.objects.filter(pk=failed.subscriber_id).update(email="ok@example.com")
+        CampaignDelivery.objects.filter(pk=failed.pk).update(email="ok@example.com")
+        mail.outbox = []
+        send_campaign(self.campaign)
+
+        self.assertEqual([message.to for message in mail.outbox], [["ok@example.com"]])
+        self.campaign.refresh_from_db()
+        self.assertEqual((self.campaign.sent_count, self.campaign.failed_count), (4, 0))
+
+    def test_query_count_does_not_grow_with_batch_content(self):
+        self.subscribe(10, prefix="small")
+        with CaptureQueriesContext(connection) as small:
+            send_campaign(self.campaign, chunk_size=1000, batch_size=100, workers=1)
+
+        other = Campaign.objects.create(title="Autre", subject_fr="Sujet", body_fr="Corps")
+        self.subscribe(90, prefix="large")
+        with CaptureQueriesContext(connection) as large:
+            send_campaign(other, chunk_size=1000, batch_size=100, workers=1)
+
+        self.assertEqual(len(small), len(large))
+
+    def test_command_sends_queued_campaigns(self):
+        self.subscribe(2)
+        Campaign.objects.filter(pk=self.campaign.pk).update(status=Campaign.QUEUED)
+        Campaign.objects.create(title="Brouillon", subject_fr="Sujet", body_fr="Corps")
+
+        call_command("send_campaigns", stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(Campaign.objects.get(pk=self.campaign.pk).status, Campaign.SENT)
+        self.assertEqual(Campaign.objects.get(title="Brouillon").status, Campaign.DRAFT)
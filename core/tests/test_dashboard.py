@@ -0,0 +1,115 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import Student, Teacher
+from core.dashboard import DashboardStats, get_dashboard_stats, load_dashboard_stats
+from core.models import DashboardSnapshot, Testimonial
+
+User = get_user_model()
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password"
+        )
+
+    def create_student(self, username, gender, level):
+        user = User.objects.create_user(
+            username=username, password="password", is_student=True, gender=gender
+        )
+        return Student.objects.create(student=user, level=level)
+
+    def create_lecturer(self, username, diploma):
+        user = User.objects.create_user(
+            username=username, password="password", is_lecturer=True
+        )
+        return Teacher.objects.create(user=user, speciality="Maths", diploma=diploma)
+
+    def test_counts_match_individual_queries(self):
+        self.create_student("s1", "M", "Primary")
+        self.create_student("s2", "F", "Primary")
+        self.create_student("s3", "F", "High")
+        self.create_lecturer("t1", "PhD en physique")
+        self.create_lecturer("t2", "Master 2")
+        self.create_lecturer("t3", "BSc")
+
+        stats = get_dashboard_stats()
+
+        self.assertIsInstance(stats, DashboardStats)
+        self.assertEqual(stats.student_count, 3)
+        self.assertEqual(stats.lecturer_count, 3)
+        self.assertEqual(stats.superuser_count, 1)
+        self.assertEqual(stats.males_count, 1)
+        self.assertEqual(stats.females_count, 2)
+        self.assertEqual(stats.teacher_qualifications, {"PhD": 1, "Masters": 1, "BSc": 1})
+        self.assertEqual(stats.student_levels, {"Primary": 2, "Secondary": 0, "High": 1})
+
+    def test_single_query_regardless_of_row_count(self):
+        with self.assertNumQueries(1):
+            get_dashboard_stats()
+
+        for i in range(20):
+            self.create_student(f"student{i}", "M" if i % 2 else "F", "Secondary")
+            self.create_lecturer(f"lecturer{i}", "Master")
+
+        with self.assertNumQueries(1):
+            stats = get_dashboard_stats()
+        self.assertEqual(stats.student_levels["Secondary"], 20)
+
+    def test_dashboard_view_uses_snapshot(self):
+        self.client.force_login(self.superuser)
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.context["stats"], DashboardStats)
+
+
+class DashboardSnapshotTests(TestCase):
+    def assertSnapshotMatchesSource(self):
+        snapshot = DashboardSnapshot.objects.get(pk=DashboardSnapshot.SINGLETON_PK)
+        rebuilt = DashboardSnapshot.rebuild()
+        for field in DashboardSnapshot._meta.concrete_fields:
+            if field.name in ("id", "rebuilt_at"):
+                continue
+            self.assertEqual(
+                getattr(snapshot, field.name), getattr(rebuilt, field.name), field.name
+            )
+
+    def test_signals_keep_snapshot_in_sync(self):
+        user = User.objects.create_user(username="s1", password="password", is_student=True, gender="M")
+        student = Student.objects.create(student=user, level="Primary")
+        lecturer = User.objects.create_user(username="t1", password="password", is_lecturer=True)
+        teacher = Teacher.objects.create(user=lecturer, speciality="Maths", diploma="Master")
+        Testimonial.objects.create(author="A", content="Bien", rating=4, is_approved=True)
+        self.assertSnapshotMatchesSource()
+
+        user.gender = "F"
+        user.save()
+        student.level = "High"
+        student.save()
+        teacher.diploma = "PhD"
+        teacher.save()
+        self.assertSnapshotMatchesSource()
+
+        user.delete()
+        teacher.delete()
+        self.assertSnapshotMatchesSource()
+
+    def test_bulk_approval_refreshes_ratings(self):
+        from django.contrib.admin.sites import AdminSite
+        from django.test import RequestFactory
+        from core.admin import TestimonialAdmin
+
+        Testimonial.objects.create(author="A", content="Bien", rating=5)
+        admin = TestimonialAdmin(Testimonial, AdminSite())
+        admin.message_user = lambda *args, **kwargs: None
+        admin.approve_testimonials(RequestFactory().get("/"), Testimonial.objects.all())
+
+        self.assertEqual(DashboardSnapshot.load().rating_distribution[5], 1)
+
+    def test_read_is_single_primary_key_lookup(self):
+        DashboardSnapshot.rebuild()
+        with self.assertNumQueries(1):
+            stats = load_dashboard_stats()
+        self.assertIsInstance(stats, DashboardStats)
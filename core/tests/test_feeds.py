@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import translation
+
+from accounts.models import ActivityLog
+from core import activity
+from core.feeds import feed_key, get_feeds
+from core.models import NewsAndEvents, SuccessRate
+
+User = get_user_model()
+
+FEED_TABLES = ("core_newsandevents", "accounts_activitylog", "core_successrate")
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(activity, "buffer", activity.ActivityBuffer(size=100, interval=60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.news = NewsAndEvents.objects.create(title_fr="Rentrée", title_en="Back to school", posted_as="News")
+        SuccessRate.objects.create(year=2024, rate=92)
+
+    def test_warm_feeds_cost_no_query(self):
+        get_feeds()
+        with self.assertNumQueries(0):
+            feeds = get_feeds()
+        self.assertEqual(feeds["news"], [self.news])
+        self.assertEqual(feeds["success_rate"].rate, 92)
+
+    def test_missing_success_rate_is_cached_too(self):
+        SuccessRate.objects.all().delete()
+        self.assertIsNone(get_feeds("success_rate")["success_rate"])
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_feeds("success_rate")["success_rate"])
+
+    def test_news_are_cached_per_language(self):
+        with translation.override("en"):
+            self.assertEqual(get_feeds("news")["news"][0].title, "Back to school")
+        with translation.override("fr"):
+            self.assertEqual(get_feeds("news")["news"][0].title, "Rentrée")
+        self.assertNotEqual(feed_key("news", "fr"), feed_key("news", "en"))
+        self.assertEqual(feed_key("activity", "fr"), feed_key("activity", "en"))
+
+    def test_changes_refresh_the_feeds(self):
+        for language in ("fr", "en"):
+            with translation.override(language):
+                get_feeds()
+        NewsAndEvents.objects.create(title_fr="Examens", posted_as="Event")
+        SuccessRate.objects.create(year=2025, rate=95)
+        ActivityLog.objects.create(message="Connexion")
+        with translation.override("en"):
+            feeds = get_feeds()
+        self.assertEqual(len(feeds["news"]), 2)
+        self.assertEqual(feeds["success_rate"].year, 2025)
+        self.assertEqual([log.message for log in feeds["activity"]], ["Connexion"])
+
+        self.news.delete()
+        self.assertEqual(len(get_feeds("news")["news"]), 1)
+
+    def test_buffered_entries_reach_the_feed(self):
+        get_feeds("activity")
+        activity.log_activity("Publication ajoutée : Rentrée", self.user)
+        self.assertEqual(get_feeds("activity")["activity"][0].message, "Publication ajoutée : Rentrée")
+
+    def test_home_page_reads_feeds_from_cache(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("home"))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("home"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["items"], [self.news])
+        self.assertFalse([q["sql"] for q in queries if any(table in q["sql"] for table in FEED_TABLES)])
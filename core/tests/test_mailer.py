@@ -0,0 +1,64 @@
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.mailer import enqueue_mail, process_outbox
+from core.models import OutboundEmail
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException("serveur indisponible")
+
+
+class OutboxTests(TestCase):
+    def test_enqueue_does_not_send(self):
+        enqueue_mail("Bonjour", "Message", ["a@example.com"], html_message="<p>Message</p>")
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.get().status, OutboundEmail.PENDING)
+
+    def test_worker_sends_pending_emails_in_batches(self):
+        for i in range(30):
+            enqueue_mail(f"Sujet {i}", "Message", [f"user{i}@example.com"])
+
+        sent, processed = process_outbox(batch_size=50, workers=2, chunk_size=10)
+
+        self.assertEqual((sent, processed), (30, 30))
+        self.assertEqual(len(mail.outbox), 30)
+        self.assertFalse(OutboundEmail.objects.exclude(status=OutboundEmail.SENT).exists())
+
+    @override_settings(EMAIL_BACKEND="core.tests.test_mailer.FailingBackend")
+    def test_failures_are_retried_then_dead_lettered(self):
+        email = enqueue_mail("Sujet", "Message", ["a@example.com"])
+
+        with mock.patch("core.mailer.MAX_ATTEMPTS", 2):
+            process_outbox()
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboundEmail.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            self.assertIn("indisponible", email.last_error)
+
+            # Pas encore dû : rien n'est traité
+            self.assertEqual(process_outbox(), (0, 0))
+
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            process_outbox()
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboundEmail.DEAD)
+
+    def test_contact_view_enqueues_and_returns(self):
+        response = self.client.post(reverse("contact"), {
+            "nom": "Jean Dupont",
+            "email": "jean@example.com",
+            "sujet": "Inscription",
+            "message": "Je souhaite inscrire mon fils.",
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.count(), 2)
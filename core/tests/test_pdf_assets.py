@@ -0,0 +1,93 @@
+import io
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from pypdf import PdfReader
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from core import pdf_assets
+from core.exports import build_calendar_pdf, build_secretary_report_pdf
+from core.pdf_assets import LOGO, SIGNATURE, STAMP, draw_image
+
+
+def page_images(pdf_bytes, page=0):
+    return PdfReader(io.BytesIO(pdf_bytes)).pages[page].images
+
+
+class PdfAssetRegistryTests(SimpleTestCase):
+    def setUp(self):
+        pdf_assets.clear()
+        self.addCleanup(pdf_assets.clear)
+
+    def test_images_are_decoded_once_per_process(self):
+        with mock.patch.object(pdf_assets, "ImageReader", wraps=ImageReader) as reader:
+            for _ in range(3):
+                output = io.BytesIO()
+                p = canvas.Canvas(output)
+                self.assertTrue(draw_image(p, LOGO, 0, 0, 100, 80))
+                draw_image(p, LOGO, 200, 0, 100, 80)  # même XObject réutilisé dans le document
+                p.save()
+                self.assertEqual(len(page_images(output.getvalue())), 1)
+        self.assertEqual(reader.call_count, 1)
+
+    def test_transparent_images_keep_their_mask(self):
+        output = io.BytesIO()
+        p = canvas.Canvas(output)
+        draw_image(p, STAMP, 0, 0, 100, 100)
+        p.save()
+        xobjects = PdfReader(output).pages[0]["/Resources"]["/XObject"]
+        self.assertTrue(any("/SMask" in ref.get_object() for ref in xobjects.values()))
+
+    @mock.patch.object(pdf_assets, "FAST_PATH", False)
+    def test_public_drawing_path(self):
+        # Version de reportlab non vérifiée : canvas.drawImage avec l'ImageReader partagé
+        with mock.patch.object(pdf_assets, "ImageReader", wraps=ImageReader) as reader:
+            for _ in range(2):
+                output = io.BytesIO()
+                p = canvas.Canvas(output)
+                self.assertTrue(draw_image(p, STAMP, 0, 0, 100, 100))
+                draw_image(p, STAMP, 200, 0, 100, 100)
+                p.save()
+                xobjects = PdfReader(output).pages[0]["/Resources"]["/XObject"]
+                self.assertEqual(len(page_images(output.getvalue())), 1)
+                self.assertTrue(any("/SMask" in ref.get_object() for ref in xobjects.values()))
+        self.assertEqual(reader.call_count, 1)
+
+    def test_missing_image_is_skipped(self):
+        with mock.patch.object(pdf_assets, "IMAGE_DIR", "/nonexistent"):
+            p = canvas.Canvas(io.BytesIO())
+            self.assertIsNone(pdf_assets.image(LOGO))
+            self.assertFalse(draw_image(p, LOGO, 0, 0, 100, 80))
+
+    def test_fit_text_truncates_to_the_cell(self):
+        self.assertEqual(pdf_assets.fit_text("Maths", 100), "Maths")
+        self.assertEqual(pdf_assets.fit_text(None, 100), "")
+        full = "Réunion pédagogique de fin de trimestre"
+        text = pdf_assets.fit_text(full, 80, size=9)
+        self.assertTrue(text.endswith("…"))
+        self.assertLessEqual(stringWidth(text, "Helvetica", 9), 80 - 12)
+        # Plus long préfixe possible : un caractère de plus ne tiendrait pas
+        self.assertGreater(stringWidth(full[:len(text)] + "…", "Helvetica", 9), 80 - 12)
+
+    def test_styles_are_shared(self):
+        sheet = pdf_assets.styles()
+        self.assertIs(pdf_assets.styles(), sheet)
+        self.assertIn("Centered", sheet)
+        self.assertIn("Helvetica-Bold", pdf_assets.fonts())
+
+
+class PdfDocumentsTests(TestCase):
+    def test_documents_render_registry_images(self):
+        for _ in range(2):  # deuxième rendu : registre déjà chargé
+            calendar = io.BytesIO()
+            build_calendar_pdf(calendar, 2025, 2026)
+            self.assertEqual(len(page_images(calendar.getvalue())), 3)  # logo, signature, cachet
+
+            report = io.BytesIO()
+            build_secretary_report_pdf(report, {})
+            reader = PdfReader(report)
+            self.assertEqual(sum(len(page.images) for page in reader.pages), 3)
+            self.assertIn("SECRETARY MANAGEMENT REPORT", reader.pages[0].extract_text())
+        self.assertIsNotNone(pdf_assets.image(SIGNATURE))
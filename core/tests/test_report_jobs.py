@@ -0,0 +1,156 @@
+import io
+import shutil
+import tempfile
+import zipfile
+from dataclasses import replace
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from pypdf import PdfReader
+
+from core import reports
+from core.models import AcademicEvent, ReportJob
+from core.reports import REPORTS, enqueue_report, process_report_jobs, purge_expired_reports
+
+User = get_user_model()
+
+
+class ReportJobTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="x")
+        self.client.force_login(self.admin)
+
+    def test_identical_requests_share_one_job(self):
+        secretaries = [
+            User.objects.create_user(username=f"secretaire{i}", password="x", is_staff=True) for i in range(10)
+        ]
+        for user in secretaries:
+            self.client.force_login(user)
+            response = self.client.post(
+                reverse("report_request", args=["calendar_pdf"]), headers={"x-requested-with": "XMLHttpRequest"}
+            )
+            self.assertEqual(response.status_code, 202)
+
+        job = ReportJob.objects.get()
+        self.assertEqual(job.request_count, 10)
+        self.assertEqual(job.requested_by, secretaries[0])
+        self.assertEqual(response.json()["id"], str(job.token))
+
+        # Une fois la tâche terminée, une nouvelle demande relance un rendu
+        process_report_jobs()
+        _job, created = enqueue_report("calendar_pdf", job.params)
+        self.assertTrue(created)
+
+    def test_different_params_are_not_merged(self):
+        first, _created = enqueue_report("calendar_pdf", {"start_year": 2025, "end_year": 2026})
+        second, created = enqueue_report("calendar_pdf", {"start_year": 2026, "end_year": 2027})
+        self.assertTrue(created)
+        self.assertNotEqual(first.pk, second.pk)
+
+    def test_worker_renders_and_serves_the_artifact(self):
+        # Un GET (lien, préchargement) ne crée aucune tâche
+        self.assertContains(self.client.get(reverse("report_request", args=["student_list"])), "<form")
+        self.assertFalse(ReportJob.objects.exists())
+
+        response = self.client.post(reverse("report_request", args=["student_list"]))
+        job = ReportJob.objects.get()
+        self.assertRedirects(response, reverse("report_job", args=[job.token]))
+        status = self.client.get(reverse("report_job_status", args=[job.token])).json()
+        self.assertEqual(status["status"], ReportJob.PENDING)
+        self.assertIsNone(status["download_url"])
+
+        self.assertEqual(process_report_jobs(), (1, 1))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ReportJob.DONE)
+        self.assertTrue(default_storage.exists(job.artifact.name))
+        self.assertGreater(job.expires_at, timezone.now())
+        status = self.client.get(reverse("report_job_status", args=[job.token])).json()
+        self.assertEqual(status["download_url"], reverse("report_job_download", args=[job.token]))
+
+        response = self.client.get(status["download_url"])
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertIn('filename="eleves.pdf"', response["Content-Disposition"])
+        pdf = PdfReader(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertIn("Liste des Élèves", pdf.pages[0].extract_text())
+
+    def test_calendar_docx_is_rendered(self):
+        AcademicEvent.objects.create(date=timezone.localdate(), activity="Rentrée", responsible="Direction")
+        job, _created = enqueue_report("calendar_docx", reports._calendar_params(self.client.request().wsgi_request))
+        process_report_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ReportJob.DONE, job.error)
+        with job.artifact.open("rb") as f, zipfile.ZipFile(f) as docx:
+            self.assertIn("Rentrée", docx.read("word/document.xml").decode())
+
+    def test_failure_is_recorded_and_does_not_block_other_jobs(self):
+        def broken(output):
+            raise ValueError("rendu impossible")
+
+        enqueue_report("student_list")
+        enqueue_report("parent_list")
+        with mock.patch.dict(REPORTS, {"student_list": replace(REPORTS["student_list"], build=broken)}):
+            self.assertEqual(process_report_jobs(), (1, 2))
+
+        failed = ReportJob.objects.get(kind="student_list")
+        self.assertEqual(failed.status, ReportJob.FAILED)
+        self.assertEqual(failed.error, "rendu impossible")
+        self.assertEqual(ReportJob.objects.get(kind="parent_list").status, ReportJob.DONE)
+        # Le rapport en échec n'est plus « en cours » : une nouvelle demande crée une tâche
+        self.assertTrue(enqueue_report("student_list")[1])
+
+    def test_stale_running_job_is_reclaimed(self):
+        job, _created = enqueue_report("student_list")
+        ReportJob.objects.filter(pk=job.pk).update(
+            status=ReportJob.RUNNING, started_at=timezone.now() - timedelta(seconds=reports.TIMEOUT + 1)
+        )
+        self.assertEqual(process_report_jobs(), (1, 1))
+        self.assertEqual(process_report_jobs(), (0, 0))
+
+    def test_expired_artifacts_are_purged(self):
+        job, _created = enqueue_report("student_list")
+        process_report_jobs()
+        job.refresh_from_db()
+        name = job.artifact.name
+
+        ReportJob.objects.filter(pk=job.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.client.get(reverse("report_job_download", args=[job.token])).status_code, 410)
+
+        out = StringIO()
+        call_command("process_report_jobs", "--purge", stdout=out)
+        self.assertIn("1 rapport(s) expiré(s)", out.getvalue())
+        self.assertFalse(ReportJob.objects.exists())
+        self.assertFalse(default_storage.exists(name))
+        self.assertEqual(purge_expired_reports(), 0)
+
+    def test_command_processes_pending_jobs(self):
+        enqueue_report("lecturer_list")
+        out = StringIO()
+        call_command("process_report_jobs", "--workers", "0", stdout=out)
+        self.assertIn("1/1 rapport(s) généré(s).", out.getvalue())
+
+    def test_permissions(self):
+        job, _created = enqueue_report("student_list")
+        staff = User.objects.create_user(username="secretaire", password="x", is_staff=True)
+        self.client.force_login(staff)
+        # Les listes sont réservées aux administrateurs, le calendrier au personnel
+        self.assertEqual(self.client.get(reverse("report_request", args=["student_list"])).status_code, 403)
+        self.assertEqual(self.client.get(reverse("report_job_status", args=[job.token])).status_code, 403)
+        self.assertEqual(self.client.post(reverse("report_request", args=["calendar_pdf"])).status_code, 302)
+        self.assertEqual(self.client.get(reverse("report_request", args=["inconnu"])).status_code, 404)
+        self.assertEqual(
+            self.client.get(reverse("report_request", args=["teacher_info"]), {"pk": "999"}).status_code, 404
+        )
@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import service_worker
+from core.service_worker import AUTH_HEADER
+
+User = get_user_model()
+
+PATHS = ["css/site.css", "js/app.js"]
+
+
+class ServiceWorkerTests(TestCase):
+    def setUp(self):
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root, ignore_errors=True)
+        for path in PATHS:
+            self.write(path, f"/* {path} */")
+
+    def write(self, path, content):
+        os.makedirs(os.path.dirname(os.path.join(self.static_root, path)), exist_ok=True)
+        with open(os.path.join(self.static_root, path), "w") as f:
+            f.write(content)
+
+    def constant(self, source, name):
+        line = next(line for line in source.splitlines() if line.startswith(f"const {name} = "))
+        return json.loads(line.split(" = ", 1)[1].split(";")[0].replace("'", '"'))
+
+    def build(self):
+        return service_worker.build_service_worker(paths=PATHS)
+
+    def test_version_follows_file_contents(self):
+        with override_settings(STATIC_ROOT=self.static_root):
+            source = self.build()
+            self.assertEqual(self.constant(source, "PRECACHE_URLS"), ["/static/css/site.css", "/static/js/app.js"])
+            self.assertEqual(self.constant(source, "OFFLINE_URLS"), {"fr": "/fr/offline/", "en": "/en/offline/"})
+            self.assertEqual(self.build(), source)  # aucun changement : même cache
+
+            self.write("js/app.js", "/* nouvelle version */")
+            self.assertNotEqual(self.constant(self.build(), "VERSION"), self.constant(source, "VERSION"))
+
+    def test_manifest_names_are_precached(self):
+        manifest = {"paths": {"css/site.css": "css/site.0123abcd.css", "js/app.js": "js/app.4567ef01.js"}, "version": "1.1"}
+        self.write("staticfiles.json", json.dumps(manifest))
+        storages = {"staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"}}
+        with override_settings(STATIC_ROOT=self.static_root, STORAGES=storages):
+            source = self.build()
+            self.assertEqual(
+                self.constant(source, "PRECACHE_URLS"), ["/static/css/site.0123abcd.css", "/static/js/app.4567ef01.js"]
+            )
+            self.assertIs(self.constant(source, "HASHED"), True)
+
+            manifest["paths"]["js/app.js"] = "js/app.89abcdef.js"
+            self.write("staticfiles.json", json.dumps(manifest))
+        with override_settings(STATIC_ROOT=self.static_root, STORAGES=storages):
+            self.assertNotEqual(self.constant(self.build(), "VERSION"), self.constant(source, "VERSION"))
+
+    @mock.patch.object(service_worker, "PRECACHE", PATHS)
+    def test_command(self):
+        output = os.path.join(self.static_root, "serviceworker.js")
+        with override_settings(STATIC_ROOT=self.static_root):
+            call_command("build_service_worker", output=output, stdout=StringIO())
+            with open(output) as f:
+                self.assertIn("const AUTH_HEADER = 'X-Authenticated';", f.read())
+
+            os.remove(os.path.join(self.static_root, "js/app.js"))
+            with self.assertRaisesMessage(CommandError, "js/app.js"):
+                call_command("build_service_worker", output=output, stdout=StringIO())
+
+    def test_pages_tell_the_worker_who_is_logged_in(self):
+        response = self.client.get(reverse("about"))
+        self.assertEqual(response[AUTH_HEADER], "0")
+        self.client.force_login(User.objects.create_user(username="prof"))
+        self.assertEqual(self.client.get(reverse("about"))[AUTH_HEADER], "1")
+        self.assertNotIn(AUTH_HEADER, self.client.get(reverse("search_suggest"), {"q": "ma"}))
+
+    def test_form_pages_are_not_stored_by_the_worker(self):
+        # Jeton CSRF dans la page : jamais resservie depuis le cache du navigateur
+        for name in ("login", "contact", "about", "about"):  # deuxième « about » : cache serveur
+            response = self.client.get(reverse(name))
+            self.assertContains(response, "csrfmiddlewaretoken")
+            self.assertEqual(response[AUTH_HEADER], "0")
+            self.assertIn("no-store", response["Cache-Control"])
+            self.assertIn("private", response["Cache-Control"])
+
+        offline = self.client.get(reverse("offline"))
+        self.assertNotContains(offline, "csrfmiddlewaretoken")
+        self.assertFalse(offline.has_header("Cache-Control"))
+
+        with override_settings(STATIC_ROOT=self.static_root):
+            source = self.build()
+        self.assertIn("cacheControl.includes('no-store')", source)
+
@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.template import RequestContext, Template
+from django.test import RequestFactory, TestCase
+
+from core import stat_values
+from core.models import StatValue
+
+
+class StatValueRegistryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        StatValue.objects.create(name="students", value=120)
+        StatValue.objects.create(name="teachers", value=15)
+
+    def test_one_query_then_none(self):
+        with self.assertNumQueries(1):
+            values = stat_values.stat_values()
+        self.assertEqual(values["students"].value, 120)
+        with self.assertNumQueries(0):
+            stat_values.stat_values()
+
+    def test_changes_reload_every_worker(self):
+        stat_values.stat_values()
+        # Autre worker : même cache partagé, mais son propre dictionnaire (ici, le jeton change sous nos pieds)
+        StatValue.objects.filter(name="students").update(value=130)
+        self.assertEqual(stat_values.stat_values()["students"].value, 120)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            StatValue.objects.update_or_create(name="teachers", defaults={"value": 16})
+        values = stat_values.stat_values()
+        self.assertEqual((values["students"].value, values["teachers"].value), (130, 16))
+
+    def test_lost_version_forces_reload(self):
+        stat_values.stat_values()
+        StatValue.objects.filter(name="students").update(value=140)
+        cache.clear()
+        self.assertEqual(stat_values.stat_values()["students"].value, 140)
+
+    def test_context_processor(self):
+        request = RequestFactory().get("/")
+        with self.assertNumQueries(0):
+            Template("{{ request.path }}").render(RequestContext(request))  # registre non consulté
+        rendered = Template("{{ stats.students.value }}/{{ stats.teachers.value }}").render(RequestContext(request))
+        self.assertEqual(rendered, "120/15")
@@ -0,0 +1,38 @@
+from django.contrib.admin.sites import AdminSite
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from core.admin import TestimonialAdmin
+from core.models import Testimonial
+from core.testimonial_stats import compute_testimonial_stats, get_testimonial_stats
+
+
+class TestimonialStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for rating in (5, 5, 4, 2):
+            Testimonial.objects.create(author="A", content="Bien", rating=rating, is_approved=True)
+        Testimonial.objects.create(author="B", content="Caché", rating=1, is_approved=False)
+
+    def test_distribution_average_and_total_in_one_query(self):
+        with self.assertNumQueries(1):
+            stats = compute_testimonial_stats()
+        self.assertEqual(stats.distribution, {5: 2, 4: 1, 3: 0, 2: 1, 1: 0})
+        self.assertEqual(stats.total, 4)
+        self.assertEqual(stats.average, 4.0)
+
+    def test_stats_are_cached(self):
+        get_testimonial_stats()
+        with self.assertNumQueries(0):
+            get_testimonial_stats()
+
+    def test_admin_approval_invalidates_cache(self):
+        self.assertEqual(get_testimonial_stats().total, 4)
+
+        admin = TestimonialAdmin(Testimonial, AdminSite())
+        admin.message_user = lambda *args, **kwargs: None
+        admin.approve_testimonials(RequestFactory().get("/"), Testimonial.objects.filter(is_approved=False))
+
+        stats = get_testimonial_stats()
+        self.assertEqual(stats.total, 5)
+        self.assertEqual(stats.distribution[1], 1)
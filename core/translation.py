@@ -1,5 +1,5 @@
 from modeltranslation.translator import register, TranslationOptions
-from .models import NewsAndEvents
+from .models import Campaign, NewsAndEvents
 
 
 @register(NewsAndEvents)
@@ -9,3 +9,11 @@ class NewsAndEventsTranslationOptions(TranslationOptions):
         "summary",
     )
     empty_values = None
+
+
+@register(Campaign)
+class CampaignTranslationOptions(TranslationOptions):
+    fields = (
+        "subject",
+        "body",
+    )
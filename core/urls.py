@@ -42,5 +42,11 @@ urlpatterns = [
     path("secretary/", views.secretary_dashboard, name="secretary_dashboard"),
     path("secretary/report/pdf/", views.secretary_report_pdf, name="secretary_report_pdf"),
 
+    # --- Rapports en arrière-plan ---
+    path("reports/jobs/<uuid:token>/", views.report_job, name="report_job"),
+    path("reports/jobs/<uuid:token>/status/", views.report_job_status, name="report_job_status"),
+    path("reports/jobs/<uuid:token>/download/", views.report_job_download, name="report_job_download"),
+    path("reports/<slug:kind>/", views.report_request, name="report_request"),
+
     path('offline/', TemplateView.as_view(template_name='offline.html'), name='offline'),
 ]
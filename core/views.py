@@ -16,24 +16,24 @@ from django.urls import reverse
 # ########################################################
 
 from django.utils import timezone
-from .models import NewsAndEvents, ActivityLog, SuccessRate
+from .models import NewsAndEvents
 
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
-from .models import NewsAndEvents, ActivityLog, SuccessRate
+from .models import NewsAndEvents
+from .activity import log_activity
+from .feeds import get_feeds
 
 @login_required
 def home_view(request):
-    items = NewsAndEvents.objects.all().order_by("-updated_date")[:5]
-    activities = ActivityLog.objects.all().order_by("-created_at")[:5]
-
-    # récupère le dernier SuccessRate enregistré
-    success_obj = SuccessRate.get_latest()
+    # Listes en cache, invalidées par signaux (core.feeds)
+    feeds = get_feeds("news", "activity", "success_rate")
+    success_obj = feeds["success_rate"]
 
     context = {
         "title": "Accueil | The Genius Academy",
-        "items": items,
-        "activities": activities,
+        "items": feeds["news"],
+        "activities": feeds["activity"][:5],
         "success_rate": success_obj.rate if success_obj else 0,
         "exam_year": success_obj.year if success_obj else 'N/A',
     }
@@ -53,50 +53,20 @@ from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from accounts.models import User, Student, Teacher, ActivityLog
 from accounts.decorators import admin_required
+from .dashboard import load_dashboard_stats
 
 @login_required
 @admin_required
 def dashboard_view(request):
     # Logs récents
-    logs = ActivityLog.objects.all().order_by("-created_at")[:10]
-
-    # Comptage utilisateurs
-    student_count = User.objects.get_student_count()
-    lecturer_count = User.objects.get_lecturer_count()
-    superuser_count = User.objects.filter(is_superuser=True).count()
-
-    # Comptage hommes/femmes étudiants
-    gender_counts = Student.get_gender_count()
-    males_count = gender_counts.get('M', 0)
-    females_count = gender_counts.get('F', 0)
-
-    # Qualifications enseignants
-    phd_count = Teacher.objects.filter(diploma__icontains='PHD').count()
-    masters_count = Teacher.objects.filter(diploma__icontains='Master').count()
-    bsc_count = Teacher.objects.filter(diploma__icontains='BSc').count()
+    logs = get_feeds("activity")["activity"]
 
-    # Niveaux étudiants
-    primary_count = Student.objects.filter(level='Primary').count()
-    secondary_count = Student.objects.filter(level='Secondary').count()
-    high_count = Student.objects.filter(level='High').count()
+    # Compteurs pré-calculés : lecture d'une seule ligne par clé primaire
+    stats = load_dashboard_stats()
 
     context = {
-        "student_count": student_count,
-        "lecturer_count": lecturer_count,
-        "superuser_count": superuser_count,
-        "males_count": males_count,
-        "females_count": females_count,
+        "stats": stats,
         "logs": logs,
-        "teacher_qualifications": {
-            'PhD': phd_count,
-            'Masters': masters_count,
-            'BSc': bsc_count,
-        },
-        "student_levels": {
-            'Primary': primary_count,
-            'Secondary': secondary_count,
-            'High': high_count,
-        },
     }
 
     return render(request, "core/dashboard.html", context)
@@ -108,6 +78,7 @@ def post_add(request):
         title = form.cleaned_data.get("title", "Post") if form.is_valid() else None
         if form.is_valid():
             form.save()
+            log_activity(f"Publication ajoutée : {title}", request.user)
             messages.success(request, f"{title} has been uploaded.")
             return redirect("home")
         messages.error(request, "Please correct the error(s) below.")
@@ -125,6 +96,7 @@ def edit_post(request, pk):
         title = form.cleaned_data.get("title", "Post") if form.is_valid() else None
         if form.is_valid():
             form.save()
+            log_activity(f"Publication modifiée : {title}", request.user)
             messages.success(request, f"{title} has been updated.")
             return redirect("home")
         messages.error(request, "Please correct the error(s) below.")
@@ -139,6 +111,7 @@ def delete_post(request, pk):
     post = get_object_or_404(NewsAndEvents, pk=pk)
     post_title = post.title
     post.delete()
+    log_activity(f"Publication supprimée : {post_title}", request.user)
     messages.success(request, f"{post_title} has been deleted.")
     return redirect("home")
 
@@ -148,14 +121,19 @@ def delete_post(request, pk):
 # core/views.py
 from django.conf import settings
 from django.contrib import messages
-from django.core.mail import send_mail
 from django.db import DatabaseError
 from django.utils.translation import gettext_lazy as _
 from django.shortcuts import render, redirect
 import logging
 
-from .models import NewsletterSubscriber, GalleryImage, Testimonial, ContactMessage, Slide
+from django.utils.functional import SimpleLazyObject
+
+from .models import NewsletterSubscriber, Testimonial, ContactMessage
 from .forms import NewsletterForm, TestimonialForm, ContactForm
+from .caching import cache_anonymous_page, fallback_slides, get_cached_base_context
+from .testimonial_stats import get_testimonial_stats
+from .stat_values import stat_values
+from .mailer import enqueue_mail
 
 logger = logging.getLogger(__name__)
 
@@ -166,52 +144,18 @@ def get_base_context(request, title=None):
     """Fournit le contexte commun pour toutes les vues."""
     context = {
         "title": title or _("Accueil"),
-        "newsletter_form": NewsletterForm(),
+        # Formulaires instanciés seulement si le template les utilise
+        "newsletter_form": SimpleLazyObject(NewsletterForm),
         "gallery_images": [],
         "slides": [],
         "testimonials": [],
-        "contact_form": ContactForm(),
-        "fallback_slides": [  # Slides de secours si aucune slide en base
-            {
-                "images": [
-                    {"image": "img/carousel1.jpg", "alt": _("Image alternative 1")},
-                ],
-                "title": _("L'excellence éducative à Yaoundé"),
-                "description": _("Accompagnement scolaire personnalisé de la maternelle à la terminale."),
-                "primary_cta": _("Nos services"),
-                "primary_link": "#services",
-                "secondary_cta": _("Contactez-nous"),
-                "secondary_link": "#contact",
-                "secondary_icon": "phone-alt",
-                "tag": _("Excellence académique"),
-                "tag_class": "bg-primary-600",
-            },
-            {
-                "images": [
-                    {"image": "img/carousel2.jpg", "alt": _("Image alternative 2")},
-                ],
-                "title": _("Une pédagogie adaptée à chaque élève"),
-                "description": _("Des enseignants qualifiés pour un suivi personnalisé."),
-                "primary_cta": _("Découvrir nos cours"),
-                "primary_link": "#services",
-                "secondary_cta": _("Nous contacter"),
-                "secondary_link": "#contact",
-                "secondary_icon": "envelope",
-                "tag": _("Apprentissage sur mesure"),
-                "tag_class": "bg-primary-500",
-            },
-        ],
+        "contact_form": SimpleLazyObject(ContactForm),
+        "fallback_slides": fallback_slides(),
     }
 
     try:
-        # Images de la galerie (hors slides)
-        context["gallery_images"] = GalleryImage.objects.filter(slide__isnull=True).order_by("order")[:6]
-
-        # Slides avec leurs images (préchargement pour optimisation)
-        context["slides"] = Slide.objects.prefetch_related("images").order_by("order")
-
-        # Témoignages
-        context["testimonials"] = Testimonial.objects.filter(is_active=True, is_approved=True).order_by("order")[:3]
+        # Galerie, slides et témoignages : cache par langue (voir core.caching)
+        context.update(get_cached_base_context())
 
     except DatabaseError as e:
         logger.error("Erreur lors de la récupération du contexte: %s", str(e), exc_info=True)
@@ -227,45 +171,18 @@ def get_base_context(request, title=None):
 # VUES PRINCIPALES AMÉLIORÉES
 # =========================
 
+@cache_anonymous_page("base", "stats")
 def about(request):
-    tems = NewsAndEvents.objects.all().order_by("-updated_date")[:5]
-    activities = ActivityLog.objects.all().order_by("-created_at")[:5]
-
-    # récupère le dernier SuccessRate enregistré
-    success_obj = SuccessRate.get_latest()
-
-    context = {
-        "title": "Accueil | The Genius Academy",
-        "activities": activities,
-        "success_rate": success_obj.rate if success_obj else 0,
-        "exam_year": success_obj.year if success_obj else 'N/A',
-    }
     context = get_base_context(request, _("À propos de nous"))
     
-    # Récupération dynamique des statistiques
-    stats = {
-        'students': StatValue.objects.filter(name='students').first(),
-        'teachers': StatValue.objects.filter(name='teachers').first(),
-        'success_rate': StatValue.objects.filter(name='success_rate').first(),
-        'years_experience': StatValue.objects.filter(name='years_experience').first(),
-    }
-    
-    context.update(stats)
+    # Statistiques : registre chargé en une requête, partagé par les pages (core.stat_values)
+    stats = stat_values()
+    context.update({
+        name: stats.get(name) for name in ('students', 'teachers', 'success_rate', 'years_experience')
+    })
     return render(request, "core/about.html", context)
 
 def testimonials(request):
-    tems = NewsAndEvents.objects.all().order_by("-updated_date")[:5]
-    activities = ActivityLog.objects.all().order_by("-created_at")[:5]
-
-    # récupère le dernier SuccessRate enregistré
-    success_obj = SuccessRate.get_latest()
-
-    context = {
-        "title": "Accueil | The Genius Academy",
-        "activities": activities,
-        "success_rate": success_obj.rate if success_obj else 0,
-        "exam_year": success_obj.year if success_obj else 'N/A',
-    }
     from .forms import TestimonialForm
     
     # Récupérer les témoignages approuvés et actifs avec pagination
@@ -279,23 +196,22 @@ def testimonials(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    # Calculer la note moyenne
-    from django.db.models import Avg, Count
-    rating_stats = approved_testimonials.aggregate(
-        average_rating=Avg('rating'),
-        total_count=Count('id')
-    )
+    # Distribution, moyenne et total : une requête groupée, mise en cache
+    rating_stats = get_testimonial_stats()
     
     # Récupérer les témoignages en vedette
-    featured_testimonials = approved_testimonials.filter(featured=True)[:5]
+    featured_testimonials = approved_testimonials.filter(featured=True).only(
+        "author", "content", "rating", "testimonial_type", "child_name",
+        "subject_taught", "image", "created_at", "featured",
+    )[:5]
     
     context = get_base_context(request, _("Témoignages"))
     context.update({
         'testimonials': page_obj,
         'featured_testimonials': featured_testimonials,
-        'average_rating': round(rating_stats['average_rating'] or 0, 1),
-        'total_testimonials': rating_stats['total_count'],
-        'rating_distribution': get_rating_distribution(approved_testimonials),
+        'average_rating': rating_stats.average,
+        'total_testimonials': rating_stats.total,
+        'rating_distribution': rating_stats.distribution,
     })
     
     if request.method == "POST":
@@ -362,16 +278,8 @@ def testimonials(request):
     
     return render(request, "core/testimonials.html", context)
 
-# Fonction utilitaire pour la distribution des notes
-def get_rating_distribution(testimonials):
-    distribution = {5: 0, 4: 0, 3: 0, 2: 0, 1: 0}
-    for testimonial in testimonials:
-        distribution[testimonial.rating] += 1
-    return distribution
-
-# Fonction utilitaire pour l'envoi d'email
+# Fonction utilitaire pour l'envoi d'email (mis en file, non bloquant)
 def send_testimonial_notification_email(testimonial):
-    from django.core.mail import send_mail
     from django.conf import settings
     
     subject = f"Nouveau témoignage soumis par {testimonial.author}"
@@ -384,12 +292,11 @@ def send_testimonial_notification_email(testimonial):
         f"Connectez-vous à l'admin pour le modérer."
     )
     
-    send_mail(
+    enqueue_mail(
         subject=subject,
         message=message,
         from_email=settings.DEFAULT_FROM_EMAIL,
         recipient_list=[settings.CONTACT_EMAIL],
-        fail_silently=True,
     )
 
 # Ajouter cette vue pour gérer les requêtes AJAX de détails de témoignage
@@ -417,6 +324,7 @@ def testimonial_detail(request, pk):
         return JsonResponse({'error': 'Témoignage non trouvé'}, status=404)
 
 
+@cache_anonymous_page("base")
 def services(request):
     context = get_base_context(request, _("Nos services"))
     return render(request, "core/services.html", context)
@@ -430,22 +338,27 @@ def static_page_view(request, template, title):
     return render(request, f"core/{template}.html", context)
 
 
+@cache_anonymous_page("base")
 def faq(request):
     return static_page_view(request, "faq", _("Foire aux questions"))
 
 
+@cache_anonymous_page("base")
 def privacy(request):
     return static_page_view(request, "privacy", _("Politique de confidentialité"))
 
 
+@cache_anonymous_page("base")
 def terms(request):
     return static_page_view(request, "terms", _("Conditions d'utilisation"))
 
 
+@cache_anonymous_page("base")
 def cookies(request):
     return static_page_view(request, "cookies", _("Gestion des cookies"))
 
 
+@cache_anonymous_page("base")
 def help(request):
     return static_page_view(request, "help", _("Aide"))
 
@@ -453,7 +366,7 @@ def help(request):
 # =========================
 # CONTACT
 # =========================
-from django.core.mail import send_mail, BadHeaderError
+from django.core.mail import BadHeaderError
 from django.conf import settings
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
@@ -503,7 +416,8 @@ def contact(request):
                         defaults={
                             "nom": contact_message.nom,
                             "is_active": True,
-                            "source": "formulaire_contact"
+                            "source": "formulaire_contact",
+                            "language": request.LANGUAGE_CODE,
                         },
                     )
                     if not created and not subscriber.is_active:
@@ -542,24 +456,22 @@ def contact(request):
                     f"Email: ayangluc096@gmail.com"
                 )
 
-                # Envoi des emails
+                # Mise en file des emails (envoyés par la commande process_outbox)
                 try:
                     # Email à l'admin
-                    send_mail(
+                    enqueue_mail(
                         subject=f"[Contact] {contact_message.sujet} - {contact_message.nom}",
                         message=full_message,
                         from_email=settings.DEFAULT_FROM_EMAIL,
                         recipient_list=[settings.CONTACT_EMAIL, "ayangluc096@gmail.com"],
-                        fail_silently=False,
                     )
 
                     # Email de confirmation à l'utilisateur
-                    send_mail(
+                    enqueue_mail(
                         subject="The Genius Academy - Confirmation de réception de votre message",
                         message=user_message,
                         from_email=settings.DEFAULT_FROM_EMAIL,
                         recipient_list=[contact_message.email],
-                        fail_silently=False,
                     )
                 except BadHeaderError:
                     messages.error(request, _("Erreur d'en-tête dans l'envoi d'email."))
@@ -610,7 +522,8 @@ def newsletter_subscribe(request):
                     defaults={
                         "nom": nom,
                         "is_active": True,
-                        "source": "newsletter_form"
+                        "source": "newsletter_form",
+                        "language": request.LANGUAGE_CODE,
                     }
                 )
 
@@ -625,9 +538,9 @@ def newsletter_subscribe(request):
                 else:
                     messages.success(request, _("Inscription à la newsletter réussie !"))
 
-                # Email de confirmation
+                # Email de confirmation (mis en file)
                 try:
-                    send_mail(
+                    enqueue_mail(
                         subject="Confirmation d'inscription à la newsletter - The Genius Academy",
                         message=(
                             f"Bonjour {nom or 'cher client'},\n\n"
@@ -639,7 +552,6 @@ def newsletter_subscribe(request):
                         ),
                         from_email=settings.DEFAULT_FROM_EMAIL,
                         recipient_list=[email],
-                        fail_silently=False,
                     )
                 except Exception as e:
                     logger.error("Erreur envoi email newsletter: %s", e)
@@ -684,7 +596,7 @@ def submit_testimonial(request):
                 
                 # Notification à l'admin
                 try:
-                    send_mail(
+                    enqueue_mail(
                         subject=f"Nouveau témoignage soumis par {testimonial.nom}",
                         message=(
                             f"Un nouveau témoignage a été soumis:\n\n"
@@ -696,7 +608,6 @@ def submit_testimonial(request):
                         ),
                         from_email=settings.DEFAULT_FROM_EMAIL,
                         recipient_list=[settings.CONTACT_EMAIL],
-                        fail_silently=True,
                     )
                 except Exception:
                     pass
@@ -742,10 +653,7 @@ import os
 from django.conf import settings
 from .models import AcademicEvent
 from .forms import AcademicEventForm
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.platypus import Table, TableStyle
+from .exports import build_calendar_docx, build_calendar_pdf, build_secretary_report_pdf
 # from docx import Document
 # from docx.shared import Inches, Pt
 # from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
@@ -758,6 +666,13 @@ class GenerateCalendarForm(forms.Form):
     start_year = forms.IntegerField(label="Année de début", min_value=2000, max_value=2100)
     end_year = forms.IntegerField(label="Année de fin", min_value=2000, max_value=2100)
 
+    def clean(self):
+        cleaned_data = super().clean()
+        start_year, end_year = cleaned_data.get("start_year"), cleaned_data.get("end_year")
+        if start_year and end_year and end_year < start_year:
+            raise forms.ValidationError("L'année de fin doit suivre l'année de début.")
+        return cleaned_data
+
 
 # -------------------------------
 # Vérification admin
@@ -819,11 +734,6 @@ from django.http import HttpResponse
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.conf import settings
 
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import Table, TableStyle
-from reportlab.pdfgen import canvas
-
 # from docx import Document
 # from docx.shared import Pt, Inches
 # from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
@@ -846,7 +756,21 @@ def is_admin(user):
 @login_required
 @user_passes_test(is_admin)
 def generate_calendar(request):
-    if request.method == "POST":
+    start_year = request.session.get('calendar_start_year', datetime.now().year)
+    period = {"start_year": start_year, "end_year": request.session.get('calendar_end_year', start_year + 1)}
+    form = AcademicEventForm()
+    period_form = GenerateCalendarForm(initial=period)
+
+    if request.method == "POST" and "period" in request.POST:
+        # Période exportée (PDF/DOCX), conservée en session
+        period_form = GenerateCalendarForm(request.POST)
+        if period_form.is_valid():
+            request.session['calendar_start_year'] = period_form.cleaned_data["start_year"]
+            request.session['calendar_end_year'] = period_form.cleaned_data["end_year"]
+            messages.success(request, "Période du calendrier enregistrée ✅")
+            return redirect("generate_calendar")
+        messages.error(request, "Veuillez corriger les erreurs ❌")
+    elif request.method == "POST":
         form = AcademicEventForm(request.POST)
         if form.is_valid():
             form.save()
@@ -854,71 +778,9 @@ def generate_calendar(request):
             return redirect("generate_calendar")
         else:
             messages.error(request, "Veuillez corriger les erreurs ❌")
-    else:
-        form = AcademicEventForm()
 
     events = AcademicEvent.objects.all().order_by("date")
-    return render(request, "core/generate_calendar.html", {"form": form, "events": events})
-
-# -------------------------------
-# PDF Helper: Header amélioré
-# -------------------------------
-def header_footer(p, width, height):
-    """Header PDF avec étoiles, logo et titre"""
-    stars = "★ ★ ★ ★ ★"
-    spacing = 18
-
-    # République / Académie
-    for x_center, lang in [(width/4, "FR"), (3*width/4, "EN")]:
-        y = height - 50
-        p.setFont("Helvetica-Bold", 11)
-        text = "REPUBLIQUE DU CAMEROUN" if lang=="FR" else "REPUBLIC OF CAMEROON"
-        p.drawCentredString(x_center, y, text)
-        y -= spacing
-        p.setFont("Helvetica-Bold", 12)
-        p.drawCentredString(x_center, y, stars)
-        y -= spacing
-        p.setFont("Helvetica-Oblique", 10)
-        text = "Paix – Travail – Patrie" if lang=="FR" else "Peace – Work – Fatherland"
-        p.drawCentredString(x_center, y, text)
-        y -= spacing
-        p.setFont("Helvetica-Bold", 12)
-        p.drawCentredString(x_center, y, stars)
-
-    # Logo centré
-    logo_path = os.path.join(settings.BASE_DIR, "static", "img", "logo2.jpg")
-    if os.path.exists(logo_path):
-        p.drawImage(logo_path, width/2 - 50, height - 150, width=100, height=80, mask="auto")
-
-    # Titre
-    p.setFont("Helvetica-Bold", 16)
-    p.setFillColor(colors.HexColor("#0D47A1"))
-    p.drawCentredString(width/2, height - 180, "CALENDRIER DE L’ANNÉE SCOLAIRE ACADÉMIQUE")
-    p.setFont("Helvetica-Bold", 13)
-    p.drawCentredString(width/2, height - 200, f"{datetime.today().year} – {datetime.today().year+1}")
-    p.setFont("Helvetica-Bold", 12)
-    p.drawCentredString(width/2, height - 220, "DU GROUPE THE GENIUS ACADEMY")
-    p.setFillColor(colors.black)
-
-# -------------------------------
-# PDF Helper: Footer
-# -------------------------------
-def footer_signature(p, width):
-    """Footer PDF avec signatures et cachet"""
-    y_footer = 70
-    date_str = datetime.now().strftime("%d/%m/%Y")
-    p.setFont("Helvetica", 10)
-    p.drawString(50, y_footer, "Visa du Responsable Académique")
-    p.drawString(width - 200, y_footer, f"Yaoundé, le {date_str}")
-    p.drawString(width - 200, y_footer - 15, "Directeur Général")
-
-    sign_path = os.path.join(settings.BASE_DIR, "static", "img", "signature_admin.png")
-    if os.path.exists(sign_path):
-        p.drawImage(sign_path, width - 180, y_footer - 80, width=120, height=60, mask="auto")
-
-    cachet_path = os.path.join(settings.BASE_DIR, "static", "img", "cachet.png")
-    if os.path.exists(cachet_path):
-        p.drawImage(cachet_path, width/2 - 50, y_footer - 60, width=100, height=100, mask="auto")
+    return render(request, "core/generate_calendar.html", {"form": form, "period_form": period_form, "events": events})
 
 # -------------------------------
 # Générer PDF calendrier
@@ -931,45 +793,7 @@ def calendrier_academique_pdf(request):
 
     response = HttpResponse(content_type="application/pdf")
     response['Content-Disposition'] = 'attachment; filename="calendrier_academique.pdf"'
-
-    p = canvas.Canvas(response, pagesize=A4)
-    width, height = A4
-
-    # Watermark
-    p.saveState()
-    p.setFont("Helvetica-Bold", 60)
-    p.setFillColorRGB(0.92, 0.92, 0.92)
-    p.translate(width/2, height/2)
-    p.rotate(45)
-    p.drawCentredString(0, 0, "THE GENIUS ACADEMY")
-    p.restoreState()
-
-    events = AcademicEvent.objects.filter(date__year__gte=start_year, date__year__lte=end_year).order_by("date")
-
-    header_footer(p, width, height)
-
-    # Tableau
-    data = [["Dates", "Activités", "Responsable"]]
-    for e in events:
-        data.append([e.date.strftime("%d %b %Y"), e.activity, e.responsible])
-
-    table = Table(data, colWidths=[100, 280, 120])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#0D47A1")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,0), 11),
-        ('FONTSIZE', (0,1), (-1,-1), 9),
-        ('INNERGRID', (0,0), (-1,-1), 0.5, colors.black),
-        ('BOX', (0,0), (-1,-1), 1, colors.black),
-    ]))
-    table.wrapOn(p, width, height)
-    table.drawOn(p, 40, height - 300)
-
-    footer_signature(p, width)
-    p.showPage()
-    p.save()
+    build_calendar_pdf(response, start_year, end_year)
     return response
 
 # -------------------------------
@@ -981,78 +805,9 @@ def calendrier_academique_docx(request):
     start_year = request.session.get('calendar_start_year', datetime.now().year)
     end_year = request.session.get('calendar_end_year', start_year + 1)
 
-    document = Document()
-
-    # Header République / Académie avec étoiles
-    stars = "★ ★ ★ ★ ★"
-    table_header = document.add_table(rows=2, cols=2)
-    table_header.autofit = True
-    table_header.cell(0,0).text = f"REPUBLIQUE DU CAMEROUN\n{stars}\nPaix – Travail – Patrie\n{stars}"
-    table_header.cell(0,1).text = f"REPUBLIC OF CAMEROON\n{stars}\nPeace – Work – Fatherland\n{stars}"
-    for cell in table_header.rows[0].cells:
-        for paragraph in cell.paragraphs:
-            paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-            run = paragraph.runs[0]
-            run.font.size = Pt(10)
-            run.font.bold = True
-
-    # Logo centré
-    logo_path = os.path.join(settings.BASE_DIR, "static", "img", "logo2.jpg")
-    if os.path.exists(logo_path):
-        document.add_picture(logo_path, width=Inches(1.5))
-        document.paragraphs[-1].alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-
-    # Titre
-    title = document.add_paragraph()
-    title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    run = title.add_run("CALENDRIER DE L’ANNÉE SCOLAIRE ACADÉMIQUE\n")
-    run.font.size = Pt(14)
-    run.font.bold = True
-    run.font.name = "Arial"
-
-    subtitle = document.add_paragraph()
-    subtitle.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    run = subtitle.add_run(f"{start_year} – {end_year}\n")
-    run.font.size = Pt(12)
-    run.font.bold = True
-
-    school = document.add_paragraph()
-    school.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-    run = school.add_run("DU GROUPE THE GENIUS ACADEMY\n\n")
-    run.font.size = Pt(12)
-    run.font.bold = True
-
-    # Tableau des événements
-    events = AcademicEvent.objects.filter(date__year__gte=start_year, date__year__lte=end_year).order_by("date")
-    table = document.add_table(rows=1, cols=3)
-    hdr_cells = table.rows[0].cells
-    hdr_cells[0].text = "Dates"
-    hdr_cells[1].text = "Activités"
-    hdr_cells[2].text = "Responsable"
-    for e in events:
-        row_cells = table.add_row().cells
-        row_cells[0].text = e.date.strftime("%d/%m/%Y")
-        row_cells[1].text = e.activity
-        row_cells[2].text = e.responsible
-
-    # Footer
-    document.add_paragraph("\n\n")
-    footer = document.add_table(rows=1, cols=2)
-    footer.autofit = True
-    footer.cell(0, 0).text = "Visa du Responsable Académique"
-    footer.cell(0, 1).text = f"Yaoundé, le {datetime.now().strftime('%d/%m/%Y')}\nDirecteur Général"
-
-    # Signatures et cachet
-    sign_path = os.path.join(settings.BASE_DIR, "static", "img", "signature_admin.png")
-    if os.path.exists(sign_path):
-        document.add_picture(sign_path, width=Inches(2))
-    cachet_path = os.path.join(settings.BASE_DIR, "static", "img", "cachet.png")
-    if os.path.exists(cachet_path):
-        document.add_picture(cachet_path, width=Inches(1.5))
-
     response = HttpResponse(content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
     response['Content-Disposition'] = 'attachment; filename="calendrier_academique.docx"'
-    document.save(response)
+    build_calendar_docx(response, start_year, end_year)
     return response
 
 from django.shortcuts import render, redirect
@@ -1061,11 +816,6 @@ from django.http import HttpResponse
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.conf import settings
 
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import Table, TableStyle
-from reportlab.pdfgen import canvas
-
 from datetime import datetime
 import os
 
@@ -1134,14 +884,6 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer, Image
-)
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-
 from datetime import datetime
 import os
 
@@ -1154,110 +896,100 @@ def is_secretary(user):
     return user.is_staff or user.is_superuser
 
 
-# Tableau utilitaire
-def build_table(title, columns, rows):
-    styles = getSampleStyleSheet()
-    elements = []
+@login_required
+@user_passes_test(is_secretary)
+def secretary_report_pdf(request):
+    response = HttpResponse(content_type="application/pdf")
+    response["Content-Disposition"] = 'attachment; filename="rapport_secretaire.pdf"'
+    build_secretary_report_pdf(response, request.session.get("secretary_report_ids", {}))
+    return response
 
-    # Titre de section
-    elements.append(Paragraph(f"<b>{title}</b>", styles["Heading3"]))
-    elements.append(Spacer(1, 6))
 
-    if not rows:
-        elements.append(Paragraph(_("<i>No data available</i>"), styles["Normal"]))
-        elements.append(Spacer(1, 12))
-        return elements
+# -------------------------------
+# Rapports en arrière-plan
+# -------------------------------
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404, HttpResponseGone, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_http_methods
+
+from .models import ReportJob
+from .reports import REPORTS, enqueue_report
+
+
+def _get_report_job(request, token):
+    job = get_object_or_404(ReportJob, token=token)
+    report = REPORTS.get(job.kind)
+    if report is None:
+        raise Http404
+    if not report.allowed(request.user):
+        raise PermissionDenied
+    return job, report
+
+
+def report_job_payload(job):
+    ready = job.status == ReportJob.DONE and bool(job.artifact) and not job.is_expired
+    return {
+        "id": str(job.token),
+        "kind": job.kind,
+        "status": job.status,
+        "status_display": str(job.get_status_display()),
+        "expired": job.is_expired,
+        "error": job.error,
+        "request_count": job.request_count,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+        "expires_at": job.expires_at,
+        "status_url": reverse("report_job_status", args=[job.token]),
+        "download_url": reverse("report_job_download", args=[job.token]) if ready else None,
+    }
 
-    data = [columns] + rows
-    table = Table(data, colWidths=[120, 200, 120])
 
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0D47A1")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, 0), 11),
-        ("FONTSIZE", (0, 1), (-1, -1), 9),
-        ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.black),
-        ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-    ]))
+@login_required
+@require_http_methods(["GET", "POST"])
+def report_request(request, kind):
+    """
+    Demande un export. Seul un POST crée la tâche (ou rejoint la tâche
+    identique en cours) : en AJAX, réponse JSON (202), sinon redirection
+    vers la page d'attente. Un GET (lien de menu, préchargement, robot)
+    affiche seulement le bouton de confirmation.
+    """
+    report = REPORTS.get(kind)
+    if report is None:
+        raise Http404
+    if not report.allowed(request.user):
+        raise PermissionDenied
+    params = report.params(request)
+    if request.method == "GET":
+        return render(request, "core/report_request.html", {"report": report})
+    job, _created = enqueue_report(kind, params, request.user)
+    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        return JsonResponse(report_job_payload(job), status=202)
+    return redirect("report_job", token=job.token)
 
-    elements.append(table)
-    elements.append(Spacer(1, 18))
-    return elements
+
+@login_required
+@require_GET
+def report_job(request, token):
+    job, report = _get_report_job(request, token)
+    return render(request, "core/report_job.html", {"job": job, "report": report})
 
 
 @login_required
-@user_passes_test(is_secretary)
-def secretary_report_pdf(request):
-    # Réponse HTTP
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = 'attachment; filename="rapport_secretaire.pdf"'
+@require_GET
+def report_job_status(request, token):
+    job, _report = _get_report_job(request, token)
+    return JsonResponse(report_job_payload(job))
 
-    # Document
-    doc = SimpleDocTemplate(
-        response,
-        pagesize=A4,
-        rightMargin=30, leftMargin=30,
-        topMargin=40, bottomMargin=30
-    )
 
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(name="Centered", alignment=TA_CENTER, fontSize=12, spaceAfter=12))
-    styles.add(ParagraphStyle(name="Small", alignment=TA_LEFT, fontSize=9, textColor=colors.grey))
-
-    elements = []
-
-    # En-tête officiel
-    elements.append(Paragraph("<b>REPUBLIQUE DU CAMEROUN</b>", styles["Centered"]))
-    elements.append(Paragraph(_("Peace – Work – Fatherland"), styles["Centered"]))
-    elements.append(Spacer(1, 6))
-    elements.append(Paragraph("<b>REPUBLIC OF CAMEROON</b>", styles["Centered"]))
-    elements.append(Paragraph(_("Paix – Travail – Patrie"), styles["Centered"]))
-    elements.append(Spacer(1, 12))
-
-    # Logo
-    logo_path = os.path.join(settings.BASE_DIR, "static", "img", "logo2.jpg")
-    if os.path.exists(logo_path):
-        elements.append(Image(logo_path, width=80, height=60))
-        elements.append(Spacer(1, 12))
-
-    # Titre rapport
-    elements.append(Paragraph("<b><font size=14 color='#0D47A1'>"
-                              f"{_('SECRETARY MANAGEMENT REPORT')}"
-                              "</font></b>", styles["Centered"]))
-    elements.append(Spacer(1, 24))
-
-    # Récupération des données
-    report_ids = request.session.get("secretary_report_ids", {})
-    events = AcademicEvent.objects.filter(id__in=report_ids.get("events", []))
-    absences = Absence.objects.filter(id__in=report_ids.get("absences", []))
-    reservations = Reservation.objects.filter(id__in=report_ids.get("reservations", []))
-
-    # Tables
-    rows = [[e.date.strftime("%d/%m/%Y"), e.activity, e.responsible] for e in events]
-    elements += build_table(_("Academic Events"), [_("Date"), _("Activity"), _("Responsible")], rows)
-
-    rows = [[a.teacher.get_full_name(), a.date.strftime("%d/%m/%Y"), a.reason or ""] for a in absences]
-    elements += build_table(_("Teacher Absences"), [_("Teacher"), _("Date"), _("Reason")], rows)
-
-    rows = [[r.course_name, r.student_name, r.date.strftime("%d/%m/%Y")] for r in reservations]
-    elements += build_table(_("Course Reservations"), [_("Course"), _("Student"), _("Date")], rows)
-
-    # Signature et footer
-    date_str = datetime.now().strftime("%d/%m/%Y")
-    elements.append(Spacer(1, 24))
-    elements.append(Paragraph(_("Secretary's approval"), styles["Normal"]))
-    elements.append(Paragraph(f"Yaoundé, le {date_str}", styles["Normal"]))
-
-    # Signature + cachet
-    sign_path = os.path.join(settings.BASE_DIR, "static", "img", "signature_admin.png")
-    if os.path.exists(sign_path):
-        elements.append(Image(sign_path, width=120, height=60))
-    cachet_path = os.path.join(settings.BASE_DIR, "static", "img", "cachet.png")
-    if os.path.exists(cachet_path):
-        elements.append(Image(cachet_path, width=100, height=100))
-
-    # Construction du document
-    doc.build(elements)
-    return response
+@login_required
+@require_GET
+def report_job_download(request, token):
+    job, report = _get_report_job(request, token)
+    if job.status != ReportJob.DONE or not job.artifact:
+        raise Http404
+    if job.is_expired:
+        return HttpResponseGone()
+    return FileResponse(
+        job.artifact.open("rb"), as_attachment=True, filename=job.artifact_filename, content_type=report.content_type
+    )
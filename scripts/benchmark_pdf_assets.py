@@ -0,0 +1,99 @@
+"""
+Mesure le gain du registre de ressources PDF (core.pdf_assets) : chaque
+document est rendu avec le registre chaud, puis en le vidant avant chaque
+rendu (images relues, décodées et réencodées, styles reconstruits : le
+comportement d'avant le registre).
+
+    python scripts/benchmark_pdf_assets.py --repeat 50
+
+Les données de test sont créées dans une transaction annulée à la fin :
+la base configurée n'est pas modifiée (elle doit être migrée).
+"""
+import argparse
+import datetime
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.exports import build_teacher_info_pdf
+from accounts.models import Teacher, TeacherInfo, User
+from core import pdf_assets
+from core.exports import build_calendar_pdf, build_secretary_report_pdf
+from core.models import AcademicEvent
+
+
+class Rollback(Exception):
+    pass
+
+
+def create_data():
+    user = User.objects.create(username="bench-teacher", first_name="Jean", last_name="Mbarga")
+    teacher = Teacher.objects.create(user=user, speciality="Mathématiques")
+    info = TeacherInfo.objects.create(
+        teacher=teacher, nom="Mbarga", prenom="Jean", date_naissance=datetime.date(1990, 5, 1),
+        lieu_naissance="Yaoundé", statut_matrimonial="single", email="bench-teacher@example.com",
+        personne_urgence="Marie", cont_urgence="+237600000000", section_enseignement="Francophone",
+        diplome="Licence",
+    )
+    today = timezone.localdate()
+    events = AcademicEvent.objects.bulk_create(
+        AcademicEvent(date=today, activity=f"Activité {i}", responsible="Direction") for i in range(10)
+    )
+    return info, [e.pk for e in events]
+
+
+def measure(label, build, repeat):
+    timings = {}
+    for mode, cold in (("registre vidé", True), ("registre chaud", False)):
+        pdf_assets.clear()
+        build(io.BytesIO())  # échauffement (imports, requêtes)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            if cold:
+                pdf_assets.clear()
+            build(io.BytesIO())
+        timings[mode] = (time.perf_counter() - started) / repeat * 1000
+    cold, warm = timings["registre vidé"], timings["registre chaud"]
+    print(f"{label:<24} {cold:10.1f} ms {warm:10.1f} ms {cold / warm:8.1f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="Rendus par document et par mode")
+    args = parser.parse_args(argv)
+
+    year = timezone.localdate().year
+    try:
+        with transaction.atomic():
+            info, event_ids = create_data()
+            print(f"{'':<24} {'vidé':>13} {'chaud':>13} {'gain':>9}")
+            measure("fiche répétiteur", lambda out: build_teacher_info_pdf(out, info), args.repeat)
+            measure("calendrier académique", lambda out: build_calendar_pdf(out, year, year + 1), args.repeat)
+            measure(
+                "rapport secrétariat",
+                lambda out: build_secretary_report_pdf(out, {"events": event_ids}),
+                args.repeat,
+            )
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def run(*args):
+    """Point d'entrée pour ``python manage.py runscript benchmark_pdf_assets``."""
+    main(list(args))
+
+
+if __name__ == "__main__":
+    main()
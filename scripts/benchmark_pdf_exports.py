@@ -0,0 +1,99 @@
+"""
+Compare l'export PDF de la liste des élèves : ancien chemin (template HTML
++ xhtml2pdf en mémoire) et moteur reportlab en flux (accounts.exports).
+
+    python scripts/benchmark_pdf_exports.py --rows 5000
+
+Les élèves de test sont créés dans une transaction annulée à la fin :
+la base configurée n'est pas modifiée (elle doit être migrée).
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from django.db import connection, transaction
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+from xhtml2pdf import pisa
+
+from accounts.exports import STUDENT_COLUMNS, build_list_pdf, student_rows
+from accounts.models import Student, User
+
+
+class Rollback(Exception):
+    pass
+
+
+def create_students(count):
+    users = User.objects.bulk_create(
+        (
+            User(username=f"bench{i}", first_name="Élève", last_name=f"Benchmark {i}",
+                 email=f"bench{i}@example.com", phone="+237600000000", is_student=True)
+            for i in range(count)
+        ),
+        batch_size=500,
+    )
+    Student.objects.bulk_create((Student(student=user, level="Secondary") for user in users), batch_size=500)
+
+
+def measure(label, func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        size = func()
+    elapsed = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed:8.2f} s {peak / 1024 / 1024:9.1f} Mo {len(queries):8d} {size / 1024:9.0f} Ko")
+
+
+def legacy_export():
+    html = render_to_string("pdf/student_list.html", {"students": Student.objects.all(), "title": "Students List"})
+    output = io.BytesIO()
+    pisa.CreatePDF(html, dest=output)
+    return output.tell()
+
+
+def streaming_export():
+    with tempfile.TemporaryFile() as output:
+        build_list_pdf(output, "Liste des Élèves", STUDENT_COLUMNS, student_rows())
+        return output.tell()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--skip-legacy", action="store_true", help="Ne mesure que le nouveau moteur")
+    args = parser.parse_args(argv)
+
+    try:
+        with transaction.atomic():
+            create_students(args.rows)
+            print(f"{Student.objects.count()} élèves\n")
+            print(f"{'':<28} {'durée':>10} {'pic mém.':>12} {'requêtes':>8} {'taille':>12}")
+            if not args.skip_legacy:
+                measure("xhtml2pdf (ancien)", legacy_export)
+            measure("reportlab en flux", streaming_export)
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def run(*args):
+    """Point d'entrée pour ``python manage.py runscript benchmark_pdf_exports``."""
+    main(list(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compare la recherche d'utilisateurs : ancien filtre (``icontains`` sur
+prénom, nom, identifiant et email) et colonne normalisée indexée
+(accounts.directory).
+
+    python scripts/benchmark_user_search.py --users 100000
+
+Les utilisateurs de test sont créés dans une transaction annulée à la
+fin : la base configurée n'est pas modifiée (elle doit être migrée).
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.directory import user_search_text
+from accounts.models import User
+
+FIRST_NAMES = ["Paul", "Awa", "Jean", "Hélène", "Éric", "Aïcha", "Brice", "Carine", "Désiré", "Joël", "Ngono", "Marthe"]
+LAST_NAMES = ["Biya", "Mbarga", "Ngo Bassa", "Fotso", "Essomba", "Tchatchoua", "Kamga", "Owona", "Nkoulou", "Abena"]
+QUERIES = ["biya", "helene", "Hélène", "mba", "fotso paul", "user4242", "example.com", "zz", "introuvable"]
+
+
+class Rollback(Exception):
+    pass
+
+
+def create_users(count):
+    def build(i):
+        user = User(
+            username=f"user{i}", first_name=random.choice(FIRST_NAMES),
+            last_name=f"{random.choice(LAST_NAMES)} {i % 997}", email=f"user{i}@example.com",
+        )
+        user.search_text = user_search_text(user)
+        return user
+
+    User.objects.bulk_create((build(i) for i in range(count)), batch_size=2000)
+
+
+def legacy_search(query):
+    return User.objects.filter(
+        Q(username__icontains=query) | Q(first_name__icontains=query)
+        | Q(last_name__icontains=query) | Q(email__icontains=query)
+    ).distinct()
+
+
+def timed(queryset, repeat):
+    """Médiane (ms) d'un COUNT et de la première page de 20 résultats."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = queryset.count()
+        list(queryset.order_by("pk").values_list("pk", flat=True)[:20])
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations), count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    random.seed(args.seed)
+
+    try:
+        with transaction.atomic():
+            started = time.perf_counter()
+            create_users(args.users)
+            print(f"{User.objects.count()} utilisateurs créés en {time.perf_counter() - started:.1f} s\n")
+            print(f"{'requête':<16} {'icontains':>12} {'colonne':>12} {'résultats':>18}")
+            for query in QUERIES:
+                legacy, legacy_count = timed(legacy_search(query), args.repeat)
+                indexed, indexed_count = timed(User.objects.search(query), args.repeat)
+                print(
+                    f"{query:<16} {legacy:9.1f} ms {indexed:9.1f} ms {legacy_count:8d} / {indexed_count:<8d}"
+                )
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def run(*args):
+    """Point d'entrée pour ``python manage.py runscript benchmark_user_search``."""
+    main(list(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Test de charge des suggestions de recherche (/search/suggest/) : latences
+p50/p95/p99 sur des préfixes tirés des titres indexés.
+
+    python scripts/loadtest_typeahead.py --entries 20000 --requests 5000
+    python scripts/loadtest_typeahead.py --url http://127.0.0.1:8000/search/suggest/ --threads 8
+
+Sans ``--url``, les requêtes passent par le client de test Django (en
+processus) sur des événements créés dans une transaction annulée à la
+fin : la base configurée n'est pas modifiée (elle doit être migrée).
+Avec ``--url``, un serveur lancé est interrogé sur ses données réelles.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+
+from core.models import AcademicEvent
+from search import typeahead
+from search.index import rebuild
+from search.models import SearchEntry
+
+WORDS = [
+    "Réunion", "Conseil", "Examen", "Rentrée", "Sortie", "Journée", "Atelier", "Concours", "Remise",
+    "parents", "classe", "blanc", "pédagogique", "culturelle", "sportive", "bulletins", "orientation",
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+def create_events(count):
+    start = date(2025, 9, 1)
+    AcademicEvent.objects.bulk_create(
+        (
+            AcademicEvent(
+                date=start + timedelta(days=i % 300),
+                activity=" ".join(random.sample(WORDS, 3)) + f" {i}",
+                responsible="Direction",
+            )
+            for i in range(count)
+        ),
+        batch_size=1000,
+    )
+
+
+def prefixes(count):
+    """Préfixes de 1 à 6 lettres (et quelques requêtes de deux mots), comme une saisie en cours."""
+    titles = list(SearchEntry.objects.values_list("title", flat=True)[:5000]) or WORDS
+    queries = []
+    for _ in range(count):
+        title_words = typeahead.words(random.choice(titles)) or ["a"]
+        word = random.choice(title_words)
+        query = word[:random.randint(1, 6)]
+        if len(title_words) > 1 and random.random() < 0.2:
+            query = f"{title_words[0]} {query}"
+        queries.append(query)
+    return queries
+
+
+def report(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<12} {len(latencies):7d} req. {len(latencies) / elapsed:9.0f} req/s"
+        f"   p50 {quantiles[49]:7.2f} ms   p95 {quantiles[94]:7.2f} ms   p99 {quantiles[98]:7.2f} ms"
+        f"   max {latencies[-1]:7.2f} ms"
+    )
+
+
+def run_in_process(queries):
+    client = Client()
+    url = reverse("search_suggest")
+    latencies = []
+    started = time.perf_counter()
+    for query in queries:
+        before = time.perf_counter()
+        response = client.get(url, {"q": query})
+        latencies.append((time.perf_counter() - before) * 1000)
+        assert response.status_code == 200, response.status_code
+    return latencies, time.perf_counter() - started
+
+
+def run_http(url, queries, threads):
+    latencies, lock = [], threading.Lock()
+
+    def worker(chunk):
+        for query in chunk:
+            before = time.perf_counter()
+            with urlopen(f"{url}?{urlencode({'q': query})}") as response:
+                json.load(response)
+            elapsed = (time.perf_counter() - before) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    workers = [threading.Thread(target=worker, args=(queries[i::threads],)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=20000, help="Événements de test (sans --url)")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--url", help="URL d'un serveur lancé, ex. http://127.0.0.1:8000/search/suggest/")
+    parser.add_argument("--threads", type=int, default=4, help="Clients simultanés (avec --url)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    random.seed(args.seed)
+
+    if args.url:
+        queries = prefixes(args.requests)
+        report("HTTP", *run_http(args.url, queries, args.threads))
+        return
+
+    try:
+        with transaction.atomic():
+            create_events(args.entries)
+            started = time.perf_counter()
+            rebuild(["event"])
+            print(f"{SearchEntry.objects.count()} entrées indexées en {time.perf_counter() - started:.1f} s")
+            queries = prefixes(args.requests)
+
+            started = time.perf_counter()
+            typeahead.publish()  # hors commit : le rechargement est demandé explicitement
+            suggestions = typeahead.prefix_index.suggest("a", ["", "fr"], ["event"])
+            print(f"index de préfixes chargé en {time.perf_counter() - started:.2f} s ({len(suggestions)} résultats)\n")
+
+            report("à froid", *run_in_process(queries))  # chaque préfixe calculé une première fois
+            report("à chaud", *run_in_process(queries))  # servis par le cache LRU
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def run(*args):
+    """Point d'entrée pour ``python manage.py runscript loadtest_typeahead``."""
+    main(list(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# search/backends.py
+"""
+Moteurs d'interrogation de l'index (search.SearchEntry) :
+
+- PostgreSQL : colonne ``vector`` (tsvector, titre pondéré A, texte B) et
+  index GIN, classement ``ts_rank`` ;
+- SQLite : table virtuelle FTS5 ``search_fts`` tenue à jour par triggers,
+  classement bm25 ;
+- autres bases : ``icontains``, titres d'abord.
+
+Tous renvoient un queryset ordonné par pertinence : la pagination
+(LIMIT/OFFSET) et le comptage se font en base. Le moteur est choisi par
+``settings.SEARCH_BACKEND`` ("auto" : selon la base).
+"""
+import re
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, F, FloatField, IntegerField, Q, Value, When
+from django.utils.module_loading import import_string
+
+from .models import SearchEntry
+
+AUTO_BACKENDS = {
+    "postgresql": "search.backends.PostgresBackend",
+    "sqlite": "search.backends.SqliteBackend",
+}
+
+WORD_RE = re.compile(r"\w+")
+
+
+class BasicBackend:
+    def index(self, entries):
+        """Appelé après l'écriture de ``entries`` (déjà enregistrées)."""
+
+    def entries(self, languages, kinds):
+        return SearchEntry.objects.filter(language__in=languages, kind__in=kinds)
+
+    def search(self, query, languages, kinds):
+        words = WORD_RE.findall(query)
+        if not words:
+            return SearchEntry.objects.none()
+        in_title = reduce(lambda q, word: q & Q(title__icontains=word), words, Q())
+        anywhere = Q()
+        for word in words:
+            anywhere &= Q(title__icontains=word) | Q(body__icontains=word)
+        return (
+            self.entries(languages, kinds)
+            .filter(anywhere)
+            .annotate(rank=Case(When(in_title, then=Value(1)), default=Value(0), output_field=IntegerField()))
+            .order_by("-rank", "-pk")
+        )
+
+
+class SqliteBackend(BasicBackend):
+    @staticmethod
+    def match_expression(words):
+        """Requête FTS5 : chaque mot (préfixe accepté) doit apparaître ; les guillemets neutralisent la syntaxe."""
+        return " ".join(f'"{word}"*' for word in words)
+
+    def search(self, query, languages, kinds):
+        words = WORD_RE.findall(query)
+        if not words:
+            return SearchEntry.objects.none()
+        return (
+            self.entries(languages, kinds)
+            .filter(fts__document__match=self.match_expression(words))
+            .annotate(rank=F("fts__rank"))
+            .order_by("rank", "-pk")
+        )
+
+
+class PostgresBackend(BasicBackend):
+    # Configuration text search par langue ("" : modèles non traduits)
+    CONFIGS = {"fr": "french", "en": "english"}
+    DEFAULT_CONFIG = "simple"
+
+    def config(self, language):
+        return self.CONFIGS.get(language, self.DEFAULT_CONFIG)
+
+    def index(self, entries):
+        by_language = defaultdict(list)
+        for entry in entries:
+            by_language[entry.language].append(entry.pk)
+        for language, pks in by_language.items():
+            config = self.config(language)
+            SearchEntry.objects.filter(pk__in=pks).update(
+                vector=SearchVector("title", weight="A", config=config)
+                + SearchVector("body", weight="B", config=config)
+            )
+
+    def search(self, query, languages, kinds):
+        if not WORD_RE.search(query):
+            return SearchEntry.objects.none()
+        conditions, ranks = [], []
+        for language in languages:
+            # Même configuration que celle de l'indexation : sinon les racines ne correspondent pas
+            search_query = SearchQuery(query, config=self.config(language), search_type="websearch")
+            conditions.append(Q(language=language, vector=search_query))
+            ranks.append(When(language=language, then=SearchRank(F("vector"), search_query)))
+        return (
+            self.entries(languages, kinds)
+            .filter(reduce(or_, conditions))
+            .annotate(rank=Case(*ranks, default=Value(0.0), output_field=FloatField()))
+            .order_by("-rank", "-pk")
+        )
+
+
+def get_backend():
+    path = getattr(settings, "SEARCH_BACKEND", "auto")
+    if path == "auto":
+        path = AUTO_BACKENDS.get(connection.vendor, "search.backends.BasicBackend")
+    return import_string(path)()
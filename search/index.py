@@ -0,0 +1,212 @@
+# search/index.py
+"""
+Registre des modèles indexés et synchronisation de search.SearchEntry.
+
+Chaque ``IndexedModel`` décrit comment un objet devient un document
+(titre, texte) ; les modèles traduits (modeltranslation) donnent un
+document par langue de settings.LANGUAGES. Les sauvegardes et
+suppressions sont répercutées par search.signals ; les écritures en masse
+(bulk_create, update) appellent ``index_objects`` ou passent par
+``python manage.py rebuild_search_index``.
+"""
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from typing import Callable
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import get_language
+from modeltranslation.utils import build_localized_fieldname
+
+from . import typeahead
+from .backends import get_backend
+from .models import SearchEntry
+
+CHUNK_SIZE = 500
+
+
+@dataclass(frozen=True)
+class IndexedModel:
+    kind: str
+    model: str  # "app_label.ModelName"
+    document: Callable  # (objet, langue) -> (titre, texte)
+    fields: tuple  # champs lus par ``document`` : un save(update_fields=...) sans eux ne réindexe pas
+    translated: bool = False
+    indexed: Callable = lambda queryset: queryset  # objets à indexer (ex. témoignages approuvés)
+    visible: Callable = lambda user: True  # qui voit ces résultats
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+    def get_queryset(self):
+        return self.indexed(self.get_model()._default_manager.all())
+
+    def documents(self, obj):
+        languages = [code for code, _name in settings.LANGUAGES] if self.translated else [""]
+        for language in languages:
+            title, body = self.document(obj, language)
+            yield SearchEntry(
+                kind=self.kind, object_id=obj.pk, language=language,
+                title=(title or "")[:255], body=body or "",
+            )
+
+
+# ----------------------------------------
+# Documents
+# ----------------------------------------
+def _translated(obj, field, language):
+    """Valeur du champ dans ``language``, sinon celle de la langue par défaut."""
+    return getattr(obj, build_localized_fieldname(field, language), None) or getattr(obj, field) or ""
+
+
+def _join(*parts):
+    return " ".join(str(part) for part in parts if part)
+
+
+def news_document(news, language):
+    return _translated(news, "title", language), _join(_translated(news, "summary", language), news.posted_as)
+
+
+def testimonial_document(testimonial, _language):
+    return testimonial.author, _join(testimonial.content, testimonial.subject_taught, testimonial.child_name)
+
+
+def event_document(event, _language):
+    return event.activity, _join(event.responsible, event.date.strftime("%d/%m/%Y"))
+
+
+def user_document(user, _language):
+    return user.get_full_name() or user.username, _join(user.username, user.email, user.matricule)
+
+
+REGISTRY = {
+    spec.kind: spec
+    for spec in (
+        IndexedModel(
+            "news", "core.NewsAndEvents", news_document, ("title", "summary", "posted_as"), translated=True,
+        ),
+        IndexedModel(
+            "testimonial", "core.Testimonial", testimonial_document,
+            ("author", "content", "subject_taught", "child_name", "is_active", "is_approved"),
+            indexed=lambda queryset: queryset.filter(is_active=True, is_approved=True),
+        ),
+        IndexedModel("event", "core.AcademicEvent", event_document, ("activity", "responsible", "date")),
+        IndexedModel(
+            "user", settings.AUTH_USER_MODEL, user_document,
+            ("first_name", "last_name", "username", "email", "matricule", "is_active"),
+            indexed=lambda queryset: queryset.filter(is_active=True),
+            visible=lambda user: user.is_staff,  # données personnelles : personnel uniquement
+        ),
+    )
+}
+
+
+def spec_for_model(model):
+    label = model._meta.label_lower
+    return next((spec for spec in REGISTRY.values() if spec.model.lower() == label), None)
+
+
+# ----------------------------------------
+# Synchronisation
+# ----------------------------------------
+def index_objects(spec, objects):
+    """(Ré)indexe ``objects`` (instances du modèle de ``spec``, déjà filtrées par ``spec.indexed``)."""
+    objects = list(objects)
+    if not objects:
+        return
+    pks = [obj.pk for obj in objects]
+    entries = [entry for obj in objects for entry in spec.documents(obj)]
+    with transaction.atomic():
+        SearchEntry.objects.filter(kind=spec.kind, object_id__in=pks).delete()
+        SearchEntry.objects.bulk_create(entries)
+        get_backend().index(entries)
+        transaction.on_commit(partial(typeahead.publish, spec.kind, pks))
+
+
+def remove_objects(spec, pks):
+    SearchEntry.objects.filter(kind=spec.kind, object_id__in=pks).delete()
+    transaction.on_commit(partial(typeahead.publish, spec.kind, pks))
+
+
+def index_instance(instance):
+    """Répercute la sauvegarde d'un objet : indexé, ou retiré s'il ne doit plus l'être."""
+    spec = spec_for_model(type(instance))
+    if spec.get_queryset().filter(pk=instance.pk).exists():
+        index_objects(spec, [instance])
+    else:
+        remove_objects(spec, [instance.pk])
+
+
+def rebuild(kinds=None, chunk_size=CHUNK_SIZE):
+    """Reconstruit l'index (tout, ou les ``kinds`` donnés) ; retourne {kind: documents indexés}."""
+    counts = {}
+    for kind in kinds or REGISTRY:
+        spec = REGISTRY[kind]
+        with transaction.atomic():
+            SearchEntry.objects.filter(kind=kind).delete()
+            objects = spec.get_queryset().order_by("pk").iterator(chunk_size=chunk_size)
+            counts[kind] = 0
+            while chunk := list(islice(objects, chunk_size)):
+                index_objects(spec, chunk)
+                counts[kind] += len(chunk)
+    transaction.on_commit(typeahead.publish)  # rechargement complet des suggestions
+    return counts
+
+
+# ----------------------------------------
+# Interrogation
+# ----------------------------------------
+def current_language():
+    language = (get_language() or settings.LANGUAGE_CODE).split("-")[0]
+    codes = [code for code, _name in settings.LANGUAGES]
+    return language if language in codes else settings.LANGUAGE_CODE
+
+
+def visible_kinds(user=None, kinds=None):
+    return [kind for kind in (kinds or REGISTRY) if user is None or REGISTRY[kind].visible(user)]
+
+
+def search(query, user=None, kinds=None, language=None):
+    """
+    Entrées correspondant à ``query``, classées par pertinence : un
+    queryset de SearchEntry (paginé en base par LIMIT/OFFSET), limité aux
+    types visibles par ``user`` et à la langue courante.
+    """
+    language = language or current_language()
+    return get_backend().search(query, [language, ""], visible_kinds(user, kinds))
+
+
+def suggest(query, user=None, kinds=None, language=None, limit=typeahead.LIMIT):
+    """Titres commençant par les mots de ``query`` (saisie en cours), depuis l'index en mémoire."""
+    language = language or current_language()
+    return typeahead.prefix_index.suggest(query, [language, ""], visible_kinds(user, kinds), limit)
+
+
+class SearchResults:
+    """
+    Séquence paresseuse pour Paginator : ``count()`` et la tranche de la
+    page sont calculés en base ; seuls les objets de la page sont chargés
+    (une requête par type).
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def count(self):
+        return self.entries.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        hits = list(self.entries.values_list("kind", "object_id")[index])
+        objects = {}
+        for kind in {kind for kind, _pk in hits}:
+            pks = [pk for hit_kind, pk in hits if hit_kind == kind]
+            objects[kind] = REGISTRY[kind].get_model()._default_manager.in_bulk(pks)
+        # Un objet supprimé sans signal (suppression en masse) est ignoré
+        return [objects[kind][pk] for kind, pk in hits if pk in objects[kind]]
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from search.index import CHUNK_SIZE, REGISTRY, rebuild
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index de recherche (après une écriture en masse ou un premier déploiement)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "kinds", nargs="*", help=f"Types à réindexer parmi {', '.join(sorted(REGISTRY))} (tous par défaut)"
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        unknown = set(options["kinds"]) - set(REGISTRY)
+        if unknown:
+            raise CommandError(f"Type(s) inconnu(s) : {', '.join(sorted(unknown))}")
+        started = time.perf_counter()
+        counts = rebuild(options["kinds"] or None, chunk_size=options["chunk_size"])
+        for kind, count in counts.items():
+            self.stdout.write(f"{kind} : {count} objet(s) indexé(s)")
+        self.stdout.write(f"Index reconstruit en {time.perf_counter() - started:.1f} s.")
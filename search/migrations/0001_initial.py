@@ -0,0 +1,104 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:19
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+import search.models
+from django.db import migrations, models
+
+# Table FTS5 à contenu externe : seuls les index sont stockés, le texte est
+# relu dans search_searchentry. Les triggers la tiennent à jour.
+# Attention : une migration qui reconstruit search_searchentry sur SQLite
+# (ALTER non supporté) supprime ces triggers ; les recréer ensuite.
+SQLITE_SQL = [
+    """
+    CREATE VIRTUAL TABLE search_fts USING fts5(
+        title, body, content='search_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER search_fts_insert AFTER INSERT ON search_searchentry BEGIN
+        INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_fts_delete AFTER DELETE ON search_searchentry BEGIN
+        INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_fts_update AFTER UPDATE ON search_searchentry BEGIN
+        INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    # Colonne « rank » : bm25 avec le titre dix fois plus important que le texte
+    "INSERT INTO search_fts(search_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+]
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS search_fts_insert",
+    "DROP TRIGGER IF EXISTS search_fts_delete",
+    "DROP TRIGGER IF EXISTS search_fts_update",
+    "DROP TABLE IF EXISTS search_fts",
+]
+POSTGRESQL_SQL = ["CREATE INDEX search_entry_vector_gin ON search_searchentry USING gin (vector)"]
+POSTGRESQL_REVERSE_SQL = ["DROP INDEX IF EXISTS search_entry_vector_gin"]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+create_fulltext_index = _run({"sqlite": SQLITE_SQL, "postgresql": POSTGRESQL_SQL})
+drop_fulltext_index = _run({"sqlite": SQLITE_REVERSE_SQL, "postgresql": POSTGRESQL_REVERSE_SQL})
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('language', models.CharField(blank=True, default='', max_length=10)),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True, default='')),
+                ('vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+            ],
+            options={
+                'verbose_name': "Entrée de l'index de recherche",
+                'verbose_name_plural': 'Index de recherche',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchEntryFTS',
+            fields=[
+                ('entry', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='fts', serialize=False, to='search.searchentry')),
+                ('document', search.models.FullTextField(db_column='search_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'search_fts',
+                'managed': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='searchentry',
+            index=models.Index(fields=['language', 'kind'], name='search_entry_lang_kind'),
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id', 'language'), name='unique_search_entry'),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
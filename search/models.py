@@ -1,3 +1,63 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils.translation import gettext_lazy as _
 
-# Create your models here.
+
+# ----------------------------------------
+# Index de recherche (voir search.index et search.backends)
+# ----------------------------------------
+class SearchEntry(models.Model):
+    """
+    Document indexé : une ligne par objet et par langue ("" pour les
+    modèles non traduits). Tenue à jour par search.signals ; reconstruite
+    par ``python manage.py rebuild_search_index``.
+
+    Sur SQLite, la table virtuelle FTS5 ``search_fts`` est synchronisée par
+    triggers (migration 0001) ; sur PostgreSQL, ``vector`` porte l'index GIN.
+    """
+
+    kind = models.CharField(max_length=30)
+    object_id = models.PositiveBigIntegerField()
+    language = models.CharField(max_length=10, blank=True, default="")
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True, default="")
+    vector = SearchVectorField(null=True, editable=False)  # PostgreSQL uniquement
+
+    class Meta:
+        verbose_name = _("Entrée de l'index de recherche")
+        verbose_name_plural = _("Index de recherche")
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id", "language"], name="unique_search_entry"),
+        ]
+        indexes = [models.Index(fields=["language", "kind"], name="search_entry_lang_kind")]
+
+    def __str__(self):
+        return f"[{self.kind}:{self.object_id}] {self.title}"
+
+
+class FullTextField(models.TextField):
+    """Colonne cachée d'une table FTS5 (elle porte le nom de la table) : opérande de MATCH."""
+
+
+@FullTextField.register_lookup
+class Match(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class SearchEntryFTS(models.Model):
+    """Table virtuelle FTS5 (SQLite), à contenu externe : ``rowid`` = ``SearchEntry.id``."""
+
+    entry = models.OneToOneField(
+        SearchEntry, primary_key=True, db_column="rowid", on_delete=models.DO_NOTHING, related_name="fts"
+    )
+    document = FullTextField(db_column="search_fts")
+    rank = models.FloatField()  # bm25, pondéré titre/texte (plus petit = plus pertinent)
+
+    class Meta:
+        managed = False
+        db_table = "search_fts"
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.deletions import signals_deferred
+
+from .index import REGISTRY, index_instance, remove_objects, spec_for_model
+
+
+# ----------------------------------------
+# Synchronisation de l'index de recherche
+# ----------------------------------------
+def update_search_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    spec = spec_for_model(sender)
+    # Fixtures, ou sauvegarde partielle sans champ indexé (ex. last_login à la connexion)
+    if raw or (update_fields is not None and not set(update_fields) & set(spec.fields)):
+        return
+    index_instance(instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    if signals_deferred():  # suppression en masse : retirés par paquet (core.deletions)
+        return
+    remove_objects(spec_for_model(sender), [instance.pk])
+
+
+def connect():
+    for spec in REGISTRY.values():
+        model = spec.get_model()
+        post_save.connect(update_search_index, sender=model, dispatch_uid=f"search_index_{spec.kind}")
+        post_delete.connect(remove_from_search_index, sender=model, dispatch_uid=f"search_unindex_{spec.kind}")
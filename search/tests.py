@@ -1,3 +1,211 @@
-from django.test import TestCase
+from datetime import date
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.utils import translation
+
+from core.models import AcademicEvent, NewsAndEvents, Testimonial
+from search import typeahead
+from search.index import SearchResults, search, suggest
+from search.models import SearchEntry
+
+User = get_user_model()
+
+
+def hits(query, **kwargs):
+    return [(entry.kind, entry.object_id) for entry in search(query, **kwargs)]
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.news = NewsAndEvents.objects.create(
+            title_fr="Journée portes ouvertes", title_en="Open day",
+            summary_fr="Visite de l'établissement", summary_en="Visit the school", posted_as="News",
+        )
+        self.event = AcademicEvent.objects.create(
+            date=date(2025, 9, 8), activity="Rentrée scolaire", responsible="Direction des études",
+        )
+
+    def test_documents_follow_saves_and_deletes(self):
+        self.assertEqual(hits("portes"), [("news", self.news.pk)])
+        self.assertEqual(hits("rentree"), [("event", self.event.pk)])  # accents ignorés
+
+        self.event.activity = "Examens blancs"
+        self.event.save()
+        self.assertEqual(hits("rentree"), [])
+        self.assertEqual(hits("blanc"), [("event", self.event.pk)])  # préfixe
+
+        self.event.delete()
+        self.assertEqual(hits("blancs"), [])
+        self.assertFalse(SearchEntry.objects.filter(kind="event").exists())
+
+    def test_translated_fields_are_searched_in_the_current_language(self):
+        self.assertEqual(hits("open day"), [])
+        with translation.override("en"):
+            self.assertEqual(hits("open day"), [("news", self.news.pk)])
+            self.assertEqual(hits("rentrée"), [("event", self.event.pk)])  # non traduit : toutes les langues
+
+    def test_title_matches_rank_first(self):
+        in_body = AcademicEvent.objects.create(date=date(2025, 10, 1), activity="Conseil", responsible="Examens")
+        in_title = AcademicEvent.objects.create(date=date(2025, 10, 2), activity="Examens", responsible="Direction")
+        self.assertEqual(hits("examens"), [("event", in_title.pk), ("event", in_body.pk)])
+
+    def test_only_approved_testimonials_are_indexed(self):
+        testimonial = Testimonial.objects.create(author="Awa", content="Excellents répétiteurs", is_approved=False)
+        self.assertEqual(hits("repetiteurs"), [])
+        testimonial.is_approved = True
+        testimonial.save()
+        self.assertEqual(hits("repetiteurs"), [("testimonial", testimonial.pk)])
+
+    def test_users_are_only_visible_to_staff(self):
+        student = User.objects.create_user(username="eleve1", first_name="Paul", last_name="Biya", password="x")
+        staff = User.objects.create_user(username="secretaire", password="x", is_staff=True)
+        self.assertEqual(hits("biya", user=student), [])
+        self.assertEqual(hits("biya", user=staff), [("user", student.pk)])
+
+        # Une connexion (update_fields=["last_login"]) ne réindexe pas
+        with CaptureQueriesContext(connection) as queries:
+            student.save(update_fields=["last_login"])
+        self.assertFalse(any("search_searchentry" in query["sql"] for query in queries))
+
+    def test_query_syntax_is_neutralised(self):
+        self.assertEqual(hits('portes" OR NOT *'), [])
+        self.assertEqual(hits("***"), [])
+
+    def test_rebuild_command(self):
+        AcademicEvent.objects.bulk_create(
+            AcademicEvent(date=date(2025, 11, i), activity=f"Conseil de classe {i}", responsible="Direction")
+            for i in range(1, 6)
+        )
+        self.assertEqual(len(hits("conseil")), 0)  # bulk_create : pas de signal
+        out = StringIO()
+        call_command("rebuild_search_index", "event", stdout=out)
+        self.assertIn("event : 6 objet(s) indexé(s)", out.getvalue())
+        self.assertEqual(len(hits("conseil")), 5)
+
+    @override_settings(SEARCH_BACKEND="search.backends.BasicBackend")
+    def test_basic_backend(self):
+        self.assertEqual(hits("rentrée"), [("event", self.event.pk)])
+
+
+class SearchViewTests(TestCase):
+    def test_results_are_paginated_in_the_database(self):
+        AcademicEvent.objects.bulk_create(
+            AcademicEvent(date=date(2025, 9, 1), activity=f"Réunion {i}", responsible="Direction") for i in range(45)
+        )
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("query"), {"q": "réunion", "page": 3})
+        self.assertEqual(response.context["count"], 45)
+        self.assertEqual(len(response.context["object_list"]), 5)
+        self.assertContains(response, "Réunion 0")  # la plus ancienne en dernier
+        search_queries = [q["sql"] for q in queries if "search_searchentry" in q["sql"]]
+        self.assertEqual(len(search_queries), 2)  # COUNT + page
+        self.assertIn("LIMIT", search_queries[-1])
+
+    def test_empty_query(self):
+        response = self.client.get(reverse("query"), {"q": " "})
+        self.assertEqual(response.context["count"], 0)
+
+    def test_results_sequence_loads_one_query_per_kind(self):
+        AcademicEvent.objects.create(date=date(2025, 9, 1), activity="Sortie", responsible="Direction")
+        NewsAndEvents.objects.create(title="Sortie au musée", summary="", posted_as="Event")
+        results = SearchResults(search("sortie"))
+        with self.assertNumQueries(3):
+            page = results[0:20]
+        self.assertEqual(len(page), 2)
+
+
+class TypeaheadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(setattr, typeahead, "prefix_index", typeahead.prefix_index)
+        typeahead.prefix_index = typeahead.PrefixIndex()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event = AcademicEvent.objects.create(
+                date=date(2025, 9, 8), activity="Rentrée scolaire", responsible="Direction",
+            )
+            self.news = NewsAndEvents.objects.create(
+                title_fr="Journée portes ouvertes", title_en="Open day", summary="", posted_as="News",
+            )
+
+    def titles(self, query, **kwargs):
+        return [result["title"] for result in suggest(query, **kwargs)]
+
+    def test_prefixes_match_any_word_without_accents(self):
+        self.assertEqual(self.titles("ren"), ["Rentrée scolaire"])
+        self.assertEqual(self.titles("SCOL"), ["Rentrée scolaire"])
+        self.assertEqual(self.titles("jour port"), ["Journée portes ouvertes"])
+        self.assertEqual(self.titles("jour rent"), [])
+        self.assertEqual(self.titles("open"), [])
+        with translation.override("en"):
+            self.assertEqual(self.titles("open"), ["Open day"])
+
+    def test_index_follows_saves_incrementally(self):
+        self.assertEqual(self.titles("exam"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.activity = "Examens blancs"
+            self.event.save()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.titles("exam"), ["Examens blancs"])
+        self.assertEqual(len(queries), 1)  # relecture du seul objet modifié
+        self.assertEqual(self.titles("ren"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.delete()
+        self.assertEqual(self.titles("exam"), [])
+
+    def test_full_reload_after_rebuild(self):
+        AcademicEvent.objects.bulk_create(
+            AcademicEvent(date=date(2025, 11, i), activity=f"Conseil de classe {i}", responsible="Direction")
+            for i in range(1, 6)
+        )
+        self.assertEqual(self.titles("cons"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("rebuild_search_index", "event", stdout=StringIO())
+        self.assertEqual(len(self.titles("cons")), 5)
+        self.assertEqual(len(suggest("cons", limit=2)), 2)
+
+    def test_generation_clash_publishes_a_reset(self):
+        self.assertEqual(self.titles("ren"), ["Rentrée scolaire"])
+        generation = cache.get(typeahead.GENERATION_KEY)
+        # Deux processus obtiennent la même génération (incr non atomique)
+        typeahead.publish("event", [self.event.pk])
+        cache.set(typeahead.GENERATION_KEY, generation)
+        typeahead.publish("news", [self.news.pk])
+
+        change = typeahead.CHANGE_KEY.format
+        self.assertEqual(cache.get(change(generation=generation + 1)), ("event", [self.event.pk]))
+        self.assertIs(cache.get(change(generation=generation + 2), "absente"), typeahead.RESET)
+        with mock.patch.object(typeahead.prefix_index, "_load_all", wraps=typeahead.prefix_index._load_all) as load:
+            self.titles("ren")
+        load.assert_called_once()
+
+    def test_repeated_prefixes_are_served_from_the_cache(self):
+        self.titles("ren")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles("Ren"), ["Rentrée scolaire"])
+
+    def test_users_are_only_suggested_to_staff(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            student = User.objects.create_user(username="eleve1", first_name="Paul", last_name="Biya", password="x")
+            staff = User.objects.create_user(username="secretaire", password="x", is_staff=True)
+        self.assertEqual(self.titles("biy", user=student), [])
+        self.assertEqual(self.titles("biy", user=staff), ["Paul Biya"])
+
+    def test_suggest_endpoint(self):
+        response = self.client.get(reverse("search_suggest"), {"q": "rent"})
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIn("private", response["Cache-Control"])
+        result, = response.json()["results"]
+        self.assertEqual((result["kind"], result["id"]), ("event", self.event.pk))
+        self.assertEqual(result["url"], reverse("query") + "?q=Rentr%C3%A9e+scolaire")
+        self.assertEqual(self.client.get(reverse("search_suggest")).json()["results"], [])
@@ -0,0 +1,182 @@
+# search/typeahead.py
+"""
+Suggestions de la barre de recherche : index de préfixes en mémoire (un
+par processus) sur les titres de search.SearchEntry, et cache LRU des
+derniers préfixes demandés.
+
+L'index est chargé au premier appel puis tenu à jour par morceaux :
+search.index publie, après commit, les (type, ids) modifiés dans un
+journal partagé (cache Django, une clé par génération). Avant de
+répondre, chaque processus relit les objets des générations qu'il n'a
+pas encore vues ; si le journal a été évincé, il recharge tout.
+
+``cache.incr`` n'est pas atomique sur tous les backends (fichiers, base) :
+deux publications peuvent obtenir la même génération. L'entrée est donc
+écrite par ``cache.add`` ; en cas de collision, la publication perdante
+prend une nouvelle génération et y écrit RESET (rechargement complet).
+"""
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import SearchEntry
+
+LIMIT = getattr(settings, "TYPEAHEAD_LIMIT", 8)
+CACHE_SIZE = getattr(settings, "TYPEAHEAD_CACHE_SIZE", 1024)
+# Mots d'index parcourus au plus par requête (préfixes très courts)
+MAX_SCAN = 5000
+JOURNAL_TIMEOUT = 24 * 60 * 60
+PUBLISH_ATTEMPTS = 3
+
+GENERATION_KEY = "search:typeahead:generation"
+CHANGE_KEY = "search:typeahead:change:{generation}"
+RESET = None  # entrée de journal : tout recharger
+
+WORD_RE = re.compile(r"\w+")
+
+
+def normalize(text):
+    """Minuscules sans accents : « Journée » et « journee » ont la même clé."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def words(text):
+    return WORD_RE.findall(normalize(text))
+
+
+# ----------------------------------------
+# Journal des modifications (partagé entre processus)
+# ----------------------------------------
+def next_generation():
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 0, None)
+        return cache.incr(GENERATION_KEY)
+
+
+def publish(kind=RESET, pks=()):
+    """Signale aux processus que les documents ``kind``/``pks`` ont changé (tout, sans ``kind``)."""
+    change = RESET if kind is RESET else (kind, list(pks))
+    for _attempt in range(PUBLISH_ATTEMPTS):
+        if cache.add(CHANGE_KEY.format(generation=next_generation()), change, JOURNAL_TIMEOUT):
+            return
+        # Génération déjà écrite par une publication concurrente : notre modification
+        # n'y figure pas, les processus devront tout recharger
+        change = RESET
+    # Collisions répétées : RESET écrase l'entrée (il couvre toute autre modification)
+    cache.set(CHANGE_KEY.format(generation=next_generation()), RESET, JOURNAL_TIMEOUT)
+
+
+# ----------------------------------------
+# Index de préfixes
+# ----------------------------------------
+class PrefixIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = None  # dernière génération appliquée (None : pas encore chargé)
+        self.tokens = []  # liste triée de (mot, clé d'entrée)
+        self.entries = {}  # clé d'entrée (type, id, langue) -> titre
+        self.by_object = defaultdict(set)  # (type, id) -> clés d'entrée
+        self.results = OrderedDict()  # cache LRU : requête -> suggestions
+
+    # Chargement
+    def _add(self, kind, object_id, language, title):
+        key = (kind, object_id, language)
+        self.entries[key] = title
+        self.by_object[kind, object_id].add(key)
+        for word in set(words(title)):
+            insort(self.tokens, (word, key))
+
+    def _remove(self, kind, object_id):
+        for key in self.by_object.pop((kind, object_id), ()):
+            for word in set(words(self.entries.pop(key))):
+                position = bisect_left(self.tokens, (word, key))
+                if position < len(self.tokens) and self.tokens[position] == (word, key):
+                    del self.tokens[position]
+
+    def _load_all(self, generation):
+        rows = SearchEntry.objects.values_list("kind", "object_id", "language", "title")
+        entries, tokens, by_object = {}, [], defaultdict(set)
+        for kind, object_id, language, title in rows.iterator(chunk_size=5000):
+            key = (kind, object_id, language)
+            entries[key] = title
+            by_object[kind, object_id].add(key)
+            tokens.extend((word, key) for word in set(words(title)))
+        tokens.sort()
+        self.entries, self.tokens, self.by_object = entries, tokens, by_object
+        self.generation = generation
+
+    def _reload(self, kind, pks):
+        for pk in pks:
+            self._remove(kind, pk)
+        rows = SearchEntry.objects.filter(kind=kind, object_id__in=pks)
+        for object_id, language, title in rows.values_list("object_id", "language", "title"):
+            self._add(kind, object_id, language, title)
+
+    def sync(self):
+        """Rattrape les générations publiées depuis le dernier appel (appelé sous ``lock``)."""
+        current = cache.get(GENERATION_KEY, 0)
+        if current == self.generation:
+            return
+        self.results.clear()
+        if self.generation is None or current < self.generation:  # premier appel, ou cache vidé
+            return self._load_all(current)
+        keys = [CHANGE_KEY.format(generation=g) for g in range(self.generation + 1, current + 1)]
+        changes = cache.get_many(keys)
+        if len(changes) < len(keys) or any(changes[key] is RESET for key in keys):
+            return self._load_all(current)
+        pending = defaultdict(set)
+        for key in keys:
+            kind, pks = changes[key]
+            pending[kind].update(pks)
+        for kind, pks in pending.items():
+            self._reload(kind, pks)
+        self.generation = current
+
+    # Interrogation
+    def _match(self, query_words, languages, kinds, limit):
+        # Le mot le plus long délimite la plage la plus courte ; les autres filtrent
+        probe = max(query_words, key=len)
+        others = [word for word in query_words if word != probe]
+        found, seen = [], set()
+        position = bisect_left(self.tokens, (probe,))
+        for word, key in self.tokens[position:position + MAX_SCAN]:
+            if not word.startswith(probe):
+                break
+            kind, object_id, language = key
+            if (kind, object_id) in seen or language not in languages or kind not in kinds:
+                continue
+            title = self.entries[key]
+            if others and not all(any(w.startswith(other) for w in words(title)) for other in others):
+                continue
+            seen.add((kind, object_id))
+            found.append({"kind": kind, "id": object_id, "title": title})
+            if len(found) == limit:
+                break
+        return found
+
+    def suggest(self, query, languages, kinds, limit=LIMIT):
+        query_words = words(query)
+        if not query_words or not kinds:
+            return []
+        cache_key = (" ".join(query_words), tuple(languages), tuple(sorted(kinds)), limit)
+        with self.lock:
+            self.sync()
+            if cache_key in self.results:
+                self.results.move_to_end(cache_key)
+                return self.results[cache_key]
+            found = self._match(query_words, set(languages), set(kinds), limit)
+            self.results[cache_key] = found
+            if len(self.results) > CACHE_SIZE:
+                self.results.popitem(last=False)
+            return found
+
+
+prefix_index = PrefixIndex()
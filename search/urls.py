@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import SearchView
+from .views import SearchView, suggest_view
 
 urlpatterns = [
     path("", SearchView.as_view(), name="query"),
+    path("suggest/", suggest_view, name="search_suggest"),
 ]
@@ -1,38 +1,38 @@
-from itertools import chain
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils.http import urlencode
 from django.views.generic import ListView
-from core.models import NewsAndEvents
-# from course.models import Program, Course
-# from quiz.models import Quiz
+
+from .index import SearchResults, search, suggest
 
 
 class SearchView(ListView):
     template_name = "search/search_view.html"
     paginate_by = 20
-    count = 0
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
-        context["count"] = self.count or 0
+        paginator = context.get("paginator")
+        context["count"] = paginator.count if paginator else 0
         context["query"] = self.request.GET.get("q")
         return context
 
     def get_queryset(self):
-        request = self.request
-        query = request.GET.get("q", None)
+        query = self.request.GET.get("q", "").strip()
+        if not query:
+            return []
+        # Classement et pagination dans la base (index plein texte, voir search.backends)
+        return SearchResults(search(query, user=self.request.user))
 
-        if query is not None:
-            news_events_results = NewsAndEvents.objects.search(query)
-            # program_results = Program.objects.search(query)
-            # course_results = Course.objects.search(query)
-            # quiz_results = Quiz.objects.search(query)
 
-            # combine querysets
-            queryset_chain = chain(
-                # news_events_results, program_results, course_results, quiz_results
-            )
-            queryset = sorted(
-                queryset_chain, key=lambda instance: instance.pk, reverse=True
-            )
-            self.count = len(queryset)  # since queryset is actually a list
-            return queryset
-        return NewsAndEvents.objects.none()  # just an empty queryset as default
+def suggest_view(request):
+    """Suggestions JSON pour la saisie dans la barre de recherche (index de préfixes en mémoire)."""
+    query = request.GET.get("q", "")[:100]
+    results = [
+        dict(result, url=f"{reverse('query')}?{urlencode({'q': result['title']})}")
+        for result in suggest(query, user=request.user)
+    ]
+    response = JsonResponse({"query": query, "results": results})
+    patch_cache_control(response, private=True, max_age=30)  # les résultats dépendent de l'utilisateur
+    return response
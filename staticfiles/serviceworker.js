@@ -0,0 +1,112 @@
+// Généré par « python manage.py build_service_worker » (voir core/service_worker.py) : ne pas modifier.
+const VERSION = '1cb453eaba01';
+const STATIC_CACHE = `genius-academy-static-${VERSION}`;
+const PAGE_CACHE = `genius-academy-pages-${VERSION}`;
+const PRECACHE_URLS = ["/static/css/style.css", "/static/css/style.min.css", "/static/css/tailwind.css", "/static/vendor/bootstrap-5.3.2/css/bootstrap.min.css", "/static/vendor/fontawesome-6.5.1/css/all.min.css", "/static/js/main.js", "/static/vendor/bootstrap-5.3.2/js/bootstrap.bundle.min.js", "/static/vendor/jquery-3.7.1/jquery-3.7.1.min.js", "/static/img/icons/web-app-manifest-192x192.png", "/static/img/icons/web-app-manifest-512x512.png", "/static/manifest/site.webmanifest"];
+const OFFLINE_URLS = {"fr": "/fr/offline/", "en": "/en/offline/"};
+const DEFAULT_LANGUAGE = 'fr';
+const STATIC_URL = '/static/';
+const HASHED = false;  // noms hachés : un fichier statique ne change jamais sous la même URL
+const NETWORK_ONLY = ["/admin/", "/pwa/", "/i18n/"];
+const AUTH_HEADER = 'X-Authenticated';
+
+// Utilisateur connecté ? Inconnu (null) tant qu'aucune page n'a répondu, et après chaque envoi de formulaire
+let authenticated = null;
+
+// Install : préchargement des fichiers statiques et des pages hors ligne
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(STATIC_CACHE)
+            .then(cache => cache.addAll([...PRECACHE_URLS, ...Object.values(OFFLINE_URLS)]))
+            .then(() => self.skipWaiting())
+    );
+});
+
+// Activate : suppression des caches des versions précédentes
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(
+                keys.filter(key => key !== STATIC_CACHE && key !== PAGE_CACHE).map(key => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+function rememberAuthState(response) {
+    const state = response.headers.get(AUTH_HEADER);
+    if (state !== null) {
+        authenticated = state === '1';
+    }
+    return response;
+}
+
+// Seules les pages anonymes, servies directement (pas après redirection), sont mises en cache
+function isStorablePage(response) {
+    return response.ok && response.type === 'basic' && !response.redirected && response.headers.get(AUTH_HEADER) === '0';
+}
+
+function offlinePage(request) {
+    const language = new URL(request.url).pathname.split('/')[1];
+    return caches.match(OFFLINE_URLS[language] || OFFLINE_URLS[DEFAULT_LANGUAGE]);
+}
+
+async function fetchPage(request) {
+    const response = rememberAuthState(await fetch(request));
+    if (isStorablePage(response)) {
+        const cache = await caches.open(PAGE_CACHE);
+        await cache.put(request, response.clone());
+    }
+    return response;
+}
+
+// Utilisateurs connectés (ou état inconnu) : réseau d'abord, cache puis page hors ligne en secours
+async function networkFirst(request) {
+    try {
+        return await fetchPage(request);
+    } catch (error) {
+        return (await caches.match(request, { cacheName: PAGE_CACHE })) || offlinePage(request);
+    }
+}
+
+// Visiteurs anonymes : version en cache tout de suite, mise à jour en arrière-plan
+function staleWhileRevalidate(event) {
+    const request = event.request;
+    const network = fetchPage(request);
+    event.waitUntil(network.catch(() => null));
+    return caches.match(request, { cacheName: PAGE_CACHE })
+        .then(cached => cached || network.catch(() => offlinePage(request)));
+}
+
+async function staticFile(request) {
+    const cached = await caches.match(request, { cacheName: STATIC_CACHE });
+    if (cached) {
+        return cached;
+    }
+    const response = await fetch(request);
+    if (HASHED && response.ok) {
+        const cache = await caches.open(STATIC_CACHE);
+        await cache.put(request, response.clone());
+    }
+    return response;
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin || NETWORK_ONLY.some(prefix => url.pathname.startsWith(prefix))) {
+        return;
+    }
+    if (request.method !== 'GET') {
+        // Connexion, déconnexion… : l'état sera relu sur la prochaine page
+        authenticated = null;
+        return;
+    }
+    if (url.pathname.startsWith(STATIC_URL)) {
+        event.respondWith(staticFile(request));
+    } else if (request.mode === 'navigate' || (request.headers.get('Accept') || '').includes('text/html')) {
+        event.respondWith(authenticated === false ? staleWhileRevalidate(event) : networkFirst(request));
+    }
+    // Autres requêtes (JSON, suggestions de recherche…) : réseau
+});
+
@@ -0,0 +1,116 @@
+{% autoescape off %}// Généré par « python manage.py build_service_worker » (voir core/service_worker.py) : ne pas modifier.
+const VERSION = '{{ version }}';
+const STATIC_CACHE = `genius-academy-static-${VERSION}`;
+const PAGE_CACHE = `genius-academy-pages-v2-${VERSION}`;  // v2 : purge des pages à jeton CSRF des versions précédentes
+const PRECACHE_URLS = {{ precache_urls }};
+const OFFLINE_URLS = {{ offline_urls }};
+const DEFAULT_LANGUAGE = '{{ default_language }}';
+const STATIC_URL = '{{ static_url }}';
+const HASHED = {{ hashed }};  // noms hachés : un fichier statique ne change jamais sous la même URL
+const NETWORK_ONLY = {{ network_only }};
+const AUTH_HEADER = '{{ auth_header }}';
+
+// Utilisateur connecté ? Inconnu (null) tant qu'aucune page n'a répondu, et après chaque envoi de formulaire
+let authenticated = null;
+
+// Install : préchargement des fichiers statiques et des pages hors ligne
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(STATIC_CACHE)
+            .then(cache => cache.addAll([...PRECACHE_URLS, ...Object.values(OFFLINE_URLS)]))
+            .then(() => self.skipWaiting())
+    );
+});
+
+// Activate : suppression des caches des versions précédentes
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(
+                keys.filter(key => key !== STATIC_CACHE && key !== PAGE_CACHE).map(key => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+function rememberAuthState(response) {
+    const state = response.headers.get(AUTH_HEADER);
+    if (state !== null) {
+        authenticated = state === '1';
+    }
+    return response;
+}
+
+// Seules les pages anonymes, servies directement (pas après redirection) et sans
+// « Cache-Control: no-store / private » (pages à formulaire : jeton CSRF), sont mises en cache
+function isStorablePage(response) {
+    const cacheControl = (response.headers.get('Cache-Control') || '').toLowerCase();
+    return response.ok && response.type === 'basic' && !response.redirected
+        && response.headers.get(AUTH_HEADER) === '0'
+        && !cacheControl.includes('no-store') && !cacheControl.includes('private');
+}
+
+function offlinePage(request) {
+    const language = new URL(request.url).pathname.split('/')[1];
+    return caches.match(OFFLINE_URLS[language] || OFFLINE_URLS[DEFAULT_LANGUAGE]);
+}
+
+async function fetchPage(request) {
+    const response = rememberAuthState(await fetch(request));
+    if (isStorablePage(response)) {
+        const cache = await caches.open(PAGE_CACHE);
+        await cache.put(request, response.clone());
+    }
+    return response;
+}
+
+// Utilisateurs connectés (ou état inconnu) : réseau d'abord, cache puis page hors ligne en secours
+async function networkFirst(request) {
+    try {
+        return await fetchPage(request);
+    } catch (error) {
+        return (await caches.match(request, { cacheName: PAGE_CACHE })) || offlinePage(request);
+    }
+}
+
+// Visiteurs anonymes : version en cache tout de suite, mise à jour en arrière-plan
+function staleWhileRevalidate(event) {
+    const request = event.request;
+    const network = fetchPage(request);
+    event.waitUntil(network.catch(() => null));
+    return caches.match(request, { cacheName: PAGE_CACHE })
+        .then(cached => cached || network.catch(() => offlinePage(request)));
+}
+
+async function staticFile(request) {
+    const cached = await caches.match(request, { cacheName: STATIC_CACHE });
+    if (cached) {
+        return cached;
+    }
+    const response = await fetch(request);
+    if (HASHED && response.ok) {
+        const cache = await caches.open(STATIC_CACHE);
+        await cache.put(request, response.clone());
+    }
+    return response;
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin || NETWORK_ONLY.some(prefix => url.pathname.startsWith(prefix))) {
+        return;
+    }
+    if (request.method !== 'GET') {
+        // Connexion, déconnexion… : l'état sera relu sur la prochaine page
+        authenticated = null;
+        return;
+    }
+    if (url.pathname.startsWith(STATIC_URL)) {
+        event.respondWith(staticFile(request));
+    } else if (request.mode === 'navigate' || (request.headers.get('Accept') || '').includes('text/html')) {
+        event.respondWith(authenticated === false ? staleWhileRevalidate(event) : networkFirst(request));
+    }
+    // Autres requêtes (JSON, suggestions de recherche…) : réseau
+});
+{% endautoescape %}